@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+"""
+Process-wide Vosk model registry and recognizer pool.
+
+Loading a ``vosk.Model`` takes seconds and hundreds of MB, so models are loaded
+once per directory and reference counted by open sessions. Each model keeps a
+bounded pool of ``KaldiRecognizer`` instances per (samplerate, words) flavour;
+recognizers are ``Reset()`` and reused between sessions, which makes opening a
+session on a warm model practically free.
+
+Sessions expose a synchronous ``accept``/``finish`` API and an async streaming
+API that feeds PCM chunks inline on the event loop (no thread hop per chunk).
+
+Environment:
+  - ``ADAOS_VOSK_POOL_SIZE``    recognizers per model flavour (default 4)
+  - ``ADAOS_VOSK_POOL_WAIT_S``  max wait for a free recognizer (default 10)
+  - ``ADAOS_VOSK_MODEL_IDLE_S`` unload unreferenced models after this long (default 600)
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _vosk_model(model_dir: str) -> Any:
+    import vosk  # type: ignore
+
+    return vosk.Model(model_dir)
+
+
+def _vosk_recognizer(model: Any, samplerate: int) -> Any:
+    import vosk  # type: ignore
+
+    return vosk.KaldiRecognizer(model, samplerate)
+
+
+def _text(raw: Optional[str]) -> str:
+    try:
+        return (json.loads(raw or "{}").get("text") or "").strip()
+    except Exception:
+        return ""
+
+
+class RecognizerPool:
+    """Bounded pool of recognizers for one model flavour."""
+
+    def __init__(self, factory: Callable[[], Any], *, size: int, wait_s: float) -> None:
+        self._factory = factory
+        self.size = max(1, size)
+        self.wait_s = wait_s
+        self._idle: List[Any] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self.reused = 0
+
+    def try_acquire(self) -> Optional[Any]:
+        with self._cond:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return self._factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        deadline = time.monotonic() + (self.wait_s if timeout is None else timeout)
+        while True:
+            rec = self.try_acquire()
+            if rec is not None:
+                return rec
+            with self._cond:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"no free Vosk recognizer (pool size {self.size})")
+                if not self._idle and self._created >= self.size:
+                    self._cond.wait(remaining)
+
+    def release(self, rec: Any) -> None:
+        try:
+            rec.Reset()
+            keep = True
+        except Exception:
+            keep = False  # old vosk without Reset(): drop it, a fresh one is built on demand
+        with self._cond:
+            if keep:
+                self._idle.append(rec)
+            else:
+                self._created -= 1
+            self._cond.notify()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "created": self._created, "idle": len(self._idle), "reused": self.reused}
+
+
+@dataclass
+class _ModelEntry:
+    path: str
+    ready: threading.Event = field(default_factory=threading.Event)
+    model: Any = None
+    error: Optional[BaseException] = None
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    pools: Dict[Tuple[int, bool], RecognizerPool] = field(default_factory=dict)
+
+
+class SttSession:
+    """One recognition session holding a model reference and a pooled recognizer."""
+
+    def __init__(self, registry: "VoskModelRegistry", entry: _ModelEntry, pool: RecognizerPool, recognizer: Any) -> None:
+        self._registry = registry
+        self._entry = entry
+        self._pool = pool
+        self.recognizer = recognizer
+        self.model = entry.model
+        self._closed = False
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        """Feed PCM; returns the final phrase when the recognizer closes one."""
+        if self.recognizer.AcceptWaveform(chunk):
+            return _text(self.recognizer.Result())
+        return None
+
+    def partial(self) -> str:
+        try:
+            return (json.loads(self.recognizer.PartialResult() or "{}").get("partial") or "").strip()
+        except Exception:
+            return ""
+
+    def finish(self) -> str:
+        return _text(self.recognizer.FinalResult())
+
+    async def feed(self, chunk: bytes) -> Optional[str]:
+        return self.accept(chunk)
+
+    async def transcribe_stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+        """Yield final phrases for an async PCM stream, then the trailing remainder."""
+        async for chunk in chunks:
+            text = self.accept(chunk)
+            if text:
+                yield text
+        tail = self.finish()
+        if tail:
+            yield tail
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.release(self.recognizer)
+        self._registry._release(self._entry)
+
+    def __enter__(self) -> "SttSession":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "SttSession":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class VoskModelRegistry:
+    def __init__(
+        self,
+        *,
+        model_factory: Callable[[str], Any] = _vosk_model,
+        recognizer_factory: Callable[[Any, int], Any] = _vosk_recognizer,
+        pool_size: Optional[int] = None,
+        wait_s: Optional[float] = None,
+        idle_ttl_s: Optional[float] = None,
+    ) -> None:
+        self._model_factory = model_factory
+        self._recognizer_factory = recognizer_factory
+        self.pool_size = int(pool_size if pool_size is not None else _env_float("ADAOS_VOSK_POOL_SIZE", 4))
+        self.wait_s = wait_s if wait_s is not None else _env_float("ADAOS_VOSK_POOL_WAIT_S", 10.0)
+        self.idle_ttl_s = idle_ttl_s if idle_ttl_s is not None else _env_float("ADAOS_VOSK_MODEL_IDLE_S", 600.0)
+        self._models: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    # --- models -----------------------------------------------------------
+    def _retain(self, model_dir: str | Path) -> _ModelEntry:
+        key = str(Path(model_dir).resolve())
+        with self._lock:
+            self._evict_idle_locked()
+            entry = self._models.get(key)
+            loader = entry is None
+            if loader:
+                entry = self._models[key] = _ModelEntry(path=key)
+            entry.refs += 1
+        if loader:
+            try:
+                entry.model = self._model_factory(key)
+                self.loads += 1
+            except BaseException as exc:
+                entry.error = exc
+                with self._lock:
+                    self._models.pop(key, None)
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+        if entry.error is not None:
+            raise RuntimeError(f"failed to load Vosk model {key}: {entry.error}") from entry.error
+        return entry
+
+    def _release(self, entry: _ModelEntry) -> None:
+        with self._lock:
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time.monotonic()
+            self._evict_idle_locked()
+
+    def _evict_idle_locked(self, ttl: Optional[float] = None) -> None:
+        ttl = self.idle_ttl_s if ttl is None else ttl
+        now = time.monotonic()
+        for key, entry in list(self._models.items()):
+            if entry.refs == 0 and entry.ready.is_set() and now - entry.last_used >= ttl:
+                self._models.pop(key, None)
+
+    def evict_idle(self, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._evict_idle_locked(ttl)
+
+    def _pool(self, entry: _ModelEntry, samplerate: int, words: bool) -> RecognizerPool:
+        flavour = (int(samplerate), bool(words))
+        with self._lock:
+            pool = entry.pools.get(flavour)
+            if pool is None:
+
+                def _factory() -> Any:
+                    rec = self._recognizer_factory(entry.model, flavour[0])
+                    rec.SetWords(flavour[1])
+                    return rec
+
+                pool = entry.pools[flavour] = RecognizerPool(_factory, size=self.pool_size, wait_s=self.wait_s)
+            return pool
+
+    # --- sessions ---------------------------------------------------------
+    def open_session(self, model_dir: str | Path, *, samplerate: int = 16000, words: bool = False, timeout: Optional[float] = None) -> SttSession:
+        entry = self._retain(model_dir)
+        try:
+            pool = self._pool(entry, samplerate, words)
+            rec = pool.acquire(timeout)
+        except BaseException:
+            self._release(entry)
+            raise
+        return SttSession(self, entry, pool, rec)
+
+    async def open_session_async(self, model_dir: str | Path, *, samplerate: int = 16000, words: bool = False) -> SttSession:
+        """Like :meth:`open_session`; only hops to a thread when it would block."""
+        key = str(Path(model_dir).resolve())
+        with self._lock:
+            entry = self._models.get(key)
+            warm = entry is not None and entry.ready.is_set() and entry.error is None
+            if warm:
+                entry.refs += 1
+        if warm:
+            try:
+                pool = self._pool(entry, samplerate, words)
+                rec = pool.try_acquire()
+            except BaseException:
+                self._release(entry)
+                raise
+            if rec is not None:
+                return SttSession(self, entry, pool, rec)
+            self._release(entry)
+        return await asyncio.to_thread(self.open_session, model_dir, samplerate=samplerate, words=words)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "models": {
+                    key: {"refs": entry.refs, "pools": {f"{rate}:{int(words)}": pool.snapshot() for (rate, words), pool in entry.pools.items()}}
+                    for key, entry in self._models.items()
+                },
+            }
+
+
+_REGISTRY: Optional[VoskModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_vosk_registry() -> VoskModelRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = VoskModelRegistry()
+    return _REGISTRY
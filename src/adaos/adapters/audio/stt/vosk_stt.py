@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 import queue
 from pathlib import Path
 from typing import Generator, Iterable, Optional
 
+from adaos.adapters.audio.stt.vosk_pool import get_vosk_registry
 from adaos.services.agent_context import get_ctx
 
 
@@ -44,9 +44,11 @@ class VoskSTT:
         if not Path(model_dir).exists():
             raise RuntimeError(f"Vosk model not found: {model_dir}")
 
-        self.model = vosk.Model(str(model_dir))
-        self.rec = vosk.KaldiRecognizer(self.model, self.samplerate)
-        self.rec.SetWords(True)
+        # Model and recognizer come from the process-wide registry: concurrent
+        # sessions share one loaded model, recognizers are reused across sessions.
+        self.session = get_vosk_registry().open_session(model_dir, samplerate=self.samplerate, words=True)
+        self.model = self.session.model
+        self.rec = self.session.recognizer
 
         if external_stream is None:
             try:
@@ -85,20 +87,16 @@ class VoskSTT:
         """Infinite generator of final phrases (final STT results)."""
         if self._external_stream is not None:
             for chunk in self._external_stream:
-                if self.rec.AcceptWaveform(chunk):
-                    res = json.loads(self.rec.Result() or "{}")
-                    text = (res.get("text") or "").strip()
-                    if text:
-                        yield text
+                text = self.session.accept(chunk)
+                if text:
+                    yield text
             return
 
         while True:
             data = self._q.get()
-            if self.rec.AcceptWaveform(data):
-                res = json.loads(self.rec.Result() or "{}")
-                text = (res.get("text") or "").strip()
-                if text:
-                    yield text
+            text = self.session.accept(data)
+            if text:
+                yield text
 
     def close(self) -> None:
         try:
@@ -107,4 +105,5 @@ class VoskSTT:
                 self.stream.close()
         except Exception:
             pass
+        self.session.close()
 
@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field
 from adaos.apps.api.auth import require_token
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
-from adaos.services.yjs.doc import async_get_ydoc
+from adaos.services.nlu.teacher_state import read_teacher
 from adaos.services.yjs.webspace import default_webspace_id
 
 router = APIRouter(tags=["nlu-teacher"])
@@ -21,11 +21,6 @@ def _resolve_webspace_id(token: Optional[str]) -> str:
     return default_webspace_id()
 
 
-def _teacher_obj(data_map: Any) -> dict:
-    current = data_map.get("nlu_teacher")
-    return dict(current) if isinstance(current, dict) else {}
-
-
 class ApplyRevisionRequest(BaseModel):
     revision_id: str = Field(..., min_length=1)
     intent: str = Field(..., min_length=1)
@@ -36,9 +31,7 @@ class ApplyRevisionRequest(BaseModel):
 @router.get("/nlu/teacher/{webspace_id}", dependencies=[Depends(require_token)])
 async def get_teacher_state(webspace_id: str):
     ws = _resolve_webspace_id(webspace_id)
-    async with async_get_ydoc(ws) as ydoc:
-        data_map = ydoc.get_map("data")
-        return {"webspace_id": ws, "nlu_teacher": _teacher_obj(data_map)}
+    return {"webspace_id": ws, "nlu_teacher": await read_teacher(ws)}
 
 
 @router.post("/nlu/teacher/{webspace_id}/revision/apply", dependencies=[Depends(require_token)])
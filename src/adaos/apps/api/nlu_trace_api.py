@@ -0,0 +1,73 @@
+# src/adaos/apps/api/nlu_trace_api.py
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from adaos.apps.api.auth import require_token
+from adaos.services.nlu.trace_store import get_trace_store
+from adaos.services.yjs.webspace import default_webspace_id
+
+router = APIRouter(tags=["nlu-trace"])
+
+
+def _resolve_webspace_id(token: Optional[str]) -> str:
+    if isinstance(token, str) and token.strip():
+        return token.strip()
+    return default_webspace_id()
+
+
+@router.get("/nlu/trace/{webspace_id}", dependencies=[Depends(require_token)])
+async def get_trace(
+    webspace_id: str,
+    before: Optional[int] = None,
+    limit: int = 50,
+    type: Optional[list[str]] = Query(default=None),
+    request_id: Optional[str] = None,
+):
+    """Newest-first page of NLU trace items; pass ``next_before`` back as ``before`` for the next page."""
+    ws = _resolve_webspace_id(webspace_id)
+    page = await get_trace_store().query_async(ws, before=before, limit=limit, types=type, request_id=request_id)
+    return {"webspace_id": ws, **page}
+
+
+def _sse(record: dict) -> bytes:
+    return b"event: nlu.trace\ndata: " + json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n\n"
+
+
+async def _stream_iter(webspace_id: str, since: Optional[int]) -> AsyncIterator[bytes]:
+    store = get_trace_store()
+    queue = store.subscribe(webspace_id)
+    last = 0
+    heartbeat_at = time.time()
+    try:
+        if since is not None:
+            for record in store.since(webspace_id, since):
+                last = int(record["seq"])
+                yield _sse(record)
+        while True:
+            try:
+                record = await asyncio.wait_for(queue.get(), timeout=5.0)
+                if int(record["seq"]) > last:
+                    last = int(record["seq"])
+                    yield _sse(record)
+            except asyncio.TimeoutError:
+                pass
+            if time.time() - heartbeat_at >= 15:
+                heartbeat_at = time.time()
+                yield b": keep-alive\n\n"
+    finally:
+        store.unsubscribe(webspace_id, queue)
+
+
+@router.get("/nlu/trace/{webspace_id}/stream", dependencies=[Depends(require_token)])
+async def stream_trace(webspace_id: str, since: Optional[int] = None):
+    """SSE stream of new trace items (``since`` replays what is still in the ring)."""
+    ws = _resolve_webspace_id(webspace_id)
+    headers = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
+    return StreamingResponse(_stream_iter(ws, since), media_type="text/event-stream", headers=headers)
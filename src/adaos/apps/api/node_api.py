@@ -14,6 +14,7 @@ from adaos.domain import Event
 from adaos.adapters.db import SqliteSkillRegistry
 from adaos.apps.api.auth import ensure_token, require_token, resolve_presented_token
 from adaos.services.agent_context import get_ctx
+from adaos.services.boot_graph import boot_timeline_snapshot
 from adaos.services.bootstrap import is_ready, load_config, request_hub_root_reconnect, switch_role
 from adaos.services.io_web.desktop import WebDesktopInstalled, WebDesktopService, WebDesktopSnapshot
 from adaos.services.media_library import (
@@ -25,7 +26,13 @@ from adaos.services.media_library import (
     media_snapshot,
 )
 from adaos.services.node_config import set_node_names as save_node_names_config
-from adaos.services.reliability import reliability_snapshot, yjs_sync_runtime_snapshot
+from adaos.services.reliability import (
+    reliability_delta_refresh_s,
+    reliability_snapshot,
+    reliability_snapshot_delta,
+    wait_reliability_change,
+    yjs_sync_runtime_snapshot,
+)
 from adaos.services.scenario.webspace_runtime import (
     WebspaceService,
     describe_webspace_operational_state,
@@ -344,23 +351,56 @@ async def node_status():
     )
 
 
-@router.get("/reliability", dependencies=[Depends(require_token)])
-async def node_reliability() -> dict[str, Any]:
+def _reliability_kwargs() -> dict[str, Any]:
     conf = load_config()
     route_mode, connected = _route_info(conf.role)
     lifecycle = runtime_lifecycle_snapshot()
-    local_ready = is_ready()
-    return reliability_snapshot(
-        node_id=conf.node_id,
-        subnet_id=conf.subnet_id,
-        role=conf.role,
-        local_ready=local_ready,
-        node_state=str(lifecycle.get("node_state") or "ready"),
-        draining=bool(lifecycle.get("draining")),
-        route_mode=route_mode,
-        connected_to_hub=connected,
-        node_names=list(getattr(conf, "node_names", []) or []),
-    )
+    return {
+        "node_id": conf.node_id,
+        "subnet_id": conf.subnet_id,
+        "role": conf.role,
+        "local_ready": is_ready(),
+        "node_state": str(lifecycle.get("node_state") or "ready"),
+        "draining": bool(lifecycle.get("draining")),
+        "route_mode": route_mode,
+        "connected_to_hub": connected,
+        "node_names": list(getattr(conf, "node_names", []) or []),
+    }
+
+
+@router.get("/reliability", dependencies=[Depends(require_token)])
+async def node_reliability() -> dict[str, Any]:
+    return reliability_snapshot(**_reliability_kwargs())
+
+
+@router.get("/reliability/delta", dependencies=[Depends(require_token)])
+async def node_reliability_delta(
+    since: Optional[int] = None,
+    epoch: Optional[str] = None,
+    wait_s: float = 0.0,
+) -> dict[str, Any]:
+    """Long-poll variant of /reliability returning only changed sections.
+
+    Pass back ``epoch`` and ``version`` from the previous response as
+    ``epoch``/``since``; with ``wait_s`` > 0 the request is held until a
+    section changes or the wait expires (at most 60s).
+    """
+    deadline = time.monotonic() + max(0.0, min(float(wait_s or 0.0), 60.0))
+    while True:
+        delta = reliability_snapshot_delta(since=since, epoch=epoch, **_reliability_kwargs())
+        remaining = deadline - time.monotonic()
+        if delta.get("sections") or remaining <= 0:
+            return delta
+        await wait_reliability_change(
+            int(delta.get("generation") or 0),
+            timeout_s=min(remaining, max(0.1, reliability_delta_refresh_s())),
+        )
+
+
+@router.get("/boot/timeline", dependencies=[Depends(require_token)])
+async def node_boot_timeline() -> dict[str, Any]:
+    """Per-component startup timeline of the last boot (see services.boot_graph)."""
+    return {"ok": True, "ready": bool(is_ready()), "timeline": boot_timeline_snapshot()}
 
 
 @router.post("/hub-root/reconnect", dependencies=[Depends(require_token)])
@@ -152,8 +152,10 @@ from adaos.integrations.rhasspy.tts import RhasspyTTSAdapter
 
 from adaos.apps.bootstrap import init_ctx
 from adaos.services.bootstrap import run_boot_sequence, shutdown, is_ready
+from adaos.services.boot_graph import BootGraph, BootTask
 from adaos.services.observe import start_observer, stop_observer
 from adaos.services.agent_context import get_ctx
+from adaos.services.config_cache import config_cache_snapshot
 from adaos.services.router import RouterService
 from adaos.services.realtime_sidecar import (
     realtime_sidecar_enabled,
@@ -368,117 +370,8 @@ def _consume_restart_marker(base_url: str | None) -> dict[str, Any] | None:
     return data
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # 1) инициализируем AgentContext (публикуется через set_ctx внутри bootstrap_app)
-
-    # 2) только теперь импортируем то, что может косвенно дернуть контекст
-    from adaos.apps.api import tool_bridge, subnet_api, observe_api, node_api, scenarios, root_endpoints, skills, stt_api, nlu_teacher_api, join_api
-    from adaos.apps.api import io_webhooks
-    from adaos.services.yjs.gateway import router as y_router, start_y_server, stop_y_server
-    from adaos.services.subnet.link_ws import router as subnet_link_router
-    from adaos.services.subnet.runtime import start_subnet_p2p, stop_subnet_p2p
-
-    # 3) монтируем роутеры после bootstrap
-    app.include_router(tool_bridge.router, prefix="/api")
-    app.include_router(subnet_api.router, prefix="/api")
-    app.include_router(nlu_teacher_api.router, prefix="/api")
-    app.include_router(node_api.router, prefix="/api/node")
-    app.include_router(join_api.router, prefix="/api")
-    app.include_router(observe_api.router, prefix="/api/observe")
-    app.include_router(scenarios.router, prefix="/api/scenarios")
-    app.include_router(skills.router, prefix="/api/skills")
-    app.include_router(stt_api.router, prefix="/api")
-    app.include_router(root_endpoints.router)
-    # Chat IO webhooks (mounted without /api prefix to keep exact paths)
-    app.include_router(io_webhooks.router)
-    # Yjs / events gateways (Stage A1)
-    app.include_router(y_router)
-    # Subnet P2P member link (member->hub)
-    app.include_router(subnet_link_router)
-
-    # 3.5) сохранить ссылки на контекст/шину в state для внешних компонентов
-    try:
-        app.state.ctx = _get_ctx()
-        app.state.bus = app.state.ctx.bus
-        app.state.shutdown_requested = False
-        app.state.shutdown_reason = "signal"
-        app.state.shutdown_drain_timeout = _DEFAULT_SHUTDOWN_DRAIN_SEC
-        app.state.shutdown_stopping_emitted = False
-        reset_runtime_lifecycle()
-        app.state.core_update_task = None
-        app.state.restart_marker = _consume_restart_marker(os.getenv("ADAOS_SELF_BASE_URL"))
-        app.state.realtime_sidecar_proc = None
-    except Exception:
-        pass
-
-    # 3.6) стартуем RouterService с локальной шиной
-    router_service = RouterService(eventbus=app.state.bus, base_dir=app.state.ctx.paths.base_dir())
-    app.state.router_service = router_service
-    # Periodic liveness staler (hub only)
-    staler_task = None
-
-    # 4) поднимаем наблюдатель и выполняем boot-последовательность
-    await start_observer()
-    # Start Yjs websocket server background task
-    try:
-        await start_y_server()
-    except Exception:
-        logging.getLogger("adaos.yjs.gateway").warning("failed to start Yjs websocket server", exc_info=True)
-    # Start router early so ui.notify/ui.say from boot sequence are routed.
-    try:
-        await router_service.start()
-    except Exception:
-        pass
-    try:
-        conf = get_ctx().config
-        advertised_base = str(os.getenv("ADAOS_SELF_BASE_URL") or "").strip()
-        if advertised_base and str(getattr(conf, "role", "") or "").strip().lower() == "hub":
-            if str(getattr(conf, "hub_url", "") or "").strip() != advertised_base:
-                conf.hub_url = advertised_base
-                save_config(conf)
-    except Exception:
-        pass
-    try:
-        conf = get_ctx().config
-        role = str(getattr(conf, "role", "") or "").strip().lower()
-        if realtime_sidecar_enabled(role=role):
-            app.state.realtime_sidecar_proc = await start_realtime_sidecar_subprocess(role=role)
-    except Exception:
-        logging.getLogger("adaos.realtime").warning("failed to start adaos-realtime sidecar", exc_info=True)
-    await run_boot_sequence(app)
-    # Keep node.yaml capacity in sync with optional native deps (vosk/pyttsx3),
-    # so other components can see IO availability without importing native libs.
-    try:
-        from adaos.services.capacity import refresh_native_io_capacity
-
-        refresh_native_io_capacity()
-    except Exception:
-        pass
-    try:
-        await start_subnet_p2p(app)
-    except Exception:
-        pass
-    # hub: seed self node into directory (base_url + capacity)
-    try:
-        conf = get_ctx().config
-        from adaos.services.registry.subnet_directory import get_directory
-
-        directory = get_directory()
-        base_url = os.environ.get("ADAOS_SELF_BASE_URL")
-        node_item = {
-            "node_id": conf.node_id,
-            "subnet_id": conf.subnet_id,
-            "hostname": platform.node(),
-            "roles": [conf.role],
-            "base_url": base_url,
-            "capacity": get_local_capacity(),
-        }
-        directory.on_register(node_item)
-    except Exception:
-        pass
-
-    # 4.5) Hub-only: detect Telegram binding on Root for this subnet and expose IO telegram in capacity.
+async def _probe_telegram_binding(app: FastAPI) -> None:
+    """Hub-only: detect Telegram binding on Root for this subnet and expose IO telegram in capacity."""
     tg_enabled = False
     try:
         conf = get_ctx().config
@@ -626,6 +519,7 @@ async def lifespan(app: FastAPI):
                         "telegram broadcast (%s) exception", startup_notice_key, exc_info=True
                     )
                 tg_enabled = True
+                app.state.tg_enabled = True
     except Exception:
         try:
             if tg_enabled:
@@ -638,12 +532,102 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
         pass
-    # Start directory staler on hub to mark nodes offline after TTL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 1) инициализируем AgentContext (публикуется через set_ctx внутри bootstrap_app)
+
+    # 2) только теперь импортируем то, что может косвенно дернуть контекст
+    from adaos.apps.api import tool_bridge, subnet_api, observe_api, node_api, scenarios, root_endpoints, skills, stt_api, nlu_teacher_api, nlu_trace_api, join_api
+    from adaos.apps.api import io_webhooks
+    from adaos.services.yjs.gateway import router as y_router, start_y_server, stop_y_server
+    from adaos.services.subnet.link_ws import router as subnet_link_router
+    from adaos.services.subnet.runtime import start_subnet_p2p, stop_subnet_p2p
+
+    # 3) монтируем роутеры после bootstrap
+    app.include_router(tool_bridge.router, prefix="/api")
+    app.include_router(subnet_api.router, prefix="/api")
+    app.include_router(nlu_teacher_api.router, prefix="/api")
+    app.include_router(nlu_trace_api.router, prefix="/api")
+    app.include_router(node_api.router, prefix="/api/node")
+    app.include_router(join_api.router, prefix="/api")
+    app.include_router(observe_api.router, prefix="/api/observe")
+    app.include_router(scenarios.router, prefix="/api/scenarios")
+    app.include_router(skills.router, prefix="/api/skills")
+    app.include_router(stt_api.router, prefix="/api")
+    app.include_router(root_endpoints.router)
+    # Chat IO webhooks (mounted without /api prefix to keep exact paths)
+    app.include_router(io_webhooks.router)
+    # Yjs / events gateways (Stage A1)
+    app.include_router(y_router)
+    # Subnet P2P member link (member->hub)
+    app.include_router(subnet_link_router)
+
+    # 3.5) сохранить ссылки на контекст/шину в state для внешних компонентов
     try:
+        app.state.ctx = _get_ctx()
+        app.state.bus = app.state.ctx.bus
+        app.state.shutdown_requested = False
+        app.state.shutdown_reason = "signal"
+        app.state.shutdown_drain_timeout = _DEFAULT_SHUTDOWN_DRAIN_SEC
+        app.state.shutdown_stopping_emitted = False
+        reset_runtime_lifecycle()
+        app.state.core_update_task = None
+        app.state.restart_marker = _consume_restart_marker(os.getenv("ADAOS_SELF_BASE_URL"))
+        app.state.realtime_sidecar_proc = None
+    except Exception:
+        pass
+
+    # 3.6) стартуем RouterService с локальной шиной
+    router_service = RouterService(eventbus=app.state.bus, base_dir=app.state.ctx.paths.base_dir())
+    app.state.router_service = router_service
+    app.state.tg_enabled = False
+    # Periodic liveness staler (hub only)
+    staler_task = None
+
+    # 4) граф запуска: независимые компоненты стартуют параллельно, сетевые пробы уходят в фон
+    async def _boot_advertise() -> None:
         conf = get_ctx().config
-        if conf.role == "hub":
-            import asyncio as _asyncio
+        advertised_base = str(os.getenv("ADAOS_SELF_BASE_URL") or "").strip()
+        if advertised_base and str(getattr(conf, "role", "") or "").strip().lower() == "hub":
+            if str(getattr(conf, "hub_url", "") or "").strip() != advertised_base:
+                conf.hub_url = advertised_base
+                save_config(conf)
+
+    async def _boot_sidecar() -> None:
+        conf = get_ctx().config
+        role = str(getattr(conf, "role", "") or "").strip().lower()
+        if realtime_sidecar_enabled(role=role):
+            app.state.realtime_sidecar_proc = await start_realtime_sidecar_subprocess(role=role)
+
+    async def _boot_capacity() -> None:
+        # Keep node.yaml capacity in sync with optional native deps (vosk/pyttsx3),
+        # so other components can see IO availability without importing native libs.
+        from adaos.services.capacity import refresh_native_io_capacity
+
+        await asyncio.to_thread(refresh_native_io_capacity)
 
+    async def _boot_directory_seed() -> None:
+        # hub: seed self node into directory (base_url + capacity)
+        conf = get_ctx().config
+        directory = get_directory()
+        base_url = os.environ.get("ADAOS_SELF_BASE_URL")
+        node_item = {
+            "node_id": conf.node_id,
+            "subnet_id": conf.subnet_id,
+            "hostname": platform.node(),
+            "roles": [conf.role],
+            "base_url": base_url,
+            "capacity": get_local_capacity(),
+        }
+        directory.on_register(node_item)
+
+    async def _boot_directory_staler() -> None:
+        nonlocal staler_task
+        conf = get_ctx().config
+        if conf.role == "hub":
+            # Start directory staler on hub to mark nodes offline after TTL
             async def _staler():
                 directory = get_directory()
                 while True:
@@ -652,12 +636,11 @@ async def lifespan(app: FastAPI):
                     except Exception:
                         pass
                     directory.mark_stale_if_expired(45.0)
-                    await _asyncio.sleep(5.0)
+                    await asyncio.sleep(5.0)
 
-            staler_task = _asyncio.create_task(_staler(), name="subnet-directory-staler")
+            staler_task = asyncio.create_task(_staler(), name="subnet-directory-staler")
         else:
             # member: periodically fetch snapshot from hub and ingest locally
-            import asyncio as _asyncio
             import requests as _requests
 
             async def _pull_snapshot():
@@ -666,7 +649,7 @@ async def lifespan(app: FastAPI):
                     try:
                         if conf.hub_url:
                             url = f"{conf.hub_url.rstrip('/')}/api/subnet/nodes"
-                            r = await _asyncio.to_thread(
+                            r = await asyncio.to_thread(
                                 _requests.get,
                                 url,
                                 headers={"X-AdaOS-Token": conf.token or "dev-local-token"},
@@ -677,15 +660,42 @@ async def lifespan(app: FastAPI):
                                 directory.ingest_snapshot(payload.get("nodes") or [])
                     except Exception:
                         pass
-                    await _asyncio.sleep(10.0)
-
-            staler_task = _asyncio.create_task(_pull_snapshot(), name="subnet-directory-snapshot-puller")
-    except Exception:
-        pass
+                    await asyncio.sleep(10.0)
+
+            staler_task = asyncio.create_task(_pull_snapshot(), name="subnet-directory-snapshot-puller")
+
+    boot_graph = BootGraph(
+        [
+            BootTask("observer", start_observer, fatal=True),
+            BootTask("yjs", start_y_server),
+            # Start router early so ui.notify/ui.say from boot sequence are routed.
+            BootTask("router", router_service.start, gate=lambda: bool(getattr(router_service, "_started", False))),
+            BootTask("advertise", _boot_advertise),
+            BootTask("sidecar", _boot_sidecar),
+            BootTask(
+                "boot_sequence",
+                lambda: run_boot_sequence(app),
+                deps=("observer", "yjs", "router", "advertise", "sidecar"),
+                fatal=True,
+            ),
+            BootTask("subnet_p2p", lambda: start_subnet_p2p(app), deps=("boot_sequence",)),
+            BootTask("capacity", _boot_capacity, deps=("boot_sequence",), critical=False),
+            BootTask("directory_seed", _boot_directory_seed, deps=("capacity",), critical=False),
+            BootTask("telegram_probe", lambda: _probe_telegram_binding(app), deps=("directory_seed",), critical=False),
+            BootTask("directory_staler", _boot_directory_staler, deps=("directory_seed",), critical=False),
+        ]
+    )
+    app.state.boot_graph = boot_graph
+    await boot_graph.run()
 
     try:
         yield
     finally:
+        # Background (non-critical) boot tasks must not outlive the app.
+        try:
+            await boot_graph.cancel()
+        except Exception:
+            pass
         try:
             conf = get_ctx().config
             if not getattr(app.state, "shutdown_stopping_emitted", False):
@@ -708,7 +718,7 @@ async def lifespan(app: FastAPI):
             pass
         # On graceful shutdown, notify Telegram and UI if enabled
         try:
-            if tg_enabled and str(getattr(app.state, "shutdown_reason", "signal") or "signal") != "cli.restart":
+            if getattr(app.state, "tg_enabled", False) and str(getattr(app.state, "shutdown_reason", "signal") or "signal") != "cli.restart":
                 conf = get_ctx().config
                 ctx = _get_ctx()
                 api_base = getattr(ctx.settings, "api_base", "https://api.inimatic.com")
@@ -1100,6 +1110,7 @@ async def status():
             "build_date": BUILD_INFO.build_date,
         },
         "lifecycle": runtime_lifecycle_snapshot(),
+        "config_cache": config_cache_snapshot(),
     }
 
 
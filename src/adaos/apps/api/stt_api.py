@@ -165,16 +165,14 @@ async def stt_transcribe(
     pcm = _read_wav_mono16k(body)
 
     try:
-        model = vosk.Model(str(model_path))
-        # Use the model-native rate (16k) regardless of input; the frontend
-        # encodes 16kHz WAV, and we also accept other rates for debugging.
-        rec = vosk.KaldiRecognizer(model, 16000)
-        rec.SetWords(False)
-        rec.AcceptWaveform(pcm)
-        import json
-
-        res = json.loads(rec.FinalResult() or "{}")
-        text = (res.get("text") or "").strip()
+        from adaos.adapters.audio.stt.vosk_pool import get_vosk_registry
+
+        # Shared model + pooled recognizer; use the model-native rate (16k)
+        # regardless of input; the frontend encodes 16kHz WAV, and we also
+        # accept other rates for debugging.
+        async with await get_vosk_registry().open_session_async(model_path, samplerate=16000, words=False) as session:
+            session.accept(pcm)
+            text = session.finish()
         return {"ok": True, "text": text}
     except HTTPException:
         raise
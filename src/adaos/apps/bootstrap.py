@@ -1,31 +1,67 @@
 # src/adaos/apps/bootstrap.py
 from __future__ import annotations
-from typing import Optional
-from threading import RLock
+from typing import Any, Callable, Optional
+from threading import Lock, RLock
 
 from adaos.services.settings import Settings
 from adaos.services.agent_context import AgentContext
 from adaos.adapters.fs.path_provider import PathProvider
 from adaos.services.eventbus import LocalEventBus
 from adaos.services.logging import setup_logging, attach_event_logger
-from adaos.adapters.git.cli_git import CliGitClient
-from adaos.adapters.db import SQLite, SQLiteKV
-from adaos.services.runtime import AsyncProcessManager
 from adaos.services.policy.capabilities import InMemoryCapabilities
 from adaos.services.policy.net import NetPolicy
-from adaos.adapters.git.secure_git import SecureGitClient
 from adaos.services.policy.fs import SimpleFSPolicy
-from adaos.adapters.secrets.keyring_vault import KeyringVault
-from adaos.adapters.secrets.file_vault import FileVault
-from adaos.services.crypto.secrets_service import SecretsService
-from adaos.services.crypto.vault import load_or_create_master  # noqa: F401 (если пока не используешь)
-from adaos.services.sandbox.runner import ProcSandbox
-from adaos.services.sandbox.service import SandboxService
 
 from adaos.services.agent_context import set_ctx
 from adaos.services.node_config import load_config
 
 
+class LazyPort:
+    """
+    Прокси порта контекста: адаптер (и его модуль) создаётся при первом обращении.
+
+    Позволяет CLI-командам, которым нужны только paths/settings, не платить
+    за импорт и инициализацию SQL, git, секретов и песочницы.
+    """
+
+    __slots__ = ("_name", "_factory", "_target", "_lock")
+
+    def __init__(self, name: str, factory: Callable[[], Any]) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", Lock())
+
+    def _resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    @property
+    def resolved(self) -> bool:
+        return self._target is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self) -> str:
+        state = repr(self._target) if self._target is not None else "unresolved"
+        return f"<LazyPort {self._name}: {state}>"
+
+
+def resolve_port(port: Any) -> Any:
+    """Вернуть реальный адаптер, если ``port`` — ленивый прокси."""
+    return port._resolve() if isinstance(port, LazyPort) else port
+
+
 class _CtxHolder:
     _ctx: Optional[AgentContext] = None
     _lock = RLock()
@@ -105,43 +141,74 @@ class _CtxHolder:
         # базовые capabilities
         caps.grant("core", "proc.run", "net.git", "git.write", "skills.manage", "scenarios.manage", "secrets.read", "secrets.write")
 
-        # Git с защитой
-        git_base = CliGitClient(depth=1)
-        git = SecureGitClient(git_base, net)
+        def _git():
+            from adaos.adapters.git.cli_git import CliGitClient
+            from adaos.adapters.git.secure_git import SecureGitClient
 
-        proc = AsyncProcessManager(bus=bus)
-        sql = SQLite(paths)
-        kv = SQLiteKV(sql, namespace="adaos")
+            # Git с защитой
+            return SecureGitClient(CliGitClient(depth=1), net)
 
-        # Secrets: keyring primary; file vault fallback (ключ в keyring)
-        try:
-            secrets_backend = KeyringVault(profile=settings.profile, kv=kv)
-        except Exception:
-            # file vault (ключ через keyring, но если keyring недоступен — ищем в ENV)
-            def key_get():
-                try:
-                    import keyring
+        def _proc():
+            from adaos.services.runtime import AsyncProcessManager
+
+            return AsyncProcessManager(bus=bus)
+
+        def _sql():
+            from adaos.adapters.db import SQLite
+
+            return SQLite(paths)
+
+        def _kv():
+            from adaos.adapters.db import SQLiteKV
+
+            return SQLiteKV(resolve_port(sql), namespace="adaos")
+
+        def _secrets():
+            from adaos.adapters.secrets.keyring_vault import KeyringVault
+            from adaos.adapters.secrets.file_vault import FileVault
+            from adaos.services.crypto.secrets_service import SecretsService
+
+            # Secrets: keyring primary; file vault fallback (ключ в keyring)
+            try:
+                secrets_backend = KeyringVault(profile=settings.profile, kv=resolve_port(kv))
+            except Exception:
+                # file vault (ключ через keyring, но если keyring недоступен — ищем в ENV)
+                def key_get():
+                    try:
+                        import keyring
+
+                        v = keyring.get_password(f"adaos:master:{settings.profile}", "vault.key")
+                        return v.encode("utf-8") if v else None
+                    except Exception:
+                        return None
+
+                def key_set(b: bytes):
+                    try:
+                        import keyring
 
-                    v = keyring.get_password(f"adaos:master:{settings.profile}", "vault.key")
-                    return v.encode("utf-8") if v else None
-                except Exception:
-                    return None
+                        keyring.set_password(f"adaos:master:{settings.profile}", "vault.key", b.decode("utf-8"))
+                    except Exception:
+                        pass
 
-            def key_set(b: bytes):
-                try:
-                    import keyring
+                secrets_backend = FileVault(base_dir=paths.base, fs=None, key_get=key_get, key_set=key_set)
 
-                    keyring.set_password(f"adaos:master:{settings.profile}", "vault.key", b.decode("utf-8"))
-                except Exception:
-                    pass
+            # если backend FileVault — подставим fs
+            if isinstance(secrets_backend, FileVault):
+                secrets_backend.fs = fs
+            return SecretsService(secrets_backend, caps)
 
-            secrets_backend = FileVault(base_dir=paths.base, fs=None, key_get=key_get, key_set=key_set)
+        def _sandbox():
+            from adaos.services.sandbox.runner import ProcSandbox
+            from adaos.services.sandbox.service import SandboxService
 
-        secrets = SecretsService(secrets_backend, caps)
+            return SandboxService(runner=ProcSandbox(fs_base=paths.base), caps=caps, bus=bus)
 
-        # если backend FileVault — подставим fs
-        if isinstance(secrets_backend, FileVault):
-            secrets_backend.fs = fs
+        git = LazyPort("git", _git)
+        proc = LazyPort("proc", _proc)
+        sql = LazyPort("sql", _sql)
+        kv = LazyPort("kv", _kv)
+        secrets = LazyPort("secrets", _secrets)
+        sandbox = LazyPort("sandbox", _sandbox)
 
         ctx = AgentContext(
             settings=settings,
@@ -157,7 +224,7 @@ class _CtxHolder:
             updates=object(),
             git=git,
             fs=fs,
-            sandbox=SandboxService(runner=ProcSandbox(fs_base=paths.base), caps=caps, bus=bus),
+            sandbox=sandbox,
         )
 
         # чтобы в адаптерах было paths.ctx.fs (если Paths это позволяет)
@@ -151,21 +151,65 @@ def _apply_cli_log_noise_defaults() -> None:
         return
     os.environ["ADAOS_LOG_HIDE"] = ",".join([*items, rule])
 
-from adaos.sdk.manage.environment import prepare_environment
 from adaos.services.settings import Settings
 from adaos.apps.bootstrap import init_ctx, reload_ctx
 from adaos.apps.cli.i18n import _
+from adaos.apps.cli.lazy import LazyCommand, LazyTyperGroup
 from adaos.services.agent_context import get_ctx
-from adaos.apps.cli.commands import monitor, skill, runtime, llm, tests as tests_cmd, api, scenario, sdk_export as _sdk_export, repo, dev, node, hub, realtime
-from adaos.apps.cli.commands import git as git_cmd
-from adaos.apps.cli.commands import interpreter
-from adaos.apps.cli.commands import native
-from adaos.apps.cli.commands import rhasspy as rhasspy_cmd
-from adaos.apps.cli.commands import secret
-from adaos.apps.cli.commands import sandbox as sandbox_cmd
-from adaos.apps.cli.commands import setup as setup_cmd
 
-app = typer.Typer(help=_("cli.help"))
+
+def _read(name: str, default: str = "") -> str:
+    return os.getenv(name, default).strip().lower()
+
+
+_CMD = "adaos.apps.cli.commands"
+
+# Sub-commands are imported only when invoked (see adaos.apps.cli.lazy); help
+# strings are kept here so ``adaos --help`` does not import the command modules.
+_LAZY_COMMANDS: dict[str, LazyCommand] = {
+    "skill": LazyCommand(f"{_CMD}.skill", help=_("cli.help_skill")),
+    "tests": LazyCommand(f"{_CMD}.tests", help=_("cli.help_test")),
+    "runtime": LazyCommand(f"{_CMD}.runtime", help=_("cli.help_runtime")),
+    "llm": LazyCommand(f"{_CMD}.llm", help=_("cli.help_llm")),
+    "api": LazyCommand(f"{_CMD}.api", help="HTTP API for AdaOS"),
+    "realtime": LazyCommand(f"{_CMD}.realtime", help="Realtime sidecar"),
+    "node": LazyCommand(f"{_CMD}.node", help="Node onboarding and role management"),
+    "hub": LazyCommand(f"{_CMD}.hub", help="Hub operations (join-codes)"),
+    "monitor": LazyCommand(f"{_CMD}.monitor", help="Monitoring tools"),
+    "repo": LazyCommand(f"{_CMD}.repo", help=_("cli.repo.help")),
+    "git": LazyCommand(f"{_CMD}.git", help="Git availability / archive fallback"),
+    "scenario": LazyCommand(f"{_CMD}.scenario", help=_("cli.help_scenario")),
+    "autostart": LazyCommand(f"{_CMD}.setup", attr="autostart_app", help="OS autostart management"),
+    "secret": LazyCommand(f"{_CMD}.secret", help=_("cli.secret.help")),
+    "sandbox": LazyCommand(f"{_CMD}.sandbox", help="Песочница процессов (диагностика)"),
+    "sdk": LazyCommand(f"{_CMD}.sdk_export", help="SDK export utilities"),
+    "interpreter": LazyCommand(f"{_CMD}.interpreter", help="Интерпретатор и обучение"),
+    "dev": LazyCommand(f"{_CMD}.dev", help="Developer operations"),
+    # Root-level setup helpers
+    "install": LazyCommand(f"{_CMD}.setup", attr="install", help="Install default scenarios/skills into the local workspace."),
+    "update": LazyCommand(
+        f"{_CMD}.setup",
+        attr="update",
+        help="Update installed scenarios/skills and refresh runtime slots from workspace sources.",
+    ),
+}
+
+# ---- Фильтрация интеграций по ENV ----
+if _read("ADAOS_TTS", "native") == "rhasspy":
+    _LAZY_COMMANDS["rhasspy"] = LazyCommand(f"{_CMD}.rhasspy", help="Rhasspy-integration")
+else:
+    # Native commands are merged into the root group (add_typer with name="").
+    _LAZY_COMMANDS["say"] = LazyCommand(f"{_CMD}.native", command="say")
+    _LAZY_COMMANDS["start"] = LazyCommand(
+        f"{_CMD}.native", command="start", help="Run offline STT listener (Vosk). Ctrl+C to exit."
+    )
+
+
+class _AdaosGroup(LazyTyperGroup):
+    lazy_commands = _LAZY_COMMANDS
+
+
+app = typer.Typer(help=_("cli.help"), cls=_AdaosGroup)
 
 # -------- helpers --------
 
@@ -182,10 +226,6 @@ def _run_safe(func):
     return wrapper
 
 
-def _read(name: str, default: str = "") -> str:
-    return os.getenv(name, default).strip().lower()
-
-
 def _write_env_var(key: str, value: str, dotenv_path: Path | None = None):
     """Примитивно патчим .env (или создаём)."""
     dotenv_path = dotenv_path or Path(find_dotenv() or ".env")
@@ -225,6 +265,8 @@ def ensure_environment():
     os.environ["ADAOS_PROFILE"] = ctx.settings.profile
 
     if not base_dir.exists():
+        from adaos.sdk.manage.environment import prepare_environment
+
         typer.echo(_("cli.no_env_creating"))
         prepare_environment()
 
@@ -309,37 +351,9 @@ def where():
 
 
 # -------- подкоманды --------
+# Остальные подкоманды регистрируются лениво через _LAZY_COMMANDS (см. выше).
 
-app.add_typer(skill.app, name="skill", help=_("cli.help_skill"))
-app.add_typer(tests_cmd.app, name="tests", help=_("cli.help_test"))
-app.add_typer(runtime.app, name="runtime", help=_("cli.help_runtime"))
-app.add_typer(llm.app, name="llm", help=_("cli.help_llm"))
-app.add_typer(api.app, name="api")
-app.add_typer(realtime.app, name="realtime", help="Realtime sidecar")
-app.add_typer(node.app, name="node", help="Node onboarding and role management")
-app.add_typer(hub.app, name="hub", help="Hub operations (join-codes)")
-app.add_typer(monitor.app, name="monitor")
-app.add_typer(repo.app, name="repo", help=_("cli.repo.help"))
-app.add_typer(git_cmd.app, name="git", help="Git availability / archive fallback")
-app.add_typer(scenario.app, name="scenario", help=_("cli.help_scenario"))
-app.add_typer(setup_cmd.autostart_app, name="autostart", help="OS autostart management")
 app.add_typer(switch_app, name="switch", help="Переключение профилей интеграций")
-app.add_typer(secret.app, name="secret")
-app.add_typer(sandbox_cmd.app, name="sandbox")
-app.add_typer(_sdk_export.app, name="sdk")
-app.add_typer(interpreter.app, name="interpreter", help="Интерпретатор и обучение")
-app.add_typer(dev.app, name="dev", help="Developer operations")
-
-# Root-level setup helpers
-app.command("install")(setup_cmd.install)
-app.command("update")(setup_cmd.update)
-
-# ---- Фильтрация интеграций по ENV ----
-_tts = _read("ADAOS_TTS", "native")
-if _tts == "rhasspy":
-    app.add_typer(rhasspy_cmd.app, name="rhasspy", help="Rhasspy-integration")
-else:
-    app.add_typer(native.app, name="", help="Native commands")
 
 if __name__ == "__main__":
     app()
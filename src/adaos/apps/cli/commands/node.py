@@ -125,6 +125,39 @@ def _control_patch_json(
     return response.status_code, payload
 
 
+def _fmt_ms(value: Any) -> str:
+    return f"{float(value):.0f}ms" if isinstance(value, (int, float)) else "-"
+
+
+def _print_boot_timeline(payload: dict[str, Any]) -> None:
+    timeline = payload.get("timeline") if isinstance(payload.get("timeline"), dict) else {}
+    typer.echo(
+        f"boot: state={timeline.get('state') or 'unknown'} ready={bool(payload.get('ready'))} "
+        f"time_to_ready={_fmt_ms(timeline.get('time_to_ready_ms'))} "
+        f"time_to_complete={_fmt_ms(timeline.get('time_to_complete_ms'))}"
+    )
+    path = timeline.get("critical_path") if isinstance(timeline.get("critical_path"), list) else []
+    if path:
+        typer.echo("critical_path: " + " -> ".join(str(name) for name in path))
+    tasks = timeline.get("tasks") if isinstance(timeline.get("tasks"), list) else []
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        line = (
+            f"  {task.get('name') or '?':<18} {task.get('state') or '?':<9} "
+            f"start={_fmt_ms(task.get('start_ms')):>7} took={_fmt_ms(task.get('duration_ms')):>7}"
+        )
+        if not task.get("critical"):
+            line += " (background)"
+        if task.get("error"):
+            line += f" error={task.get('error')}"
+        typer.echo(line)
+        steps = task.get("steps") if isinstance(task.get("steps"), list) else []
+        for step in steps:
+            if isinstance(step, dict):
+                typer.echo(f"    - {step.get('name') or '?'}: {_fmt_ms(step.get('duration_ms'))}")
+
+
 def _print_reliability_summary(payload: dict[str, Any]) -> None:
     node = payload.get("node") if isinstance(payload.get("node"), dict) else {}
     runtime = payload.get("runtime") if isinstance(payload.get("runtime"), dict) else {}
@@ -756,6 +789,35 @@ def node_reliability(
         _print_reliability_summary(payload)
 
 
+@app.command("boot-timeline")
+def node_boot_timeline(
+    control: str | None = typer.Option(None, "--control", help="Control API base URL (default: active server)"),
+    json_output: bool = typer.Option(False, "--json", help="JSON output"),
+):
+    from adaos.apps.cli.active_control import resolve_control_base_url, resolve_control_token
+
+    cfg = load_config()
+    control0 = resolve_control_base_url(explicit=control, hub_url=cfg.hub_url if cfg.role == "member" else None)
+    status_code, payload = _control_get_json(
+        control=control0,
+        path="/api/node/boot/timeline",
+        token=resolve_control_token(explicit=cfg.token),
+    )
+    if status_code is None:
+        typer.secho(_control_error_message("boot timeline probe", payload), fg=typer.colors.RED)
+        raise typer.Exit(code=2)
+    if status_code != 200 or not isinstance(payload, dict):
+        typer.secho(f"[AdaOS] boot timeline probe failed: HTTP {status_code}", fg=typer.colors.RED)
+        if payload:
+            typer.echo(payload)
+        raise typer.Exit(code=1)
+
+    if json_output:
+        _print(payload, json_output=True)
+    else:
+        _print_boot_timeline(payload)
+
+
 @app.command("members")
 def node_members(
     control: str | None = typer.Option(None, "--control", help="Control API base URL (default: active server)"),
@@ -0,0 +1,108 @@
+# src/adaos/apps/cli/lazy.py
+from __future__ import annotations
+
+"""
+Lazy sub-command registration for the root ``adaos`` Typer app.
+
+Command modules pull in large parts of the platform (skills, root client,
+FastAPI, audio adapters). The root group only records *where* each command
+lives and imports the module when the command is actually resolved, so
+``adaos --help`` and one-shot commands pay only for what they use.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True, slots=True)
+class LazyCommand:
+    """
+    Location of a lazily imported command.
+
+    ``attr`` names either a ``typer.Typer`` sub-app or a plain command
+    function. With ``command`` set, a single command is taken from the
+    sub-app (used for apps merged into the root via ``name=""``).
+    """
+
+    module: str
+    attr: str = "app"
+    help: str = ""
+    command: Optional[str] = None
+
+
+def load_lazy_command(name: str, entry: LazyCommand) -> click.Command:
+    obj: Any = getattr(importlib.import_module(entry.module), entry.attr)
+    if isinstance(obj, typer.Typer):
+        group = typer.main.get_group(obj)
+        cmd: click.Command = group.commands[entry.command] if entry.command else group
+    else:
+        holder = typer.Typer()
+        holder.command(name)(obj)
+        cmd = typer.main.get_group(holder).commands[name]
+    cmd.name = name
+    if entry.help and not entry.command:
+        cmd.help = entry.help
+    return cmd
+
+
+class _LazyPlaceholder(click.Command):
+    """Stands in for a not-yet-imported command in help listings."""
+
+    def __init__(self, name: str, entry: LazyCommand, group: "LazyTyperGroup") -> None:
+        super().__init__(name, help=entry.help or None)
+        self._group = group
+
+    def _real(self) -> click.Command:
+        return self._group.load_command(self.name or "")
+
+    def make_context(self, info_name, args, parent=None, **extra):  # type: ignore[override]
+        return self._real().make_context(info_name, args, parent=parent, **extra)
+
+    def invoke(self, ctx: click.Context) -> Any:
+        return self._real().invoke(ctx)
+
+
+class LazyTyperGroup(TyperGroup):
+    """
+    TyperGroup that resolves sub-commands listed in ``lazy_commands`` on demand.
+
+    Help output uses the recorded help strings without importing anything;
+    ``resolve_command`` (the invocation path) imports the real command.
+    """
+
+    lazy_commands: Dict[str, LazyCommand] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = list(super().list_commands(ctx))
+        names.extend(name for name in self.lazy_commands if name not in self.commands)
+        return names
+
+    def load_command(self, name: str) -> click.Command:
+        cmd = self.commands.get(name)
+        if cmd is None:
+            cmd = load_lazy_command(name, self.lazy_commands[name])
+            self.add_command(cmd, name)
+        return cmd
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        cmd = self.commands.get(cmd_name)
+        if cmd is not None:
+            return cmd
+        entry = self.lazy_commands.get(cmd_name)
+        if entry is None:
+            return None
+        return _LazyPlaceholder(cmd_name, entry, self)
+
+    def resolve_command(self, ctx: click.Context, args: List[str]):  # type: ignore[override]
+        if args:
+            name = click.utils.make_str(args[0])
+            if ctx.token_normalize_func is not None:
+                name = ctx.token_normalize_func(name)
+            if name in self.lazy_commands:
+                self.load_command(name)
+        return super().resolve_command(ctx, args)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+"""
+Persistent content-hash -> Telegram ``file_id`` cache.
+
+Telegram lets a bot re-send any file it uploaded before by passing the
+``file_id`` instead of the bytes. Entries are keyed by the bot (a hash of the
+token, never the token itself), the media kind and the sha256 of the file, so
+the same voice reply or image sent to many chats is uploaded once.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def bot_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class TelegramFileIdCache:
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, str] = {}
+        # file path -> ((mtime_ns, size), sha256)
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if isinstance(data, dict):
+            self._entries = {str(k): str(v) for k, v in data.items() if isinstance(v, str)}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self._entries, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def digest(self, file_path: str) -> str:
+        st = os.stat(file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._digests.get(file_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        h = hashlib.sha256()
+        with open(file_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self._digests[file_path] = (stamp, digest)
+        return digest
+
+    @staticmethod
+    def _key(bot: str, kind: str, digest: str) -> str:
+        return f"{bot}:{kind}:{digest}"
+
+    def get(self, bot: str, kind: str, digest: str) -> Optional[str]:
+        return self._entries.get(self._key(bot, kind, digest))
+
+    def put(self, bot: str, kind: str, digest: str, file_id: str) -> None:
+        with self._lock:
+            self._entries[self._key(bot, kind, digest)] = file_id
+            self._save()
+
+    def forget(self, bot: str, kind: str, digest: str) -> None:
+        with self._lock:
+            if self._entries.pop(self._key(bot, kind, digest), None) is not None:
+                self._save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHES: Dict[str, TelegramFileIdCache] = {}
+
+
+def default_file_cache() -> TelegramFileIdCache:
+    """Node-wide cache stored under ``<state>/telegram/file_ids.json``."""
+    path: Optional[Path] = None
+    try:
+        from adaos.services.agent_context import get_ctx
+
+        path = Path(get_ctx().paths.state_dir()) / "telegram" / "file_ids.json"
+    except Exception:
+        path = None
+    key = str(path)
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = _CACHES[key] = TelegramFileIdCache(path)
+    return cache
@@ -1,21 +1,130 @@
 from __future__ import annotations
 from adaos.services.chat_io.interfaces import ChatSender, ChatOutputEvent, ChatOutputMessage
 from adaos.services.agent_context import get_ctx
-from adaos.services.io_bus.rate_limit import PerChatLimiter
+from adaos.services.io_bus.rate_limit import AdaptiveRateLimiter
 from adaos.services.chat_io import telemetry as tm
-from typing import Any
+from adaos.integrations.telegram.file_cache import TelegramFileIdCache, bot_key, default_file_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 import asyncio
+import os
 import httpx
 
+_RETRYABLE = (500, 502, 503, 504)
+# Telegram answers a stale/foreign file_id with 400 "wrong file identifier".
+_BAD_REFERENCE = (400,)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _api_base() -> str:
+    return (os.getenv("ADAOS_TG_API_BASE") or "https://api.telegram.org").rstrip("/")
+
+
+# One pooled client per event loop: keeps TLS connections to the Bot API alive
+# across sends instead of handshaking for every message.
+_CLIENTS: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _shared_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    entry = _CLIENTS.get(id(loop))
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+    for key, (other, _client) in list(_CLIENTS.items()):
+        if other.is_closed():
+            _CLIENTS.pop(key, None)
+    size = int(_env_float("ADAOS_TG_MAX_CONNECTIONS", 8))
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(20.0, connect=10.0),
+        limits=httpx.Limits(max_connections=size, max_keepalive_connections=size, keepalive_expiry=60.0),
+    )
+    _CLIENTS[id(loop)] = (loop, client)
+    return client
+
+
+async def aclose_shared_client() -> None:
+    entry = _CLIENTS.pop(id(asyncio.get_running_loop()), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+# Telegram limits are per bot, so every sender of the same bot shares one limiter.
+_LIMITERS: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def _bot_limiter(bot: str) -> AdaptiveRateLimiter:
+    limiter = _LIMITERS.get(bot)
+    if limiter is None:
+        limiter = _LIMITERS[bot] = AdaptiveRateLimiter(
+            global_rate=_env_float("ADAOS_TG_GLOBAL_RATE", 30.0),
+            global_capacity=int(_env_float("ADAOS_TG_GLOBAL_BURST", 30)),
+            key_rate=_env_float("ADAOS_TG_CHAT_RATE", 1.0),
+            key_capacity=int(_env_float("ADAOS_TG_CHAT_BURST", 3)),
+        )
+    return limiter
+
+
+def _retry_after(resp: httpx.Response, default: float) -> float:
+    try:
+        value = (resp.json().get("parameters") or {}).get("retry_after")
+        if value is not None:
+            return float(value)
+    except Exception:
+        pass
+    try:
+        return float(resp.headers.get("Retry-After") or default)
+    except Exception:
+        return default
+
+
+def _file_id(body: Any, field: str) -> Optional[str]:
+    result = body.get("result") if isinstance(body, dict) else None
+    if not isinstance(result, dict):
+        return None
+    for key in (field, "voice", "audio", "document", "photo"):
+        item = result.get(key)
+        if isinstance(item, list) and item:
+            item = item[-1]  # photo sizes, largest last
+        if isinstance(item, dict) and item.get("file_id"):
+            return str(item["file_id"])
+    return None
+
 
 class TelegramSender(ChatSender):
-    def __init__(self, bot_id: str) -> None:
+    def __init__(
+        self,
+        bot_id: str,
+        *,
+        token: Optional[str] = None,
+        api_base: Optional[str] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        file_cache: Optional[TelegramFileIdCache] = None,
+        attempts: int = 3,
+        max_throttled: int = 5,
+    ) -> None:
         self.bot_id = bot_id
-        self._token = get_ctx().settings.tg_bot_token
-        self._limiter = PerChatLimiter(rate_per_sec=1.0, capacity=30)
+        self._token = token if token is not None else get_ctx().settings.tg_bot_token
+        self._api_base = (api_base or _api_base()).rstrip("/")
+        self._bot = bot_key(self._token or "")
+        self._limiter = limiter or _bot_limiter(self._bot)
+        self._file_cache = file_cache
+        self._attempts = attempts
+        self._max_throttled = max_throttled
+
+    @property
+    def file_cache(self) -> TelegramFileIdCache:
+        if self._file_cache is None:
+            self._file_cache = default_file_cache()
+        return self._file_cache
 
     async def send(self, out: ChatOutputEvent) -> None:
-        # TODO: respect rate-limit, idempotency
+        # TODO: idempotency
         for m in out.messages:
             await self._send_one(out, m)
 
@@ -23,62 +132,81 @@ class TelegramSender(ChatSender):
         chat_id = out.target.get("chat_id")
         if not chat_id or not self._token:
             return
-        # rate limit per chat
-        if not self._limiter.allow(chat_id):
-            await asyncio.sleep(0.5)
         if m.type == "text" and m.text:
             await self._call("sendMessage", {"chat_id": chat_id, "text": m.text})
             tm.record_event("outbound_total", {"type": "text"})
         elif m.type == "photo" and m.image_path:
-            # simple caption within text if provided
-            await self._call_multipart("sendPhoto", {"chat_id": chat_id}, file_field="photo", file_path=m.image_path)
+            await self._send_media("sendPhoto", chat_id, field="photo", file_path=m.image_path)
             tm.record_event("outbound_total", {"type": "photo"})
         elif m.type == "voice" and m.audio_path:
-            await self._call_multipart("sendVoice", {"chat_id": chat_id}, file_field="voice", file_path=m.audio_path)
+            await self._send_media("sendVoice", chat_id, field="voice", file_path=m.audio_path)
             tm.record_event("outbound_total", {"type": "voice"})
+        elif m.type == "document" and m.document_path:
+            await self._send_media("sendDocument", chat_id, field="document", file_path=m.document_path)
+            tm.record_event("outbound_total", {"type": "document"})
 
-    async def _call(self, method: str, payload: dict[str, Any]) -> None:
-        url = f"https://api.telegram.org/bot{self._token}/{method}"
-        await _with_retries_json(url, payload)
+    async def _send_media(self, method: str, chat_id: str, *, field: str, file_path: str) -> None:
+        cache = self.file_cache
+        digest = cache.digest(file_path)
+        file_id = cache.get(self._bot, field, digest)
+        if file_id:
+            body = await self._call(method, {"chat_id": chat_id, field: file_id})
+            if body.get("ok", True):
+                tm.record_event("outbound_file_id_hits_total", {"type": field})
+                return
+            if body.get("status") not in _BAD_REFERENCE:
+                return
+            cache.forget(self._bot, field, digest)
+        data = Path(file_path).read_bytes()
+        files = {field: (Path(file_path).name, data, "application/octet-stream")}
+        body = await self._call(method, {"chat_id": chat_id}, files=files)
+        new_id = _file_id(body, field)
+        if new_id:
+            cache.put(self._bot, field, digest, new_id)
 
-    async def _call_multipart(self, method: str, fields: dict[str, Any], *, file_field: str, file_path: str) -> None:
-        url = f"https://api.telegram.org/bot{self._token}/{method}"
-        files = {file_field: (file_path.split("/")[-1], open(file_path, "rb"), "application/octet-stream")}
-        await _with_retries_multipart(url, fields, files)
+    async def _call(self, method: str, payload: dict[str, Any], *, files: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        POST ``method`` through the shared client, honouring the bot limiter.
 
-async def _with_retries_json(url: str, payload: dict[str, Any], *, attempts: int = 3) -> None:
-    backoff = 0.5
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for _ in range(attempts):
+        429 answers block the chat for ``retry_after`` and are retried without
+        consuming an attempt (up to ``max_throttled`` times); 5xx/network errors
+        back off exponentially. Other errors are returned as ``{"ok": False}``.
+        """
+        url = f"{self._api_base}/bot{self._token}/{method}"
+        chat_id = str(payload.get("chat_id"))
+        client = _shared_client()
+        backoff = 0.5
+        attempts = throttled = 0
+        while attempts < self._attempts:
+            await self._limiter.acquire(chat_id)
             try:
-                resp = await client.post(url, json=payload)
-                if resp.status_code in (200, 201, 202):
-                    return
-                if resp.status_code in (429, 500, 502, 503, 504):
-                    await asyncio.sleep(backoff)
-                    backoff = min(backoff * 2, 5.0)
-                    continue
-                return
+                if files is not None:
+                    resp = await client.post(url, data=payload, files=files)
+                else:
+                    resp = await client.post(url, json=payload)
             except Exception:
+                attempts += 1
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, 5.0)
-    raise RuntimeError("telegram_http_failed")
-
-
-async def _with_retries_multipart(url: str, fields: dict[str, Any], files: dict[str, Any], *, attempts: int = 3) -> None:
-    backoff = 0.5
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        for _ in range(attempts):
-            try:
-                resp = await client.post(url, data=fields, files=files)
-                if resp.status_code in (200, 201, 202):
-                    return
-                if resp.status_code in (429, 500, 502, 503, 504):
-                    await asyncio.sleep(backoff)
-                    backoff = min(backoff * 2, 5.0)
-                    continue
-                return
-            except Exception:
+                continue
+            if resp.status_code in (200, 201, 202):
+                self._limiter.succeeded()
+                try:
+                    body = resp.json()
+                except Exception:
+                    body = {}
+                return body if isinstance(body, dict) else {}
+            if resp.status_code == 429:
+                throttled += 1
+                tm.record_event("outbound_throttled_total", {"method": method})
+                if throttled > self._max_throttled:
+                    break
+                self._limiter.throttled(chat_id, _retry_after(resp, backoff))
+                continue
+            if resp.status_code in _RETRYABLE:
+                attempts += 1
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, 5.0)
-    raise RuntimeError("telegram_http_failed")
+                continue
+            return {"ok": False, "status": resp.status_code}
+        raise RuntimeError("telegram_http_failed")
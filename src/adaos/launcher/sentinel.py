@@ -1,126 +1,591 @@
-import os, sys, time, json, socket, threading, subprocess, signal
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.request import urlopen, Request
+"""
+Lazy-boot gateway in front of the AdaOS core.
 
-ADAOS_CMD = os.environ.get("ADAOS_CMD", sys.executable + " -m adaos.app.cli app start")
-TARGET_HOST = os.environ.get("ADAOS_TARGET_HOST", "127.0.0.1")
-TARGET_PORT = int(os.environ.get("ADAOS_TARGET_PORT", "8788"))  # где слушает ядро
-LISTEN_PORT = int(os.environ.get("ADAOS_GW_PORT", "8777"))  # куда стучатся клиенты
-AUTH_TOKEN = os.environ.get("ADAOS_TOKEN", "dev-local-token")
-READY_PATH = os.environ.get("ADAOS_READY_PATH", f"http://{TARGET_HOST}:{TARGET_PORT}/ready")
+Клиенты стучатся в sentinel, а ядро стартует только при первом запросе.
+The gateway is a small asyncio HTTP/1.1 proxy (stdlib only):
 
-proc = None
-proc_lock = threading.Lock()
+- readiness of the core is cached state; ``/ready`` of the core is probed
+  only while booting or after the upstream became unreachable;
+- requests that arrive during a cold boot wait on the same boot future and
+  are released together once the core answers ``/ready``;
+- upstream connections are kept alive and pooled;
+- request and response bodies are streamed (Content-Length, chunked or
+  until close), WebSocket upgrades are passed through as a raw tunnel;
+- with ``ADAOS_GW_IDLE_S`` > 0 a core started by the gateway is stopped
+  again after that many seconds without traffic.
+"""
 
+from __future__ import annotations
 
-def is_ready(timeout=0.3) -> bool:
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import urlsplit
+
+_MAX_HEAD = 64 * 1024
+_CHUNK = 64 * 1024
+# Transfer-Encoding is not in the list: bodies are relayed with their
+# original framing.
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "proxy-connection", "te", "trailer", "upgrade"})
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)) or default)
+    except Exception:
+        return float(default)
+
+
+def _env_int(name: str, default: int) -> int:
     try:
-        req = Request(READY_PATH, headers={"X-AdaOS-Token": AUTH_TOKEN})
-        with urlopen(req, timeout=timeout) as r:
-            return r.status == 200
+        return int(os.environ.get(name, str(default)) or default)
     except Exception:
+        return int(default)
+
+
+@dataclass
+class SentinelConfig:
+    cmd: str
+    target_host: str = "127.0.0.1"
+    target_port: int = 8788  # где слушает ядро
+    listen_host: str = "127.0.0.1"
+    listen_port: int = 8777  # куда стучатся клиенты
+    token: str = "dev-local-token"
+    ready_path: str = "/ready"
+    boot_timeout_s: float = 20.0
+    idle_timeout_s: float = 0.0
+    pool_size: int = 8
+    health_interval_s: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "SentinelConfig":
+        ready = urlsplit(os.environ.get("ADAOS_READY_PATH", "/ready"))
+        return cls(
+            cmd=os.environ.get("ADAOS_CMD", sys.executable + " -m adaos.app.cli app start"),
+            target_host=os.environ.get("ADAOS_TARGET_HOST", "127.0.0.1"),
+            target_port=_env_int("ADAOS_TARGET_PORT", 8788),
+            listen_port=_env_int("ADAOS_GW_PORT", 8777),
+            token=os.environ.get("ADAOS_TOKEN", "dev-local-token"),
+            ready_path=ready.path or "/ready",
+            boot_timeout_s=_env_float("ADAOS_GW_BOOT_TIMEOUT_S", 20.0),
+            idle_timeout_s=_env_float("ADAOS_GW_IDLE_S", 0.0),
+            pool_size=max(0, _env_int("ADAOS_GW_POOL_SIZE", 8)),
+            health_interval_s=max(0.1, _env_float("ADAOS_GW_HEALTH_S", 5.0)),
+        )
+
+
+# --- HTTP/1.1 helpers --------------------------------------------------------
+
+
+def _header(headers: list[tuple[str, str]], name: str) -> str | None:
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _tokens(headers: list[tuple[str, str]], name: str) -> set[str]:
+    return {item.strip().lower() for item in (_header(headers, name) or "").split(",") if item.strip()}
+
+
+def _has_body(headers: list[tuple[str, str]]) -> bool:
+    if "chunked" in _tokens(headers, "transfer-encoding"):
+        return True
+    try:
+        return int(_header(headers, "content-length") or 0) > 0
+    except ValueError:
         return False
 
 
-def start_core():
-    global proc
-    with proc_lock:
-        if proc and proc.poll() is None:
+async def _read_head(reader: asyncio.StreamReader) -> tuple[str, list[tuple[str, str]]] | None:
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial.strip():
+            return None
+        raise
+    lines = raw[:-4].decode("latin-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        key, _, value = line.partition(":")
+        headers.append((key.strip(), value.strip()))
+    return lines[0], headers
+
+
+def _encode_head(start: str, headers: list[tuple[str, str]]) -> bytes:
+    return (start + "\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers) + "\r\n").encode("latin-1")
+
+
+async def _copy_exact(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, size: int) -> None:
+    while size > 0:
+        data = await reader.read(min(size, _CHUNK))
+        if not data:
+            raise asyncio.IncompleteReadError(b"", size)
+        writer.write(data)
+        size -= len(data)
+        await writer.drain()
+
+
+async def _copy_chunked(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        writer.write(line)
+        size = int(line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            while True:  # trailers up to the empty line
+                trailer = await reader.readuntil(b"\r\n")
+                writer.write(trailer)
+                if trailer == b"\r\n":
+                    break
+            await writer.drain()
             return
-        # Запуск ядра как подпроцесса (без шелла безопаснее)
-        args = ADAOS_CMD.split()
-        env = os.environ.copy()
-        env["ADAOS_TOKEN"] = AUTH_TOKEN
-        proc = subprocess.Popen(args, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        await _copy_exact(reader, writer, size + 2)
+
+
+async def _copy_body(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    headers: list[tuple[str, str]],
+    *,
+    until_close: bool,
+) -> None:
+    if "chunked" in _tokens(headers, "transfer-encoding"):
+        await _copy_chunked(reader, writer)
+        return
+    length = _header(headers, "content-length")
+    if length is not None:
+        await _copy_exact(reader, writer, int(length))
+        return
+    if until_close:
+        while True:
+            data = await reader.read(_CHUNK)
+            if not data:
+                return
+            writer.write(data)
+            await writer.drain()
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def _respond(writer: asyncio.StreamWriter, status: int, body: bytes = b"", *, keep_alive: bool = True) -> None:
+    headers = [
+        ("Content-Type", "application/json"),
+        ("Content-Length", str(len(body))),
+        ("Connection", "keep-alive" if keep_alive else "close"),
+    ]
+    writer.write(_encode_head(f"HTTP/1.1 {status} {_reason(status)}", headers) + body)
+
+
+# --- upstream ------------------------------------------------------------------
+
+
+class _UpstreamPool:
+    """LIFO pool of idle keep-alive connections to the core."""
 
+    def __init__(self, host: str, port: int, size: int, stats: dict[str, int]) -> None:
+        self.host = host
+        self.port = port
+        self.size = size
+        self.stats = stats
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
 
-def wait_until_ready(deadline_sec=20):
-    start = time.time()
-    while time.time() - start < deadline_sec:
-        if is_ready():
+    async def acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            self.stats["upstream_reused"] += 1
+            return reader, writer, True
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=_MAX_HEAD)
+        self.stats["upstream_opened"] += 1
+        return reader, writer, False
+
+    def release(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self._idle) < self.size and not writer.is_closing() and not reader.at_eof():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class _Core:
+    """Core process and its cached readiness: unknown, stopped, booting, ready."""
+
+    def __init__(self, config: SentinelConfig, pool: _UpstreamPool, stats: dict[str, int]) -> None:
+        self.config = config
+        self.pool = pool
+        self.stats = stats
+        self.state = "unknown"
+        self.proc: subprocess.Popen[Any] | None = None
+        self.active = 0
+        self.last_active = time.monotonic()
+        self._boot: asyncio.Future[bool] | None = None
+
+    async def probe(self, timeout: float = 0.5) -> bool:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.config.target_host, self.config.target_port), timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            writer.write(
+                _encode_head(
+                    f"GET {self.config.ready_path} HTTP/1.1",
+                    [
+                        ("Host", f"{self.config.target_host}:{self.config.target_port}"),
+                        ("X-AdaOS-Token", self.config.token),
+                        ("Connection", "close"),
+                    ],
+                )
+            )
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            parts = line.split()
+            return len(parts) >= 2 and parts[1] == b"200"
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return False
+        finally:
+            writer.close()
+
+    async def ensure_ready(self) -> bool:
+        if self.state == "ready":
             return True
-        time.sleep(0.2)
-    return False
-
-
-class Gateway(BaseHTTPRequestHandler):
-    def _auth_ok(self):
-        return self.headers.get("X-AdaOS-Token") == AUTH_TOKEN
-
-    def _proxy(self, method: str, path: str, body: bytes):
-        # простейший прокси только для POST /api/say и GET /health|/ready для примера
-        import http.client
-
-        conn = http.client.HTTPConnection(TARGET_HOST, TARGET_PORT, timeout=10)
-        headers = {k: v for k, v in self.headers.items()}
-        headers["X-AdaOS-Token"] = AUTH_TOKEN
-        conn.request(method, path, body, headers)
-        resp = conn.getresponse()
-        data = resp.read()
-        self.send_response(resp.status)
-        for k, v in resp.getheaders():
-            self.send_header(k, v)
-        self.end_headers()
-        self.wfile.write(data)
-
-    def do_GET(self):
-        if self.path in ("/health", "/ready"):
-            # не стартуем ядро ради health-check самого лончера
-            code = 200 if (proc and proc.poll() is None and is_ready()) else 503
-            self.send_response(code)
-            self.end_headers()
-            self.wfile.write(b'{"ok":%s}' % (b"true" if code == 200 else b"false"))
+        if self._boot is None or self._boot.done():
+            self._boot = asyncio.ensure_future(self._boot_core())
+        else:
+            self.stats["queued_during_boot"] += 1
+        return await asyncio.shield(self._boot)
+
+    def _start_process(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
             return
+        # Запуск ядра как подпроцесса (без шелла безопаснее); вывод ядра
+        # идёт в консоль лончера.
+        env = os.environ.copy()
+        env["ADAOS_TOKEN"] = self.config.token
+        self.proc = subprocess.Popen(self.config.cmd.split(), env=env)
+        self.stats["boots"] += 1
 
-        if not self._auth_ok():
-            self.send_response(401)
-            self.end_headers()
+    async def _boot_core(self) -> bool:
+        # The core may already be up (started outside or before a restart
+        # of the sentinel) or just have dropped one connection.
+        if await self.probe():
+            self.state = "ready"
+            return True
+        self.state = "booting"
+        self._start_process()
+        deadline = time.monotonic() + self.config.boot_timeout_s
+        while time.monotonic() < deadline:
+            if self.proc is not None and self.proc.poll() is not None:
+                break
+            if await self.probe():
+                self.state = "ready"
+                return True
+            await asyncio.sleep(0.1)
+        self.state = "stopped"
+        return False
+
+    def mark_unreachable(self) -> None:
+        if self.state == "ready":
+            self.state = "unknown"
+        self.pool.close()
+
+    async def stop(self) -> None:
+        self.state = "stopped"
+        self.pool.close()
+        proc, self.proc = self.proc, None
+        if proc is None or proc.poll() is not None:
             return
 
-        if not is_ready():
-            start_core()
-            if not wait_until_ready():
-                self.send_response(503)
-                self.end_headers()
-                self.wfile.write(b'{"error":"core not ready"}')
-                return
-        self._proxy("GET", self.path, b"")
+        def _terminate() -> None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait(5)
+
+        await asyncio.to_thread(_terminate)
+
+    async def watch(self) -> None:
+        idle_s = self.config.idle_timeout_s
+        interval = self.config.health_interval_s
+        if idle_s > 0:
+            interval = min(interval, max(0.05, idle_s / 4))
+        while True:
+            await asyncio.sleep(interval)
+            if self.state != "ready" or self.proc is None:
+                continue
+            if self.proc.poll() is not None:
+                self.state = "stopped"
+                self.pool.close()
+            elif idle_s > 0 and self.active == 0 and time.monotonic() - self.last_active >= idle_s:
+                await self.stop()
+                self.stats["idle_shutdowns"] += 1
+
+
+# --- gateway -------------------------------------------------------------------
+
 
-    def do_POST(self):
-        length = int(self.headers.get("Content-Length") or 0)
-        body = self.rfile.read(length)
+class SentinelGateway:
+    def __init__(self, config: SentinelConfig) -> None:
+        self.config = config
+        self.stats: dict[str, int] = {
+            "requests": 0,
+            "boots": 0,
+            "queued_during_boot": 0,
+            "upstream_opened": 0,
+            "upstream_reused": 0,
+            "upgrades": 0,
+            "idle_shutdowns": 0,
+        }
+        self.pool = _UpstreamPool(config.target_host, config.target_port, config.pool_size, self.stats)
+        self.core = _Core(config, self.pool, self.stats)
+        self._server: asyncio.AbstractServer | None = None
+        self._watch_task: asyncio.Task[None] | None = None
 
-        if not self._auth_ok():
-            self.send_response(401)
-            self.end_headers()
+    @property
+    def port(self) -> int:
+        if self._server is not None and self._server.sockets:
+            return int(self._server.sockets[0].getsockname()[1])
+        return int(self.config.listen_port)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_client, self.config.listen_host, self.config.listen_port, limit=_MAX_HEAD
+        )
+        self._watch_task = asyncio.create_task(self.core.watch(), name="adaos-sentinel-watch")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            with contextlib.suppress(BaseException):
+                await self._watch_task
+        if self._server is not None:
+            self._server.close()
+            with contextlib.suppress(Exception):
+                await self._server.wait_closed()
+        await self.core.stop()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await _read_head(reader)
+                if head is None:
+                    break
+                if not await self._handle_request(head, reader, writer):
+                    break
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(
+        self,
+        head: tuple[str, list[tuple[str, str]]],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        start, headers = head
+        parts = start.split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            _respond(writer, 400, keep_alive=False)
+            return False
+        method, target, version = parts
+        connection = _tokens(headers, "connection")
+        client_keep = "close" not in connection and (version == "HTTP/1.1" or "keep-alive" in connection)
+        has_body = _has_body(headers)
+        self.stats["requests"] += 1
+
+        if urlsplit(target).path in ("/health", "/ready"):
+            # не стартуем ядро ради health-check самого лончера
+            ok = self.core.state == "ready"
+            _respond(writer, 200 if ok else 503, b'{"ok":%s}' % (b"true" if ok else b"false"), keep_alive=client_keep)
+            return client_keep and not has_body
+
+        if _header(headers, "X-AdaOS-Token") != self.config.token:
+            _respond(writer, 401, keep_alive=client_keep and not has_body)
+            return client_keep and not has_body
+
+        self.core.active += 1
+        try:
+            if not await self.core.ensure_ready():
+                _respond(writer, 503, b'{"error":"core not ready"}', keep_alive=client_keep and not has_body)
+                return client_keep and not has_body
+            if "upgrade" in connection and _header(headers, "Upgrade"):
+                await self._tunnel(start, headers, reader, writer)
+                return False
+            return await self._forward(method, target, headers, reader, writer, client_keep=client_keep)
+        finally:
+            self.core.active -= 1
+            self.core.last_active = time.monotonic()
+
+    def _upstream_headers(self, headers: list[tuple[str, str]], *, keep_hop: bool = False) -> list[tuple[str, str]]:
+        out = [
+            (k, v)
+            for k, v in headers
+            if k.lower() != "x-adaos-token" and (keep_hop or k.lower() not in _HOP_BY_HOP)
+        ]
+        out.append(("X-AdaOS-Token", self.config.token))
+        return out
+
+    async def _forward(
+        self,
+        method: str,
+        target: str,
+        headers: list[tuple[str, str]],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        client_keep: bool,
+    ) -> bool:
+        has_body = _has_body(headers)
+        request_head = _encode_head(
+            f"{method} {target} HTTP/1.1", self._upstream_headers(headers) + [("Connection", "keep-alive")]
+        )
+        for attempt in (0, 1):
+            try:
+                up_reader, up_writer, reused = await self.pool.acquire()
+            except OSError:
+                self.core.mark_unreachable()
+                _respond(writer, 502, b'{"error":"core unreachable"}', keep_alive=False)
+                return False
+            try:
+                up_writer.write(request_head)
+                if has_body:
+                    await _copy_body(reader, up_writer, headers, until_close=False)
+                await up_writer.drain()
+                status, response_headers = await self._read_response_head(up_reader, writer)
+                break
+            except (OSError, asyncio.IncompleteReadError):
+                up_writer.close()
+                if reused and attempt == 0 and not has_body:
+                    continue  # stale keep-alive connection, retry on a fresh one
+                self.core.mark_unreachable()
+                _respond(writer, 502, b'{"error":"core unreachable"}', keep_alive=False)
+                return False
+        try:
+            no_body = method == "HEAD" or status in (204, 304)
+            framed = (
+                no_body
+                or "chunked" in _tokens(response_headers, "transfer-encoding")
+                or _header(response_headers, "content-length") is not None
+            )
+            upstream_keep = framed and "close" not in _tokens(response_headers, "connection")
+            keep = client_keep and framed
+            status_line = f"HTTP/1.1 {status} {_reason(status)}".rstrip()
+            out = [(k, v) for k, v in response_headers if k.lower() not in _HOP_BY_HOP]
+            out.append(("Connection", "keep-alive" if keep else "close"))
+            writer.write(_encode_head(status_line, out))
+            if not no_body:
+                await _copy_body(up_reader, writer, response_headers, until_close=True)
+            await writer.drain()
+        except BaseException:
+            up_writer.close()
+            raise
+        if upstream_keep:
+            self.pool.release(up_reader, up_writer)
+        else:
+            up_writer.close()
+        return keep
+
+    @staticmethod
+    async def _read_response_head(
+        up_reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[int, list[tuple[str, str]]]:
+        while True:
+            head = await _read_head(up_reader)
+            if head is None:
+                raise asyncio.IncompleteReadError(b"", None)
+            start, headers = head
+            status = int(start.split(" ", 2)[1])
+            if 100 <= status < 200:
+                # interim responses (100 Continue) go straight to the client
+                writer.write(_encode_head(start, headers))
+                await writer.drain()
+                continue
+            return status, headers
+
+    async def _tunnel(
+        self,
+        start: str,
+        headers: list[tuple[str, str]],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """WebSocket (or any Upgrade) pass-through on a dedicated connection."""
+        try:
+            up_reader, up_writer = await asyncio.open_connection(self.config.target_host, self.config.target_port)
+        except OSError:
+            self.core.mark_unreachable()
+            _respond(writer, 502, b'{"error":"core unreachable"}', keep_alive=False)
             return
+        self.stats["upgrades"] += 1
+        up_writer.write(_encode_head(start, self._upstream_headers(headers, keep_hop=True)))
 
-        if not is_ready():
-            start_core()
-            if not wait_until_ready():
-                self.send_response(503)
-                self.end_headers()
-                self.wfile.write(b'{"error":"core not ready"}')
-                return
+        async def _pipe(src: asyncio.StreamReader, dst: asyncio.StreamWriter) -> None:
+            while True:
+                data = await src.read(_CHUNK)
+                if not data:
+                    return
+                dst.write(data)
+                await dst.drain()
 
-        self._proxy("POST", self.path, body)
+        tasks = [asyncio.ensure_future(_pipe(reader, up_writer)), asyncio.ensure_future(_pipe(up_reader, writer))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            up_writer.close()
 
 
-def run():
-    server = HTTPServer(("127.0.0.1", LISTEN_PORT), Gateway)
-    print(f"[sentinel] listen http://127.0.0.1:{LISTEN_PORT}  → core {TARGET_HOST}:{TARGET_PORT}")
+async def _main(config: SentinelConfig) -> None:
+    gateway = SentinelGateway(config)
+    await gateway.start()
+    print(f"[sentinel] listen http://{config.listen_host}:{gateway.port}  → core {config.target_host}:{config.target_port}")
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, stop.set)
     try:
-        server.serve_forever()
+        await stop.wait()
+    finally:
+        await gateway.close()
+
+
+def run() -> None:
+    try:
+        asyncio.run(_main(SentinelConfig.from_env()))
     except KeyboardInterrupt:
         pass
-    finally:
-        with proc_lock:
-            if proc and proc.poll() is None:
-                proc.send_signal(signal.SIGTERM)
-                try:
-                    proc.wait(5)
-                except subprocess.TimeoutExpired:
-                    proc.kill()
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from importlib import import_module
 __all__ = [
     "BusNotAvailable",
     "emit",
+    "emit_many",
     "on",
     "get_meta",
     "clear_current_skill",
@@ -46,6 +47,7 @@ __all__ = [
 _EXPORTS: dict[str, tuple[str, str]] = {
     "BusNotAvailable": ("adaos.sdk.data.bus", "BusNotAvailable"),
     "emit": ("adaos.sdk.data.bus", "emit"),
+    "emit_many": ("adaos.sdk.data.bus", "emit_many"),
     "on": ("adaos.sdk.data.bus", "on"),
     "get_meta": ("adaos.sdk.data.bus", "get_meta"),
     "clear_current_skill": ("adaos.sdk.data.context", "clear_current_skill"),
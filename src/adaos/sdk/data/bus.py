@@ -5,11 +5,11 @@ from __future__ import annotations
 import inspect
 import time
 from types import SimpleNamespace
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Iterable, Tuple
 
 from adaos.sdk.core._ctx import require_ctx
 
-__all__ = ["emit", "on", "get_meta", "BusNotAvailable"]
+__all__ = ["emit", "emit_many", "on", "get_meta", "BusNotAvailable"]
 
 
 class BusNotAvailable(RuntimeError):
@@ -37,18 +37,52 @@ def get_meta(payload: dict) -> dict:
     return payload.get("_meta", {}) if isinstance(payload, dict) else {}
 
 
-async def emit(topic: str, payload: dict, **kw: Any):
-    bus = _bus()
-    publish = getattr(bus, "publish")
+# How to call a bus's publish/subscribe is worked out once per (bus, method)
+# instead of on every emit(); the key includes the underlying function so a
+# re-bound or patched method gets a fresh adapter.
+_ADAPTERS: dict[tuple[int, str, Any], tuple[Any, Any]] = {}
+_ADAPTER_LIMIT = 64
 
-    source = kw.pop("source", "")
-    ts = float(kw.pop("ts", time.time()))
-    extra_meta = dict(kw)
 
-    pp = dict(payload) if isinstance(payload, dict) else {"value": payload}
-    if extra_meta:
-        pp["_meta"] = {**pp.get("_meta", {}), **extra_meta}
+def _cached(bus: Any, name: str, build: Callable[[Any], Any]) -> Any:
+    method = getattr(bus, name)
+    key = (id(bus), name, getattr(method, "__func__", method))
+    entry = _ADAPTERS.get(key)
+    if entry is not None and entry[0] is bus:
+        return entry[1]
+    adapter = build(method)
+    if len(_ADAPTERS) >= _ADAPTER_LIMIT:
+        _ADAPTERS.clear()
+    _ADAPTERS[key] = (bus, adapter)
+    return adapter
+
+
+_EVENT_CLS: Any = None
+
+
+def _make_event(topic: str, pp: dict, source: str, ts: float) -> Any:
+    global _EVENT_CLS
+    try:
+        if _EVENT_CLS is None:
+            from adaos.domain.types import Event as DomainEvent
+
+            _EVENT_CLS = DomainEvent
+        return _EVENT_CLS(type=topic, payload=pp, source=source, ts=ts)
+    except Exception:
+        return SimpleNamespace(type=topic, payload=pp, source=source, ts=ts)
+
+
+class _Publisher:
+    """Precompiled call into ``bus.publish``; ``many`` is set when events can be handed over in one call."""
+
+    __slots__ = ("call", "many")
+
+    def __init__(self, call: Callable[..., Any], many: Callable[..., Any] | None = None) -> None:
+        self.call = call
+        self.many = many
 
+
+def _build_publisher(publish: Callable[..., Any], bus: Any = None) -> _Publisher:
     npos = _positional_params(publish)
     try:
         sig = inspect.signature(publish)
@@ -57,69 +91,164 @@ async def emit(topic: str, payload: dict, **kw: Any):
 
     if npos >= 2:
         if sig and any(p.kind is inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
-            res = publish(topic, pp, source=source, ts=ts, **extra_meta)
-        else:
-            allowed = {}
-            if sig:
-                for name in ("source", "ts"):
-                    if name in sig.parameters:
-                        allowed[name] = locals()[name]
+
+            def _call_kw(topic: str, pp: dict, source: str, ts: float, meta: dict) -> Any:
+                return publish(topic, pp, source=source, ts=ts, **meta)
+
+            return _Publisher(_call_kw)
+
+        names = tuple(name for name in ("source", "ts") if sig and name in sig.parameters)
+
+        def _call_pos(topic: str, pp: dict, source: str, ts: float, meta: dict) -> Any:
+            values = {"source": source, "ts": ts}
             try:
-                res = publish(topic, pp, **allowed)
+                return publish(topic, pp, **{name: values[name] for name in names})
             except TypeError:
-                res = publish(topic, pp)
-        if inspect.iscoroutine(res):
-            return await res
-        return res
+                return publish(topic, pp)
 
-    try:
-        from adaos.domain.types import Event as DomainEvent
+        return _Publisher(_call_pos)
 
-        event = DomainEvent(type=topic, payload=pp, source=source, ts=ts)
-    except Exception:
-        event = SimpleNamespace(type=topic, payload=pp, source=source, ts=ts)
+    def _call_event(topic: str, pp: dict, source: str, ts: float, meta: dict) -> Any:
+        try:
+            return publish(_make_event(topic, pp, source, ts))
+        except TypeError:
+            return publish(topic, pp)
 
-    try:
-        res = publish(event)
-    except TypeError:
-        res = publish(topic, pp)
+    publish_many = getattr(bus, "publish_many", None)
+    if not callable(publish_many) or getattr(type(bus), "publish", None) is not getattr(publish, "__func__", None):
+        # No batch entry point, or publish() was patched on the instance and
+        # publish_many() would bypass it.
+        return _Publisher(_call_event)
+
+    def _many(items: list[tuple[str, dict]], source: str, ts: float) -> Any:
+        return publish_many([_make_event(topic, pp, source, ts) for topic, pp in items])
+
+    return _Publisher(_call_event, _many)
+
+
+def _publisher(bus: Any) -> _Publisher:
+    return _cached(bus, "publish", lambda publish: _build_publisher(publish, bus))
+
+
+def _prepare(payload: Any, extra_meta: dict) -> dict:
+    pp = dict(payload) if isinstance(payload, dict) else {"value": payload}
+    if extra_meta:
+        pp["_meta"] = {**pp.get("_meta", {}), **extra_meta}
+    return pp
+
+
+async def emit(topic: str, payload: dict, **kw: Any):
+    bus = _bus()
+    source = kw.pop("source", "")
+    ts = float(kw.pop("ts", time.time()))
+    pp = _prepare(payload, kw)
 
+    res = _publisher(bus).call(topic, pp, source, ts, kw)
     if inspect.iscoroutine(res):
         return await res
     return res
 
 
-async def on(topic: str, handler: Callable[[dict], Awaitable[Any]]):
+_DIRECT_EMIT = emit
+
+
+async def emit_many(events: Iterable[Tuple[str, dict]], **kw: Any) -> list[Any]:
+    """
+    Publish several ``(topic, payload)`` events with shared ``source``/``ts``/meta.
+
+    Buses exposing ``publish_many(events)`` receive the whole batch in one
+    call; otherwise events are published one by one through the same
+    precompiled adapter. Results are returned in order.
+    """
+    items = list(events)
+    if emit is not _DIRECT_EMIT:
+        # emit() is wrapped (e.g. by the observer): keep its per-event behaviour.
+        return [await emit(topic, payload, **dict(kw)) for topic, payload in items]
+
     bus = _bus()
-    subscribe = getattr(bus, "subscribe")
+    source = kw.pop("source", "")
+    ts = float(kw.pop("ts", time.time()))
+    prepared = [(topic, _prepare(payload, kw)) for topic, payload in items]
+    if not prepared:
+        return []
+    publisher = _publisher(bus)
+
+    if publisher.many is not None:
+        res = publisher.many(prepared, source, ts)
+        if inspect.iscoroutine(res):
+            res = await res
+        return list(res) if isinstance(res, (list, tuple)) else [res] * len(prepared)
+
+    results: list[Any] = []
+    for topic, pp in prepared:
+        res = publisher.call(topic, pp, source, ts, kw)
+        if inspect.iscoroutine(res):
+            res = await res
+        results.append(res)
+    return results
+
+
+def _trampoline(handler: Callable[[dict], Any]) -> Callable[[Any], Awaitable[Any]]:
+    """Build the event -> payload adapter once per subscription."""
+
+    if inspect.iscoroutinefunction(handler):
+
+        async def _adapt_async(ev):
+            if hasattr(ev, "payload"):
+                return await handler(ev.payload)
+            if isinstance(ev, dict) and "payload" in ev and "type" in ev:
+                return await handler(ev.get("payload"))
+            return await handler(ev)
+
+        return _adapt_async
 
     async def _adapt(ev):
         if hasattr(ev, "payload"):
-            data = getattr(ev, "payload")
-        elif isinstance(ev, dict) and "payload" in ev and "type" in ev:
-            data = ev.get("payload")
-        else:
-            data = ev
-        if inspect.iscoroutinefunction(handler):
-            return await handler(data)
-        return handler(data)
+            return handler(ev.payload)
+        if isinstance(ev, dict) and "payload" in ev and "type" in ev:
+            return handler(ev.get("payload"))
+        return handler(ev)
 
-    try:
-        sig = inspect.signature(subscribe)
-    except (TypeError, ValueError):
-        sig = None
+    return _adapt
+
+
+class _Subscriber:
+    """Remembers which calling convention ``bus.subscribe`` accepted."""
 
-    if sig and len(sig.parameters) >= 3:
-        res = subscribe(topic, _adapt)
-    else:
+    __slots__ = ("subscribe", "mode")
+
+    def __init__(self, subscribe: Callable[..., Any]) -> None:
+        self.subscribe = subscribe
+        try:
+            sig = inspect.signature(subscribe)
+        except (TypeError, ValueError):
+            sig = None
+        self.mode = "topic" if sig and len(sig.parameters) >= 3 else None
+
+    def __call__(self, topic: str, adapt: Callable[..., Any]) -> Any:
+        subscribe = self.subscribe
+        if self.mode == "topic":
+            return subscribe(topic, adapt)
+        if self.mode == "handler":
+            return subscribe(adapt)
+        if self.mode == "keywords":
+            return subscribe(topic=topic, handler=adapt)
         try:
-            res = subscribe(_adapt)
+            res = subscribe(adapt)
+            self.mode = "handler"
         except TypeError:
             try:
-                res = subscribe(topic=topic, handler=_adapt)
+                res = subscribe(topic=topic, handler=adapt)
+                self.mode = "keywords"
             except TypeError:
-                res = subscribe(topic, _adapt)
+                res = subscribe(topic, adapt)
+                self.mode = "topic"
+        return res
+
 
+async def on(topic: str, handler: Callable[[dict], Awaitable[Any]]):
+    bus = _bus()
+    res = _cached(bus, "subscribe", _Subscriber)(topic, _trampoline(handler))
     if inspect.iscoroutine(res):
         return await res
     return res
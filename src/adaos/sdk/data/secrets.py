@@ -2,30 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
 
 from adaos.sdk.core._cap import require_cap
 
+# Per-invocation secrets service of the running skill. The skill runtime sets
+# this instead of swapping ``ctx.secrets`` on the shared AgentContext, so
+# concurrent (or timed-out, still running) tool calls keep their own store.
+_SKILL_SECRETS: ContextVar[Any | None] = ContextVar("adaos_skill_secrets", default=None)
+
+
+@contextmanager
+def skill_secrets(service: Any) -> Iterator[None]:
+    """Route secrets calls to ``service`` for the current execution context."""
+    token = _SKILL_SECRETS.set(service)
+    try:
+        yield
+    finally:
+        _SKILL_SECRETS.reset(token)
+
+
+def _secrets(ctx: Any) -> Any:
+    service = _SKILL_SECRETS.get()
+    return service if service is not None else ctx.secrets
+
 
 def get(name: str, default: Optional[str] = None) -> Optional[str]:
     """Return a secret by name or the provided default when missing."""
 
     ctx = require_cap("secrets.read")
-    return ctx.secrets.get(name, default=default)
+    return _secrets(ctx).get(name, default=default)
 
 
 def set(name: str, value: str) -> None:
     """Store or update a secret value for the active skill."""
 
     ctx = require_cap("secrets.write")
-    ctx.secrets.put(name, value)
+    _secrets(ctx).put(name, value)
 
 
 def delete(name: str) -> None:
     """Remove a stored secret value for the active skill."""
 
     ctx = require_cap("secrets.write")
-    ctx.secrets.delete(name)
+    _secrets(ctx).delete(name)
 
 
 # Backwards-compatible aliases for older skills.
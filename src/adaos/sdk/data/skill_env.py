@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
 from adaos.sdk.core._ctx import require_ctx
 from adaos.sdk.core.errors import SdkRuntimeNotInitialized
@@ -20,6 +22,29 @@ __all__ = [
 ]
 
 
+# Per-invocation overrides for ADAOS_SKILL_ENV_PATH / ADAOS_SKILL_MEMORY_PATH.
+# The skill runtime sets these instead of mutating os.environ, so concurrent tool
+# calls of different skills do not see each other's paths.
+_ENV_OVERRIDES: ContextVar[Mapping[str, str] | None] = ContextVar("adaos_skill_env_overrides", default=None)
+
+
+@contextmanager
+def skill_env_overrides(values: Mapping[str, str]) -> Iterator[None]:
+    """Temporarily override skill env variables for the current execution context."""
+    token = _ENV_OVERRIDES.set(dict(values))
+    try:
+        yield
+    finally:
+        _ENV_OVERRIDES.reset(token)
+
+
+def _getenv(name: str) -> str | None:
+    overrides = _ENV_OVERRIDES.get()
+    if overrides is not None and name in overrides:
+        return overrides[name]
+    return os.getenv(name)
+
+
 def _deep_merge(base: dict[str, Any], overlay: Mapping[str, Any]) -> dict[str, Any]:
     merged = dict(base)
     for key, value in overlay.items():
@@ -113,7 +138,7 @@ def _runtime_env_path_from_ctx() -> Path | None:
 def skill_env_path() -> Path:
     path = _runtime_env_path_from_ctx()
     if path is None:
-        override = os.getenv("ADAOS_SKILL_ENV_PATH") or os.getenv("ADAOS_SKILL_MEMORY_PATH")
+        override = _getenv("ADAOS_SKILL_ENV_PATH") or _getenv("ADAOS_SKILL_MEMORY_PATH")
         if override:
             path = Path(override)
         else:
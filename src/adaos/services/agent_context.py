@@ -10,10 +10,7 @@ from adaos.ports.paths import PathProvider
 from adaos.ports.fs import FSPolicy
 from adaos.ports.sandbox import Sandbox
 
-from adaos.adapters.skills.git_repo import GitSkillRepository
-from adaos.adapters.scenarios.git_repo import GitScenarioRepository
 from adaos.ports.skill_context import SkillContextPort
-from adaos.adapters.sdk.inproc_skill_context import InprocSkillContext
 from contextvars import ContextVar
 from contextlib import contextmanager
 
@@ -59,6 +56,8 @@ def use_ctx(ctx: AgentContext):
 
 if TYPE_CHECKING:
     from adaos.services.i18n.service import I18nService
+    from adaos.adapters.skills.git_repo import GitSkillRepository
+    from adaos.adapters.scenarios.git_repo import GitScenarioRepository
     from adaos.services.scenario.projection_registry import ProjectionRegistry
 
 
@@ -92,6 +91,8 @@ class AgentContext:
     def skills_repo(self) -> GitSkillRepository:
         repo = self._skills_repo
         if repo is None:
+            from adaos.adapters.skills.git_repo import GitSkillRepository  # local import: pulls git/requests
+
             repo = GitSkillRepository(
                 paths=self.paths,
                 git=self.git,
@@ -106,6 +107,8 @@ class AgentContext:
     def scenarios_repo(self) -> GitScenarioRepository:
         repo = self._scenarios_repo
         if repo is None:
+            from adaos.adapters.scenarios.git_repo import GitScenarioRepository  # local import: pulls git/requests
+
             repo = GitScenarioRepository(
                 paths=self.paths,
                 git=self.git,
@@ -119,6 +122,8 @@ class AgentContext:
     def skill_ctx(self) -> SkillContextPort:
         port = self._skill_ctx_port
         if port is None:
+            from adaos.adapters.sdk.inproc_skill_context import InprocSkillContext  # local import
+
             port = InprocSkillContext()
             object.__setattr__(self, "_skill_ctx_port", port)
         return port
@@ -145,6 +150,8 @@ class AgentContext:
     def i18n(self) -> I18nService:
         svc = self._i18n
         if svc is None:
+            from adaos.services.i18n.service import I18nService  # local import
+
             svc = I18nService(self)
             object.__setattr__(self, "_i18n", svc)
         return svc
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_log = logging.getLogger("adaos.boot")
+
+TASK_STATES = ("pending", "running", "gating", "ready", "failed", "cancelled")
+
+# (graph, task name) of the boot task the current coroutine runs in; lets
+# deep code such as run_boot_sequence() mark sub-steps without plumbing.
+_CURRENT: contextvars.ContextVar[Optional[Tuple["BootGraph", str]]] = contextvars.ContextVar(
+    "adaos_boot_task", default=None
+)
+_LAST_GRAPH: Optional["BootGraph"] = None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+class BootGraphError(ValueError):
+    """Invalid boot graph: duplicate names, unknown dependencies or cycles."""
+
+
+@dataclass
+class BootTask:
+    """One startup component.
+
+    ``run`` starts the component; ``gate`` (sync or async, optional) is polled
+    after ``run`` returns until it reports the component ready.  Critical tasks
+    must be ready before the API starts serving; the rest finish in the
+    background.  A failing ``fatal`` task aborts startup, any other failure is
+    recorded and dependents still start (boot stays best-effort).
+    """
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    critical: bool = True
+    fatal: bool = False
+    gate: Optional[Callable[[], Any]] = None
+    timeout_s: Optional[float] = None
+
+
+@dataclass
+class _Record:
+    task: BootTask
+    state: str = "pending"
+    started_at: Optional[float] = None
+    run_done_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    failed_deps: List[str] = field(default_factory=list)
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class BootGraph:
+    """Starts boot tasks as soon as their dependencies finish and records a timeline."""
+
+    def __init__(
+        self,
+        tasks: Iterable[BootTask],
+        *,
+        gate_poll_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._tasks: Dict[str, BootTask] = {}
+        for task in tasks:
+            if task.name in self._tasks:
+                raise BootGraphError(f"duplicate boot task {task.name!r}")
+            self._tasks[task.name] = task
+        self._order = self._validate()
+        self._gate_poll_s = max(0.001, gate_poll_s if gate_poll_s is not None else _env_float("ADAOS_BOOT_GATE_POLL_S", 0.05))
+        self._clock = clock
+        self._records: Dict[str, _Record] = {name: _Record(task) for name, task in self._tasks.items()}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._t0: Optional[float] = None
+        self._started_wall: Optional[float] = None
+        self._ready_at: Optional[float] = None
+
+    # ------------------------------------------------------------------ graph
+    def _validate(self) -> List[str]:
+        for task in self._tasks.values():
+            for dep in task.deps:
+                if dep not in self._tasks:
+                    raise BootGraphError(f"boot task {task.name!r} depends on unknown task {dep!r}")
+                if task.critical and not self._tasks[dep].critical:
+                    raise BootGraphError(f"critical boot task {task.name!r} cannot wait for non-critical {dep!r}")
+            if task.fatal and not task.critical:
+                raise BootGraphError(f"fatal boot task {task.name!r} must be critical")
+        # Kahn's algorithm; leftovers form a cycle.
+        indegree = {name: len(task.deps) for name, task in self._tasks.items()}
+        order = [name for name, deg in indegree.items() if deg == 0]
+        for name in order:
+            for other, task in self._tasks.items():
+                if name in task.deps:
+                    indegree[other] -= 1
+                    if indegree[other] == 0:
+                        order.append(other)
+        if len(order) != len(self._tasks):
+            cycle = sorted(name for name, deg in indegree.items() if deg > 0)
+            raise BootGraphError(f"boot task dependency cycle: {', '.join(cycle)}")
+        return order
+
+    @property
+    def order(self) -> List[str]:
+        return list(self._order)
+
+    # -------------------------------------------------------------- execution
+    async def run(self) -> Dict[str, Any]:
+        """Start every task and return once all critical tasks are done."""
+        global _LAST_GRAPH
+        if self._t0 is not None:
+            raise RuntimeError("boot graph already started")
+        _LAST_GRAPH = self
+        self._t0 = self._clock()
+        self._started_wall = time.time()
+        self._done = {name: asyncio.Event() for name in self._tasks}
+        for name in self._order:
+            self._running[name] = asyncio.create_task(self._execute(self._tasks[name]), name=f"adaos-boot-{name}")
+        critical = [self._running[name] for name in self._order if self._tasks[name].critical]
+        if critical:
+            done, _ = await asyncio.wait(critical, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    await self.cancel()
+                    raise task.exception()  # type: ignore[misc]
+        self._ready_at = self._clock()
+        return self.timeline()
+
+    async def wait_all(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background (non-critical) tasks too; False on timeout."""
+        pending = [task for task in self._running.values() if not task.done()]
+        if not pending:
+            return True
+        _, still = await asyncio.wait(pending, timeout=timeout)
+        return not still
+
+    async def cancel(self) -> None:
+        pending = [task for task in self._running.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _execute(self, task: BootTask) -> None:
+        record = self._records[task.name]
+        try:
+            for dep in task.deps:
+                await self._done[dep].wait()
+            record.failed_deps = [dep for dep in task.deps if self._records[dep].state != "ready"]
+            record.state = "running"
+            record.started_at = self._clock()
+            token = _CURRENT.set((self, task.name))
+            try:
+                if task.timeout_s:
+                    await asyncio.wait_for(self._start(task, record), timeout=task.timeout_s)
+                else:
+                    await self._start(task, record)
+            finally:
+                _CURRENT.reset(token)
+            record.state = "ready"
+        except asyncio.CancelledError:
+            record.state = "cancelled"
+            raise
+        except Exception as exc:
+            record.state = "failed"
+            if isinstance(exc, asyncio.TimeoutError):
+                record.error = f"timeout after {task.timeout_s}s"
+            else:
+                record.error = f"{type(exc).__name__}: {exc}"
+            _log.warning("boot task %s failed: %s", task.name, record.error, exc_info=not isinstance(exc, asyncio.TimeoutError))
+            if task.fatal:
+                raise
+        finally:
+            record.finished_at = self._clock()
+            if task.name in self._done:
+                self._done[task.name].set()
+
+    async def _start(self, task: BootTask, record: _Record) -> None:
+        await task.run()
+        record.run_done_at = self._clock()
+        if task.gate is None:
+            return
+        record.state = "gating"
+        while True:
+            ok = task.gate()
+            if inspect.isawaitable(ok):
+                ok = await ok
+            if ok:
+                return
+            await asyncio.sleep(self._gate_poll_s)
+
+    # --------------------------------------------------------------- timeline
+    def _offset_ms(self, ts: Optional[float]) -> Optional[float]:
+        if ts is None or self._t0 is None:
+            return None
+        return round((ts - self._t0) * 1000.0, 3)
+
+    @staticmethod
+    def _span_ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None:
+            return None
+        return round((end - start) * 1000.0, 3)
+
+    def _note_step(self, task_name: str, step: str, started: float, ended: float, error: Optional[str]) -> None:
+        record = self._records.get(task_name)
+        if record is None:
+            return
+        item: Dict[str, Any] = {
+            "name": step,
+            "start_ms": self._offset_ms(started),
+            "duration_ms": self._span_ms(started, ended),
+        }
+        if error:
+            item["error"] = error
+        record.steps.append(item)
+
+    def _critical_path(self) -> List[str]:
+        finished = {
+            name: rec.finished_at
+            for name, rec in self._records.items()
+            if rec.task.critical and rec.finished_at is not None
+        }
+        if not finished:
+            return []
+        path = [max(finished, key=lambda name: finished[name])]
+        while True:
+            deps = [dep for dep in self._tasks[path[-1]].deps if self._records[dep].finished_at is not None]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda dep: self._records[dep].finished_at or 0.0))
+        path.reverse()
+        return path
+
+    def timeline(self) -> Dict[str, Any]:
+        tasks: List[Dict[str, Any]] = []
+        for name in self._order:
+            rec = self._records[name]
+            tasks.append(
+                {
+                    "name": name,
+                    "deps": list(rec.task.deps),
+                    "critical": rec.task.critical,
+                    "state": rec.state,
+                    "start_ms": self._offset_ms(rec.started_at),
+                    "run_ms": self._span_ms(rec.started_at, rec.run_done_at),
+                    "gate_ms": self._span_ms(rec.run_done_at, rec.finished_at) if rec.task.gate else None,
+                    "ready_ms": self._offset_ms(rec.finished_at),
+                    "duration_ms": self._span_ms(rec.started_at, rec.finished_at),
+                    "failed_deps": list(rec.failed_deps),
+                    "error": rec.error,
+                    "steps": [dict(step) for step in rec.steps],
+                }
+            )
+        finished = [rec.finished_at for rec in self._records.values() if rec.finished_at is not None]
+        complete = bool(self._records) and all(rec.finished_at is not None for rec in self._records.values())
+        if self._t0 is None:
+            state = "pending"
+        elif complete:
+            state = "complete"
+        elif self._ready_at is not None:
+            state = "ready"
+        else:
+            state = "booting"
+        return {
+            "state": state,
+            "started_at": self._started_wall,
+            "time_to_ready_ms": self._offset_ms(self._ready_at),
+            "time_to_complete_ms": self._offset_ms(max(finished)) if complete and finished else None,
+            "critical_path": self._critical_path(),
+            "failed": [name for name in self._order if self._records[name].state == "failed"],
+            "tasks": tasks,
+        }
+
+
+@contextlib.contextmanager
+def boot_step(name: str) -> Iterator[None]:
+    """Record a named sub-step of the boot task the caller runs in (no-op outside a graph)."""
+    current = _CURRENT.get()
+    if current is None:
+        yield
+        return
+    graph, task_name = current
+    started = graph._clock()
+    error: Optional[str] = None
+    try:
+        yield
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        graph._note_step(task_name, name, started, graph._clock(), error)
+
+
+def current_boot_graph() -> Optional[BootGraph]:
+    return _LAST_GRAPH
+
+
+def boot_timeline_snapshot() -> Dict[str, Any]:
+    graph = _LAST_GRAPH
+    if graph is None:
+        return {"state": "unknown", "tasks": []}
+    return graph.timeline()
@@ -29,6 +29,7 @@ from adaos.sdk.core.decorators import register_subscriptions
 from adaos.sdk.data import bus
 from adaos.services import yjs as _y_store  # ensure YStore subscriptions are registered
 from adaos.services.agent_context import AgentContext, get_ctx
+from adaos.services.boot_graph import boot_step
 from adaos.services.chat_io import telemetry as tm
 from adaos.services.chat_io.interfaces import ChatOutputEvent, ChatOutputMessage
 from adaos.services.chat_io.nlu_bridge import register_chat_nlu_bridge  # chat->NLU bridge
@@ -79,6 +80,13 @@ from adaos.services.node_config import NodeConfig, load_config, set_role as cfg_
 from adaos.services.hub_root_outbox_store import load_outbox_items, outbox_store_path, save_outbox_items
 from adaos.services.root.control_lifecycle_sync import report_hub_control_lifecycle_state
 from adaos.services.root.core_update_sync import reconcile_hub_core_update
+from adaos.services.route_tunnel import (
+    TUNNEL_CODEC_BINARY,
+    TunnelSession,
+    is_binary_tunnel_message,
+    json_frame_envelopes,
+    negotiate_tunnel_codec,
+)
 from adaos.services.scheduler import start_scheduler, stop_scheduler
 from adaos.services.scenario import (
     webspace_runtime as _scenario_ws_runtime,  # ensure core scenario subscriptions
@@ -651,11 +659,13 @@ class BootstrapService:
                 await asyncio.sleep(_control_lifecycle_heartbeat_s)
                 await _report_control_lifecycle("heartbeat")
 
-        self._prepare_environment()
+        with boot_step("environment"):
+            self._prepare_environment()
         # local adapter over LocalEventBus
         core_bus = self.ctx.bus if isinstance(self.ctx.bus, LocalEventBus) else LocalEventBus()
         io_bus: Any = LocalIoBus(core=core_bus)
-        await io_bus.connect()
+        with boot_step("io_bus"):
+            await io_bus.connect()
         print("[bootstrap] IO bus: LocalEventBus")
         self._io_bus = io_bus
         # Attach chat IO -> NLU bridge (e.g. Telegram text -> nlp.intent.detect.request)
@@ -669,13 +679,16 @@ class BootstrapService:
         except Exception:
             pass
         await bus.emit("sys.boot.start", {"role": conf.role, "node_id": conf.node_id, "subnet_id": conf.subnet_id}, source="lifecycle", actor="system")
-        await self.skills_loader.import_all_handlers(self.ctx.paths.skills_dir())
+        with boot_step("skill_handlers"):
+            await self.skills_loader.import_all_handlers(self.ctx.paths.skills_dir())
         # Start service-type skills (external processes).
         try:
-            await get_service_supervisor().start_all()
+            with boot_step("service_skills"):
+                await get_service_supervisor().start_all()
         except Exception:
             self._log.warning("failed to start service skills", exc_info=True)
-        await register_subscriptions()
+        with boot_step("subscriptions"):
+            await register_subscriptions()
         if str(getattr(conf, "role", "") or "").strip().lower() == "hub":
             try:
                 from adaos.services.subnet.link_manager import get_hub_link_manager as _get_hub_link_manager
@@ -714,7 +727,8 @@ class BootstrapService:
         await bus.emit("sys.bus.ready", {}, source="lifecycle", actor="system")
         # Start in-process scheduler after the bus is ready.
         try:
-            await start_scheduler()
+            with boot_step("scheduler"):
+                await start_scheduler()
         except Exception:
             self._log.warning("failed to start scheduler", exc_info=True)
 
@@ -885,7 +899,13 @@ class BootstrapService:
                     _finalize_runtime_boot_status()
             except Exception:
                 self._log.debug("failed to finalize core.update.status after sys.ready", exc_info=True)
-            await _report_control_lifecycle("sys.ready")
+            # Root telemetry is a blocking HTTP call; keep it off the path to serving the API.
+            self._boot_tasks.append(
+                asyncio.create_task(
+                    _report_control_lifecycle("sys.ready"),
+                    name="adaos-control-lifecycle-ready",
+                )
+            )
             self._boot_tasks.append(
                 asyncio.create_task(
                     _control_lifecycle_heartbeat(),
@@ -893,7 +913,8 @@ class BootstrapService:
                 )
             )
         else:
-            task = await self._member_register_and_heartbeat(conf)
+            with boot_step("member_register"):
+                task = await self._member_register_and_heartbeat(conf)
             if task:
                 self._boot_tasks.append(task)
                 self._ready.set()
@@ -3395,7 +3416,7 @@ class BootstrapService:
                         tunnels: dict[str, dict[str, Any]] = {}
                         tunnel_tasks: dict[str, asyncio.Task] = {}
                         pending_chunks: dict[str, dict[str, Any]] = {}
-                        pending_tunnel_events: dict[str, list[dict[str, Any]]] = {}
+                        pending_tunnel_events: dict[str, deque[dict[str, Any]]] = {}
                         pending_tunnel_meta: dict[str, dict[str, Any]] = {}
                         pending_tunnel_close_tasks: dict[str, asyncio.Task] = {}
                         # Map route key -> reply subject so we can support both legacy v1 and v2 subjects.
@@ -3507,6 +3528,9 @@ class BootstrapService:
                                         continue
                                 observe_hub_root_route_runtime(
                                     active_tunnels=len(tunnels),
+                                    binary_tunnels=sum(
+                                        1 for rec0 in tunnels.values() if isinstance(rec0, dict) and rec0.get("session") is not None
+                                    ),
                                     active_reader_tasks=active_reader_tasks,
                                     pending_tunnels=len(pending_tunnel_events),
                                     pending_events=pending_events,
@@ -4170,6 +4194,43 @@ class BootstrapService:
                                     except Exception:
                                         pass
 
+                        async def _route_publish_binary(key: str, blob: bytes) -> None:
+                            # Data path of binary (adt1) tunnels: no JSON/base64, no per-frame flush.
+                            reply_subject = str(reply_subjects.get(key) or "") or f"route.v2.to_browser.{hub_id}.{key}"
+                            started = time.monotonic()
+                            try:
+                                try:
+                                    await asyncio.wait_for(
+                                        nc.publish(reply_subject, blob),
+                                        timeout=max(0.1, float(_route_send_timeout_s)),
+                                    )
+                                except asyncio.TimeoutError:
+                                    raise RuntimeError("publish timeout")
+                            except Exception as e:
+                                try:
+                                    observe_hub_root_protocol_publish(
+                                        reply_subject,
+                                        ok=False,
+                                        traffic_class="route",
+                                        payload_bytes=len(blob),
+                                        error=f"{type(e).__name__}: {e}",
+                                    )
+                                except Exception:
+                                    pass
+                                _route_observe_flow("frame", "bin_publish_fail", payload_bytes=len(blob), error=str(e))
+                                raise
+                            try:
+                                observe_hub_root_protocol_publish(
+                                    reply_subject,
+                                    ok=True,
+                                    traffic_class="route",
+                                    payload_bytes=len(blob),
+                                    latency_ms=(time.monotonic() - started) * 1000.0,
+                                )
+                            except Exception:
+                                pass
+                            _route_observe_flow("frame", "browser_bin", direction="to_browser", payload_bytes=len(blob))
+
                         try:
                             self._hub_root_route_reset = _reset_route_runtime
                         except Exception:
@@ -4187,7 +4248,7 @@ class BootstrapService:
                             except Exception:
                                 return False
 
-                        async def _tunnel_reader(key: str, ws) -> None:
+                        async def _tunnel_reader(key: str, ws, session: TunnelSession | None = None) -> None:
                             try:
                                 async for msg in ws:
                                     if _route_frame_verbose:
@@ -4200,45 +4261,13 @@ class BootstrapService:
                                                 )
                                         except Exception:
                                             pass
-                                    if isinstance(msg, (bytes, bytearray)):
-                                        raw = bytes(msg)
-                                        if len(raw) > MAX_CHUNK_RAW:
-                                            cid = f"c_{uuid.uuid4().hex}"
-                                            total = (len(raw) + MAX_CHUNK_RAW - 1) // MAX_CHUNK_RAW
-                                            for idx in range(total):
-                                                chunk = raw[idx * MAX_CHUNK_RAW : (idx + 1) * MAX_CHUNK_RAW]
-                                                await _route_reply(
-                                                    key,
-                                                    {
-                                                        "t": "chunk",
-                                                        "id": cid,
-                                                        "kind": "bin",
-                                                        "idx": idx,
-                                                        "total": total,
-                                                        "data_b64": base64.b64encode(chunk).decode("ascii"),
-                                                    },
-                                                )
-                                        else:
-                                            await _route_reply(
-                                                key,
-                                                {
-                                                    "t": "frame",
-                                                    "kind": "bin",
-                                                    "data_b64": base64.b64encode(raw).decode("ascii"),
-                                                },
-                                            )
-                                    else:
-                                        text = str(msg)
-                                        if len(text) > MAX_CHUNK_RAW:
-                                            cid = f"c_{uuid.uuid4().hex}"
-                                            parts = [text[i : i + MAX_CHUNK_RAW] for i in range(0, len(text), MAX_CHUNK_RAW)]
-                                            for idx, part in enumerate(parts):
-                                                await _route_reply(
-                                                    key,
-                                                    {"t": "chunk", "id": cid, "kind": "text", "idx": idx, "total": len(parts), "data": part},
-                                                )
-                                        else:
-                                            await _route_reply(key, {"t": "frame", "kind": "text", "data": text})
+                                    frame = bytes(msg) if isinstance(msg, (bytes, bytearray)) else str(msg)
+                                    if session is not None:
+                                        # Waits for credit only; batching/publish happen in the session.
+                                        await session.send(frame)
+                                        continue
+                                    for envelope in json_frame_envelopes(frame, max_chunk=MAX_CHUNK_RAW):
+                                        await _route_reply(key, envelope)
                             except Exception as e:
                                 if _route_trace:
                                     try:
@@ -4265,6 +4294,13 @@ class BootstrapService:
                                     except Exception:
                                         pass
                                 _route_observe_flow("control", "upstream_closed")
+                                if session is not None:
+                                    # Let queued binary data go out before the JSON close.
+                                    try:
+                                        await session.drain(timeout=max(0.1, float(_route_send_timeout_s)))
+                                    except Exception:
+                                        pass
+                                    session.close()
                                 try:
                                     await _route_reply(key, {"t": "close"})
                                 except Exception:
@@ -4297,10 +4333,9 @@ class BootstrapService:
                             try:
                                 items = pending_tunnel_events.get(key)
                                 if items is None:
-                                    items = []
+                                    # Bounded: the oldest event is dropped once the limit is reached.
+                                    items = deque(maxlen=MAX_PENDING_TUNNEL_EVENTS)
                                     pending_tunnel_events[key] = items
-                                if len(items) >= MAX_PENDING_TUNNEL_EVENTS:
-                                    items.pop(0)
                                 items.append(dict(payload))
                             except Exception:
                                 pass
@@ -4488,6 +4523,38 @@ class BootstrapService:
                                     raw = bytes(getattr(msg, "data", b"") or b"")
                                 except Exception:
                                     raw = b""
+                                if is_binary_tunnel_message(raw):
+                                    route_t = "bin"
+                                    rec = tunnels.get(key)
+                                    ws = rec.get("ws") if isinstance(rec, dict) else None
+                                    session = rec.get("session") if isinstance(rec, dict) else None
+                                    if not ws or session is None:
+                                        route_outcome = "bin_no_session"
+                                        _route_observe_flow("frame", "bin_no_session", payload_bytes=len(raw), error="no_session")
+                                        return
+                                    try:
+                                        frames = session.receive(raw)
+                                    except ValueError as e:
+                                        route_outcome = "drop_invalid_bin"
+                                        _route_observe_flow("frame", "bin_decode_fail", payload_bytes=len(raw), error=str(e))
+                                        return
+                                    try:
+                                        for frame in frames:
+                                            await asyncio.wait_for(
+                                                ws.send(frame),
+                                                timeout=max(0.1, float(_route_upstream_ws_send_timeout_s)),
+                                            )
+                                        route_outcome = "bin_sent"
+                                        _route_observe_flow(
+                                            "frame",
+                                            "bin_upstream_sent",
+                                            direction="to_upstream",
+                                            payload_bytes=len(raw),
+                                        )
+                                    except Exception as e:
+                                        route_outcome = f"bin_send_fail:{type(e).__name__}"
+                                        _route_observe_flow("frame", "bin_send_fail", payload_bytes=len(raw), error=str(e))
+                                    return
                                 try:
                                     data = _json.loads(raw.decode("utf-8"))
                                 except Exception as e:
@@ -4756,9 +4823,28 @@ class BootstrapService:
                                         await _route_reply(key, {"t": "close", "err": str(e)})
                                         return
                                     route_outcome = "open_connected"
-                                    tunnels[key] = {"ws": ws, "url": url}
+                                    session = None
+                                    codec = negotiate_tunnel_codec((data or {}).get("codecs"))
+                                    if codec == TUNNEL_CODEC_BINARY:
+                                        try:
+                                            peer_window = int((data or {}).get("window") or 0) or None
+                                        except Exception:
+                                            peer_window = None
+                                        session = TunnelSession(
+                                            lambda blob, _key=key: _route_publish_binary(_key, blob),
+                                            peer_window_bytes=peer_window,
+                                        )
+                                    tunnels[key] = {"ws": ws, "url": url, "session": session}
                                     _clear_pending_tunnel_state(key, drop_events=False)
-                                    tunnel_tasks[key] = asyncio.create_task(_tunnel_reader(key, ws), name=f"hub-route-{key}")
+                                    if session is not None:
+                                        # Confirm the codec before the reader can emit binary data.
+                                        await _route_reply(
+                                            key,
+                                            {"t": "open_ack", "codec": codec, "window": session.window_bytes},
+                                        )
+                                    tunnel_tasks[key] = asyncio.create_task(
+                                        _tunnel_reader(key, ws, session), name=f"hub-route-{key}"
+                                    )
                                     pending = pending_tunnel_events.pop(key, None) or []
                                     for pending_payload in pending:
                                         try:
@@ -4786,6 +4872,11 @@ class BootstrapService:
                                     rec = tunnels.pop(key, None)
                                     task = tunnel_tasks.pop(key, None)
                                     _clear_pending_tunnel_state(key, drop_events=True)
+                                    try:
+                                        if rec and rec.get("session"):
+                                            rec["session"].close()
+                                    except Exception:
+                                        pass
                                     try:
                                         if task:
                                             task.cancel()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Any, Dict, List
-import yaml
+import copy
+
+from adaos.services.config_cache import config_cache
 
 
 def load_capacity_from_node_yaml(base_dir: Path | None = None) -> Dict[str, Any]:
@@ -31,10 +33,15 @@ def load_capacity_from_node_yaml(base_dir: Path | None = None) -> Dict[str, Any]
 
     node_path = Path(base_dir) / "node.yaml"
     try:
-        data = yaml.safe_load(node_path.read_text(encoding="utf-8")) if node_path.exists() else {}
+        snapshot = config_cache().derive(node_path, "capacity", _capacity_from_data)
     except Exception:
-        data = {}
+        snapshot = None
+    if snapshot is None:
+        snapshot = _capacity_from_data({})
+    return copy.deepcopy(snapshot)
+
 
+def _capacity_from_data(data: Any) -> Dict[str, Any]:
     # Read capacity section: io + skills
     io_list: list[dict[str, Any]] = []
     skills_list: list[dict[str, Any]] = []
@@ -117,10 +124,8 @@ def _resolve_base_dir(base_dir: Path | None = None) -> Path:
 def _load_node_yaml(base_dir: Path | None = None) -> Dict[str, Any]:
     base = _resolve_base_dir(base_dir)
     path = Path(base) / "node.yaml"
-    if not path.exists():
-        return {}
     try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        return config_cache().load_yaml(path) or {}
     except Exception:
         return {}
 
@@ -128,8 +133,7 @@ def _load_node_yaml(base_dir: Path | None = None) -> Dict[str, Any]:
 def _save_node_yaml(data: Dict[str, Any], base_dir: Path | None = None) -> None:
     base = _resolve_base_dir(base_dir)
     path = Path(base) / "node.yaml"
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    config_cache().write_yaml(path, data)
 
 
 def install_skill_in_capacity(name: str, version: str, *, active: bool = True, dev: bool = False, base_dir: Path | None = None) -> None:
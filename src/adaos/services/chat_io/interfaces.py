@@ -20,11 +20,12 @@ class ChatInputEvent:
 # ---- Output (hubs -> root -> platform) ----
 @dataclass(slots=True)
 class ChatOutputMessage:
-    type: str  # "text|voice|photo"
+    type: str  # "text|voice|photo|document"
     text: Optional[str] = None
     audio_path: Optional[str] = None
     image_path: Optional[str] = None
     keyboard: Optional[Dict[str, Any]] = None
+    document_path: Optional[str] = None
 
 
 @dataclass(slots=True)
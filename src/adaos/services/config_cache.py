@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+"""
+Stat-validated cache for YAML config files (``node.yaml`` and friends).
+
+Status, routing and reliability paths read node.yaml many times per second;
+parsing it every time dominated those calls. Entries are keyed by absolute
+path and validated against ``(mtime_ns, size, inode)``, so a steady-state read
+costs one ``stat()`` and no YAML parsing. Files modified within the last
+``_RACY_S`` seconds are additionally compared byte-for-byte (timestamps are
+coarse on many filesystems, the "racy git" problem), still without parsing.
+
+Values derived from a file (``NodeConfig``, capacity snapshot) are cached per
+file version through :meth:`ConfigCache.derive`. Writes go through
+:meth:`ConfigCache.write_yaml` (temp file + ``os.replace``) and update the
+cache in place.
+
+Components can :meth:`ConfigCache.subscribe` to a path instead of re-reading
+it; callbacks fire on in-process writes and on external edits, detected by
+inotify (Linux, ``ADAOS_CONFIG_INOTIFY=1``, which also lets reads skip the
+``stat()`` until an event arrives) or by a polling thread otherwise.
+
+Environment:
+  - ``ADAOS_CONFIG_INOTIFY``  trust inotify events instead of stat-ing on every read (default off)
+  - ``ADAOS_CONFIG_POLL_S``   polling interval for subscriptions without inotify (default 2)
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import os
+import stat
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+Stamp = Tuple[int, int, int]
+
+_RACY_S = 2.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _env_flag(name: str) -> bool:
+    return (os.getenv(name) or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _stamp(path: str) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@dataclass
+class _Entry:
+    stamp: Optional[Stamp]
+    raw: bytes
+    data: Any
+    racy: bool
+    trusted: bool = False
+    error: Optional[Exception] = None
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+class _Inotify:
+    """Minimal ctypes inotify reader watching parent directories."""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    _MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, on_event: Callable[[Optional[str]], None]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._on_event = on_event
+        self._dirs: Dict[int, str] = {}
+        self._watched: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="adaos-config-inotify", daemon=True).start()
+
+    def watch_dir(self, directory: str) -> bool:
+        with self._lock:
+            if directory in self._watched:
+                return True
+            wd = self._add(self._fd, os.fsencode(directory), self._MASK)
+            if wd < 0:
+                return False
+            self._watched[directory] = wd
+            self._dirs[wd] = directory
+            return True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except OSError:
+                return
+            pos = 0
+            while pos + self._HEADER.size <= len(buf):
+                wd, mask, _cookie, length = self._HEADER.unpack_from(buf, pos)
+                name = buf[pos + self._HEADER.size : pos + self._HEADER.size + length].rstrip(b"\0")
+                pos += self._HEADER.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    self._on_event(None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is not None and name:
+                    self._on_event(os.path.join(directory, os.fsdecode(name)))
+
+
+class ConfigCache:
+    def __init__(self, *, use_inotify: Optional[bool] = None, poll_interval: Optional[float] = None) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        self._subs: Dict[str, List[Callable[[Path], None]]] = {}
+        self._seen: Dict[str, Optional[Stamp]] = {}
+        self.poll_interval = poll_interval if poll_interval is not None else _env_float("ADAOS_CONFIG_POLL_S", 2.0)
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify if use_inotify is not None else _env_flag("ADAOS_CONFIG_INOTIFY"):
+            try:
+                self._inotify = _Inotify(self._on_fs_event)
+            except Exception:
+                self._inotify = None
+        self._poller: Optional[threading.Thread] = None
+        self._events = 0
+        self.stats: Dict[str, int] = {"hits": 0, "parses": 0, "stat_checks": 0, "derive_hits": 0, "derive_misses": 0, "writes": 0, "invalidations": 0, "notifications": 0}
+
+    @staticmethod
+    def _key(path: str | Path) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    # --- reads --------------------------------------------------------------
+    def _entry(self, key: str) -> Optional[_Entry]:
+        """Return a valid entry for ``key`` (``None`` if the file is missing)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.trusted and not entry.racy:
+                self.stats["hits"] += 1
+                return entry
+        # An event between stat() and storing the entry must not be lost.
+        generation = self._events
+        trusted = self._inotify is not None and self._inotify.watch_dir(os.path.dirname(key))
+        stamp = _stamp(key)
+        with self._lock:
+            self.stats["stat_checks"] += 1
+            entry = self._entries.get(key)
+            if stamp is None:
+                if key in self._entries:
+                    self._entries.pop(key, None)
+                    self.stats["invalidations"] += 1
+                self._changed(key, None)
+                return None
+            trusted = trusted and generation == self._events
+            if entry is not None and entry.stamp == stamp and not entry.racy:
+                entry.trusted = trusted
+                self.stats["hits"] += 1
+                return entry
+        try:
+            raw = Path(key).read_bytes()
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            racy = time.time_ns() - stamp[0] < _RACY_S * 1e9
+            trusted = trusted and generation == self._events
+            if entry is not None and entry.raw == raw:
+                entry.stamp, entry.racy, entry.trusted = stamp, racy, trusted
+                self.stats["hits"] += 1
+                return entry
+        error: Optional[Exception] = None
+        try:
+            data = yaml.safe_load(raw.decode("utf-8"))
+        except Exception as exc:
+            data, error = None, exc
+        with self._lock:
+            trusted = trusted and generation == self._events
+            self.stats["parses"] += 1
+            if key in self._entries:
+                self.stats["invalidations"] += 1
+            entry = self._entries[key] = _Entry(stamp=stamp, raw=raw, data=data, racy=racy, trusted=trusted, error=error)
+            self._changed(key, stamp)
+            return entry
+
+    def load_yaml(self, path: str | Path, default: Any = None) -> Any:
+        """Parsed content of ``path`` (a private copy the caller may mutate)."""
+        entry = self._entry(self._key(path))
+        if entry is None or entry.data is None:
+            return copy.deepcopy(default)
+        return copy.deepcopy(entry.data)
+
+    def derive(self, path: str | Path, name: str, builder: Callable[[Any], Any], default: Any = None) -> Any:
+        """
+        Cached ``builder(data)`` for the current version of ``path``.
+
+        ``builder`` receives a private copy of the parsed content and runs once per
+        file version; the shared result is returned as is, so callers must copy
+        it before mutating. A missing file yields ``default``; a file that is not
+        valid YAML raises the parser error.
+        """
+        key = self._key(path)
+        entry = self._entry(key)
+        if entry is None:
+            return default
+        if entry.error is not None:
+            raise entry.error
+        with self._lock:
+            if name in entry.derived:
+                self.stats["derive_hits"] += 1
+                return entry.derived[name]
+        value = builder(copy.deepcopy(entry.data))
+        with self._lock:
+            self.stats["derive_misses"] += 1
+            if self._entries.get(key) is entry:
+                entry.derived[name] = value
+        return value
+
+    # --- writes -------------------------------------------------------------
+    def write_yaml(self, path: str | Path, data: Any) -> None:
+        key = self._key(path)
+        text = yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
+        raw = text.encode("utf-8")
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        tmp = f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(raw)
+        try:
+            # Keep the permissions of the file being replaced (e.g. 0600 configs).
+            os.chmod(tmp, stat.S_IMODE(os.stat(key).st_mode))
+        except OSError:
+            pass  # new file: keep the default mode
+        os.replace(tmp, key)
+        stamp = _stamp(key)
+        with self._lock:
+            self.stats["writes"] += 1
+            self._entries[key] = _Entry(stamp=stamp, raw=raw, data=copy.deepcopy(data), racy=True)
+            self._changed(key, stamp)
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self.stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(self._key(path), None) is not None:
+                self.stats["invalidations"] += 1
+
+    # --- change notification -------------------------------------------------
+    def subscribe(self, path: str | Path, callback: Callable[[Path], None]) -> Callable[[], None]:
+        """Call ``callback(path)`` whenever ``path`` changes; returns an unsubscribe function."""
+        key = self._key(path)
+        with self._lock:
+            self._subs.setdefault(key, []).append(callback)
+            self._seen.setdefault(key, _stamp(key))
+        if self._inotify is None or not self._inotify.watch_dir(os.path.dirname(key)):
+            self._ensure_poller()
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                subs = self._subs.get(key) or []
+                if callback in subs:
+                    subs.remove(callback)
+                if not subs:
+                    self._subs.pop(key, None)
+                    self._seen.pop(key, None)
+
+        return _unsubscribe
+
+    def _changed(self, key: str, stamp: Optional[Stamp]) -> None:
+        # Called with the lock held; callbacks run on a helper thread so that
+        # they may read the cache themselves.
+        if key not in self._subs or self._seen.get(key) == stamp:
+            return
+        self._seen[key] = stamp
+        callbacks = list(self._subs.get(key) or [])
+        self.stats["notifications"] += len(callbacks)
+        threading.Thread(target=self._notify, args=(key, callbacks), name="adaos-config-notify", daemon=True).start()
+
+    @staticmethod
+    def _notify(key: str, callbacks: List[Callable[[Path], None]]) -> None:
+        for cb in callbacks:
+            try:
+                cb(Path(key))
+            except Exception:
+                pass
+
+    def _on_fs_event(self, path: Optional[str]) -> None:
+        with self._lock:
+            self._events += 1
+            if path is None:
+                targets = list(self._entries.values())
+            else:
+                entry = self._entries.get(path)
+                targets = [entry] if entry is not None else []
+            for entry in targets:
+                entry.trusted = False
+            watched = list(self._subs) if path is None else ([path] if path in self._subs else [])
+        for key in watched:
+            stamp = _stamp(key)
+            with self._lock:
+                self._changed(key, stamp)
+
+    def _ensure_poller(self) -> None:
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._poller = threading.Thread(target=self._poll_loop, name="adaos-config-poll", daemon=True)
+            self._poller.start()
+
+    def _poll_loop(self) -> None:
+        while True:
+            time.sleep(max(0.05, self.poll_interval))
+            with self._lock:
+                keys = list(self._subs)
+            if not keys:
+                return
+            for key in keys:
+                stamp = _stamp(key)
+                with self._lock:
+                    self._changed(key, stamp)
+
+    # --- metrics ------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "inotify" if self._inotify is not None else "stat",
+                "entries": len(self._entries),
+                "subscriptions": sum(len(v) for v in self._subs.values()),
+                **self.stats,
+            }
+
+
+_CACHE: Optional[ConfigCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def config_cache() -> ConfigCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ConfigCache()
+    return _CACHE
+
+
+def config_cache_snapshot() -> Dict[str, Any]:
+    return config_cache().snapshot()
+
+
+__all__ = ["ConfigCache", "config_cache", "config_cache_snapshot"]
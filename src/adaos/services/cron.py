@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+"""
+Minimal five-field cron expressions for the scheduler.
+
+Supported syntax per field (``minute hour day-of-month month day-of-week``):
+``*``, ``N``, ``A-B``, ``*/S``, ``A-B/S``, ``N/S`` and comma separated lists.
+Day of week is ``0-7`` (both 0 and 7 are Sunday); when both day fields are
+restricted a day matches if either does (classic Vixie cron semantics).
+The ``@yearly``, ``@monthly``, ``@weekly``, ``@daily`` and ``@hourly`` macros
+are accepted. Times are evaluated in the node's local time zone.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_RANGES: Tuple[Tuple[int, int], ...] = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Upper bound for the search in next_after(); a valid expression always
+# matches within a few years (Feb 29 needs up to 8).
+_MAX_YEARS = 9
+
+
+class CronError(ValueError):
+    """Raised for malformed cron expressions."""
+
+
+def _parse_field(raw: str, lo: int, hi: int) -> FrozenSet[int]:
+    values: set[int] = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            raise CronError(f"empty cron field element in {raw!r}")
+        step = 1
+        if "/" in part:
+            part, step_raw = part.split("/", 1)
+            try:
+                step = int(step_raw)
+            except ValueError:
+                raise CronError(f"invalid cron step {step_raw!r}") from None
+            if step <= 0:
+                raise CronError(f"invalid cron step {step_raw!r}")
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            try:
+                start, end = int(a), int(b)
+            except ValueError:
+                raise CronError(f"invalid cron range {part!r}") from None
+        else:
+            try:
+                start = int(part)
+            except ValueError:
+                raise CronError(f"invalid cron value {part!r}") from None
+            end = hi if step > 1 else start
+        if start < lo or end > hi or start > end:
+            raise CronError(f"cron value {part!r} out of range {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSpec:
+    expr: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]  # 0 = Monday ... 6 = Sunday (datetime.weekday())
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expr: str) -> "CronSpec":
+        text = " ".join(str(expr or "").split())
+        fields = _MACROS.get(text.lower(), text).split(" ")
+        if len(fields) != 5:
+            raise CronError(f"cron expression needs 5 fields, got {expr!r}")
+        minutes, hours, days, months, dows = (_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _RANGES))
+        # cron: 0/7 = Sunday, 1 = Monday; datetime: 0 = Monday, 6 = Sunday
+        weekdays = frozenset((d - 1) % 7 for d in dows)
+        return cls(
+            expr=text,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=weekdays,
+            # A day field that covers its whole range ("*", "*/1", "1-31", "0-7")
+            # does not restrict; only then the other day field decides alone.
+            any_day=days == frozenset(range(_RANGES[2][0], _RANGES[2][1] + 1)),
+            any_weekday=len(weekdays) == 7,
+        )
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = dt.weekday() in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return dow
+        if self.any_weekday:
+            return dom
+        return dom or dow
+
+    def next_after(self, ts: float) -> float:
+        """First matching minute strictly after ``ts`` (epoch seconds, local time)."""
+        dt = datetime.fromtimestamp(ts).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt.year + _MAX_YEARS
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt.timestamp()
+        raise CronError(f"cron expression {self.expr!r} never matches")
+
+
+__all__ = ["CronError", "CronSpec"]
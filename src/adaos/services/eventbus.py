@@ -68,7 +68,7 @@ class LocalEventBus(EventBus):
     """
     Локальная неблокирующая шина событий для одного процесса.
       - subscribe(prefix, handler)
-      - publish(event)
+      - publish(event) / publish_many(events)
 
     Особенности:
       * prefix = "" или "*" — подписка на все события.
@@ -118,7 +118,16 @@ class LocalEventBus(EventBus):
     def publish(self, event: Event) -> None:
         with self._lock:
             pairs = [(p, hs[:]) for p, hs in self._subs.items()]
+        self._dispatch(event, pairs)
 
+    def publish_many(self, events: List[Event]) -> None:
+        """Publish events in order, taking the subscription snapshot once for the batch."""
+        with self._lock:
+            pairs = [(p, hs[:]) for p, hs in self._subs.items()]
+        for event in events:
+            self._dispatch(event, pairs)
+
+    def _dispatch(self, event: Event, pairs: List[tuple[str, List[Handler]]]) -> None:
         if _log.isEnabledFor(logging.DEBUG):
             total_handlers = sum(
                 len(hs) for p, hs in pairs if p == "" or p == "*" or event.type.startswith(p)
@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+"""
+Long-lived Rasa parse worker used by the interpreter subprocess fallback.
+
+The worker is a plain Python child process that imports Rasa and loads the
+interpreter model once, then answers JSON-line requests on stdin/stdout:
+
+  - ``{"id": 1, "op": "ping"}``                                  health check
+  - ``{"id": 2, "op": "parse", "model_path": "...", "texts": [...]}``  batch parse
+  - ``{"id": 3, "op": "shutdown"}``                              graceful exit
+
+The model archive is re-stat'ed before each parse and reloaded when its path or
+mtime changes, so retraining ``interpreter_latest.tar.gz`` is picked up without
+restarting the worker. The helper script does not import AdaOS, which keeps it
+usable from interpreters that cannot load the main package.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_log = logging.getLogger("adaos.interpreter.worker")
+
+
+WORKER_SCRIPT = r"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Rasa and TensorFlow print to stdout; keep the protocol channel clean.
+_proto = sys.stdout
+sys.stdout = sys.stderr
+
+_state = {"model_path": None, "mtime": None, "interpreter": None, "agent": None, "loads": 0, "parses": 0}
+_loop = asyncio.new_event_loop()
+
+
+def _load(model_path, mtime):
+    try:
+        from rasa.nlu.model import Interpreter  # type: ignore[import]
+
+        _state["interpreter"] = Interpreter.load(model_path)
+        _state["agent"] = None
+    except Exception:
+        from rasa.core.agent import Agent  # type: ignore[import]
+
+        _state["agent"] = Agent.load(model_path)
+        _state["interpreter"] = None
+    _state["model_path"] = model_path
+    _state["mtime"] = mtime
+    _state["loads"] += 1
+
+
+def _ensure(model_path):
+    mtime = os.stat(model_path).st_mtime
+    if _state["model_path"] != model_path or _state["mtime"] != mtime:
+        _load(model_path, mtime)
+
+
+def _parse_one(text):
+    if _state["interpreter"] is not None:
+        return _state["interpreter"].parse(text)
+    return _loop.run_until_complete(_state["agent"].parse_message(text))
+
+
+def _health():
+    return {
+        "pid": os.getpid(),
+        "model_path": _state["model_path"],
+        "model_mtime": _state["mtime"],
+        "loads": _state["loads"],
+        "parses": _state["parses"],
+    }
+
+
+def _handle(req):
+    op = req.get("op")
+    if op == "ping":
+        return {"ok": True, "health": _health()}
+    if op == "parse":
+        _ensure(req["model_path"])
+        results = []
+        for text in req.get("texts") or []:
+            try:
+                results.append({"ok": True, "result": _parse_one(text)})
+            except Exception as exc:
+                results.append({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+            _state["parses"] += 1
+        return {"ok": True, "results": results, "health": _health()}
+    return {"ok": False, "error": f"unknown op: {op!r}"}
+
+
+for line in sys.stdin:
+    line = line.strip()
+    if not line:
+        continue
+    try:
+        req = json.loads(line)
+    except Exception as exc:
+        _proto.write(json.dumps({"ok": False, "error": f"bad request: {exc}"}) + "\n")
+        _proto.flush()
+        continue
+    if req.get("op") == "shutdown":
+        break
+    try:
+        resp = _handle(req)
+    except Exception as exc:
+        resp = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    resp["id"] = req.get("id")
+    _proto.write(json.dumps(resp, ensure_ascii=False, default=str) + "\n")
+    _proto.flush()
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+class ParseWorkerError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True)
+class _Pending:
+    texts: List[str]
+    done: bool = False
+    results: Optional[List[Dict[str, Any]]] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass(slots=True)
+class _WorkerStats:
+    started_total: int = 0
+    restarts_total: int = 0
+    requests_total: int = 0
+    batches_total: int = 0
+    texts_total: int = 0
+    max_batch: int = 0
+    timeouts_total: int = 0
+    last_latency_ms: Optional[float] = None
+    stderr_tail: deque = field(default_factory=lambda: deque(maxlen=20))
+
+
+class RasaParseWorker:
+    """
+    Client side of a warm parse worker process.
+
+    Thread-safe: callers running in executor threads queue their texts and
+    whichever thread owns the pipe sends everything queued so far as a single
+    batch, so concurrent utterances share one round-trip.
+    """
+
+    def __init__(self, python: str | Path | None = None, *, timeout_s: float | None = None) -> None:
+        self.python = str(python or sys.executable)
+        self.timeout_s = timeout_s if timeout_s is not None else _env_float("ADAOS_INTERPRETER_WORKER_TIMEOUT_S", 120.0)
+        self._proc: subprocess.Popen | None = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._io_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: List[_Pending] = []
+        self._next_id = 0
+        self._health: Dict[str, Any] = {}
+        self._stats = _WorkerStats()
+
+    # ------------------------------------------------------------ process mgmt
+    def _alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self) -> None:
+        if self._stats.started_total:
+            self._stats.restarts_total += 1
+        self._stats.started_total += 1
+        self._responses = queue.Queue()
+        proc = subprocess.Popen(
+            [self.python, "-u", "-c", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self._proc = proc
+        responses = self._responses
+        threading.Thread(target=self._pump_stdout, args=(proc, responses), name="rasa-worker-out", daemon=True).start()
+        threading.Thread(target=self._pump_stderr, args=(proc,), name="rasa-worker-err", daemon=True).start()
+        _log.info("interpreter parse worker started pid=%s python=%s", proc.pid, self.python)
+
+    @staticmethod
+    def _pump_stdout(proc: subprocess.Popen, responses: "queue.Queue[Optional[str]]") -> None:
+        try:
+            for line in proc.stdout:  # type: ignore[union-attr]
+                responses.put(line)
+        except Exception:
+            pass
+        responses.put(None)
+
+    def _pump_stderr(self, proc: subprocess.Popen) -> None:
+        try:
+            for line in proc.stderr:  # type: ignore[union-attr]
+                line = line.rstrip()
+                if line:
+                    self._stats.stderr_tail.append(line)
+                    _log.debug("parse worker: %s", line)
+        except Exception:
+            pass
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            _log.debug("failed to kill parse worker pid=%s", getattr(proc, "pid", None), exc_info=True)
+
+    def close(self) -> None:
+        with self._io_lock:
+            proc, self._proc = self._proc, None
+            if proc is None:
+                return
+            try:
+                if proc.poll() is None:
+                    proc.stdin.write(json.dumps({"op": "shutdown"}) + "\n")  # type: ignore[union-attr]
+                    proc.stdin.flush()  # type: ignore[union-attr]
+                    proc.wait(timeout=5)
+            except Exception:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+
+    # ---------------------------------------------------------------- protocol
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and wait for its reply. Caller must hold ``_io_lock``."""
+        if not self._alive():
+            self._start()
+        self._next_id += 1
+        req_id = self._next_id
+        payload = dict(payload, id=req_id)
+        self._stats.requests_total += 1
+        started = time.perf_counter()
+        try:
+            self._proc.stdin.write(json.dumps(payload, ensure_ascii=False) + "\n")  # type: ignore[union-attr]
+            self._proc.stdin.flush()  # type: ignore[union-attr]
+        except Exception as exc:
+            self._kill()
+            raise ParseWorkerError(f"parse worker pipe closed: {exc}") from exc
+
+        deadline = time.monotonic() + self.timeout_s
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats.timeouts_total += 1
+                self._kill()
+                raise ParseWorkerError(f"parse worker did not answer within {self.timeout_s:.0f}s")
+            try:
+                line = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                self._kill()
+                tail = " | ".join(list(self._stats.stderr_tail)[-5:])
+                raise ParseWorkerError(f"parse worker exited; stderr={tail[:400]}")
+            try:
+                resp = json.loads(line)
+            except Exception:
+                continue
+            if resp.get("id") != req_id:
+                continue
+            self._stats.last_latency_ms = round((time.perf_counter() - started) * 1000.0, 3)
+            if isinstance(resp.get("health"), dict):
+                self._health = resp["health"]
+            if not resp.get("ok"):
+                raise ParseWorkerError(str(resp.get("error") or "parse worker request failed"))
+            return resp
+
+    def ping(self) -> Dict[str, Any]:
+        with self._io_lock:
+            return dict(self._request({"op": "ping"}).get("health") or {})
+
+    def parse_many(self, model_path: str | Path, texts: List[str]) -> List[Dict[str, Any]]:
+        """Parse ``texts`` with the model at ``model_path``; results keep input order."""
+        if not texts:
+            return []
+        slot = _Pending(texts=list(texts))
+        with self._pending_lock:
+            self._pending.append(slot)
+        with self._io_lock:
+            if not slot.done:
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                self._run_batch(str(model_path), batch)
+        if slot.error is not None:
+            raise slot.error
+        out: List[Dict[str, Any]] = []
+        for item in slot.results or []:
+            if not item.get("ok"):
+                raise ParseWorkerError(str(item.get("error") or "parse failed"))
+            out.append(item.get("result"))
+        return out
+
+    def parse(self, model_path: str | Path, text: str) -> Dict[str, Any]:
+        return self.parse_many(model_path, [text])[0]
+
+    def _run_batch(self, model_path: str, batch: List[_Pending]) -> None:
+        texts = [text for slot in batch for text in slot.texts]
+        self._stats.batches_total += 1
+        self._stats.texts_total += len(texts)
+        self._stats.max_batch = max(self._stats.max_batch, len(texts))
+        try:
+            results = list(self._request({"op": "parse", "model_path": model_path, "texts": texts}).get("results") or [])
+            if len(results) != len(texts):
+                raise ParseWorkerError(f"parse worker returned {len(results)} results for {len(texts)} texts")
+        except BaseException as exc:
+            for slot in batch:
+                slot.error = exc
+                slot.done = True
+            return
+        offset = 0
+        for slot in batch:
+            slot.results = results[offset : offset + len(slot.texts)]
+            offset += len(slot.texts)
+            slot.done = True
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self._stats
+        return {
+            "python": self.python,
+            "alive": self._alive(),
+            "pid": self._proc.pid if self._proc is not None else None,
+            "started_total": stats.started_total,
+            "restarts_total": stats.restarts_total,
+            "requests_total": stats.requests_total,
+            "batches_total": stats.batches_total,
+            "texts_total": stats.texts_total,
+            "max_batch": stats.max_batch,
+            "timeouts_total": stats.timeouts_total,
+            "last_latency_ms": stats.last_latency_ms,
+            "health": dict(self._health),
+        }
+
+
+_WORKERS: Dict[str, RasaParseWorker] = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def get_parse_worker(python: str | Path | None = None) -> RasaParseWorker:
+    """Return the process-wide worker for ``python`` (defaults to ``sys.executable``)."""
+    key = str(python or sys.executable)
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get(key)
+        if worker is None:
+            worker = RasaParseWorker(key)
+            _WORKERS[key] = worker
+        return worker
+
+
+def shutdown_parse_workers() -> None:
+    with _WORKERS_LOCK:
+        workers = list(_WORKERS.values())
+        _WORKERS.clear()
+    for worker in workers:
+        try:
+            worker.close()
+        except Exception:
+            _log.debug("parse worker shutdown failed", exc_info=True)
+
+
+def parse_workers_snapshot() -> Dict[str, Any]:
+    with _WORKERS_LOCK:
+        return {key: worker.snapshot() for key, worker in _WORKERS.items()}
+
+
+atexit.register(shutdown_parse_workers)
@@ -10,18 +10,35 @@ in-process loading is not possible.
 """
 
 import asyncio
-import json
 import logging
-import subprocess
-import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from adaos.services.interpreter.parse_worker import get_parse_worker
 from adaos.services.interpreter.workspace import InterpreterWorkspace
 
 
 _log = logging.getLogger("adaos.interpreter.runtime")
 
+# Runtimes are created per request (see router_runtime), so loaded models and
+# the agent event loop live at module level keyed by (model path, mtime).
+_MODEL_CACHE: Dict[str, Tuple[float, Any | None, Any | None]] = {}
+_MODEL_LOCK = threading.Lock()
+_AGENT_LOOP: asyncio.AbstractEventLoop | None = None
+_AGENT_LOOP_LOCK = threading.Lock()
+
+
+def _agent_loop() -> asyncio.AbstractEventLoop:
+    """Background loop for ``Agent.parse_message`` instead of ``asyncio.run`` per call."""
+    global _AGENT_LOOP
+    with _AGENT_LOOP_LOCK:
+        if _AGENT_LOOP is None or _AGENT_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="rasa-agent-loop", daemon=True).start()
+            _AGENT_LOOP = loop
+        return _AGENT_LOOP
+
 
 class RasaNLURuntime:
     """
@@ -78,102 +95,55 @@ class RasaNLURuntime:
         execution via `_parse_via_subprocess`.
         """
         model_path = self._pick_model_path()
-        if self._loaded_model_path == model_path and (self._interpreter or self._agent):
-            return
-
-        # Try legacy NLU Interpreter API first (Rasa 2.x style)
-        try:
-            from rasa.nlu.model import Interpreter  # type: ignore[import]
-
-            self._interpreter = Interpreter.load(str(model_path))
-            self._agent = None
-            self._loaded_model_path = model_path
-            _log.info("Rasa Interpreter model loaded from %s", model_path)
-            return
-        except Exception as exc:
-            _log.debug("Failed to load Rasa Interpreter model: %s", exc, exc_info=True)
-
-        # Fallback to Agent-based API (Rasa 3.x)
-        try:
-            from rasa.core.agent import Agent  # type: ignore[import]
-
-            self._agent = Agent.load(str(model_path))
-            self._interpreter = None
-            self._loaded_model_path = model_path
-            _log.info("Rasa Agent model loaded from %s", model_path)
-            return
-        except Exception as exc:
-            _log.error("Failed to load Rasa model from %s: %s", model_path, exc, exc_info=True)
-            raise RuntimeError(f"Failed to load Rasa model from {model_path}: {exc}") from exc
+        key = str(model_path)
+        mtime = model_path.stat().st_mtime
+        with _MODEL_LOCK:
+            cached = _MODEL_CACHE.get(key)
+            if cached is not None and cached[0] == mtime:
+                _, interpreter, agent = cached
+                if interpreter is None and agent is None:
+                    raise RuntimeError(f"Rasa model {model_path} cannot be loaded in-process")
+                self._interpreter, self._agent, self._loaded_model_path = interpreter, agent, model_path
+                return
+
+            # Try legacy NLU Interpreter API first (Rasa 2.x style)
+            try:
+                from rasa.nlu.model import Interpreter  # type: ignore[import]
+
+                self._interpreter = Interpreter.load(key)
+                self._agent = None
+                self._loaded_model_path = model_path
+                _MODEL_CACHE[key] = (mtime, self._interpreter, None)
+                _log.info("Rasa Interpreter model loaded from %s", model_path)
+                return
+            except Exception as exc:
+                _log.debug("Failed to load Rasa Interpreter model: %s", exc, exc_info=True)
+
+            # Fallback to Agent-based API (Rasa 3.x)
+            try:
+                from rasa.core.agent import Agent  # type: ignore[import]
+
+                self._agent = Agent.load(key)
+                self._interpreter = None
+                self._loaded_model_path = model_path
+                _MODEL_CACHE[key] = (mtime, None, self._agent)
+                _log.info("Rasa Agent model loaded from %s", model_path)
+                return
+            except Exception as exc:
+                # Remember the failure for this archive version so later calls
+                # go straight to the warm worker instead of retrying the import.
+                _MODEL_CACHE[key] = (mtime, None, None)
+                _log.error("Failed to load Rasa model from %s: %s", model_path, exc, exc_info=True)
+                raise RuntimeError(f"Failed to load Rasa model from {model_path}: {exc}") from exc
 
     def _parse_via_subprocess(self, text: str) -> Dict[str, Any]:
         """
-        Fallback path: run parsing inside the interpreter venv via a short
-        helper script. Kept for environments where importing Rasa into the
-        main process is not possible (e.g. Python version mismatch).
+        Fallback path: parse inside a warm worker process (see
+        ``parse_worker``). Kept for environments where importing Rasa into the
+        main process is not possible (e.g. Python version mismatch). The worker
+        loads the model once and reloads it when the archive changes.
         """
-        model_path = self._pick_model_path()
-        python = sys.executable
-
-        helper_code = r"""
-import asyncio
-import json
-import sys
-
-def _parse_with_legacy_interpreter(model_path: str, text: str):
-    from rasa.nlu.model import Interpreter  # type: ignore[import]
-    interpreter = Interpreter.load(model_path)
-    return interpreter.parse(text)
-
-async def _parse_with_agent_async(model_path: str, text: str):
-    from rasa.core.agent import Agent  # type: ignore[import]
-    agent = Agent.load(model_path)
-    # Agent.parse_message is async in modern Rasa versions.
-    result = await agent.parse_message(text)
-    return result
-
-def _parse(model_path: str, text: str):
-    # Try legacy NLU Interpreter API first (Rasa 2.x style).
-    try:
-        return _parse_with_legacy_interpreter(model_path, text)
-    except Exception:
-        # Fallback to Agent-based API (Rasa 3.x).
-        return asyncio.run(_parse_with_agent_async(model_path, text))
-
-if len(sys.argv) < 3:
-    raise SystemExit("Usage: helper.py <model_path> <text>")
-
-model_path = sys.argv[1]
-text = sys.argv[2]
-
-result = _parse(model_path, text)
-print(json.dumps(result, ensure_ascii=False))
-"""
-
-        proc = subprocess.run(
-            [str(python), "-c", helper_code, str(model_path), text],
-            check=True,
-            capture_output=True,
-        )
-        stdout_bytes = proc.stdout or b""
-        stderr_bytes = proc.stderr or b""
-
-        output = stdout_bytes.decode("utf-8", errors="ignore").strip()
-        if not output:
-            err_snippet = stderr_bytes.decode("utf-8", errors="ignore").strip()
-            raise RuntimeError(f"Interpreter returned empty output; stderr={err_snippet[:400]}")
-
-        json_line: str | None = None
-        for line in reversed(output.splitlines()):
-            candidate = line.strip()
-            if candidate.startswith("{") or candidate.startswith("["):
-                json_line = candidate
-                break
-
-        if not json_line:
-            raise RuntimeError(f"Interpreter output did not contain JSON payload: {output[:400]}")
-
-        return json.loads(json_line)
+        return get_parse_worker().parse(self._pick_model_path(), text)
 
     # --------------------------------------------------------------------- API
     def parse(self, text: str) -> Dict[str, Any]:
@@ -191,11 +161,13 @@ print(json.dumps(result, ensure_ascii=False))
             if self._interpreter is not None:
                 result = self._interpreter.parse(text)
             elif self._agent is not None:
-                # Agent.parse_message is async in modern Rasa versions.
-                async def _run_agent() -> Dict[str, Any]:
-                    return await self._agent.parse_message(text)  # type: ignore[no-untyped-call]
-
-                result = asyncio.run(_run_agent())
+                # Agent.parse_message is async in modern Rasa versions; run it
+                # on the shared background loop rather than a fresh one.
+                future = asyncio.run_coroutine_threadsafe(
+                    self._agent.parse_message(text),  # type: ignore[no-untyped-call]
+                    _agent_loop(),
+                )
+                result = future.result()
             else:  # pragma: no cover - defensive guard
                 raise RuntimeError("Rasa model is not loaded")
         except Exception as exc:
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import asyncio
 import time
 from typing import Dict
 
@@ -10,11 +11,21 @@ class TokenBucket:
         self.tokens = float(capacity)
         self.updated = time.monotonic()
 
-    def allow(self, cost: float = 1.0) -> bool:
+    def _refill(self) -> None:
         now = time.monotonic()
         elapsed = now - self.updated
         self.updated = now
         self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until ``cost`` tokens are available (0 if they are now)."""
+        self._refill()
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def allow(self, cost: float = 1.0) -> bool:
+        self._refill()
         if self.tokens >= cost:
             self.tokens -= cost
             return True
@@ -33,3 +44,68 @@ class PerChatLimiter:
             b = self._buckets[chat_id] = TokenBucket(self.rate, self.capacity)
         return b.allow(cost)
 
+
+class AdaptiveRateLimiter:
+    """
+    Async limiter that enforces a global and a per-key token bucket at once.
+
+    ``acquire`` waits (instead of dropping) until both buckets have a token.
+    ``throttled`` is called when the remote side answered 429: the key (or
+    everything, for ``key=None``) is blocked for ``retry_after`` seconds and the
+    global rate is halved; ``succeeded`` restores it additively (AIMD).
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate: float = 30.0,
+        global_capacity: int = 30,
+        key_rate: float = 1.0,
+        key_capacity: int = 3,
+        min_global_rate: float = 1.0,
+    ) -> None:
+        self.base_rate = global_rate
+        self.min_rate = min(min_global_rate, global_rate)
+        self.key_rate = key_rate
+        self.key_capacity = key_capacity
+        self._global = TokenBucket(global_rate, global_capacity)
+        self._keys: Dict[str, TokenBucket] = {}
+        self._blocked: Dict[str, float] = {}
+        self._global_blocked = 0.0
+
+    @property
+    def global_rate(self) -> float:
+        return self._global.rate
+
+    def _bucket(self, key: str) -> TokenBucket:
+        b = self._keys.get(key)
+        if b is None:
+            b = self._keys[key] = TokenBucket(self.key_rate, self.key_capacity)
+        return b
+
+    async def acquire(self, key: str) -> None:
+        key = str(key)
+        while True:
+            # No await between the checks and the take: atomic within the event loop.
+            now = time.monotonic()
+            wait = max(self._blocked.get(key, 0.0), self._global_blocked) - now
+            if wait <= 0:
+                bucket = self._bucket(key)
+                wait = max(self._global.wait_time(), bucket.wait_time())
+                if wait <= 0:
+                    self._global.allow()
+                    bucket.allow()
+                    return
+            await asyncio.sleep(wait)
+
+    def throttled(self, key: str | None, retry_after: float) -> None:
+        until = time.monotonic() + max(0.0, float(retry_after))
+        if key is None:
+            self._global_blocked = max(self._global_blocked, until)
+        else:
+            self._blocked[str(key)] = max(self._blocked.get(str(key), 0.0), until)
+        self._global.rate = max(self.min_rate, self._global.rate / 2.0)
+
+    def succeeded(self) -> None:
+        if self._global.rate < self.base_rate:
+            self._global.rate = min(self.base_rate, self._global.rate + self.base_rate / 30.0)
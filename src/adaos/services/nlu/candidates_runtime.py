@@ -11,6 +11,7 @@ from adaos.sdk.core.decorators import subscribe
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
 from adaos.services.nlu.teacher_events import append_event, make_event
+from adaos.services.nlu.teacher_state import open_teacher
 from adaos.services.nlu.ycoerce import coerce_dict, iter_mappings
 from adaos.services.yjs.doc import async_get_ydoc
 from adaos.services.yjs.webspace import default_webspace_id
@@ -236,20 +237,7 @@ async def _on_candidate_apply(evt: Any) -> None:
             if kind not in {"skill", "scenario"}:
                 return
 
-            # mark applied
-            next_candidates: list[dict[str, Any]] = []
-            for item in iter_mappings(teacher.get("candidates")):
-                d = dict(item)
-                if d.get("id") == candidate_id:
-                    d["status"] = "applied"
-                    d["applied_at"] = time.time()
-                    d["applied"] = {"type": "plan"}
-                next_candidates.append(d)
-            teacher["candidates"] = next_candidates
-
-            # add to plan
-            plan = teacher.get("plan")
-            plan = [dict(x) for x in iter_mappings(plan)]
+            # mark applied and add to plan
             plan_item = {
                 "id": f"plan.{int(time.time() * 1000)}",
                 "ts": time.time(),
@@ -261,11 +249,13 @@ async def _on_candidate_apply(evt: Any) -> None:
                 "candidate": coerce_dict(candidate.get("candidate")),
                 "notes": candidate.get("notes"),
             }
-            plan.append(plan_item)
-            teacher["plan"] = plan[-200:]
-
-            with ydoc.begin_transaction() as txn:
-                data_map.set(txn, "nlu_teacher", teacher)
+            async with open_teacher(webspace_id, ydoc=ydoc) as state:
+                state.patch(
+                    "candidates",
+                    candidate_id,
+                    {"status": "applied", "applied_at": time.time(), "applied": {"type": "plan"}},
+                )
+                state.append("plan", plan_item)
     except Exception:
         _log.warning("failed to apply candidate webspace=%s candidate_id=%s", webspace_id, candidate_id, exc_info=True)
         return
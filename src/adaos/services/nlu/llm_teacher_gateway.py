@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+_log = logging.getLogger("adaos.nlu.teacher.llm")
+
+_WS_RE = re.compile(r"\s+")
+_EDGE_PUNCT = " \t\r\n.,!?;:…\"'«»()"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def normalize_utterance(text: str) -> str:
+    """Case/whitespace/edge-punctuation insensitive form used for dedupe keys."""
+    s = _WS_RE.sub(" ", str(text or "")).strip(_EDGE_PUNCT)
+    return s.casefold()
+
+
+def context_fingerprint(context: Any, *, model: str = "") -> str:
+    raw = json.dumps(context, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(f"{model}\x00{raw}".encode("utf-8")).hexdigest()[:24]
+
+
+def teacher_key(text: str, fingerprint: str) -> str:
+    return hashlib.sha256(f"{normalize_utterance(text)}\x00{fingerprint}".encode("utf-8")).hexdigest()[:32]
+
+
+class TeacherResponseCache:
+    """
+    Persistent map teacher_key -> raw LLM suggestion (JSON text).
+
+    Small JSON file under the state dir; LRU-bounded, entries expire after ``ttl_s``.
+    """
+
+    def __init__(self, path: Optional[Path], *, max_entries: int = 512, ttl_s: float = 7 * 86400.0) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = path is None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+        except FileNotFoundError:
+            return
+        except Exception:
+            _log.debug("llm teacher cache unreadable path=%s", self.path, exc_info=True)
+            return
+        entries = data.get("entries") if isinstance(data, dict) else None
+        if isinstance(entries, dict):
+            for key, item in entries.items():
+                if isinstance(item, dict) and isinstance(item.get("raw"), str):
+                    self._entries[str(key)] = item
+
+    def get(self, key: str) -> Optional[str]:
+        self._load()
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if self.ttl_s > 0 and time.time() - float(item.get("ts") or 0.0) > self.ttl_s:
+            self._entries.pop(key, None)
+            return None
+        # LRU: move to the end.
+        self._entries[key] = self._entries.pop(key)
+        return item["raw"]
+
+    def put(self, key: str, raw: str) -> None:
+        self._load()
+        self._entries.pop(key, None)
+        self._entries[key] = {"ts": time.time(), "raw": raw}
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps({"v": 1, "entries": dict(self._entries)}, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:
+            _log.debug("failed to persist llm teacher cache path=%s", self.path, exc_info=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loaded = True
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._entries)
+
+
+@dataclass
+class _Pending:
+    key: str
+    fingerprint: str
+    request: Dict[str, Any]
+    webspace_id: str
+    context: Dict[str, Any]
+    future: "asyncio.Future[str]"
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# (messages, request_id) -> root response payload
+LlmCall = Callable[[List[Dict[str, str]], str], Awaitable[Any]]
+
+
+class TeacherGateway:
+    """
+    Front door for teacher LLM calls.
+
+    - identical utterances under the same context fingerprint share one call (single-flight);
+    - answered keys are served from :class:`TeacherResponseCache`;
+    - at most ``concurrency`` calls are in flight; whatever queues up behind them is sent
+      as one multi-utterance prompt (up to ``batch_max`` items sharing a fingerprint).
+      A batch answer that cannot be matched back falls back to per-utterance calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        call: LlmCall,
+        build_single: Callable[..., List[Dict[str, str]]],
+        build_batch: Callable[..., List[Dict[str, str]]],
+        extract_text: Callable[[Any], str],
+        cache: Optional[TeacherResponseCache] = None,
+        concurrency: Optional[int] = None,
+        batch_max: Optional[int] = None,
+    ) -> None:
+        self._call = call
+        self._build_single = build_single
+        self._build_batch = build_batch
+        self._extract_text = extract_text
+        self.cache = cache if cache is not None else TeacherResponseCache(None)
+        self.concurrency = max(1, concurrency if concurrency is not None else _env_int("ADAOS_NLU_LLM_CONCURRENCY", 2))
+        self.batch_max = max(1, batch_max if batch_max is not None else _env_int("ADAOS_NLU_LLM_BATCH_MAX", 8))
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
+        self._queue: List[_Pending] = []
+        self._active = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._saving: Optional[asyncio.Task] = None
+        self._save_again = False
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "llm_calls": 0,
+            "batch_calls": 0,
+            "batched_items": 0,
+            "batch_fallbacks": 0,
+            "errors": 0,
+        }
+
+    async def suggest(
+        self,
+        *,
+        request: Dict[str, Any],
+        webspace_id: str,
+        context: Dict[str, Any],
+        fingerprint: str,
+    ) -> Tuple[str, str]:
+        """Return ``(raw_text, source)``; source is ``cache``, ``shared`` or ``llm``."""
+        self.stats["requests"] += 1
+        text = request.get("text") if isinstance(request.get("text"), str) else ""
+        key = teacher_key(text, fingerprint)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached, "cache"
+        shared = self._inflight.get(key)
+        if shared is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(shared), "shared"
+
+        loop = asyncio.get_running_loop()
+        fut: "asyncio.Future[str]" = loop.create_future()
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda f, key=key: self._forget(key, f))
+        self._queue.append(_Pending(key, fingerprint, dict(request), webspace_id, context, fut))
+        self._ensure_dispatcher()
+        self._wakeup.set()  # type: ignore[union-attr]
+        return await asyncio.shield(fut), "llm"
+
+    def _forget(self, key: str, fut: "asyncio.Future[str]") -> None:
+        if self._inflight.get(key) is fut:
+            self._inflight.pop(key, None)
+        if not fut.cancelled():
+            fut.exception()  # mark retrieved; waiters get it via shield
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "active_calls": self._active,
+            "inflight_keys": len(self._inflight),
+            "cache_entries": len(self.cache),
+            "stats": dict(self.stats),
+        }
+
+    # ------------------------------------------------------------ dispatcher
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch_loop(), name="adaos-nlu-teacher-llm")
+
+    async def _dispatch_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=30.0)
+                except asyncio.TimeoutError:
+                    if not self._queue:
+                        return
+                continue
+            if self._active >= self.concurrency:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            head = self._queue[0]
+            group = [p for p in self._queue if p.fingerprint == head.fingerprint][: self.batch_max]
+            taken = {id(p) for p in group}
+            self._queue = [p for p in self._queue if id(p) not in taken]
+            self._active += 1
+            task = asyncio.create_task(self._run_group(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._group_done)
+
+    def _group_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._active -= 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run_group(self, group: List[_Pending]) -> None:
+        try:
+            if len(group) == 1:
+                await self._run_single(group[0])
+                return
+            try:
+                results = await self._run_batch(group)
+            except Exception as exc:
+                _log.warning("llm teacher batch call failed (%d items): %s", len(group), exc)
+                results = None
+            if results is None:
+                self.stats["batch_fallbacks"] += 1
+                await asyncio.gather(*(self._run_single(p) for p in group))
+                return
+            for item, raw in zip(group, results):
+                self._resolve(item, raw)
+        finally:
+            for item in group:
+                if not item.future.done():
+                    item.future.set_exception(RuntimeError("llm teacher call aborted"))
+
+    async def _run_single(self, item: _Pending) -> None:
+        messages = self._build_single(request=item.request, webspace_id=item.webspace_id, context=item.context)
+        request_id = str(item.request.get("request_id") or item.key)
+        self.stats["llm_calls"] += 1
+        try:
+            res = await self._call(messages, request_id)
+        except Exception as exc:
+            self.stats["errors"] += 1
+            if not item.future.done():
+                item.future.set_exception(exc)
+            return
+        self._resolve(item, self._extract_text(res))
+
+    async def _run_batch(self, group: List[_Pending]) -> Optional[List[str]]:
+        head = group[0]
+        messages = self._build_batch(
+            requests=[p.request for p in group], webspace_id=head.webspace_id, context=head.context
+        )
+        ids = sorted(str(p.request.get("request_id") or p.key) for p in group)
+        request_id = "batch." + hashlib.sha256("\x00".join(ids).encode("utf-8")).hexdigest()[:24]
+        self.stats["llm_calls"] += 1
+        self.stats["batch_calls"] += 1
+        res = await self._call(messages, request_id)
+        results = parse_batch_results(self._extract_text(res), len(group))
+        if results is not None:
+            self.stats["batched_items"] += len(group)
+        return results
+
+    def _resolve(self, item: _Pending, raw: str) -> None:
+        if raw:
+            self.cache.put(item.key, raw)
+            self._schedule_save()
+        if not item.future.done():
+            item.future.set_result(raw)
+
+    def _schedule_save(self) -> None:
+        if self._saving is not None and not self._saving.done():
+            self._save_again = True
+            return
+
+        async def _save() -> None:
+            while True:
+                self._save_again = False
+                await asyncio.to_thread(self.cache.save)
+                if not self._save_again:
+                    return
+
+        self._saving = asyncio.create_task(_save())
+
+    async def flush(self) -> None:
+        """Wait for queued calls and the pending cache write (tests, shutdown)."""
+        while self._queue or self._tasks:
+            await asyncio.sleep(0.005)
+        if self._saving is not None:
+            await asyncio.gather(self._saving, return_exceptions=True)
+
+
+def parse_batch_results(raw_text: str, expected: int) -> Optional[List[str]]:
+    """
+    Split a batch answer (``{"results": [...]}`` or a bare list) into per-utterance JSON texts.
+    Items may carry ``index``; otherwise order is used. Returns None when it cannot be matched.
+    """
+    try:
+        data = json.loads(raw_text)
+    except Exception:
+        return None
+    items = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    out: List[Optional[str]] = [None] * expected
+    for pos, item in enumerate(items):
+        if not isinstance(item, dict):
+            return None
+        idx = item.get("index", pos)
+        if not isinstance(idx, int) or not 0 <= idx < expected or out[idx] is not None:
+            return None
+        suggestion = {k: v for k, v in item.items() if k != "index"}
+        out[idx] = json.dumps(suggestion, ensure_ascii=False)
+    return [x for x in out if x is not None]
+
+
+def default_cache_path() -> Optional[Path]:
+    try:
+        from adaos.services.agent_context import get_ctx
+
+        return Path(get_ctx().paths.state_dir()) / "nlu" / "llm_teacher_cache.json"
+    except Exception:
+        return None
+
+
+def default_response_cache() -> TeacherResponseCache:
+    path = default_cache_path() if _env_int("ADAOS_NLU_LLM_CACHE", 1) else None
+    return TeacherResponseCache(
+        path,
+        max_entries=_env_int("ADAOS_NLU_LLM_CACHE_MAX", 512),
+        ttl_s=_env_float("ADAOS_NLU_LLM_CACHE_TTL_S", 7 * 86400.0),
+    )
+
+
+__all__ = [
+    "TeacherGateway",
+    "TeacherResponseCache",
+    "context_fingerprint",
+    "default_response_cache",
+    "normalize_utterance",
+    "parse_batch_results",
+    "teacher_key",
+]
@@ -15,6 +15,7 @@ from adaos.sdk.core.decorators import subscribe
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
 from adaos.services.nlu.teacher_events import append_event, make_event
+from adaos.services.nlu.teacher_state import append_record, open_teacher, patch_record
 from adaos.services.reliability import (
     ReadinessStatus,
     observe_hub_root_integration_outbox,
@@ -25,6 +26,7 @@ from adaos.services.root.client import RootHttpClient
 from adaos.services.yjs.doc import async_get_ydoc
 from adaos.services.yjs.webspace import default_webspace_id
 
+from .llm_teacher_gateway import TeacherGateway, context_fingerprint, default_response_cache
 from .ycoerce import coerce_dict, is_iterable_like, iter_mappings, iter_scalars
 
 _log = logging.getLogger("adaos.nlu.teacher.llm")
@@ -34,6 +36,11 @@ _LLM_TEACHER_ENABLED = os.getenv("ADAOS_NLU_LLM_TEACHER") == "1"
 _MODEL = os.getenv("ADAOS_NLU_LLM_MODEL") or os.getenv("OPENAI_RESPONSES_MODEL") or "gpt-4o-mini"
 _MAX_TOKENS = int(os.getenv("ADAOS_NLU_LLM_MAX_TOKENS", "500") or "500")
 _TIMEOUT_S = float(os.getenv("ADAOS_NLU_LLM_TIMEOUT_S", "20") or "20")
+_CONTEXT_TTL_S = float(os.getenv("ADAOS_NLU_LLM_CONTEXT_TTL_S", "300") or "300")
+
+# webspace_id -> {"key", "built_at", "context", "skill_policies", "fingerprint"}
+_CONTEXT_MEMO: dict[str, dict[str, Any]] = {}
+_GATEWAY: Optional[TeacherGateway] = None
 
 
 def _payload(evt: Any) -> Dict[str, Any]:
@@ -53,10 +60,6 @@ def _resolve_webspace_id(payload: Mapping[str, Any]) -> str:
     return default_webspace_id()
 
 
-def _teacher_obj(data_map: Any) -> dict[str, Any]:
-    return coerce_dict(data_map.get("nlu_teacher"))
-
-
 def _ydoc_to_snapshot(ydoc: Any) -> dict[str, Any]:
     def _normalize(node: Any):
         if isinstance(node, dict):
@@ -495,38 +498,41 @@ def _redact_messages(messages: list[dict[str, str]]) -> list[dict[str, Any]]:
     return out
 
 
+_SYSTEM_PROMPT = (
+    "You are AdaOS NLU teacher. Decide what to do with a user utterance.\n"
+    "You must return ONLY valid JSON (no markdown).\n\n"
+    "Output schema:\n"
+    "{\n"
+    '  \"decision\": \"revise_nlu\" | \"propose_regex_rule\" | \"create_skill_candidate\" | \"create_scenario_candidate\" | \"ignore\",\n'
+    '  \"intent\": string|null,\n'
+    '  \"regex_rule\": {\"intent\": string, \"pattern\": string} | null,\n'
+    '  \"target\": {\"type\": \"skill\"|\"scenario\", \"id\": string} | null,\n'
+    '  \"examples\": string[],\n'
+    '  \"slots\": object,  // e.g. {\"city\": {\"type\": \"string\"}}\n'
+    '  \"confidence\": number, // 0..1\n'
+    '  \"notes\": string,\n'
+    '  \"candidate\": object|null\n'
+    "}\n\n"
+    "Rules:\n"
+    "- If the utterance is not actionable for AdaOS, decision=ignore.\n"
+    "- Prefer existing intents from context (scenario_nlu.intents keys) over inventing new ones.\n"
+    "- Use provided context (scenario_nlu, intent_routes, system_actions, host_actions, skills_manifest, builtin_regex, regex_rules, catalog, skill_nlu) to reuse existing intents.\n"
+    "- If it matches a known app/widget/scenario, prefer revise_nlu with an existing intent name.\n"
+    "- If an existing intent is the right match but regex stage likely misses it, prefer propose_regex_rule.\n"
+    "- propose_regex_rule.pattern MUST be a Python regex with named capture groups for slots (e.g. (?P<city>...)).\n"
+    "- Avoid proposing duplicate regex rules if builtin_regex or regex_rules already cover the utterance.\n"
+    "- If user asks about weather/temperature but doesn't say the exact keyword, propose a regex rule for intent desktop.open_weather.\n"
+    "- Regex rules should be reasonably general (avoid overfitting to a single verb like \"покажи\"); capture city via (?P<city>...).\n"
+    "- When proposing a regex rule, also set target to where the rule should be stored:\n"
+    "  - Prefer the skill that handles the intent (see context.intent_routes) over the scenario.\n"
+    "  - For intents that trigger system actions (callHost targets from context.system_actions), target should usually be the scenario.\n"
+    "- If it suggests a new capability, propose create_skill_candidate or create_scenario_candidate.\n"
+    "- Keep intent names short and namespaced (e.g. desktop.open_weather, smalltalk.how_are_you).\n"
+)
+
+
 def _build_prompt(*, request: dict[str, Any], webspace_id: str, context: dict[str, Any]) -> list[dict[str, str]]:
-    system = (
-        "You are AdaOS NLU teacher. Decide what to do with a user utterance.\n"
-        "You must return ONLY valid JSON (no markdown).\n\n"
-        "Output schema:\n"
-        "{\n"
-        '  \"decision\": \"revise_nlu\" | \"propose_regex_rule\" | \"create_skill_candidate\" | \"create_scenario_candidate\" | \"ignore\",\n'
-        '  \"intent\": string|null,\n'
-        '  \"regex_rule\": {\"intent\": string, \"pattern\": string} | null,\n'
-        '  \"target\": {\"type\": \"skill\"|\"scenario\", \"id\": string} | null,\n'
-        '  \"examples\": string[],\n'
-        '  \"slots\": object,  // e.g. {\"city\": {\"type\": \"string\"}}\n'
-        '  \"confidence\": number, // 0..1\n'
-        '  \"notes\": string,\n'
-        '  \"candidate\": object|null\n'
-        "}\n\n"
-        "Rules:\n"
-        "- If the utterance is not actionable for AdaOS, decision=ignore.\n"
-        "- Prefer existing intents from context (scenario_nlu.intents keys) over inventing new ones.\n"
-        "- Use provided context (scenario_nlu, intent_routes, system_actions, host_actions, skills_manifest, builtin_regex, regex_rules, catalog, skill_nlu) to reuse existing intents.\n"
-        "- If it matches a known app/widget/scenario, prefer revise_nlu with an existing intent name.\n"
-        "- If an existing intent is the right match but regex stage likely misses it, prefer propose_regex_rule.\n"
-        "- propose_regex_rule.pattern MUST be a Python regex with named capture groups for slots (e.g. (?P<city>...)).\n"
-        "- Avoid proposing duplicate regex rules if builtin_regex or regex_rules already cover the utterance.\n"
-        "- If user asks about weather/temperature but doesn't say the exact keyword, propose a regex rule for intent desktop.open_weather.\n"
-        "- Regex rules should be reasonably general (avoid overfitting to a single verb like \"покажи\"); capture city via (?P<city>...).\n"
-        "- When proposing a regex rule, also set target to where the rule should be stored:\n"
-        "  - Prefer the skill that handles the intent (see context.intent_routes) over the scenario.\n"
-        "  - For intents that trigger system actions (callHost targets from context.system_actions), target should usually be the scenario.\n"
-        "- If it suggests a new capability, propose create_skill_candidate or create_scenario_candidate.\n"
-        "- Keep intent names short and namespaced (e.g. desktop.open_weather, smalltalk.how_are_you).\n"
-    )
+    system = _SYSTEM_PROMPT
     utterance = request.get("text") if isinstance(request.get("text"), str) else ""
     user = {
         "webspace_id": webspace_id,
@@ -542,6 +548,34 @@ def _build_prompt(*, request: dict[str, Any], webspace_id: str, context: dict[st
     return [{"role": "system", "content": system}, {"role": "user", "content": json.dumps(user, ensure_ascii=False)}]
 
 
+def _build_batch_prompt(
+    *, requests: list[dict[str, Any]], webspace_id: str, context: dict[str, Any]
+) -> list[dict[str, str]]:
+    """Several utterances sharing one context, answered in a single round trip."""
+    system = (
+        _SYSTEM_PROMPT
+        + "\nBatch mode: the input has several utterances in `requests`. Decide for each one independently.\n"
+        + 'Return ONLY {"results": [ ... ]} with one output-schema object per request, in the same order, '
+        + 'each with an extra "index" field equal to the request index.\n'
+    )
+    user = {
+        "webspace_id": webspace_id,
+        "requests": [
+            {
+                "index": idx,
+                "id": req.get("id"),
+                "request_id": req.get("request_id"),
+                "text": req.get("text") if isinstance(req.get("text"), str) else "",
+                "reason": req.get("reason"),
+                "via": req.get("via"),
+            }
+            for idx, req in enumerate(requests)
+        ],
+        "context": context,
+    }
+    return [{"role": "system", "content": system}, {"role": "user", "content": json.dumps(user, ensure_ascii=False)}]
+
+
 async def _llm_call(messages: list[dict[str, str]], *, request_id: str | None = None) -> dict[str, Any]:
     ctx = get_ctx()
     http = RootHttpClient.from_settings(ctx.settings)
@@ -620,33 +654,148 @@ async def _llm_call(messages: list[dict[str, str]], *, request_id: str | None =
     return result
 
 
+def _file_stamp(path: Path) -> list[Any]:
+    try:
+        st = path.stat()
+        return [str(path), st.st_mtime_ns, st.st_size]
+    except Exception:
+        return [str(path), None, None]
+
+
+def _context_key(snapshot: dict[str, Any]) -> str:
+    """
+    Cheap identity of everything the teacher context is derived from: the relevant part of the
+    webspace snapshot plus mtimes of the scenario/skill files it reads.
+    """
+    ui = coerce_dict(snapshot.get("ui"))
+    data = coerce_dict(snapshot.get("data"))
+    scenario_id = ui.get("current_scenario") if isinstance(ui.get("current_scenario"), str) else None
+    catalog = coerce_dict(data.get("catalog"))
+    view = {
+        "current_scenario": scenario_id,
+        "catalog": catalog,
+        "installed": data.get("installed"),
+        "nlu": data.get("nlu"),
+    }
+    stamps: list[Any] = []
+    try:
+        if scenario_id:
+            stamps.append(_file_stamp(scenarios_loader.scenario_root(scenario_id) / "scenario.json"))
+        skills = _infer_skills_from_catalog(
+            apps=list(iter_mappings(catalog.get("apps"))), widgets=list(iter_mappings(catalog.get("widgets")))
+        )
+        skills_dir = Path(get_ctx().paths.skills_dir())
+        repo_skills = _find_repo_root() / ".adaos" / "workspace" / "skills"
+        for skill in skills:
+            stamps.append(_file_stamp(skills_dir / skill / "skill.yaml"))
+            stamps.append(_file_stamp(repo_skills / skill / "interpreter" / "intents.yml"))
+            stamps.append(_file_stamp(repo_skills / skill / "interpreter" / "nlu.yml"))
+    except Exception:
+        stamps.append(time.time())  # unknown state: never reuse
+    return context_fingerprint({"view": view, "files": stamps})
+
+
+def _compute_teacher_context(snapshot: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    context = _extract_webspace_context(snapshot)
+    context["scenario_nlu"] = _extract_scenario_nlu(scenario_id=context.get("current_scenario"))
+    try:
+        routes, skill_policies, skill_manifests = _build_intent_routes_and_policies(
+            scenario_nlu=context.get("scenario_nlu") if isinstance(context.get("scenario_nlu"), Mapping) else {},
+            skills=context.get("skills") if isinstance(context.get("skills"), list) else [],
+        )
+    except Exception:
+        routes, skill_policies, skill_manifests = ([], {}, [])
+    context["intent_routes"] = routes
+    # System actions are "callHost" targets exposed by the current scenario intents.
+    context["system_actions"] = sorted(
+        {str(r.get("target")) for r in routes if r.get("action") == "callHost" and isinstance(r.get("target"), str)}
+    )[:150]
+    context["skills_manifest"] = skill_manifests
+    try:
+        from adaos.services.nlu.system_actions_catalog import describe_system_actions
+
+        context["host_actions"] = describe_system_actions()
+    except Exception:
+        context["host_actions"] = []
+    try:
+        from adaos.services.nlu.pipeline import describe_builtin_regex_rules  # local import to avoid cycles
+
+        context["builtin_regex"] = describe_builtin_regex_rules()
+    except Exception:
+        context["builtin_regex"] = []
+    return context, skill_policies
+
+
+async def _build_teacher_context(webspace_id: str) -> tuple[dict[str, Any], dict[str, Any], str]:
+    """
+    Return ``(context, skill_policies, fingerprint)`` for the webspace.
+
+    The disk-heavy part (scenario NLU, skill manifests and interpreter files) is memoized per
+    webspace and rebuilt when the snapshot view or any of those files change, on
+    scenario/skill lifecycle events, or after ``ADAOS_NLU_LLM_CONTEXT_TTL_S``.
+    Callers must treat the returned dicts as read-only.
+    """
+    try:
+        async with async_get_ydoc(webspace_id) as ydoc:
+            snapshot = _ydoc_to_snapshot(ydoc)
+    except Exception:
+        snapshot = {}
+    if not isinstance(snapshot, dict):
+        snapshot = {}
+    key = _context_key(snapshot)
+    memo = _CONTEXT_MEMO.get(webspace_id)
+    now = time.monotonic()
+    if memo and memo.get("key") == key and now - float(memo.get("built_at") or 0.0) < _CONTEXT_TTL_S:
+        return memo["context"], memo["skill_policies"], memo["fingerprint"]
+    context, skill_policies = await asyncio.to_thread(_compute_teacher_context, snapshot)
+    fingerprint = context_fingerprint(context, model=_MODEL)
+    _CONTEXT_MEMO[webspace_id] = {
+        "key": key,
+        "built_at": now,
+        "context": context,
+        "skill_policies": skill_policies,
+        "fingerprint": fingerprint,
+    }
+    return context, skill_policies, fingerprint
+
+
+def invalidate_teacher_context(webspace_id: str | None = None) -> None:
+    if webspace_id is None:
+        _CONTEXT_MEMO.clear()
+    else:
+        _CONTEXT_MEMO.pop(webspace_id, None)
+
+
+def get_teacher_gateway() -> TeacherGateway:
+    global _GATEWAY
+    if _GATEWAY is None:
+        _GATEWAY = TeacherGateway(
+            # Late-bound so the root client (and tests) can be swapped at runtime.
+            call=lambda messages, request_id: _llm_call(messages, request_id=request_id),
+            build_single=lambda **kw: _build_prompt(**kw),
+            build_batch=lambda **kw: _build_batch_prompt(**kw),
+            extract_text=lambda res: _extract_first_output_text(res),
+            cache=default_response_cache(),
+        )
+    return _GATEWAY
+
+
+@subscribe("scenarios.synced")
+@subscribe("scenario.installed")
+@subscribe("skills.activated")
+@subscribe("skills.rolledback")
+@subscribe("skills.updated")
+async def _on_teacher_context_changed(evt: Any) -> None:
+    # Skills are shared across webspaces, so drop every memoized context.
+    invalidate_teacher_context()
+
+
 async def _append_llm_log(webspace_id: str, entry: dict[str, Any]) -> None:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _teacher_obj(data_map)
-        logs = list(iter_mappings(teacher.get("llm_logs")))
-        logs.append(entry)
-        teacher["llm_logs"] = logs[-300:]
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
+    await append_record(webspace_id, "llm_logs", entry)
 
 
 async def _patch_llm_log(webspace_id: str, *, log_id: str, patch: dict[str, Any]) -> None:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _teacher_obj(data_map)
-        logs = list(iter_mappings(teacher.get("llm_logs")))
-        next_logs: list[dict[str, Any]] = []
-        for item in logs:
-            if item.get("id") == log_id:
-                updated = dict(item)
-                updated.update(patch)
-                next_logs.append(updated)
-            else:
-                next_logs.append(item)
-        teacher["llm_logs"] = next_logs[-300:]
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
+    await patch_record(webspace_id, "llm_logs", log_id, patch)
 
 
 async def _update_revision_by_request_id(
@@ -655,34 +804,17 @@ async def _update_revision_by_request_id(
     request_id: str,
     patch: dict[str, Any],
 ) -> Optional[dict[str, Any]]:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _teacher_obj(data_map)
-        revisions = list(iter_mappings(teacher.get("revisions")))
-        updated: Optional[dict[str, Any]] = None
-        cleaned: list[dict[str, Any]] = []
-        for item in revisions:
-            if item.get("request_id") == request_id and item.get("status") in {"pending", "proposed"}:
-                updated = dict(item)
-                updated.update(patch)
-                cleaned.append(updated)
-            else:
-                cleaned.append(item)
-        teacher["revisions"] = cleaned
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
-        return updated
+    async with open_teacher(webspace_id) as teacher:
+        return teacher.patch_request(
+            "revisions",
+            request_id,
+            patch,
+            where=lambda item: item.get("status") in {"pending", "proposed"},
+        )
 
 
 async def _append_candidate(webspace_id: str, candidate: dict[str, Any]) -> None:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _teacher_obj(data_map)
-        candidates = list(iter_mappings(teacher.get("candidates")))
-        candidates.append(candidate)
-        teacher["candidates"] = candidates[-200:]
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
+    await append_record(webspace_id, "candidates", candidate)
 
 
 @subscribe("nlp.teacher.request")
@@ -716,39 +848,9 @@ async def _on_teacher_request(evt: Any) -> None:
         text = text.strip()
         request_id = request_id.strip()
 
-        # Build lightweight context snapshot for LLM.
-        try:
-            async with async_get_ydoc(webspace_id) as ydoc:
-                snapshot = _ydoc_to_snapshot(ydoc)
-        except Exception:
-            snapshot = {}
-        context = _extract_webspace_context(snapshot if isinstance(snapshot, dict) else {})
-        context["scenario_nlu"] = _extract_scenario_nlu(scenario_id=context.get("current_scenario"))
-        try:
-            routes, skill_policies, skill_manifests = _build_intent_routes_and_policies(
-                scenario_nlu=context.get("scenario_nlu") if isinstance(context.get("scenario_nlu"), Mapping) else {},
-                skills=context.get("skills") if isinstance(context.get("skills"), list) else [],
-            )
-        except Exception:
-            routes, skill_policies, skill_manifests = ([], {}, [])
-        context["intent_routes"] = routes
-        # System actions are "callHost" targets exposed by the current scenario intents.
-        context["system_actions"] = sorted(
-            {str(r.get("target")) for r in routes if r.get("action") == "callHost" and isinstance(r.get("target"), str)}
-        )[:150]
-        context["skills_manifest"] = skill_manifests
-        try:
-            from adaos.services.nlu.system_actions_catalog import describe_system_actions
-
-            context["host_actions"] = describe_system_actions()
-        except Exception:
-            context["host_actions"] = []
-        try:
-            from adaos.services.nlu.pipeline import describe_builtin_regex_rules  # local import to avoid cycles
-
-            context["builtin_regex"] = describe_builtin_regex_rules()
-        except Exception:
-            context["builtin_regex"] = []
+        # Lightweight context snapshot for LLM (memoized, see _build_teacher_context).
+        context, skill_policies, fingerprint = await _build_teacher_context(webspace_id)
+        routes = context.get("intent_routes") if isinstance(context.get("intent_routes"), list) else []
 
         messages = _build_prompt(request=dict(req), webspace_id=webspace_id, context=context)
 
@@ -799,7 +901,12 @@ async def _on_teacher_request(evt: Any) -> None:
             _log.debug("failed to append teacher event (llm.request) webspace=%s", webspace_id, exc_info=True)
 
         try:
-            res = await _llm_call(messages, request_id=request_id or log_id)
+            raw_text, source = await get_teacher_gateway().suggest(
+                request={**dict(req), "text": text, "request_id": request_id or log_id},
+                webspace_id=webspace_id,
+                context=context,
+                fingerprint=fingerprint,
+            )
         except Exception as exc:
             _log.warning("llm teacher call failed: %s", exc)
             try:
@@ -816,7 +923,6 @@ async def _on_teacher_request(evt: Any) -> None:
                 _log.debug("failed to patch llm log webspace=%s", webspace_id, exc_info=True)
             return
 
-        raw_text = _extract_first_output_text(res)
         if not raw_text:
             _log.warning("llm teacher returned empty output")
             try:
@@ -848,6 +954,7 @@ async def _on_teacher_request(evt: Any) -> None:
                 patch={
                     "status": "response",
                     "response": {"raw": _truncate(raw_text, 4000), "parsed": suggestion},
+                    "source": source,
                     "duration_s": max(0.0, time.time() - started_at),
                 },
             )
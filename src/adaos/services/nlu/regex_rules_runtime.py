@@ -14,6 +14,7 @@ from adaos.sdk.core.decorators import subscribe
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
 from adaos.services.nlu.teacher_events import append_event, make_event
+from adaos.services.nlu.teacher_state import open_teacher
 from adaos.services.nlu.ycoerce import coerce_dict, iter_mappings
 from adaos.services.scenarios import loader as scenarios_loader
 from adaos.services.yjs.doc import async_get_ydoc
@@ -39,10 +40,6 @@ def _resolve_webspace_id(payload: Mapping[str, Any]) -> str:
     return default_webspace_id()
 
 
-def _teacher_obj(data_map: Any) -> dict[str, Any]:
-    return coerce_dict(getattr(data_map, "get", lambda _k: None)("nlu_teacher"))
-
-
 def _read_nlu_obj(data_map: Any) -> dict[str, Any]:
     return coerce_dict(getattr(data_map, "get", lambda _k: None)("nlu"))
 
@@ -284,23 +281,20 @@ async def _on_regex_rule_apply(evt: Any) -> None:
                     pass
 
             # Mark candidate as applied (if present)
-            teacher = _teacher_obj(data_map)
-            candidates = teacher.get("candidates")
             if isinstance(candidate_id, str) and candidate_id:
-                next_candidates: list[dict[str, Any]] = []
-                for item in iter_mappings(candidates):
-                    d = dict(item)
-                    if d.get("id") == candidate_id:
-                        request_id = d.get("request_id") if isinstance(d.get("request_id"), str) else None
-                        request_text = d.get("text") if isinstance(d.get("text"), str) else ""
-                        d["status"] = "applied"
-                        d["applied_at"] = time.time()
-                        d["applied"] = {"type": "regex_rule", "rule_id": rule_id, "target": dict(applied_to or {})}
-                    next_candidates.append(d)
-                teacher["candidates"] = next_candidates
-
-            with ydoc.begin_transaction() as txn:
-                data_map.set(txn, "nlu_teacher", teacher)
+                async with open_teacher(webspace_id, ydoc=ydoc) as teacher:
+                    d = teacher.patch(
+                        "candidates",
+                        candidate_id,
+                        {
+                            "status": "applied",
+                            "applied_at": time.time(),
+                            "applied": {"type": "regex_rule", "rule_id": rule_id, "target": dict(applied_to or {})},
+                        },
+                    )
+                if d is not None:
+                    request_id = d.get("request_id") if isinstance(d.get("request_id"), str) else None
+                    request_text = d.get("text") if isinstance(d.get("text"), str) else ""
     except Exception:
         _log.warning("failed to apply regex rule webspace=%s intent=%s", webspace_id, intent, exc_info=True)
         return
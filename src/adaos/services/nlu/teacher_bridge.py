@@ -3,7 +3,6 @@ from __future__ import annotations
 import logging
 import os
 import time
-from collections.abc import Iterable
 from typing import Any, Dict, Mapping
 
 from adaos.sdk.core.decorators import subscribe
@@ -11,11 +10,11 @@ from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
 from adaos.services.yjs.webspace import default_webspace_id
 from adaos.services.nlu.teacher_events import append_event, make_event
-from adaos.services.nlu.ycoerce import coerce_dict, iter_mappings
+from adaos.services.nlu.teacher_state import append_record
+from adaos.services.nlu.ycoerce import coerce_dict
 
 _log = logging.getLogger("adaos.nlu.teacher")
 
-_MAX_ITEMS = int(os.getenv("ADAOS_NLU_TEACHER_MAX", "200") or "200")
 _ENABLED = os.getenv("ADAOS_NLU_TEACHER") == "1"
 
 
@@ -36,26 +35,8 @@ def _resolve_webspace_id(payload: Mapping[str, Any]) -> str:
     return default_webspace_id()
 
 
-def _list_of_dicts(value: Any) -> list[dict]:
-    if isinstance(value, (str, bytes, bytearray)) or isinstance(value, Mapping) or not isinstance(value, Iterable):
-        return []
-    return [dict(x) for x in iter_mappings(value)]
-
-
 async def _append_teacher_item(webspace_id: str, item: dict) -> None:
-    from adaos.services.yjs.doc import async_get_ydoc
-
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        current = data_map.get("nlu_teacher")
-        teacher: dict = coerce_dict(current)
-        items = _list_of_dicts(teacher.get("items"))
-        items.append(item)
-        if _MAX_ITEMS > 0 and len(items) > _MAX_ITEMS:
-            items = items[-_MAX_ITEMS:]
-        with ydoc.begin_transaction() as txn:
-            teacher["items"] = items
-            data_map.set(txn, "nlu_teacher", teacher)
+    await append_record(webspace_id, "items", item)
 
 
 @subscribe("nlp.intent.not_obtained")
@@ -5,21 +5,20 @@ import logging
 import os
 import time
 from pathlib import Path
-from collections.abc import Iterable
 from typing import Any, Dict, Mapping, Optional
 
 from adaos.sdk.core.decorators import subscribe
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit as bus_emit
-from adaos.services.nlu.teacher_events import append_event, make_event, rebuild_events_by_candidate
-from adaos.services.nlu.ycoerce import coerce_dict, iter_mappings
+from adaos.services.nlu.teacher_events import append_event, make_event
+from adaos.services.nlu.teacher_state import append_record, patch_record
+from adaos.services.nlu.ycoerce import coerce_dict
 from adaos.services.scenarios import loader as scenarios_loader
 from adaos.services.yjs.doc import async_get_ydoc
 from adaos.services.yjs.webspace import default_webspace_id
 
 _log = logging.getLogger("adaos.nlu.teacher.runtime")
 
-_MAX_ITEMS = int(os.getenv("ADAOS_NLU_TEACHER_MAX", "200") or "200")
 _ENABLED = os.getenv("ADAOS_NLU_TEACHER") == "1"
 
 
@@ -40,27 +39,6 @@ def _resolve_webspace_id(payload: Mapping[str, Any]) -> str:
     return default_webspace_id()
 
 
-def _read_teacher_obj(data_map: Any) -> dict[str, Any]:
-    return coerce_dict(getattr(data_map, "get", lambda _k: None)("nlu_teacher"))
-
-
-def _list_of_dicts(value: Any) -> list[dict[str, Any]]:
-    if isinstance(value, (str, bytes, bytearray)) or isinstance(value, Mapping) or not isinstance(value, Iterable):
-        return []
-    out: list[dict[str, Any]] = []
-    for item in iter_mappings(value):
-        out.append(dict(item))
-    return out
-
-
-def _bounded(items: list[dict[str, Any]], *, max_items: int) -> list[dict[str, Any]]:
-    if max_items <= 0:
-        return items
-    if len(items) <= max_items:
-        return items
-    return items[-max_items:]
-
-
 async def _get_current_scenario_id(webspace_id: str) -> str | None:
     try:
         async with async_get_ydoc(webspace_id) as ydoc:
@@ -134,16 +112,7 @@ def _apply_revision_to_scenario_file(*, scenario_id: str, intent: str, examples:
 
 
 async def _append_revision(webspace_id: str, revision: dict[str, Any]) -> None:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _read_teacher_obj(data_map)
-        revisions = _list_of_dicts(teacher.get("revisions"))
-        revisions.append(dict(revision))
-        revisions = _bounded(revisions, max_items=_MAX_ITEMS)
-        teacher["revisions"] = revisions
-        rebuild_events_by_candidate(teacher)
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
+    await append_record(webspace_id, "revisions", revision)
 
 
 async def _update_revision(
@@ -152,44 +121,11 @@ async def _update_revision(
     revision_id: str,
     patch: dict[str, Any],
 ) -> Optional[dict[str, Any]]:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _read_teacher_obj(data_map)
-        revisions = teacher.get("revisions")
-        if isinstance(revisions, (str, bytes, bytearray)) or isinstance(revisions, Mapping) or not isinstance(revisions, Iterable):
-            return None
-
-        cleaned: list[dict[str, Any]] = []
-        updated: Optional[dict[str, Any]] = None
-        for item in list(revisions):
-            if not isinstance(item, Mapping):
-                continue
-            d = dict(item)
-            if d.get("id") == revision_id:
-                updated = dict(d)
-                updated.update(patch)
-                cleaned.append(updated)
-            else:
-                cleaned.append(d)
-
-        teacher["revisions"] = _bounded(cleaned, max_items=_MAX_ITEMS)
-        rebuild_events_by_candidate(teacher)
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
-        return updated
+    return await patch_record(webspace_id, "revisions", revision_id, patch)
 
 
 async def _append_dataset_item(webspace_id: str, item: dict[str, Any]) -> None:
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        teacher = _read_teacher_obj(data_map)
-        dataset = _list_of_dicts(teacher.get("dataset"))
-        dataset.append(dict(item))
-        dataset = _bounded(dataset, max_items=_MAX_ITEMS)
-        teacher["dataset"] = dataset
-        rebuild_events_by_candidate(teacher)
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_teacher", teacher)
+    await append_record(webspace_id, "dataset", item)
 
 
 @subscribe("nlp.teacher.request")
@@ -0,0 +1,562 @@
+from __future__ import annotations
+
+"""
+Record-level NLU teacher state.
+
+``data.nlu_teacher`` used to be a single plain JSON value: every teacher event
+read it, copied all lists, rebuilt every derived view and wrote the whole
+object back (and the store re-serialized it to disk), so each event cost
+O(total history) in CPU, Yjs update size and I/O.
+
+Now ``data.nlu_teacher`` is a Y map whose collections (``events``,
+``candidates``, ``llm_logs`` …) and derived views (``threads_by_request``,
+``threads_by_candidate``, ``events_by_candidate``) are Y arrays of plain
+records. The JSON shape seen by the UI is unchanged.
+
+  - appends, patches and trimming touch single array entries, so the Yjs
+    update carries only the changed records; collections are trimmed in
+    batches (up to ``limit // 8`` records over the limit) since a Y array
+    delete near the head costs about as much as walking the whole array;
+  - derived views are refreshed only for the request a change belongs to;
+  - every change is appended to the teacher store journal (in a worker
+    thread, before the session releases the webspace lock) and compacted into
+    a snapshot once ``ADAOS_NLU_TEACHER_JOURNAL_COMPACT`` ops accumulated;
+    the Y structure is rewritten from the mirror at the same time, dropping
+    the tombstones that patches and trimming leave between live entries
+    (positional ops walk over them, so their cost grew with the history).
+
+A per-process mirror keeps record positions and a per-request index so no
+operation has to scan the document. It is tied to the document by the
+``_rev`` token written with every change; any other writer (legacy plain
+values, resets, another process) simply triggers a reload.
+
+Use :func:`open_teacher` for writes; do not open other transactions on the
+same document inside the session.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import y_py as Y
+
+from adaos.services.nlu.teacher_events import (
+    build_request_threads,
+    candidate_event_row,
+    rebuild_events_by_candidate,
+    request_candidate_names,
+)
+from adaos.services.nlu.teacher_store import append_teacher_journal, save_teacher_state
+from adaos.services.nlu.ycoerce import coerce_dict, is_mapping_like
+from adaos.services.yjs.doc import async_get_ydoc
+
+_log = logging.getLogger("adaos.nlu.teacher.state")
+
+TEACHER_KEY = "nlu_teacher"
+REV_KEY = "_rev"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+_MAX_ITEMS = _env_int("ADAOS_NLU_TEACHER_MAX", 200)
+_MAX_THREADS = _env_int("ADAOS_NLU_TEACHER_THREADS_MAX", 250)
+_JOURNAL_COMPACT_OPS = _env_int("ADAOS_NLU_TEACHER_JOURNAL_COMPACT", 1000)
+
+COLLECTION_LIMITS: Dict[str, int] = {
+    "events": _env_int("ADAOS_NLU_TEACHER_EVENTS_MAX", 500),
+    "items": _MAX_ITEMS,
+    "revisions": _MAX_ITEMS,
+    "dataset": _MAX_ITEMS,
+    "candidates": 200,
+    "plan": 200,
+    "llm_logs": 300,
+}
+
+DERIVED_LIMITS: Dict[str, int] = {
+    "threads_by_request": _MAX_THREADS,
+    "threads_by_candidate": _MAX_THREADS * 2,
+    "events_by_candidate": _env_int("ADAOS_NLU_TEACHER_EVENTS_BY_CANDIDATE_MAX", 1500),
+}
+
+# Collections that feed the per-request thread views.
+_THREAD_SOURCES = ("events", "candidates", "revisions", "llm_logs")
+
+
+def _record_key(record: Mapping[str, Any]) -> Any:
+    rid = record.get("id")
+    return rid if isinstance(rid, str) and rid else None
+
+
+def _ebc_key(row: Mapping[str, Any]) -> Any:
+    return (
+        row.get("request_id"),
+        row.get("id"),
+        row.get("ts"),
+        row.get("candidate_name"),
+        row.get("candidate_kind"),
+    )
+
+
+_KEY_FNS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "threads_by_request": lambda row: row.get("request_id"),
+    "threads_by_candidate": lambda row: row.get("candidate_id"),
+    "events_by_candidate": _ebc_key,
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (Y.YMap, Y.YArray)):
+        try:
+            return json.loads(value.to_json())
+        except Exception:
+            return None
+    if is_mapping_like(value) and not isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in coerce_dict(value).items()}
+    return value
+
+
+class _KeyedArray:
+    """
+    Mirror of one Y array of records.
+
+    Entries get consecutive sequence numbers; only the head is ever removed and
+    only the tail appended, so ``seq - head_seq`` is the array position.
+    ``index`` maps a record key to the newest entry carrying it.
+    """
+
+    def __init__(self, limit: int, key_fn: Callable[[Mapping[str, Any]], Any]) -> None:
+        self.limit = limit
+        self.key_fn = key_fn
+        self.entries: Dict[int, Tuple[Any, dict]] = {}
+        self.index: Dict[Any, int] = {}
+        self.next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _push(self, value: dict) -> int:
+        seq = self.next_seq
+        self.next_seq += 1
+        key = self.key_fn(value)
+        self.entries[seq] = (key, value)
+        if key is not None:
+            self.index[key] = seq
+        return seq
+
+    def load(self, values: Iterable[Any]) -> None:
+        for value in values:
+            if isinstance(value, dict):
+                self._push(value)
+
+    def _position(self, seq: int) -> int:
+        return seq - next(iter(self.entries))
+
+    def get(self, key: Any) -> Optional[dict]:
+        seq = self.index.get(key)
+        return None if seq is None else self.entries[seq][1]
+
+    def seq_of(self, key: Any) -> Optional[int]:
+        return self.index.get(key)
+
+    def at(self, seq: int) -> Optional[dict]:
+        entry = self.entries.get(seq)
+        return None if entry is None else entry[1]
+
+    def values(self) -> List[dict]:
+        return [value for _, value in self.entries.values()]
+
+    def append(self, txn: Any, yarr: Any, value: dict) -> Tuple[int, List[Tuple[int, dict]]]:
+        yarr.append(txn, value)
+        seq = self._push(value)
+        dropped: List[Tuple[int, dict]] = []
+        # A delete near the head costs about as much as walking the array,
+        # however many entries it removes: trim in batches of limit/8.
+        if self.limit > 0 and len(self.entries) > self.limit + self.limit // 8:
+            while len(self.entries) > self.limit:
+                head = next(iter(self.entries))
+                key, old = self.entries.pop(head)
+                if key is not None and self.index.get(key) == head:
+                    self.index.pop(key, None)
+                dropped.append((head, old))
+            yarr.delete_range(txn, 0, len(dropped))
+        return seq, dropped
+
+    def replace(self, txn: Any, yarr: Any, seq: int, value: dict) -> None:
+        pos = self._position(seq)
+        yarr.delete(txn, pos)
+        yarr.insert(txn, pos, value)
+        key, _ = self.entries[seq]
+        self.entries[seq] = (key, value)
+
+    def upsert(self, txn: Any, yarr: Any, value: dict) -> None:
+        seq = self.index.get(self.key_fn(value))
+        if seq is None:
+            self.append(txn, yarr, value)
+        elif self.entries[seq][1] != value:
+            self.replace(txn, yarr, seq, value)
+
+
+class _TeacherMirror:
+    def __init__(self) -> None:
+        self.token = uuid.uuid4().hex[:12]
+        self.counter = 0
+        self.arrays: Dict[str, _KeyedArray] = {
+            name: _KeyedArray(limit, _record_key) for name, limit in COLLECTION_LIMITS.items()
+        }
+        for name, limit in DERIVED_LIMITS.items():
+            self.arrays[name] = _KeyedArray(limit, _KEY_FNS[name])
+        # request_id -> collection -> seqs (oldest first)
+        self.by_request: Dict[str, Dict[str, List[int]]] = {}
+        self.values: Dict[str, Any] = {}
+
+    @property
+    def rev(self) -> str:
+        return f"{self.token}:{self.counter}"
+
+    def index_record(self, collection: str, seq: int, record: Mapping[str, Any]) -> Optional[str]:
+        rid = record.get("request_id")
+        if not isinstance(rid, str) or not rid:
+            return None
+        self.by_request.setdefault(rid, {}).setdefault(collection, []).append(seq)
+        return rid
+
+    def unindex_record(self, collection: str, seq: int, record: Mapping[str, Any]) -> None:
+        rid = record.get("request_id")
+        parts = self.by_request.get(rid) if isinstance(rid, str) else None
+        if not parts:
+            return
+        seqs = parts.get(collection) or []
+        if seq in seqs:
+            seqs.remove(seq)
+        if not any(parts.values()):
+            self.by_request.pop(rid, None)
+
+    def request_records(self, collection: str, rid: str) -> List[dict]:
+        seqs = (self.by_request.get(rid) or {}).get(collection) or []
+        arr = self.arrays[collection]
+        return [rec for rec in (arr.at(seq) for seq in seqs) if rec is not None]
+
+    def base_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = dict(self.values)
+        for name in COLLECTION_LIMITS:
+            state[name] = self.arrays[name].values()
+        return state
+
+
+_MIRRORS: Dict[str, _TeacherMirror] = {}
+_LOCKS: Dict[Tuple[int, str], asyncio.Lock] = {}
+
+
+def _lock_for(webspace_id: str) -> asyncio.Lock:
+    key = (id(asyncio.get_running_loop()), webspace_id)
+    lock = _LOCKS.get(key)
+    if lock is None:
+        lock = _LOCKS[key] = asyncio.Lock()
+    return lock
+
+
+def _build_mirror(teacher: Mapping[str, Any]) -> _TeacherMirror:
+    mirror = _TeacherMirror()
+    for name, value in teacher.items():
+        if name == REV_KEY:
+            continue
+        if name in mirror.arrays:
+            items = [dict(x) for x in (value or []) if isinstance(x, Mapping)] if isinstance(value, list) else []
+            limit = mirror.arrays[name].limit
+            if limit > 0 and len(items) > limit:
+                items = items[-limit:]
+            mirror.arrays[name].load(items)
+        else:
+            mirror.values[name] = value
+    for name in COLLECTION_LIMITS:
+        for seq, (_, record) in mirror.arrays[name].entries.items():
+            mirror.index_record(name, seq, record)
+    return mirror
+
+
+def _structured(mirror: _TeacherMirror) -> Any:
+    body: Dict[str, Any] = dict(mirror.values)
+    for name, arr in mirror.arrays.items():
+        body[name] = Y.YArray(arr.values())
+    body[REV_KEY] = mirror.rev
+    return Y.YMap(body)
+
+
+def _write_structured(data_map: Any, txn: Any, mirror: _TeacherMirror) -> Any:
+    data_map.set(txn, TEACHER_KEY, _structured(mirror))
+    return data_map.get(TEACHER_KEY)
+
+
+def _attach(webspace_id: str, data_map: Any, txn: Any) -> Tuple[_TeacherMirror, Any]:
+    """Return the mirror and the Y map, (re)loading or migrating when the document moved on."""
+    current = data_map.get(TEACHER_KEY)
+    mirror = _MIRRORS.get(webspace_id)
+    if isinstance(current, Y.YMap):
+        if mirror is not None and current.get(REV_KEY) == mirror.rev:
+            return mirror, current
+        plain = _plain(current) or {}
+        mirror = _build_mirror(plain)
+        missing = [name for name in mirror.arrays if not isinstance(current.get(name), Y.YArray)]
+        if missing or any(len(current.get(n)) != len(mirror.arrays[n]) for n in mirror.arrays if n not in missing):
+            current = _write_structured(data_map, txn, mirror)
+        else:
+            current.set(txn, REV_KEY, mirror.rev)
+    else:
+        # Legacy plain JSON value (or nothing yet): migrate once.
+        plain = _plain(current) if current is not None else {}
+        plain = dict(plain) if isinstance(plain, dict) else {}
+        rebuild_events_by_candidate(plain)
+        mirror = _build_mirror(plain)
+        current = _write_structured(data_map, txn, mirror)
+    _MIRRORS[webspace_id] = mirror
+    return mirror, current
+
+
+class TeacherSession:
+    """Record-level access to one webspace's teacher state within one transaction."""
+
+    def __init__(self, webspace_id: str, mirror: _TeacherMirror, tmap: Any, txn: Any) -> None:
+        self.webspace_id = webspace_id
+        self._mirror = mirror
+        self._tmap = tmap
+        self._txn = txn
+        self._touched: Dict[str, None] = {}
+        self.ops: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------ reads
+    def get(self, collection: str, record_id: str) -> Optional[dict]:
+        record = self._mirror.arrays[collection].get(record_id)
+        return dict(record) if record is not None else None
+
+    def records(self, collection: str) -> List[dict]:
+        return [dict(x) for x in self._mirror.arrays[collection].values()]
+
+    def by_request(self, collection: str, request_id: str) -> List[dict]:
+        return [dict(x) for x in self._mirror.request_records(collection, request_id)]
+
+    def value(self, key: str, default: Any = None) -> Any:
+        return self._mirror.values.get(key, default)
+
+    # ----------------------------------------------------------------- writes
+    def _yarr(self, collection: str) -> Any:
+        return self._tmap.get(collection)
+
+    def _touch(self, rid: Optional[str]) -> None:
+        if rid:
+            self._touched[rid] = None
+
+    def append(self, collection: str, record: Mapping[str, Any]) -> dict:
+        value = _plain(dict(record))
+        arr = self._mirror.arrays[collection]
+        seq, dropped = arr.append(self._txn, self._yarr(collection), value)
+        for old_seq, old in dropped:
+            self._mirror.unindex_record(collection, old_seq, old)
+        self._touch(self._mirror.index_record(collection, seq, value))
+        self.ops.append({"op": "append", "c": collection, "r": value})
+        return dict(value)
+
+    def patch(self, collection: str, record_id: str, patch: Mapping[str, Any]) -> Optional[dict]:
+        arr = self._mirror.arrays[collection]
+        seq = arr.seq_of(record_id)
+        if seq is None:
+            return None
+        return self._patch_seq(collection, seq, patch)
+
+    def patch_request(
+        self,
+        collection: str,
+        request_id: str,
+        patch: Mapping[str, Any],
+        *,
+        where: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> Optional[dict]:
+        """Patch the first record of ``request_id`` matching ``where``."""
+        seqs = (self._mirror.by_request.get(request_id) or {}).get(collection) or []
+        arr = self._mirror.arrays[collection]
+        for seq in seqs:
+            record = arr.at(seq)
+            if record is not None and (where is None or where(record)):
+                return self._patch_seq(collection, seq, patch)
+        return None
+
+    def _patch_seq(self, collection: str, seq: int, patch: Mapping[str, Any]) -> dict:
+        arr = self._mirror.arrays[collection]
+        current = arr.at(seq) or {}
+        updated = dict(current)
+        updated.update(_plain(dict(patch)))
+        arr.replace(self._txn, self._yarr(collection), seq, updated)
+        self._touch(updated.get("request_id") if isinstance(updated.get("request_id"), str) else None)
+        if updated.get("id"):
+            self.ops.append({"op": "patch", "c": collection, "id": updated.get("id"), "p": _plain(dict(patch))})
+        return dict(updated)
+
+    def set_value(self, key: str, value: Any) -> None:
+        if key in self._mirror.arrays or key == REV_KEY:
+            raise ValueError(f"{key!r} is a teacher collection")
+        value = _plain(value)
+        self._mirror.values[key] = value
+        self._tmap.set(self._txn, key, value)
+        self.ops.append({"op": "set", "k": key, "v": value})
+
+    # --------------------------------------------------------------- derived
+    def _refresh_request(self, rid: str) -> None:
+        mirror = self._mirror
+        parts = {name: mirror.request_records(name, rid) for name in _THREAD_SOURCES}
+        if not any(parts.values()):
+            return
+        thread, by_candidate = build_request_threads(
+            rid,
+            events=parts["events"],
+            candidates=parts["candidates"],
+            revisions=parts["revisions"],
+            llm_logs=parts["llm_logs"],
+        )
+        mirror.arrays["threads_by_request"].upsert(self._txn, self._yarr("threads_by_request"), thread)
+        threads = mirror.arrays["threads_by_candidate"]
+        for row in by_candidate:
+            threads.upsert(self._txn, self._yarr("threads_by_candidate"), row)
+        ebc = mirror.arrays["events_by_candidate"]
+        for cand in request_candidate_names(events=parts["events"], candidates=parts["candidates"]):
+            for event in parts["events"]:
+                row = candidate_event_row(event, cand)
+                if ebc.seq_of(_ebc_key(row)) is None:
+                    ebc.append(self._txn, self._yarr("events_by_candidate"), row)
+
+    def _finish(self) -> None:
+        for rid in self._touched:
+            self._refresh_request(rid)
+        if self.ops or self._touched:
+            self._mirror.counter += 1
+            self._tmap.set(self._txn, REV_KEY, self._mirror.rev)
+
+
+async def _journal(webspace_id: str, session: TeacherSession) -> bool:
+    """Journal the session's ops off the loop; True when the journal was compacted."""
+    if not session.ops:
+        return False
+    pending = await asyncio.to_thread(append_teacher_journal, webspace_id=webspace_id, ops=session.ops)
+    if _JOURNAL_COMPACT_OPS > 0 and pending >= _JOURNAL_COMPACT_OPS:
+        mirror = _MIRRORS.get(webspace_id)
+        if mirror is not None:
+            await asyncio.to_thread(save_teacher_state, webspace_id=webspace_id, teacher=mirror.base_state())
+            return True
+    return False
+
+
+def _compact_doc(webspace_id: str, ydoc: Any) -> None:
+    """Rewrite ``data.nlu_teacher`` from the mirror (a tombstone-free structure)."""
+    mirror = _MIRRORS.get(webspace_id)
+    if mirror is None:
+        return
+    try:
+        with ydoc.begin_transaction() as txn:
+            _write_structured(ydoc.get_map("data"), txn, mirror)
+    except Exception:
+        _log.warning("failed to compact nlu teacher state webspace=%s", webspace_id, exc_info=True)
+
+
+@contextlib.contextmanager
+def _session(webspace_id: str, ydoc: Any) -> Iterator[TeacherSession]:
+    data_map = ydoc.get_map("data")
+    with ydoc.begin_transaction() as txn:
+        mirror, tmap = _attach(webspace_id, data_map, txn)
+        session = TeacherSession(webspace_id, mirror, tmap, txn)
+        try:
+            yield session
+        finally:
+            session._finish()
+
+
+@contextlib.asynccontextmanager
+async def _journaled_session(webspace_id: str, ydoc: Any) -> AsyncIterator[TeacherSession]:
+    session: Optional[TeacherSession] = None
+    try:
+        with _session(webspace_id, ydoc) as session:
+            yield session
+    finally:
+        # Whatever reached the document also goes to the journal; compacting
+        # the journal also compacts the document.
+        if session is not None and await _journal(webspace_id, session):
+            _compact_doc(webspace_id, ydoc)
+
+
+@contextlib.asynccontextmanager
+async def open_teacher(webspace_id: str, *, ydoc: Any = None) -> AsyncIterator[TeacherSession]:
+    """
+    Open a record-level teacher session. Pass ``ydoc`` to reuse a document the
+    caller already holds (no transaction of its own may be open at that time).
+    """
+    async with _lock_for(webspace_id):
+        if ydoc is not None:
+            async with _journaled_session(webspace_id, ydoc) as session:
+                yield session
+            return
+        async with async_get_ydoc(webspace_id) as doc:
+            async with _journaled_session(webspace_id, doc) as session:
+                yield session
+
+
+async def append_record(webspace_id: str, collection: str, record: Mapping[str, Any]) -> dict:
+    async with open_teacher(webspace_id) as teacher:
+        return teacher.append(collection, record)
+
+
+async def patch_record(
+    webspace_id: str, collection: str, record_id: str, patch: Mapping[str, Any]
+) -> Optional[dict]:
+    async with open_teacher(webspace_id) as teacher:
+        return teacher.patch(collection, record_id, patch)
+
+
+async def read_teacher(webspace_id: str) -> dict[str, Any]:
+    """Plain JSON view of the teacher state (as the UI sees it)."""
+    async with async_get_ydoc(webspace_id) as ydoc:
+        current = ydoc.get_map("data").get(TEACHER_KEY)
+        plain = _plain(current)
+    if not isinstance(plain, dict):
+        return {}
+    plain.pop(REV_KEY, None)
+    return plain
+
+
+async def replace_teacher(webspace_id: str, teacher: Mapping[str, Any]) -> None:
+    """Bulk replace (rehydration): rebuild derived views, write once, compact the store."""
+    plain = _plain(dict(teacher)) or {}
+    plain.pop(REV_KEY, None)
+    rebuild_events_by_candidate(plain)
+    async with _lock_for(webspace_id):
+        async with async_get_ydoc(webspace_id) as ydoc:
+            data_map = ydoc.get_map("data")
+            with ydoc.begin_transaction() as txn:
+                mirror = _build_mirror(plain)
+                _write_structured(data_map, txn, mirror)
+                _MIRRORS[webspace_id] = mirror
+        await asyncio.to_thread(save_teacher_state, webspace_id=webspace_id, teacher=mirror.base_state())
+
+
+def forget_mirror(webspace_id: Optional[str] = None) -> None:
+    if webspace_id is None:
+        _MIRRORS.clear()
+    else:
+        _MIRRORS.pop(webspace_id, None)
+
+
+__all__ = [
+    "COLLECTION_LIMITS",
+    "TeacherSession",
+    "append_record",
+    "forget_mirror",
+    "open_teacher",
+    "patch_record",
+    "read_teacher",
+    "replace_teacher",
+]
@@ -26,22 +26,123 @@ def teacher_state_path(webspace_id: str) -> Path:
     return root / f"{safe}.json"
 
 
-def load_teacher_state(*, webspace_id: str) -> dict[str, Any]:
+def teacher_journal_path(webspace_id: str) -> Path:
+    return teacher_state_path(webspace_id).with_suffix(".journal.jsonl")
+
+
+# journal path -> number of ops appended since the last snapshot
+_journal_ops: dict[Path, int] = {}
+
+
+def _count_journal_ops(path: Path) -> int:
+    cached = _journal_ops.get(path)
+    if cached is not None:
+        return cached
+    count = 0
+    try:
+        with path.open("rb") as f:
+            for _ in f:
+                count += 1
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log.debug("failed to count teacher journal path=%s", path, exc_info=True)
+    _journal_ops[path] = count
+    return count
+
+
+def append_teacher_journal(*, webspace_id: str, ops: list[Mapping[str, Any]]) -> int:
+    """
+    Append record-level ops (``append``/``patch``/``set``) to the webspace journal.
+    Returns the number of ops accumulated since the last snapshot.
+    """
+    path = teacher_journal_path(webspace_id)
+    total = _count_journal_ops(path)
+    if not ops:
+        return total
+    try:
+        lines = "".join(json.dumps(op, ensure_ascii=False, default=str) + "\n" for op in ops)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+    except Exception:
+        _log.warning("failed to append teacher journal path=%s", path, exc_info=True)
+        return total
+    _journal_ops[path] = total + len(ops)
+    return _journal_ops[path]
+
+
+def _replay_journal(state: dict[str, Any], path: Path) -> None:
+    # Last position of each record id per collection; patches apply to the newest record.
+    positions: dict[str, dict[str, int]] = {}
+
+    def _collection(name: str) -> list[Any]:
+        items = state.get(name)
+        if not isinstance(items, list):
+            items = []
+            state[name] = items
+        if name not in positions:
+            positions[name] = {str(r.get("id")): i for i, r in enumerate(items) if isinstance(r, dict) and r.get("id")}
+        return items
+
+    try:
+        fh = path.open("r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with fh:
+        for line in fh:
+            try:
+                op = json.loads(line)
+            except Exception:
+                continue  # torn tail write
+            if not isinstance(op, dict):
+                continue
+            kind = op.get("op")
+            if kind == "set" and isinstance(op.get("k"), str):
+                state[op["k"]] = op.get("v")
+            elif kind == "append" and isinstance(op.get("c"), str) and isinstance(op.get("r"), dict):
+                items = _collection(op["c"])
+                record = op["r"]
+                items.append(record)
+                if record.get("id"):
+                    positions[op["c"]][str(record["id"])] = len(items) - 1
+            elif kind == "patch" and isinstance(op.get("c"), str) and isinstance(op.get("p"), dict):
+                items = _collection(op["c"])
+                idx = positions[op["c"]].get(str(op.get("id")))
+                if idx is not None and isinstance(items[idx], dict):
+                    updated = dict(items[idx])
+                    updated.update(op["p"])
+                    items[idx] = updated
+
+
+def load_teacher_state(*, webspace_id: str, limits: Optional[Mapping[str, int]] = None) -> dict[str, Any]:
+    """Last snapshot with the journal replayed on top; collections trimmed to ``limits``."""
     path = teacher_state_path(webspace_id)
-    if not path.exists():
-        return {}
+    state: dict[str, Any] = {}
+    if path.exists():
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict):
+                state = loaded
+        except Exception:
+            _log.warning("failed to read teacher state path=%s", path, exc_info=True)
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        _replay_journal(state, teacher_journal_path(webspace_id))
     except Exception:
-        _log.warning("failed to read teacher state path=%s", path, exc_info=True)
-        return {}
+        _log.warning("failed to replay teacher journal webspace=%s", webspace_id, exc_info=True)
+    for name, limit in (limits or {}).items():
+        items = state.get(name)
+        if isinstance(items, list) and limit > 0 and len(items) > limit:
+            state[name] = items[-limit:]
+    return state
 
 
 def save_teacher_state(*, webspace_id: str, teacher: Mapping[str, Any]) -> None:
+    """Write a full snapshot and truncate the journal (compaction)."""
     path = teacher_state_path(webspace_id)
+    journal = teacher_journal_path(webspace_id)
     tmp = path.with_suffix(".json.tmp")
     try:
-        tmp.write_text(json.dumps(teacher, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.write_text(json.dumps(teacher, ensure_ascii=False, default=str), encoding="utf-8")
         tmp.replace(path)
     except Exception:
         _log.warning("failed to write teacher state path=%s", path, exc_info=True)
@@ -50,4 +151,11 @@ def save_teacher_state(*, webspace_id: str, teacher: Mapping[str, Any]) -> None:
                 tmp.unlink()
         except Exception:
             pass
-
+        return
+    try:
+        journal.unlink()
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log.warning("failed to truncate teacher journal path=%s", journal, exc_info=True)
+    _journal_ops[journal] = 0
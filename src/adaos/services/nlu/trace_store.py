@@ -1,16 +1,65 @@
 from __future__ import annotations
 
+"""
+NLU trace store.
+
+Detect / detected / not-obtained events used to be appended to
+``data.nlu_trace.items`` in the webspace YDoc: every utterance read the whole
+list, appended one item and wrote the list back, so each utterance synced the
+full trace window to every connected client.
+
+Traces now live off the document:
+
+  - :class:`TraceStore` keeps a bounded ring per webspace
+    (``ADAOS_NLU_TRACE_MAX`` items, ``ADAOS_NLU_TRACE_RETENTION_S`` seconds),
+    optionally mirrored into SQLite (``ADAOS_NLU_TRACE_SQLITE=1``, written in
+    batches off the event path, ``ADAOS_NLU_TRACE_DB_MAX`` rows per webspace);
+  - requests are sampled as a whole (``ADAOS_NLU_TRACE_SAMPLE``, 0..1);
+    ``not_obtained`` items are always kept since the teacher UI relies on them;
+  - :meth:`TraceStore.query` pages newest-first by ``seq`` and
+    :meth:`TraceStore.subscribe` streams new items (see ``nlu_trace_api``);
+  - only a small summary (last ``ADAOS_NLU_TRACE_YJS_ITEMS`` items and
+    counters) is projected into ``data.nlu_trace``, at most once per
+    ``ADAOS_NLU_TRACE_YJS_INTERVAL_S``.
+"""
+
+import asyncio
+import json
 import logging
 import os
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, Mapping
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, Set
 
 from adaos.sdk.core.decorators import subscribe
 from adaos.services.yjs.webspace import default_webspace_id
 
 _log = logging.getLogger("adaos.nlu.trace")
 
-_MAX_ITEMS = int(os.getenv("ADAOS_NLU_TRACE_MAX", "200") or "200")
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+_MAX_ITEMS = _env_int("ADAOS_NLU_TRACE_MAX", 1000)
+_YJS_ITEMS = _env_int("ADAOS_NLU_TRACE_YJS_ITEMS", 20)
+_YJS_INTERVAL_S = _env_float("ADAOS_NLU_TRACE_YJS_INTERVAL_S", 1.0)
+
+_ALWAYS_KEPT = frozenset({"nlp.intent.not_obtained"})
 
 
 def _payload(evt: Any) -> Dict[str, Any]:
@@ -30,22 +79,371 @@ def _resolve_webspace_id(payload: Mapping[str, Any]) -> str:
     return default_webspace_id()
 
 
+class _TraceDb:
+    """SQLite mirror of the rings. Only touched from :meth:`TraceStore.flush` and queries."""
+
+    def __init__(self, path: Path, max_rows: int) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock:
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS nlu_trace ("
+                " webspace_id TEXT NOT NULL, seq INTEGER NOT NULL, ts REAL NOT NULL,"
+                " type TEXT, request_id TEXT, item TEXT NOT NULL,"
+                " PRIMARY KEY (webspace_id, seq))"
+            )
+            self._con.commit()
+
+    def last_seqs(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._con.execute("SELECT webspace_id, MAX(seq) FROM nlu_trace GROUP BY webspace_id").fetchall()
+        return {str(ws): int(seq or 0) for ws, seq in rows}
+
+    def write(self, rows: Sequence[dict], *, cutoff_ts: float) -> None:
+        by_ws: Dict[str, int] = {}
+        for item in rows:
+            by_ws[item["webspace_id"]] = max(by_ws.get(item["webspace_id"], 0), int(item["seq"]))
+        with self._lock:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO nlu_trace (webspace_id, seq, ts, type, request_id, item) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        item["webspace_id"],
+                        int(item["seq"]),
+                        float(item.get("ts") or 0.0),
+                        item.get("type"),
+                        item.get("request_id") if isinstance(item.get("request_id"), str) else None,
+                        json.dumps(item, ensure_ascii=False, default=str),
+                    )
+                    for item in rows
+                ],
+            )
+            for ws, last in by_ws.items():
+                if self.max_rows > 0:
+                    self._con.execute("DELETE FROM nlu_trace WHERE webspace_id=? AND seq<=?", (ws, last - self.max_rows))
+                if cutoff_ts > 0:
+                    self._con.execute("DELETE FROM nlu_trace WHERE webspace_id=? AND ts<?", (ws, cutoff_ts))
+            self._con.commit()
+
+    def page(
+        self,
+        webspace_id: str,
+        *,
+        before: int,
+        limit: int,
+        types: Optional[Set[str]],
+        request_id: Optional[str],
+    ) -> List[dict]:
+        sql = "SELECT item FROM nlu_trace WHERE webspace_id=? AND seq<?"
+        args: List[Any] = [webspace_id, before]
+        if types:
+            sql += " AND type IN (%s)" % ",".join("?" * len(types))
+            args.extend(sorted(types))
+        if request_id:
+            sql += " AND request_id=?"
+            args.append(request_id)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._con.execute(sql, args).fetchall()
+        out: List[dict] = []
+        for (raw,) in rows:
+            try:
+                out.append(json.loads(raw))
+            except Exception:
+                continue
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+
+class TraceStore:
+    def __init__(
+        self,
+        *,
+        max_items: int = 1000,
+        retention_s: float = 0.0,
+        sample: float = 1.0,
+        db_path: Optional[Path] = None,
+        db_max_rows: int = 20000,
+    ) -> None:
+        self.max_items = max(1, int(max_items))
+        self.retention_s = max(0.0, float(retention_s))
+        self.sample = min(1.0, max(0.0, float(sample)))
+        self._rings: Dict[str, Deque[dict]] = {}
+        self._seq: Dict[str, int] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._unflushed: List[dict] = []
+        self._db = _TraceDb(db_path, db_max_rows) if db_path is not None else None
+        if self._db is not None:
+            # Sequences continue across restarts; read them once here so that
+            # appends and queries on the event loop never wait for SQLite.
+            try:
+                self._seq.update(self._db.last_seqs())
+            except Exception:
+                _log.debug("failed to read nlu trace sequences path=%s", db_path, exc_info=True)
+        self.stats: Dict[str, int] = {"recorded": 0, "sampled_out": 0, "expired": 0, "stream_dropped": 0}
+
+    # ---------------------------------------------------------------- writes
+    def sampled(self, item: Mapping[str, Any]) -> bool:
+        if self.sample >= 1.0 or item.get("type") in _ALWAYS_KEPT:
+            return True
+        if self.sample <= 0.0:
+            return False
+        # Per request, so that all events of one utterance are kept or dropped together.
+        key = item.get("request_id") or item.get("text") or ""
+        return zlib.crc32(str(key).encode("utf-8")) % 10000 < self.sample * 10000
+
+    def _ring(self, webspace_id: str) -> Deque[dict]:
+        ring = self._rings.get(webspace_id)
+        if ring is None:
+            ring = self._rings[webspace_id] = deque(maxlen=self.max_items)
+        return ring
+
+    def _expire(self, ring: Deque[dict], now: float) -> None:
+        if self.retention_s <= 0:
+            return
+        cutoff = now - self.retention_s
+        while ring and float(ring[0].get("ts") or 0.0) < cutoff:
+            ring.popleft()
+            self.stats["expired"] += 1
+
+    def append(self, webspace_id: str, item: Mapping[str, Any]) -> Optional[dict]:
+        """Record ``item``; returns the stored copy (with ``seq``) or None when sampled out."""
+        if not self.sampled(item):
+            self.stats["sampled_out"] += 1
+            return None
+        ring = self._ring(webspace_id)
+        seq = self._seq.get(webspace_id, 0) + 1
+        self._seq[webspace_id] = seq
+        record = dict(item)
+        record.setdefault("ts", time.time())
+        record["seq"] = seq
+        record["webspace_id"] = webspace_id
+        ring.append(record)
+        self._expire(ring, float(record["ts"]))
+        self.stats["recorded"] += 1
+        if self._db is not None:
+            self._unflushed.append(record)
+        for queue in self._subscribers.get(webspace_id) or ():
+            try:
+                queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self.stats["stream_dropped"] += 1
+        return record
+
+    def flush(self) -> int:
+        """Write buffered items to SQLite (no-op without a database)."""
+        if self._db is None or not self._unflushed:
+            return 0
+        rows, self._unflushed = self._unflushed, []
+        cutoff = time.time() - self.retention_s if self.retention_s > 0 else 0.0
+        try:
+            self._db.write(rows, cutoff_ts=cutoff)
+        except Exception:
+            _log.warning("failed to write nlu trace rows=%d", len(rows), exc_info=True)
+            return 0
+        return len(rows)
+
+    # ----------------------------------------------------------------- reads
+    def _ring_page(
+        self,
+        webspace_id: str,
+        *,
+        before: Optional[int],
+        limit: int,
+        wanted: Optional[Set[str]],
+        request_id: Optional[str],
+    ) -> tuple[List[dict], int]:
+        """Newest-first matches from the ring and the seq to continue below in SQLite."""
+        ring = self._ring(webspace_id)
+        self._expire(ring, time.time())
+        out: List[dict] = []
+        oldest_seen: Optional[int] = None
+        for record in reversed(ring):
+            seq = int(record["seq"])
+            if before is not None and seq >= before:
+                continue
+            oldest_seen = seq
+            if wanted and record.get("type") not in wanted:
+                continue
+            if request_id and record.get("request_id") != request_id:
+                continue
+            out.append(dict(record))
+            if len(out) >= limit:
+                break
+        if oldest_seen is not None:
+            floor = oldest_seen
+        else:
+            floor = before if before is not None else self._seq.get(webspace_id, 0) + 1
+        return out, floor
+
+    def _db_page(
+        self,
+        webspace_id: str,
+        *,
+        floor: int,
+        limit: int,
+        wanted: Optional[Set[str]],
+        request_id: Optional[str],
+    ) -> List[dict]:
+        if self._db is None:
+            return []
+        self.flush()
+        try:
+            return self._db.page(webspace_id, before=floor, limit=limit, types=wanted, request_id=request_id)
+        except Exception:
+            _log.debug("failed to page nlu trace webspace=%s", webspace_id, exc_info=True)
+            return []
+
+    def _page(self, webspace_id: str, out: List[dict], limit: int) -> Dict[str, Any]:
+        next_before = None if len(out) < limit or not out else int(out[-1]["seq"])
+        return {"items": out, "next_before": next_before, "last_seq": self._seq.get(webspace_id, 0)}
+
+    def query(
+        self,
+        webspace_id: str,
+        *,
+        before: Optional[int] = None,
+        limit: int = 50,
+        types: Optional[Sequence[str]] = None,
+        request_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of items with ``seq < before``. ``next_before`` is the
+        cursor for the following page (None when there is nothing older).
+        """
+        limit = max(1, min(int(limit), 500))
+        wanted = set(types) if types else None
+        out, floor = self._ring_page(webspace_id, before=before, limit=limit, wanted=wanted, request_id=request_id)
+        if len(out) < limit:
+            # Older than the ring: continue from SQLite.
+            out.extend(self._db_page(webspace_id, floor=floor, limit=limit - len(out), wanted=wanted, request_id=request_id))
+        return self._page(webspace_id, out, limit)
+
+    async def query_async(
+        self,
+        webspace_id: str,
+        *,
+        before: Optional[int] = None,
+        limit: int = 50,
+        types: Optional[Sequence[str]] = None,
+        request_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """:meth:`query` for the event loop: the ring is read in place, SQLite in a worker thread."""
+        limit = max(1, min(int(limit), 500))
+        wanted = set(types) if types else None
+        out, floor = self._ring_page(webspace_id, before=before, limit=limit, wanted=wanted, request_id=request_id)
+        if len(out) < limit and self._db is not None:
+            out.extend(
+                await asyncio.to_thread(
+                    self._db_page, webspace_id, floor=floor, limit=limit - len(out), wanted=wanted, request_id=request_id
+                )
+            )
+        return self._page(webspace_id, out, limit)
+
+    def since(self, webspace_id: str, seq: int) -> List[dict]:
+        """Items still in the ring with ``seq`` greater than the given one, oldest first."""
+        return [dict(r) for r in self._ring(webspace_id) if int(r["seq"]) > seq]
+
+    def summary(self, webspace_id: str, *, items: int = 20) -> Dict[str, Any]:
+        ring = self._ring(webspace_id)
+        self._expire(ring, time.time())
+        tail = list(ring)[-items:] if items > 0 else []
+        return {
+            "items": [{k: v for k, v in r.items() if k != "webspace_id"} for r in tail],
+            "count": len(ring),
+            "last_seq": self._seq.get(webspace_id, 0),
+            "updated_at": time.time(),
+        }
+
+    # ---------------------------------------------------------------- stream
+    def subscribe(self, webspace_id: str, *, maxsize: int = 256) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.setdefault(webspace_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, webspace_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(webspace_id) or []
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop(webspace_id, None)
+
+    def close(self) -> None:
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+
+
+def default_trace_db_path() -> Optional[Path]:
+    try:
+        from adaos.services.agent_context import get_ctx
+
+        return Path(get_ctx().paths.state_dir()) / "nlu" / "trace.sqlite3"
+    except Exception:
+        return None
+
+
+_STORE: Optional[TraceStore] = None
+
+
+def get_trace_store() -> TraceStore:
+    global _STORE
+    if _STORE is None:
+        db_path = default_trace_db_path() if _env_int("ADAOS_NLU_TRACE_SQLITE", 0) else None
+        try:
+            _STORE = TraceStore(
+                max_items=_MAX_ITEMS,
+                retention_s=_env_float("ADAOS_NLU_TRACE_RETENTION_S", 86400.0),
+                sample=_env_float("ADAOS_NLU_TRACE_SAMPLE", 1.0),
+                db_path=db_path,
+                db_max_rows=_env_int("ADAOS_NLU_TRACE_DB_MAX", 20000),
+            )
+        except Exception:
+            _log.warning("nlu trace database unavailable path=%s; keeping traces in memory", db_path, exc_info=True)
+            _STORE = TraceStore(max_items=_MAX_ITEMS, retention_s=_env_float("ADAOS_NLU_TRACE_RETENTION_S", 86400.0))
+    return _STORE
+
+
+_projecting: Set[str] = set()
+# Strong references: the loop only keeps weak ones to running tasks.
+_project_tasks: Set[asyncio.Task] = set()
+
+
+async def _project_summary(webspace_id: str) -> None:
+    # Trailing-edge throttle: one summary write per interval, with whatever
+    # arrived in the meantime.
+    try:
+        await asyncio.sleep(_YJS_INTERVAL_S)
+    finally:
+        _projecting.discard(webspace_id)
+    store = get_trace_store()
+    try:
+        await asyncio.to_thread(store.flush)
+    except Exception:
+        _log.debug("nlu trace flush failed", exc_info=True)
+    try:
+        from adaos.services.scenario.projection_writes import projection_writer
+
+        await projection_writer().submit(webspace_id, ("data", "nlu_trace"), store.summary(webspace_id, items=_YJS_ITEMS))
+    except Exception:
+        _log.debug("failed to project nlu trace summary webspace=%s", webspace_id, exc_info=True)
+
+
 async def _append_trace_item(webspace_id: str, item: dict) -> None:
-    # Import lazily to avoid importing y_py at module import time in contexts
-    # where YJS is not available.
-    from adaos.services.yjs.doc import async_get_ydoc
-
-    async with async_get_ydoc(webspace_id) as ydoc:
-        data_map = ydoc.get_map("data")
-        current = data_map.get("nlu_trace")
-        items = []
-        if isinstance(current, dict) and isinstance(current.get("items"), list):
-            items = list(current.get("items") or [])
-        items.append(item)
-        if _MAX_ITEMS > 0 and len(items) > _MAX_ITEMS:
-            items = items[-_MAX_ITEMS:]
-        with ydoc.begin_transaction() as txn:
-            data_map.set(txn, "nlu_trace", {"items": items})
+    if get_trace_store().append(webspace_id, item) is None:
+        return
+    if webspace_id not in _projecting:
+        _projecting.add(webspace_id)
+        task = asyncio.create_task(_project_summary(webspace_id))
+        _project_tasks.add(task)
+        task.add_done_callback(_project_tasks.discard)
 
 
 def _compact_meta(meta: Mapping[str, Any] | None) -> dict:
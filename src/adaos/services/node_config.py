@@ -3,12 +3,13 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, TypedDict
+import copy
 import os
 import shutil
 import sys
 import uuid
-import yaml
 from adaos.services.agent_context import get_ctx, AgentContext  # type: ignore
+from adaos.services.config_cache import config_cache
 
 
 def _base_dir(ctx: AgentContext | None = None) -> Path:
@@ -559,14 +560,8 @@ def _migrate_managed_key_material(conf: NodeConfig) -> bool:
     return changed
 
 
-def load_node(ctx: AgentContext | None = None) -> NodeConfig:
-    path = _config_path()
-    if not path.exists():
-        conf = _default_conf()
-        save_node(conf, ctx=ctx)
-        _sync_ctx_config(conf, ctx)
-        return conf
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+def _node_from_data(data: Any) -> tuple[NodeConfig, bool]:
+    data = data if isinstance(data, dict) else {}
 
     raw_root_settings = data.get("root")
     raw_root_state = data.get("root_state")
@@ -602,7 +597,30 @@ def load_node(ctx: AgentContext | None = None) -> NodeConfig:
     )
     changed = conf.ensure_defaults()
     conf.sync_sections()
-    changed = _migrate_managed_key_material(conf) or changed
+    return conf, changed
+
+
+# Cached (NodeConfig, changed) entry whose key material was last migrated.
+_KEYS_MIGRATED: Any = None
+
+
+def load_node(ctx: AgentContext | None = None) -> NodeConfig:
+    global _KEYS_MIGRATED
+    path = _config_path()
+    # Parsed once per node.yaml version (see services.config_cache); callers get
+    # their own copy because NodeConfig is mutated and saved back.
+    cached = config_cache().derive(path, "node_config", _node_from_data)
+    if cached is None:
+        conf = _default_conf()
+        save_node(conf, ctx=ctx)
+        _sync_ctx_config(conf, ctx)
+        return conf
+    conf, changed = copy.deepcopy(cached)
+    # Re-homing key material copies files, so it is kept out of the cached
+    # builder and runs once per node.yaml version, on the first load of it.
+    if cached is not _KEYS_MIGRATED:
+        changed = _migrate_managed_key_material(conf) or changed
+        _KEYS_MIGRATED = cached
     if changed:
         save_node(conf, ctx=ctx)
     _sync_ctx_config(conf, ctx)
@@ -626,19 +644,13 @@ def save_node(conf: NodeConfig, *, ctx: AgentContext | None = None) -> None:
                 merged[key] = value
         return merged
 
-    try:
-        existing_raw = yaml.safe_load(path.read_text(encoding="utf-8")) if path.exists() else {}
-    except Exception:
-        existing_raw = {}
+    existing_raw = config_cache().load_yaml(path, default={})
     if not isinstance(existing_raw, dict):
         existing_raw = {}
 
     # Preserve unknown top-level sections (e.g. capacity) when rewriting node.yaml.
     merged = _deep_merge(existing_raw, data)
-    path.write_text(
-        yaml.safe_dump(merged, allow_unicode=True, sort_keys=False),
-        encoding="utf-8",
-    )
+    config_cache().write_yaml(path, merged)
     _sync_ctx_config(conf, ctx)
 
 
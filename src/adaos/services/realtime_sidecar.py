@@ -372,6 +372,33 @@ def _realtime_nats_ping_interval_s() -> float | None:
     return value
 
 
+def _realtime_relay_int(name: str, default: int, *, minimum: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = int(str(raw).strip() or "0")
+    except Exception:
+        return default
+    if value <= 0:
+        return default
+    return max(minimum, value)
+
+
+def _realtime_relay_max_bytes() -> int:
+    """Byte credit of each relay direction (queued plus in-flight)."""
+    return _realtime_relay_int("ADAOS_REALTIME_RELAY_MAX_BYTES", 4 * 1024 * 1024, minimum=65536)
+
+
+def _realtime_relay_max_frames() -> int:
+    return _realtime_relay_int("ADAOS_REALTIME_RELAY_MAX_FRAMES", 4096, minimum=16)
+
+
+def _realtime_relay_batch_bytes() -> int:
+    """Upper bound for chunks joined into one websocket frame / local write."""
+    return _realtime_relay_int("ADAOS_REALTIME_RELAY_BATCH_BYTES", 65536, minimum=1024)
+
+
 def _ws_socket(ws: Any) -> Any | None:
     try:
         transport = getattr(ws, "transport", None)
@@ -698,6 +725,126 @@ class _RelayStats:
     last_remote_disconnect_at: float | None = None
 
 
+class _RelayBuffer:
+    """Bounded FIFO between two relay legs with byte credits.
+
+    Producers wait for credit when ``max_bytes``/``max_frames`` are used up,
+    which stops reading from their side and propagates backpressure (TCP
+    window for the local client, websocket ``max_queue`` for the remote).
+    Credit is returned only after the consumer has finished writing a batch,
+    so in-flight data counts against the limit as well. A single frame larger
+    than the whole budget is admitted when the buffer is empty.
+    """
+
+    def __init__(self, name: str, *, max_bytes: int, max_frames: int) -> None:
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self.max_frames = int(max_frames)
+        self._items: deque[tuple[bytes, float]] = deque()
+        self._bytes = 0
+        self._frames = 0
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.enqueued_total = 0
+        self.sent_total = 0
+        self.dropped_total = 0
+        self.coalesced_total = 0
+        self.blocked_total = 0
+        self.blocked_s = 0.0
+        self.peak_bytes = 0
+        self.peak_frames = 0
+        self.last_latency_ms: float | None = None
+        self.max_latency_ms = 0.0
+        self.ewma_latency_ms: float | None = None
+
+    def _has_room(self, size: int) -> bool:
+        if self._frames == 0:
+            return True
+        return self._bytes + size <= self.max_bytes and self._frames < self.max_frames
+
+    def _append(self, payload: bytes) -> None:
+        self._items.append((payload, time.monotonic()))
+        self._bytes += len(payload)
+        self._frames += 1
+        self.enqueued_total += 1
+        self.peak_bytes = max(self.peak_bytes, self._bytes)
+        self.peak_frames = max(self.peak_frames, self._frames)
+        self._readable.set()
+
+    async def put(self, payload: bytes, *, coalesce: bool = False) -> None:
+        """Queue ``payload``, waiting for credit.
+
+        With ``coalesce`` a frame identical to the not yet taken tail is
+        merged into it instead (for idempotent control frames).
+        """
+        if coalesce and self._items and self._items[-1][0] == payload:
+            self.coalesced_total += 1
+            return
+        size = len(payload)
+        if not self._has_room(size):
+            started = time.monotonic()
+            self.blocked_total += 1
+            while not self._has_room(size):
+                self._writable.clear()
+                await self._writable.wait()
+            self.blocked_s += time.monotonic() - started
+        self._append(payload)
+
+    def offer(self, payload: bytes) -> bool:
+        """Non-blocking put for optional frames: dropped when out of credit."""
+        if not self._has_room(len(payload)):
+            self.dropped_total += 1
+            return False
+        self._append(payload)
+        return True
+
+    async def take(self, limit: int) -> tuple[list[bytes], int, float]:
+        """Pop queued frames up to ``limit`` bytes (at least one frame)."""
+        while not self._items:
+            self._readable.clear()
+            await self._readable.wait()
+        chunks: list[bytes] = []
+        size = 0
+        first_at = self._items[0][1]
+        while self._items and (not chunks or size + len(self._items[0][0]) <= limit):
+            payload, _ = self._items.popleft()
+            chunks.append(payload)
+            size += len(payload)
+        return chunks, size, first_at
+
+    def release(self, frames: int, size: int, enqueued_at: float) -> None:
+        """Return credit for a written batch and record its relay latency."""
+        self._bytes = max(0, self._bytes - size)
+        self._frames = max(0, self._frames - frames)
+        self.sent_total += frames
+        latency_ms = (time.monotonic() - enqueued_at) * 1000.0
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        prev = self.ewma_latency_ms
+        self.ewma_latency_ms = latency_ms if prev is None else prev + (latency_ms - prev) * 0.1
+        self._writable.set()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "depth_bytes": self._bytes,
+            "depth_frames": self._frames,
+            "peak_bytes": self.peak_bytes,
+            "peak_frames": self.peak_frames,
+            "max_bytes": self.max_bytes,
+            "max_frames": self.max_frames,
+            "enqueued_total": self.enqueued_total,
+            "sent_total": self.sent_total,
+            "dropped_total": self.dropped_total,
+            "coalesced_total": self.coalesced_total,
+            "blocked_total": self.blocked_total,
+            "blocked_s": round(self.blocked_s, 3),
+            "latency_ms_last": None if self.last_latency_ms is None else round(self.last_latency_ms, 3),
+            "latency_ms_ewma": None if self.ewma_latency_ms is None else round(self.ewma_latency_ms, 3),
+            "latency_ms_max": round(self.max_latency_ms, 3),
+        }
+
+
 class RealtimeSidecarServer:
     def __init__(self, *, host: str, port: int) -> None:
         self._host = str(host or "127.0.0.1")
@@ -708,6 +855,7 @@ class RealtimeSidecarServer:
         self._stopped = asyncio.Event()
         self._stats = _RelayStats()
         self._pending_ping_sources: deque[str] = deque()
+        self._relay_buffers: dict[str, _RelayBuffer] = {}
 
     def _begin_session_stats(self, *, session_id: str) -> None:
         previous = self._stats
@@ -796,6 +944,7 @@ class RealtimeSidecarServer:
             "last_remote_disconnect_ago_s": _ago(self._stats.last_remote_disconnect_at),
             "last_remote_connect_error": self._stats.last_remote_connect_error,
             "last_remote_connect_error_ago_s": _ago(self._stats.last_remote_connect_error_at),
+            "relay": {name: buf.snapshot() for name, buf in self._relay_buffers.items()},
             "loop_policy": type(asyncio.get_event_loop_policy()).__name__,
             "loop": type(asyncio.get_running_loop()).__name__,
         }
@@ -906,13 +1055,14 @@ class RealtimeSidecarServer:
         raise RuntimeError(f"realtime remote connect failed: {type(last_exc).__name__}: {last_exc}") from last_exc
 
     async def _relay_local_to_remote(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, ws: Any) -> None:
-        send_q: asyncio.Queue[bytes] = asyncio.Queue()
-        send_event = asyncio.Event()
-        recv_q: asyncio.Queue[bytes] = asyncio.Queue()
-
-        async def _queue_remote_payload(payload: bytes) -> None:
-            await send_q.put(payload)
-            send_event.set()
+        # Four long-lived loops per session, one per leg, connected by two
+        # bounded buffers; see _RelayBuffer for the flow control.
+        max_bytes = _realtime_relay_max_bytes()
+        max_frames = _realtime_relay_max_frames()
+        batch_bytes = _realtime_relay_batch_bytes()
+        send_buf = _RelayBuffer("to_remote", max_bytes=max_bytes, max_frames=max_frames)
+        recv_buf = _RelayBuffer("to_local", max_bytes=max_bytes, max_frames=max_frames)
+        self._relay_buffers = {"to_remote": send_buf, "to_local": recv_buf}
 
         async def _local_reader_loop() -> None:
             while True:
@@ -921,93 +1071,66 @@ class RealtimeSidecarServer:
                     return
                 self._stats.local_rx_bytes += len(chunk)
                 self._stats.last_local_rx_at = time.monotonic()
+                if chunk == NATS_PONG:
+                    # The server only resets its outstanding-ping counter on
+                    # PONG, so back-to-back queued PONGs are interchangeable.
+                    self._stats.local_nats_pongs_tx += 1
+                    await send_buf.put(chunk, coalesce=True)
+                    continue
+                await send_buf.put(chunk)
                 if chunk == NATS_PING:
+                    # Recorded after the put so the order of ping sources
+                    # matches the order of PINGs in the buffer.
                     self._stats.local_nats_pings_tx += 1
                     self._stats.client_nats_pings_outstanding += 1
                     self._pending_ping_sources.append("client")
-                elif chunk == NATS_PONG:
-                    self._stats.local_nats_pongs_tx += 1
-                await _queue_remote_payload(chunk)
 
         async def _remote_writer_loop() -> None:
-            recv_task: asyncio.Task[Any] | None = asyncio.create_task(ws.recv(), name="adaos-realtime-ws-recv")
-            wake_task: asyncio.Task[Any] | None = None
-            try:
-                while True:
-                    if recv_task is not None and recv_task.done():
-                        try:
-                            raw = await recv_task
-                        finally:
-                            recv_task = None
-                        if isinstance(raw, str):
-                            payload = raw.encode("utf-8", errors="replace")
-                        else:
-                            payload = bytes(raw)
-                        if not payload:
-                            recv_task = asyncio.create_task(ws.recv(), name="adaos-realtime-ws-recv")
-                            continue
-                        self._stats.remote_rx_bytes += len(payload)
-                        self._stats.last_remote_rx_at = time.monotonic()
-                        if payload == NATS_PING:
-                            self._stats.remote_nats_pings_rx += 1
-                        elif payload == NATS_PONG:
-                            self._stats.remote_nats_pongs_rx += 1
-                            source = self._pending_ping_sources.popleft() if self._pending_ping_sources else None
-                            if source == "sidecar":
-                                if self._stats.sidecar_nats_pings_outstanding > 0:
-                                    self._stats.sidecar_nats_pings_outstanding -= 1
-                                self._stats.sidecar_nats_pongs_rx += 1
-                                recv_task = asyncio.create_task(ws.recv(), name="adaos-realtime-ws-recv")
-                                continue
-                            if source == "client":
-                                if self._stats.client_nats_pings_outstanding > 0:
-                                    self._stats.client_nats_pings_outstanding -= 1
-                            elif self._stats.client_nats_pings_outstanding > 0:
-                                self._stats.client_nats_pings_outstanding -= 1
-                            elif self._stats.sidecar_nats_pings_outstanding > 0:
-                                self._stats.sidecar_nats_pings_outstanding -= 1
-                                self._stats.sidecar_nats_pongs_rx += 1
-                                recv_task = asyncio.create_task(ws.recv(), name="adaos-realtime-ws-recv")
-                                continue
-                        await recv_q.put(payload)
-                        recv_task = asyncio.create_task(ws.recv(), name="adaos-realtime-ws-recv")
-                        continue
-
-                    try:
-                        payload = send_q.get_nowait()
-                    except asyncio.QueueEmpty:
-                        payload = None
-                    if payload is not None:
-                        await ws.send(payload)
-                        self._stats.remote_tx_bytes += len(payload)
-                        self._stats.last_remote_tx_at = time.monotonic()
-                        if send_q.empty():
-                            send_event.clear()
-                        continue
+            while True:
+                chunks, size, enqueued_at = await send_buf.take(batch_bytes)
+                await ws.send(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+                send_buf.release(len(chunks), size, enqueued_at)
+                self._stats.remote_tx_bytes += size
+                self._stats.last_remote_tx_at = time.monotonic()
 
-                    send_event.clear()
-                    wake_task = asyncio.create_task(send_event.wait(), name="adaos-realtime-ws-send")
-                    done, pending = await asyncio.wait({recv_task, wake_task}, return_when=asyncio.FIRST_COMPLETED)
-                    if wake_task in done:
-                        wake_task = None
+        async def _remote_reader_loop() -> None:
+            while True:
+                raw = await ws.recv()
+                payload = raw.encode("utf-8", errors="replace") if isinstance(raw, str) else bytes(raw)
+                if not payload:
+                    continue
+                self._stats.remote_rx_bytes += len(payload)
+                self._stats.last_remote_rx_at = time.monotonic()
+                if payload == NATS_PING:
+                    self._stats.remote_nats_pings_rx += 1
+                elif payload == NATS_PONG:
+                    self._stats.remote_nats_pongs_rx += 1
+                    source = self._pending_ping_sources.popleft() if self._pending_ping_sources else None
+                    if source == "sidecar":
+                        if self._stats.sidecar_nats_pings_outstanding > 0:
+                            self._stats.sidecar_nats_pings_outstanding -= 1
+                        self._stats.sidecar_nats_pongs_rx += 1
                         continue
-                    if wake_task in pending and not wake_task.done():
-                        wake_task.cancel()
-                    wake_task = None
-                    if recv_task not in done:
+                    if source == "client":
+                        if self._stats.client_nats_pings_outstanding > 0:
+                            self._stats.client_nats_pings_outstanding -= 1
+                    elif self._stats.client_nats_pings_outstanding > 0:
+                        self._stats.client_nats_pings_outstanding -= 1
+                    elif self._stats.sidecar_nats_pings_outstanding > 0:
+                        self._stats.sidecar_nats_pings_outstanding -= 1
+                        self._stats.sidecar_nats_pongs_rx += 1
                         continue
-            finally:
-                if recv_task is not None and not recv_task.done():
-                    recv_task.cancel()
-                if wake_task is not None and not wake_task.done():
-                    wake_task.cancel()
+                # Blocks while the local client is slow; not calling recv()
+                # lets the websocket's own queue push back on the remote.
+                await recv_buf.put(payload)
 
-        async def _remote_reader_loop() -> None:
+        async def _local_writer_loop() -> None:
             while True:
-                payload = await recv_q.get()
-                writer.write(payload)
+                chunks, size, enqueued_at = await recv_buf.take(batch_bytes)
+                writer.writelines(chunks)
                 await writer.drain()
-                self._stats.local_tx_bytes += len(payload)
+                recv_buf.release(len(chunks), size, enqueued_at)
+                self._stats.local_tx_bytes += size
                 self._stats.last_local_tx_at = time.monotonic()
 
         async def _sidecar_keepalive_loop(*, interval_s: float) -> None:
@@ -1017,17 +1140,21 @@ class RealtimeSidecarServer:
                     return
                 if self._stats.sidecar_nats_pings_outstanding > 0:
                     continue
+                # Keepalive PINGs are optional: skip this tick if the
+                # upstream leg is already saturated.
+                if not send_buf.offer(NATS_PING):
+                    continue
                 self._pending_ping_sources.append("sidecar")
                 self._stats.sidecar_nats_pings_tx += 1
                 self._stats.sidecar_nats_pings_outstanding += 1
-                await _queue_remote_payload(NATS_PING)
 
         interval_s = _realtime_nats_ping_interval_s()
         self._stats.sidecar_nats_ping_interval_s = interval_s
         tasks = [
             asyncio.create_task(_local_reader_loop(), name="adaos-realtime-l2r"),
-            asyncio.create_task(_remote_writer_loop(), name="adaos-realtime-ws-io"),
-            asyncio.create_task(_remote_reader_loop(), name="adaos-realtime-r2l"),
+            asyncio.create_task(_remote_writer_loop(), name="adaos-realtime-ws-send"),
+            asyncio.create_task(_remote_reader_loop(), name="adaos-realtime-ws-recv"),
+            asyncio.create_task(_local_writer_loop(), name="adaos-realtime-r2l"),
         ]
         if interval_s is not None:
             tasks.append(asyncio.create_task(_sidecar_keepalive_loop(interval_s=interval_s), name="adaos-realtime-ka"))
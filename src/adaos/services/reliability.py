@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import threading
@@ -417,6 +418,30 @@ _HUB_ROOT_TRANSPORT_STATE: dict[str, Any] = {
 }
 _HUB_ROOT_TRANSPORT_HISTORY: deque[dict[str, Any]] = deque(maxlen=_TRANSPORT_HISTORY_LIMIT)
 
+# Generation counters: every mutation of the runtime state bumps the counter
+# of its domain and the total. Memoized sub-snapshots key on the domains they
+# read, the delta endpoint uses the total to answer unchanged polls cheaply.
+_GENERATIONS: dict[str, int] = {"channels": 0, "transport": 0, "protocol": 0, "total": 0}
+_CHANNEL_DIAG_CACHE: dict[str, Any] = {"generation": -1, "computed_at": 0.0, "valid_until": 0.0, "base": None}
+# Memoized builders return the cached object itself: like the sections held
+# by the delta API, these results are shared and must be treated as read-only.
+_READINESS_TREE_CACHE: dict[str, Any] = {"key": None, "value": None}
+_DEGRADED_MATRIX_CACHE: dict[str, Any] = {"key": None, "value": None}
+_MEMBER_CHANNELS_CACHE: dict[str, Any] = {"key": None, "base": None}
+_SIDECAR_PROBE_CACHE: dict[str, Any] = {"valid_until": 0.0, "value": None}
+
+
+def _bump(*domains: str) -> None:
+    # Callers hold _LOCK.
+    for domain in domains:
+        _GENERATIONS[domain] += 1
+    _GENERATIONS["total"] += 1
+
+
+def reliability_generation() -> int:
+    """Monotonic counter of reliability runtime mutations (process-local)."""
+    return _GENERATIONS["total"]
+
 _HUB_ROOT_PROTOCOL_TRAFFIC_CLASSES = ("control", "integration", "route", "sync_metadata")
 _HUB_ROOT_PROTOCOL_CLASS_DEFAULTS: dict[str, dict[str, Any]] = {
     "control": {
@@ -744,6 +769,7 @@ def configure_hub_root_transport_strategy(
         if hypothesis is not _UNSET:
             state["hypothesis"] = _copy_dict(hypothesis)
         state["updated_at"] = time.time()
+        _bump("transport")
 
 
 def record_hub_root_transport_event(
@@ -789,6 +815,7 @@ def record_hub_root_transport_event(
             state["last_failure_at"] = ts
         state["updated_at"] = ts
         _HUB_ROOT_TRANSPORT_HISTORY.append(record)
+        _bump("transport")
 
 
 def _hub_root_transport_assessment(history: list[dict[str, Any]], *, now_ts: float) -> dict[str, Any]:
@@ -930,6 +957,7 @@ def _set_signal(
     signal.updated_at = time.time()
     signal.observed = bool(observed)
     signal.details = dict(details or {})
+    _bump("channels")
 
 
 def _record_channel_transition(
@@ -952,6 +980,7 @@ def _record_channel_transition(
             "details": dict(details or {}),
         }
     )
+    _bump("channels")
 
 
 def _record_channel_incident(
@@ -972,6 +1001,7 @@ def _record_channel_incident(
             "details": dict(details or {}),
         }
     )
+    _bump("channels")
 
 
 def _protocol_class_state(traffic_class: str) -> dict[str, Any]:
@@ -1091,6 +1121,7 @@ def observe_hub_root_protocol_subscription(
         entry["updated_at"] = now
         _HUB_ROOT_PROTOCOL_RUNTIME["updated_at"] = now
         _protocol_refresh_subjects_locked()
+        _bump("protocol")
 
 
 def observe_hub_root_protocol_publish(
@@ -1121,6 +1152,7 @@ def observe_hub_root_protocol_publish(
         if latency_ms is not None:
             cls["last_publish_latency_ms"] = round(float(latency_ms), 3)
         _HUB_ROOT_PROTOCOL_RUNTIME["updated_at"] = now
+        _bump("protocol")
 
 
 def observe_hub_root_route_runtime(**details: Any) -> None:
@@ -1139,6 +1171,7 @@ def observe_hub_root_route_runtime(**details: Any) -> None:
             }
         route_runtime["updated_at"] = now
         _HUB_ROOT_PROTOCOL_RUNTIME["updated_at"] = now
+        _bump("protocol")
 
 
 def observe_hub_root_route_flow(
@@ -1191,6 +1224,7 @@ def observe_hub_root_route_flow(
         entry["updated_at"] = now
         route_runtime["updated_at"] = now
         _HUB_ROOT_PROTOCOL_RUNTIME["updated_at"] = now
+        _bump("protocol")
 
 
 def observe_hub_root_integration_outbox(
@@ -1278,6 +1312,7 @@ def observe_hub_root_integration_outbox(
             entry["last_error_at"] = now
         entry["updated_at"] = now
         _HUB_ROOT_PROTOCOL_RUNTIME["updated_at"] = now
+        _bump("protocol")
 
 
 def reset_reliability_runtime_state() -> None:
@@ -1311,6 +1346,9 @@ def reset_reliability_runtime_state() -> None:
         _HUB_ROOT_TRANSPORT_HISTORY.clear()
         _HUB_ROOT_PROTOCOL_RUNTIME.clear()
         _HUB_ROOT_PROTOCOL_RUNTIME.update(_new_protocol_runtime())
+        _MEMBER_CHANNELS_CACHE.update(key=None, base=None)
+        _SIDECAR_PROBE_CACHE.update(valid_until=0.0, value=None)
+        _bump("channels", "transport", "protocol")
 
 
 def mark_root_control_up(*, summary: str = "hub-root control session established", details: dict[str, Any] | None = None) -> None:
@@ -1447,6 +1485,7 @@ def observe_route_e2e(*, details: dict[str, Any]) -> None:
             _ROUTE.details = dict(details)
         _ROUTE.updated_at = time.time()
         _ROUTE.observed = True
+        _bump("channels")
 
 
 def set_integration_readiness(
@@ -1669,75 +1708,127 @@ def _channel_stability_assessment(
     return {"state": state, "score": score, "reason": reason}
 
 
-def channel_diagnostics_snapshot() -> dict[str, Any]:
-    now_ts = time.time()
-    with _LOCK:
-        signals = {
-            "root_control": _ROOT_CONTROL,
-            "route": _ROUTE,
-        }
-        diagnostics: dict[str, Any] = {}
-        for name, signal in signals.items():
-            history_entries = list(_CHANNEL_HISTORY.get(name) or [])
-            current_status = signal.status.value
-            last_ready_at = _last_transition_at(history_entries, ready=True)
-            if last_ready_at is None and current_status == ReadinessStatus.READY.value:
-                last_ready_at = signal.updated_at or None
-            last_non_ready_at = _last_transition_at(history_entries, ready=False)
-            if last_non_ready_at is None and current_status not in {
-                ReadinessStatus.READY.value,
-                ReadinessStatus.UNKNOWN.value,
-                ReadinessStatus.NOT_APPLICABLE.value,
-            }:
-                last_non_ready_at = signal.updated_at or None
-            last_transition_at = _last_transition_at(history_entries, ready=None) or signal.updated_at or None
-            non_ready_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=False)
-            non_ready_15m = _history_count(history_entries, within_s=900.0, now_ts=now_ts, ready=False)
-            ready_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=True)
-            transitions_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=None)
-            incident_classes_5m = _incident_class_counts(name, history_entries, within_s=300.0, now_ts=now_ts)
-            incident_classes_15m = _incident_class_counts(name, history_entries, within_s=900.0, now_ts=now_ts)
-            recent_incident_samples = _recent_incident_samples(name, history_entries, limit=6)
-            last_incident_class = recent_incident_samples[-1]["class"] if recent_incident_samples else None
-            stability = _channel_stability_assessment(
+def _channel_diagnostics_base_locked(now_ts: float) -> tuple[dict[str, Any], float]:
+    """History-derived part of the channel diagnostics (everything but ages).
+
+    Returns the per-channel base and the time until which the windowed counts
+    stay valid: the earliest moment an entry leaves the 5m or 15m window.
+    """
+    signals = {
+        "root_control": _ROOT_CONTROL,
+        "route": _ROUTE,
+    }
+    valid_until = float("inf")
+    base: dict[str, Any] = {}
+    for name, signal in signals.items():
+        history_entries = list(_CHANNEL_HISTORY.get(name) or [])
+        current_status = signal.status.value
+        last_ready_at = _last_transition_at(history_entries, ready=True)
+        if last_ready_at is None and current_status == ReadinessStatus.READY.value:
+            last_ready_at = signal.updated_at or None
+        last_non_ready_at = _last_transition_at(history_entries, ready=False)
+        if last_non_ready_at is None and current_status not in {
+            ReadinessStatus.READY.value,
+            ReadinessStatus.UNKNOWN.value,
+            ReadinessStatus.NOT_APPLICABLE.value,
+        }:
+            last_non_ready_at = signal.updated_at or None
+        last_transition_at = _last_transition_at(history_entries, ready=None) or signal.updated_at or None
+        non_ready_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=False)
+        non_ready_15m = _history_count(history_entries, within_s=900.0, now_ts=now_ts, ready=False)
+        ready_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=True)
+        transitions_5m = _history_count(history_entries, within_s=300.0, now_ts=now_ts, ready=None)
+        incident_classes_5m = _incident_class_counts(name, history_entries, within_s=300.0, now_ts=now_ts)
+        incident_classes_15m = _incident_class_counts(name, history_entries, within_s=900.0, now_ts=now_ts)
+        recent_incident_samples = _recent_incident_samples(name, history_entries, limit=6)
+        for item in history_entries:
+            try:
+                ts = float(item.get("ts") or 0.0)
+            except Exception:
+                continue
+            for window in (300.0, 900.0):
+                if now_ts <= ts + window < valid_until:
+                    valid_until = ts + window
+        base[name] = {
+            "status": current_status,
+            "summary": signal.summary,
+            "updated_at": signal.updated_at or None,
+            "last_transition_at": last_transition_at,
+            "last_ready_at": last_ready_at,
+            "last_non_ready_at": last_non_ready_at,
+            "recent_non_ready_transitions_5m": non_ready_5m,
+            "recent_non_ready_transitions_15m": non_ready_15m,
+            "recent_ready_transitions_5m": ready_5m,
+            "recent_transitions_5m": transitions_5m,
+            "incident_classes_5m": incident_classes_5m,
+            "incident_classes_15m": incident_classes_15m,
+            "last_incident_class": recent_incident_samples[-1]["class"] if recent_incident_samples else None,
+            "total_non_ready_transitions": sum(
+                1 for item in history_entries if str(item.get("status") or "") != ReadinessStatus.READY.value
+            ),
+            "total_ready_transitions": sum(
+                1 for item in history_entries if str(item.get("status") or "") == ReadinessStatus.READY.value
+            ),
+            "stability": _channel_stability_assessment(
                 status=current_status,
                 non_ready_5m=non_ready_5m,
                 non_ready_15m=non_ready_15m,
                 transitions_5m=transitions_5m,
-            )
-            diagnostics[name] = {
-                "status": current_status,
-                "summary": signal.summary,
-                "updated_at": signal.updated_at or None,
-                "status_age_s": _round_age(now_ts, signal.updated_at or None),
-                "last_transition_at": last_transition_at,
-                "last_transition_ago_s": _round_age(now_ts, last_transition_at),
-                "last_ready_at": last_ready_at,
-                "last_ready_ago_s": _round_age(now_ts, last_ready_at),
-                "last_non_ready_at": last_non_ready_at,
-                "last_non_ready_ago_s": _round_age(now_ts, last_non_ready_at),
-                "recent_non_ready_transitions_5m": non_ready_5m,
-                "recent_non_ready_transitions_15m": non_ready_15m,
-                "recent_ready_transitions_5m": ready_5m,
-                "recent_transitions_5m": transitions_5m,
-                "incident_classes_5m": incident_classes_5m,
-                "incident_classes_15m": incident_classes_15m,
-                "last_incident_class": last_incident_class,
-                "total_non_ready_transitions": sum(
-                    1 for item in history_entries if str(item.get("status") or "") != ReadinessStatus.READY.value
-                ),
-                "total_ready_transitions": sum(
-                    1 for item in history_entries if str(item.get("status") or "") == ReadinessStatus.READY.value
-                ),
-                "stable_for_s": _round_age(now_ts, last_ready_at) if current_status == ReadinessStatus.READY.value else None,
-                "non_ready_for_s": _round_age(now_ts, last_non_ready_at)
-                if current_status not in {ReadinessStatus.READY.value, ReadinessStatus.UNKNOWN.value, ReadinessStatus.NOT_APPLICABLE.value}
-                else None,
-                "stability": stability,
-                "recent_incident_samples": recent_incident_samples,
-                "recent_history": history_entries[-8:],
-            }
-        return diagnostics
+            ),
+            "recent_incident_samples": recent_incident_samples,
+            "recent_history": history_entries[-8:],
+        }
+    return base, valid_until
+
+
+def channel_diagnostics_snapshot() -> dict[str, Any]:
+    now_ts = time.time()
+    with _LOCK:
+        cache = _CHANNEL_DIAG_CACHE
+        if (
+            cache["base"] is None
+            or cache["generation"] != _GENERATIONS["channels"]
+            or not cache["computed_at"] <= now_ts < cache["valid_until"]
+        ):
+            cache["base"], cache["valid_until"] = _channel_diagnostics_base_locked(now_ts)
+            cache["generation"] = _GENERATIONS["channels"]
+            cache["computed_at"] = now_ts
+        base = cache["base"]
+    diagnostics: dict[str, Any] = {}
+    for name, item in base.items():
+        current_status = item["status"]
+        last_transition_at = item["last_transition_at"]
+        last_ready_at = item["last_ready_at"]
+        last_non_ready_at = item["last_non_ready_at"]
+        diagnostics[name] = {
+            "status": current_status,
+            "summary": item["summary"],
+            "updated_at": item["updated_at"],
+            "status_age_s": _round_age(now_ts, item["updated_at"]),
+            "last_transition_at": last_transition_at,
+            "last_transition_ago_s": _round_age(now_ts, last_transition_at),
+            "last_ready_at": last_ready_at,
+            "last_ready_ago_s": _round_age(now_ts, last_ready_at),
+            "last_non_ready_at": last_non_ready_at,
+            "last_non_ready_ago_s": _round_age(now_ts, last_non_ready_at),
+            "recent_non_ready_transitions_5m": item["recent_non_ready_transitions_5m"],
+            "recent_non_ready_transitions_15m": item["recent_non_ready_transitions_15m"],
+            "recent_ready_transitions_5m": item["recent_ready_transitions_5m"],
+            "recent_transitions_5m": item["recent_transitions_5m"],
+            "incident_classes_5m": dict(item["incident_classes_5m"]),
+            "incident_classes_15m": dict(item["incident_classes_15m"]),
+            "last_incident_class": item["last_incident_class"],
+            "total_non_ready_transitions": item["total_non_ready_transitions"],
+            "total_ready_transitions": item["total_ready_transitions"],
+            "stable_for_s": _round_age(now_ts, last_ready_at) if current_status == ReadinessStatus.READY.value else None,
+            "non_ready_for_s": _round_age(now_ts, last_non_ready_at)
+            if current_status not in {ReadinessStatus.READY.value, ReadinessStatus.UNKNOWN.value, ReadinessStatus.NOT_APPLICABLE.value}
+            else None,
+            "stability": dict(item["stability"]),
+            "recent_incident_samples": [dict(sample) for sample in item["recent_incident_samples"]],
+            "recent_history": list(item["recent_history"]),
+        }
+    return diagnostics
 
 
 def _transport_task_done(record: dict[str, Any], key: str) -> bool:
@@ -2008,6 +2099,38 @@ def _derived_integration_node(name: str, root_control: dict[str, Any], observed_
     )
 
 
+def _readiness_inputs_key(
+    diagnostics: dict[str, Any],
+    member_channels: dict[str, Any],
+    member_state: dict[str, Any],
+) -> tuple[Any, ...]:
+    """The fields of the readiness inputs that the tree is derived from."""
+    incidents = []
+    for name in ("root_control", "route"):
+        diag = diagnostics.get(name) if isinstance(diagnostics.get(name), dict) else {}
+        stability = diag.get("stability") if isinstance(diag.get("stability"), dict) else {}
+        incidents.append(
+            (
+                stability.get("state"),
+                stability.get("reason"),
+                diag.get("recent_non_ready_transitions_5m"),
+                diag.get("recent_transitions_5m"),
+            )
+        )
+    assessment = member_state.get("assessment") if isinstance(member_state.get("assessment"), dict) else {}
+    channels = member_channels.get("channels") if isinstance(member_channels.get("channels"), dict) else {}
+    sync = channels.get("hub_member.sync") if isinstance(channels.get("hub_member.sync"), dict) else {}
+    return (
+        tuple(incidents),
+        member_state.get("member_total"),
+        assessment.get("state"),
+        assessment.get("reason"),
+        sync.get("status"),
+        sync.get("reason"),
+        sync.get("active_path"),
+    )
+
+
 def build_readiness_tree(
     *,
     role: str,
@@ -2019,11 +2142,50 @@ def build_readiness_tree(
     hub_member_channels: dict[str, Any] | None = None,
     hub_member_connection_state: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    signals = runtime_signal_snapshot()
     diagnostics = channel_diagnostics if isinstance(channel_diagnostics, dict) else channel_diagnostics_snapshot()
-    role_norm = str(role or "").strip().lower()
     member_channels = hub_member_channels if isinstance(hub_member_channels, dict) else {}
     member_state = hub_member_connection_state if isinstance(hub_member_connection_state, dict) else {}
+    with _LOCK:
+        # Signals are covered by the "channels" generation, the rest by the
+        # arguments and the input fields the tree reads.
+        key = (
+            _GENERATIONS["channels"],
+            str(role or "").strip().lower(),
+            bool(local_ready),
+            node_state,
+            bool(draining),
+            connected_to_hub,
+            _readiness_inputs_key(diagnostics, member_channels, member_state),
+        )
+        cache = _READINESS_TREE_CACHE
+        if cache["value"] is None or cache["key"] != key:
+            cache["value"] = _build_readiness_tree(
+                role=role,
+                local_ready=local_ready,
+                node_state=node_state,
+                draining=draining,
+                connected_to_hub=connected_to_hub,
+                diagnostics=diagnostics,
+                member_channels=member_channels,
+                member_state=member_state,
+            )
+            cache["key"] = key
+        return cache["value"]
+
+
+def _build_readiness_tree(
+    *,
+    role: str,
+    local_ready: bool,
+    node_state: str,
+    draining: bool,
+    connected_to_hub: bool | None,
+    diagnostics: dict[str, Any],
+    member_channels: dict[str, Any],
+    member_state: dict[str, Any],
+) -> dict[str, Any]:
+    signals = runtime_signal_snapshot()
+    role_norm = str(role or "").strip().lower()
     member_assessment = member_state.get("assessment") if isinstance(member_state.get("assessment"), dict) else {}
     member_channels_map = member_channels.get("channels") if isinstance(member_channels.get("channels"), dict) else {}
     member_sync_channel = (
@@ -2263,7 +2425,32 @@ def _matrix_entry(*, allowed: bool, reason: str, required_ready: list[str]) -> d
     }
 
 
+def _readiness_statuses(readiness_tree: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    statuses: list[tuple[str, Any]] = []
+    for name, node in readiness_tree.items():
+        if not isinstance(node, dict):
+            continue
+        if "status" in node:
+            statuses.append((name, node.get("status")))
+            continue
+        statuses.extend(
+            (f"{name}.{sub}", item.get("status")) for sub, item in node.items() if isinstance(item, dict)
+        )
+    return tuple(statuses)
+
+
 def build_degraded_matrix(*, role: str, readiness_tree: dict[str, Any]) -> dict[str, Any]:
+    # The matrix only looks at node statuses.
+    key = (str(role or "").strip().lower(), _readiness_statuses(readiness_tree))
+    with _LOCK:
+        cache = _DEGRADED_MATRIX_CACHE
+        if cache["value"] is None or cache["key"] != key:
+            cache["value"] = _build_degraded_matrix(role=role, readiness_tree=readiness_tree)
+            cache["key"] = key
+        return cache["value"]
+
+
+def _build_degraded_matrix(*, role: str, readiness_tree: dict[str, Any]) -> dict[str, Any]:
     role_norm = str(role or "").strip().lower()
     local_core = readiness_tree["hub_local_core"]
     root_control = readiness_tree["root_control"]
@@ -2624,6 +2811,24 @@ def _semantic_channel_status(
     return ("ready", "active", f"{active_path} is the active authority path")
 
 
+def _candidate_state(spec: SemanticChannelSpec, evidence: dict[str, Any]) -> dict[str, Any]:
+    return {
+        path: {
+            "available": bool((evidence.get(path) or {}).get("available")),
+            **(
+                {
+                    key: value
+                    for key, value in (evidence.get(path) or {}).items()
+                    if key != "available"
+                }
+                if isinstance(evidence.get(path), dict)
+                else {}
+            ),
+        }
+        for path in spec.candidate_paths
+    }
+
+
 def hub_member_semantic_channels_snapshot(
     *,
     role: str,
@@ -2645,7 +2850,43 @@ def hub_member_semantic_channels_snapshot(
             hub_root_protocol=hub_root_protocol,
         )
     )
+    # Path selection only depends on which paths are available: while that
+    # set is unchanged and no channel sits in a freeze hold (which expires
+    # with time alone) the previous selection stands and only the evidence
+    # details and ages are refreshed.
+    key = (
+        role_norm,
+        tuple(sorted(path for path, item in evidence.items() if isinstance(item, dict) and item.get("available"))),
+    )
+    with _LOCK:
+        cache = _MEMBER_CHANNELS_CACHE
+        if cache["base"] is None or cache["key"] != key:
+            base = _hub_member_semantic_channels_base(role_norm=role_norm, evidence=evidence, now=now)
+            holding = any(item.get("selection") == "freeze_hold" for item in base["channels"].values())
+            cache["key"] = None if holding else key
+            cache["base"] = base
+            channels = base["channels"]
+        else:
+            base = cache["base"]
+            channels = {
+                spec.channel_id: {
+                    **base["channels"][spec.channel_id],
+                    "last_switch_ago_s": _round_age(
+                        now, _HUB_MEMBER_CHANNEL_RUNTIME.get(spec.channel_id, {}).get("last_switch_at")
+                    ),
+                    "candidate_state": _candidate_state(spec, evidence),
+                }
+                for spec in HUB_MEMBER_CHANNEL_SPECS
+            }
+    return {
+        "assessment": dict(base["assessment"]),
+        "channels": channels,
+        "transport_evidence": evidence,
+        "updated_at": now,
+    }
 
+
+def _hub_member_semantic_channels_base(*, role_norm: str, evidence: dict[str, Any], now: float) -> dict[str, Any]:
     channels: dict[str, dict[str, Any]] = {}
     assessment_state = "nominal"
     assessment_reasons: list[str] = []
@@ -2696,21 +2937,7 @@ def hub_member_semantic_channels_snapshot(
                 freeze_remaining_s=freeze_remaining_s,
             )
             last_switch_ago_s = _round_age(now, runtime_entry.get("last_switch_at"))
-            candidate_state = {
-                path: {
-                    "available": bool((evidence.get(path) or {}).get("available")),
-                    **(
-                        {
-                            key: value
-                            for key, value in (evidence.get(path) or {}).items()
-                            if key != "available"
-                        }
-                        if isinstance(evidence.get(path), dict)
-                        else {}
-                    ),
-                }
-                for path in spec.candidate_paths
-            }
+            candidate_state = _candidate_state(spec, evidence)
             entry = {
                 "channel_id": spec.channel_id,
                 "title": spec.title,
@@ -2773,8 +3000,6 @@ def hub_member_semantic_channels_snapshot(
             "reason": "; ".join(assessment_reasons),
         },
         "channels": channels,
-        "transport_evidence": evidence,
-        "updated_at": now,
     }
 
 
@@ -3498,6 +3723,22 @@ def reliability_model_snapshot() -> dict[str, Any]:
     }
 
 
+def _sidecar_listener_probe(probe: Any) -> dict[str, Any]:
+    # The listener lookup scans every inet socket of the host (psutil); it is
+    # OS state outside the generation counters, so it is reused for a short
+    # while instead.
+    now_ts = time.monotonic()
+    with _LOCK:
+        cache = _SIDECAR_PROBE_CACHE
+        if cache["value"] is not None and now_ts < cache["valid_until"]:
+            return dict(cache["value"])
+    value = probe()
+    with _LOCK:
+        cache["value"] = value
+        cache["valid_until"] = now_ts + max(0.0, _env_float("ADAOS_RELIABILITY_SIDECAR_PROBE_S", 2.0))
+    return dict(value)
+
+
 def sidecar_runtime_snapshot(
     *,
     readiness_tree: dict[str, Any] | None = None,
@@ -3551,7 +3792,7 @@ def sidecar_runtime_snapshot(
         "selected_server": transport_strategy.get("selected_server"),
         "last_transport_event": transport_strategy.get("last_event"),
     }
-    process_snapshot = realtime_sidecar_listener_snapshot()
+    process_snapshot = _sidecar_listener_probe(realtime_sidecar_listener_snapshot)
     if enabled:
         status = "unknown"
         summary = "realtime sidecar is enabled but has no diagnostics yet"
@@ -4090,3 +4331,177 @@ def reliability_snapshot(
             "sync_runtime": sync_runtime,
         },
     }
+
+
+# --- delta snapshots -------------------------------------------------------
+#
+# Clients that poll /reliability keep receiving a ~100 KB document that rarely
+# changes. The delta API splits the snapshot into sections ("node", "model",
+# "runtime.<name>"), versions each section by a fingerprint that ignores
+# age-like fields, and returns only the sections newer than the client's
+# version. Full recomputation happens at most once per refresh interval while
+# the mutation generation is unchanged, so polling an idle node is cheap.
+
+_DELTA_VOLATILE_SUFFIXES = ("_ago_s", "_age_s")
+_DELTA_VOLATILE_KEYS = frozenset({"stable_for_s", "non_ready_for_s"})
+# Sections whose top-level ``updated_at`` is the time the snapshot was built.
+_DELTA_STAMPED_SECTIONS = frozenset({"runtime.hub_member_channels", "runtime.hub_member_connection_state"})
+_DELTA_EPOCH = f"{os.getpid():x}-{int(time.time() * 1000):x}"
+_DELTA_LOCK = threading.Lock()
+_DELTA_STATE: dict[str, Any] = {
+    "version": 0,
+    "generation": -1,
+    "computed_at": 0.0,
+    "args": None,
+    "sections": {},
+}
+_DELTA_STATS: dict[str, int] = {"requests": 0, "computed": 0, "reused": 0}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)) or default)
+    except Exception:
+        return float(default)
+
+
+def reliability_delta_refresh_s() -> float:
+    """How long an unchanged generation may reuse the last computed snapshot."""
+    return max(0.0, _env_float("ADAOS_RELIABILITY_DELTA_REFRESH_S", 2.0))
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _strip_volatile(item)
+            for key, item in value.items()
+            if not (isinstance(key, str) and (key.endswith(_DELTA_VOLATILE_SUFFIXES) or key in _DELTA_VOLATILE_KEYS))
+        }
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def _advance_ages(value: Any, elapsed: float) -> Any:
+    """Copy of ``value`` with its age fields moved ``elapsed`` seconds forward."""
+    if isinstance(value, dict):
+        out: dict[Any, Any] = {}
+        for key, item in value.items():
+            if (
+                isinstance(key, str)
+                and (key.endswith(_DELTA_VOLATILE_SUFFIXES) or key in _DELTA_VOLATILE_KEYS)
+                and isinstance(item, (int, float))
+                and not isinstance(item, bool)
+            ):
+                out[key] = round(item + elapsed, 3)
+            else:
+                out[key] = _advance_ages(item, elapsed)
+        return out
+    if isinstance(value, list):
+        return [_advance_ages(item, elapsed) for item in value]
+    return value
+
+
+def _section_fingerprint(name: str, value: Any) -> str:
+    stripped = _strip_volatile(value)
+    if name in _DELTA_STAMPED_SECTIONS and isinstance(stripped, dict):
+        stripped.pop("updated_at", None)
+    return json.dumps(stripped, sort_keys=True, default=str)
+
+
+def _reliability_sections(snapshot: dict[str, Any]) -> dict[str, Any]:
+    sections: dict[str, Any] = {"node": snapshot.get("node"), "model": snapshot.get("model")}
+    runtime = snapshot.get("runtime") if isinstance(snapshot.get("runtime"), dict) else {}
+    for key, value in runtime.items():
+        sections[f"runtime.{key}"] = value
+    return sections
+
+
+def reliability_snapshot_delta(
+    *,
+    since: int | None = None,
+    epoch: str | None = None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Sections of :func:`reliability_snapshot` that changed after version ``since``.
+
+    ``kwargs`` are the arguments of :func:`reliability_snapshot`. A missing or
+    foreign ``epoch`` (the process restarted) or an unknown ``since`` yields
+    every section with ``full=True``. Versions only move when a section's
+    content changes; age fields (``*_ago_s`` etc.) never bump a version on
+    their own. A snapshot reused within ``reliability_delta_refresh_s()`` has
+    the age fields (and ``updated_at`` stamps) of its returned sections moved
+    forward by the time elapsed since it was computed.
+    """
+    now = time.monotonic()
+    args_key = json.dumps(kwargs, sort_keys=True, default=str)
+    with _DELTA_LOCK:
+        state = _DELTA_STATE
+        sections: dict[str, tuple[str, int, Any]] = state["sections"]
+        _DELTA_STATS["requests"] += 1
+        generation = reliability_generation()
+        if (
+            not sections
+            or state["args"] != args_key
+            or state["generation"] != generation
+            or now - float(state["computed_at"]) >= reliability_delta_refresh_s()
+        ):
+            snapshot = reliability_snapshot(**kwargs)
+            bumped = False
+            for name, value in _reliability_sections(snapshot).items():
+                fingerprint = _section_fingerprint(name, value)
+                previous = sections.get(name)
+                if previous is not None and previous[0] == fingerprint:
+                    sections[name] = (fingerprint, previous[1], value)
+                    continue
+                if not bumped:
+                    state["version"] += 1
+                    bumped = True
+                sections[name] = (fingerprint, state["version"], value)
+            state.update(generation=generation, computed_at=now, args=args_key)
+            _DELTA_STATS["computed"] += 1
+        else:
+            _DELTA_STATS["reused"] += 1
+        version = int(state["version"])
+        full = epoch != _DELTA_EPOCH or since is None or not 0 <= int(since) <= version
+        changed = {name: value for name, (_, ver, value) in sections.items() if full or ver > int(since or 0)}
+        elapsed = now - float(state["computed_at"])
+    if elapsed > 0:
+        for name, value in changed.items():
+            value = _advance_ages(value, elapsed)
+            if name in _DELTA_STAMPED_SECTIONS and isinstance(value, dict) and isinstance(value.get("updated_at"), (int, float)):
+                value["updated_at"] = value["updated_at"] + elapsed
+            changed[name] = value
+    return {
+        "ok": True,
+        "epoch": _DELTA_EPOCH,
+        "version": version,
+        "generation": generation,
+        "full": full,
+        "sections": changed,
+    }
+
+
+async def wait_reliability_change(generation: int, *, timeout_s: float) -> bool:
+    """Sleep until the mutation generation moves past ``generation`` or the timeout.
+
+    Polls the in-memory counter, which costs a dict lookup per tick.
+    """
+    step = max(0.01, _env_float("ADAOS_RELIABILITY_DELTA_POLL_S", 0.1))
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    while reliability_generation() == generation:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(step, remaining))
+    return True
+
+
+def reliability_delta_stats() -> dict[str, Any]:
+    with _DELTA_LOCK:
+        return {
+            **_DELTA_STATS,
+            "version": int(_DELTA_STATE["version"]),
+            "generation": reliability_generation(),
+            "sections": len(_DELTA_STATE["sections"]),
+        }
@@ -1,11 +1,18 @@
 # src\adaos\services\root\client.py
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Mapping, MutableMapping, Optional, Tuple
+import atexit
+import base64
+import hashlib
 import httpx
 import ssl, os
+import threading
+
+from . import draft_sync
 
 
 class RootHttpError(RuntimeError):
@@ -18,6 +25,89 @@ class RootHttpError(RuntimeError):
         self.payload = payload
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _http2_enabled() -> bool:
+    if (os.getenv("ADAOS_ROOT_HTTP2") or "1").strip().lower() in {"0", "false", "no", "off"}:
+        return False
+    try:
+        import h2  # noqa: F401  # type: ignore
+    except Exception:
+        return False
+    return True
+
+
+# Persistent keep-alive clients shared by every RootHttpClient of the process,
+# keyed by (base_url, verify, cert): a TLS handshake per call used to dominate
+# short Root requests. SSL contexts are keyed by identity and kept alive here.
+_POOL: "OrderedDict[tuple, tuple[Any, httpx.Client]]" = OrderedDict()
+_POOL_LOCK = threading.Lock()
+_POOL_MAX = 8
+_CA_CONTEXTS: dict[tuple[str, int, int], ssl.SSLContext] = {}
+# base URLs whose Root answered the chunked draft endpoints with 404/405/501
+_NO_CHUNKED: set[str] = set()
+# base URLs whose Root serves no draft manifests (only the legacy archive endpoint)
+_NO_CHUNKED_FETCH: set[str] = set()
+_LEGACY_STATUSES = (404, 405, 501)
+
+
+def _ca_context(ca_path: Path) -> ssl.SSLContext:
+    st = ca_path.stat()
+    key = (str(ca_path), st.st_mtime_ns, st.st_size)
+    ctx = _CA_CONTEXTS.get(key)
+    if ctx is None:
+        ctx = ssl.create_default_context()
+        # Add user-provided CA certificates without discarding system defaults.
+        ctx.load_verify_locations(cafile=str(ca_path))
+        _CA_CONTEXTS[key] = ctx
+    return ctx
+
+
+def _pooled_client(base_url: str, verify: Any, cert: tuple[str, str] | None) -> httpx.Client:
+    verify_key = ("ctx", id(verify)) if isinstance(verify, ssl.SSLContext) else verify
+    key = (base_url, verify_key, tuple(cert) if cert else None)
+    with _POOL_LOCK:
+        entry = _POOL.get(key)
+        if entry is not None and not entry[1].is_closed:
+            _POOL.move_to_end(key)
+            return entry[1]
+        size = _env_int("ADAOS_ROOT_MAX_CONNECTIONS", 10)
+        client = httpx.Client(
+            base_url=base_url,
+            verify=verify,
+            cert=cert,
+            http2=_http2_enabled(),
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size, keepalive_expiry=60.0),
+        )
+        _POOL[key] = (verify, client)
+        while len(_POOL) > _POOL_MAX:
+            _, (_verify, old) = _POOL.popitem(last=False)
+            try:
+                old.close()
+            except Exception:
+                pass
+        return client
+
+
+def close_pooled_clients() -> None:
+    with _POOL_LOCK:
+        entries = list(_POOL.values())
+        _POOL.clear()
+    for _verify, client in entries:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_pooled_clients)
+
+
 @dataclass(slots=True)
 class RootHttpClient:
     """HTTP client for the Inimatic Root API."""
@@ -112,12 +202,14 @@ class RootHttpClient:
         *,
         json: Mapping[str, Any] | None = None,
         data: Any | None = None,
+        content: bytes | None = None,
         params: Mapping[str, Any] | None = None,
         headers: Mapping[str, str] | None = None,
         verify: str | bool | ssl.SSLContext | None = None,
         cert: tuple[str, str] | None = None,
         timeout: float | None = None,
         accept_204: bool = False,
+        raw: bool = False,
     ) -> Any:
         request_headers: MutableMapping[str, str] | None = None
         if headers:
@@ -128,29 +220,26 @@ class RootHttpClient:
             if mode == "append":
                 ca_path = Path(effective_verify)
                 if ca_path.exists():
-                    ctx = ssl.create_default_context()
-                    # Add user-provided CA certificates without discarding system defaults.
-                    ctx.load_verify_locations(cafile=str(ca_path))
-                    effective_verify = ctx
+                    effective_verify = _ca_context(ca_path)
         try:
-            with httpx.Client(
-                base_url=self.base_url,
+            client = _pooled_client(self.base_url, effective_verify, cert)
+            response = client.request(
+                method,
+                path,
+                params=params,
+                json=json,
+                data=data,
+                content=content,
+                headers=request_headers,
                 timeout=timeout or self.timeout,
-                verify=effective_verify,
-                cert=cert,
-            ) as client:
-                response = client.request(
-                    method,
-                    path,
-                    params=params,
-                    json=json,
-                    data=data,
-                    headers=request_headers,
-                )
+            )
         except httpx.RequestError as exc:  # pragma: no cover - network errors are environment specific
             raise RootHttpError(f"{method} {path} failed: {exc}", status_code=0) from exc
 
-        content: Any | None = None
+        if raw and response.status_code < 400:
+            return response.content
+
+        content = None
         if response.content:
             try:
                 content = response.json()
@@ -476,20 +565,47 @@ class RootHttpClient:
         verify: str | bool | ssl.SSLContext = None,
         cert: tuple[str, str] | None = None,
         timeout: float = 60.0,
+        cache: draft_sync.ChunkCache | None = None,
     ) -> dict:
+        """
+        Fetch a draft archive (``archive_b64`` in the reply).
+
+        Uses the chunked manifest when Root offers it, downloading only chunks
+        missing from the local chunk cache; otherwise the legacy archive endpoint.
+        """
+        verify = self.verify if verify is None else verify
+        cert = self.cert if cert is None else cert
+        fetched = None
+        manifest_missing = False
+        if self.base_url not in _NO_CHUNKED and self.base_url not in _NO_CHUNKED_FETCH:
+            try:
+                fetched = self._fetch_draft_chunked(kind=kind, name=name, node_id=node_id, verify=verify, cert=cert, timeout=timeout, cache=cache)
+            except RootHttpError as exc:
+                if exc.status_code not in _LEGACY_STATUSES:
+                    raise
+                # 404 also means "no manifest for this draft": decided below,
+                # once the archive endpoint has answered.
+                if exc.status_code == 404:
+                    manifest_missing = True
+                else:
+                    _NO_CHUNKED_FETCH.add(self.base_url)
+        if fetched is not None:
+            archive, transfer = fetched
+            return {
+                "name": name,
+                "archive_b64": base64.b64encode(archive).decode("ascii"),
+                "sha256": hashlib.sha256(archive).hexdigest(),
+                "transfer": transfer,
+            }
         params: dict[str, Any] = {"name": name}
         if node_id:
             params["node_id"] = node_id
-        return dict(
-            self._request(
-                "GET",
-                f"/v1/{kind}/draft/archive",
-                params=params,
-                verify=(self.verify if verify is None else verify),
-                cert=(self.cert if cert is None else cert),
-                timeout=timeout,
-            )
-        )
+        reply = dict(self._request("GET", f"/v1/{kind}/draft/archive", params=params, verify=verify, cert=cert, timeout=timeout))
+        if manifest_missing:
+            # The draft exists but has no manifest: this Root only speaks the
+            # legacy protocol, don't ask it for manifests again in this process.
+            _NO_CHUNKED_FETCH.add(self.base_url)
+        return reply
 
     def get_skill_draft_archive(self, **kw) -> dict:
         kw["kind"] = "skills"
@@ -520,6 +636,112 @@ class RootHttpClient:
             )
         )
 
+    # Chunked draft sync -------------------------------------------------
+    def push_draft_chunked(
+        self,
+        *,
+        kind: str,  # 'skills' | 'scenarios'
+        name: str,
+        archive: bytes,
+        node_id: str | None,
+        verify: str | bool | ssl.SSLContext = None,
+        cert: tuple[str, str] | None = None,
+        sha256: str | None = None,
+    ) -> dict:
+        """
+        Upload a draft archive, sending only the content-defined chunks Root lacks.
+
+        Falls back to the legacy base64 ``POST /v1/{kind}/draft`` when Root does
+        not know the chunk endpoints. The reply gets a ``transfer`` summary.
+        """
+        verify = self.verify if verify is None else verify
+        cert = self.cert if cert is None else cert
+        if self.base_url not in _NO_CHUNKED:
+            chunks = draft_sync.split_chunks(archive)
+            manifest = draft_sync.build_manifest(archive, chunks)
+            try:
+                reply = self._request(
+                    "POST", f"/v1/{kind}/draft/chunks/missing", json={"hashes": sorted({c.sha256 for c in chunks})}, verify=verify, cert=cert
+                )
+            except RootHttpError as exc:
+                if exc.status_code not in _LEGACY_STATUSES:
+                    raise
+                _NO_CHUNKED.add(self.base_url)
+            else:
+                missing = set(reply.get("missing") or []) if isinstance(reply, Mapping) else {c.sha256 for c in chunks}
+                uploaded: set[str] = set()
+                sent = 0
+                for chunk in chunks:
+                    if chunk.sha256 not in missing or chunk.sha256 in uploaded:
+                        continue
+                    self._request(
+                        "PUT",
+                        f"/v1/{kind}/draft/chunks/{chunk.sha256}",
+                        content=archive[chunk.offset : chunk.offset + chunk.size],
+                        headers={"Content-Type": "application/octet-stream"},
+                        verify=verify,
+                        cert=cert,
+                        timeout=120.0,
+                        accept_204=True,
+                    )
+                    uploaded.add(chunk.sha256)
+                    sent += chunk.size
+                payload: dict[str, Any] = {"name": name, "manifest": manifest}
+                if node_id:
+                    payload["node_id"] = node_id
+                result = dict(self._request("POST", f"/v1/{kind}/draft/manifest", json=payload, verify=verify, cert=cert, timeout=120.0))
+                result["transfer"] = {"mode": "chunked", "chunks": len(chunks), "uploaded_chunks": len(uploaded), "bytes_uploaded": sent}
+                return result
+        archive_b64 = base64.b64encode(archive).decode("ascii")
+        push = self.push_skill_draft if kind == "skills" else self.push_scenario_draft
+        result = push(name=name, archive_b64=archive_b64, node_id=node_id, verify=verify, cert=cert, sha256=sha256 or hashlib.sha256(archive).hexdigest())
+        result["transfer"] = {"mode": "legacy", "bytes_uploaded": len(archive)}
+        return result
+
+    def _fetch_draft_chunked(
+        self,
+        *,
+        kind: str,
+        name: str,
+        node_id: str | None,
+        verify: Any,
+        cert: tuple[str, str] | None,
+        timeout: float,
+        cache: draft_sync.ChunkCache | None,
+    ) -> tuple[bytes, dict] | None:
+        """Assemble the draft from its manifest; manifest errors propagate to the caller."""
+        params: dict[str, Any] = {"name": name}
+        if node_id:
+            params["node_id"] = node_id
+        manifest = self._request("GET", f"/v1/{kind}/draft/manifest", params=params, verify=verify, cert=cert, timeout=timeout)
+        if not isinstance(manifest, Mapping) or manifest.get("algo") != draft_sync.ALGO:
+            return None
+        store = cache if cache is not None else draft_sync.default_chunk_cache()
+        transfer = {"mode": "chunked", "chunks": len(manifest.get("chunks") or []), "fetched_chunks": 0, "bytes_downloaded": 0}
+
+        def _fetch(digest: str) -> bytes:
+            blob = store.get(digest)
+            if blob is None:
+                blob = self._request("GET", f"/v1/{kind}/draft/chunks/{digest}", verify=verify, cert=cert, timeout=timeout, raw=True)
+                if not isinstance(blob, bytes):
+                    raise ValueError(f"chunk {digest} was not returned as bytes")
+                store.put(digest, blob)
+                transfer["fetched_chunks"] += 1
+                transfer["bytes_downloaded"] += len(blob)
+            return blob
+
+        try:
+            archive = draft_sync.assemble(dict(manifest), _fetch)
+            if transfer["fetched_chunks"]:
+                store.prune()
+            return archive, transfer
+        except ValueError:
+            return None
+        except RootHttpError as exc:
+            if exc.status_code == 404:  # chunk expired on Root between manifest and fetch
+                return None
+            raise
+
     def hub_core_update_report(
         self,
         *,
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+"""
+Content-defined chunking for draft archive sync with Root.
+
+Draft archives are split into chunks whose boundaries depend on the content,
+not on offsets, so editing one file of a large skill changes one or two chunks
+instead of shifting every byte after it. The node and Root then only exchange
+the chunk hashes the other side is missing, as raw bytes (no base64).
+
+Boundaries:
+  - zip local file headers (``PK\\x03\\x04``) are cut candidates; a header is a
+    cut when the hash of its file *name* selects it, so the choice survives
+    edits of the file body and regroups only the neighbourhood of an edit;
+  - the central directory (``PK\\x01\\x02``) always starts a new chunk;
+  - a chunk never grows past ``max_size`` (forced cut at the next header), and
+    single entries larger than that are split by a rolling bit-run check: each
+    position gets one pseudo-random bit mixed from the 32 bytes ending there,
+    and a chunk ends after the first ``0 1..1 0`` pattern of ``log2(avg_size)``
+    bits past ``min_size``. Mixing is table lookups (``bytes.translate``) and
+    XOR-shifts of one big integer, the search is ``bytes.find``: there is no
+    per-byte Python loop.
+
+Arbitrary (non-zip) payloads fall back to the bit-run check alone.
+
+Wire protocol (all under ``/v1/{kind}/draft``):
+  - ``POST chunks/missing``   ``{"hashes": [...]}`` -> ``{"missing": [...]}``
+  - ``PUT  chunks/{sha256}``  raw chunk bytes
+  - ``POST manifest``         ``{"name", "node_id", "manifest"}`` -> same reply as ``POST /draft``
+  - ``GET  manifest``         ``?name&node_id`` -> manifest
+  - ``GET  chunks/{sha256}``  raw chunk bytes
+"""
+
+import hashlib
+import os
+import random
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+ALGO = "adaos-cdc-v2"
+
+MIN_SIZE = 2 * 1024
+AVG_SIZE = 16 * 1024
+MAX_SIZE = 64 * 1024
+# One in FAN_IN zip entries (by name hash) starts a new chunk.
+FAN_IN = 4
+
+_LOCAL_HEADER = b"PK\x03\x04"
+_CENTRAL_HEADER = b"PK\x01\x02"
+# Fixed seed: both sides of the sync must compute identical boundaries.
+_SPREAD = random.Random(0xADA05).randbytes(256)
+# Balanced byte -> bit table: exactly half of the values map to one.
+_FOLD = bytes(random.Random(0xADA06).sample([1] * 128 + [0] * 128, 256))
+# XOR-shifts by 9, 18, 36, 72 and 144 bits mix each byte with the 31 before it.
+_MIX_STEPS = 5
+_MIX_SPAN = 9 * ((1 << _MIX_STEPS) - 1) // 8 + 1
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    sha256: str
+    offset: int
+    size: int
+
+
+def _entry_selected(data: bytes, pos: int, fan_in: int) -> bool:
+    try:
+        (name_len,) = struct.unpack_from("<H", data, pos + 26)
+        name = data[pos + 30 : pos + 30 + name_len]
+    except struct.error:
+        name = data[pos : pos + 30]
+    return zlib.crc32(name) % fan_in == 0
+
+
+def _markers(data: bytes, fan_in: int) -> List[tuple[int, bool]]:
+    """Header offsets with a flag telling whether the cut is unconditional."""
+    found: List[tuple[int, bool]] = []
+    pos = data.find(_LOCAL_HEADER, 1)
+    while pos != -1:
+        found.append((pos, _entry_selected(data, pos, fan_in)))
+        pos = data.find(_LOCAL_HEADER, pos + 4)
+    central = data.find(_CENTRAL_HEADER, 1)
+    if central != -1:
+        found = [m for m in found if m[0] < central]
+        found.append((central, True))
+    return found
+
+
+def _rolling_cuts(data: bytes, start: int, end: int, min_size: int, avg_size: int, max_size: int) -> List[int]:
+    if end - start <= max_size:
+        return []
+    # n bits, ones between two zeros: expected every ~2**n bytes of random
+    # input. A long constant stretch (indentation, zero padding) yields a
+    # constant bit, so the closing zero keeps it from ever completing a match.
+    run = b"\x00" + b"\x01" * max(1, avg_size.bit_length() - 3) + b"\x00"
+    size = end - start
+    h = int.from_bytes(data[start:end].translate(_SPREAD), "little")
+    for step in range(_MIX_STEPS):
+        h ^= h << (9 << step)
+    bits = h.to_bytes(size + _MIX_SPAN, "little")[:size].translate(_FOLD)
+    cuts: List[int] = []
+    pos = 0
+    while size - pos > max_size:
+        found = bits.find(run, pos + min_size, pos + max_size)
+        cut = pos + max_size if found == -1 else found + len(run)
+        cuts.append(start + cut)
+        pos = cut
+    return cuts
+
+
+def chunk_boundaries(
+    data: bytes,
+    *,
+    min_size: int = MIN_SIZE,
+    avg_size: int = AVG_SIZE,
+    max_size: int = MAX_SIZE,
+    fan_in: int = FAN_IN,
+) -> List[int]:
+    """Return sorted end offsets of the chunks covering ``data``."""
+    size = len(data)
+    if size == 0:
+        return []
+    cuts: List[int] = []
+    start = 0
+    for pos, forced in _markers(data, fan_in):
+        if forced or pos - start >= max_size:
+            cuts.extend(_rolling_cuts(data, start, pos, min_size, avg_size, max_size))
+            cuts.append(pos)
+            start = pos
+    cuts.extend(_rolling_cuts(data, start, size, min_size, avg_size, max_size))
+    cuts.append(size)
+    return cuts
+
+
+def split_chunks(data: bytes, **kw: int) -> List[Chunk]:
+    chunks: List[Chunk] = []
+    start = 0
+    view = memoryview(data)
+    for end in chunk_boundaries(data, **kw):
+        chunks.append(Chunk(hashlib.sha256(view[start:end]).hexdigest(), start, end - start))
+        start = end
+    return chunks
+
+
+def build_manifest(data: bytes, chunks: Optional[List[Chunk]] = None) -> dict:
+    chunks = split_chunks(data) if chunks is None else chunks
+    return {
+        "algo": ALGO,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "chunks": [{"sha256": c.sha256, "size": c.size} for c in chunks],
+    }
+
+
+def manifest_hashes(manifest: dict) -> List[str]:
+    return [str(item["sha256"]) for item in manifest.get("chunks") or []]
+
+
+def assemble(manifest: dict, fetch: Callable[[str], bytes]) -> bytes:
+    """Rebuild an archive from ``manifest`` and verify its sha256."""
+    parts: List[bytes] = []
+    for item in manifest.get("chunks") or []:
+        blob = fetch(str(item["sha256"]))
+        if hashlib.sha256(blob).hexdigest() != item["sha256"]:
+            raise ValueError(f"chunk {item['sha256']} is corrupt")
+        parts.append(blob)
+    data = b"".join(parts)
+    expected = manifest.get("sha256")
+    if expected and hashlib.sha256(data).hexdigest() != expected:
+        raise ValueError("assembled archive does not match manifest sha256")
+    return data
+
+
+class ChunkCache:
+    """
+    Flat ``<dir>/<aa>/<sha256>`` store of chunks already seen by this node.
+
+    Bounded by :meth:`prune`: chunks unused for ``max_age_s`` go first, then
+    the least recently used ones until the store fits in ``max_bytes``
+    (0 disables either limit). Reads refresh a chunk's mtime.
+    """
+
+    def __init__(self, root: Optional[Path], *, max_bytes: int = 0, max_age_s: float = 0.0) -> None:
+        self.root = Path(root) if root else None
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_age_s = max(0.0, float(max_age_s))
+        self._mem: Dict[str, bytes] = {}
+
+    def _path(self, digest: str) -> Optional[Path]:
+        if self.root is None:
+            return None
+        return self.root / digest[:2] / digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        blob = self._mem.get(digest)
+        if blob is not None:
+            return blob
+        path = self._path(digest)
+        if path is None:
+            return None
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(blob).hexdigest() != digest:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return blob
+
+    def put(self, digest: str, blob: bytes) -> None:
+        path = self._path(digest)
+        if path is None:
+            self._mem[digest] = blob
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{digest}.{os.getpid()}.tmp")
+            tmp.write_bytes(blob)
+            os.replace(tmp, path)
+        except OSError:
+            self._mem[digest] = blob
+
+    def put_many(self, data: bytes, chunks: Iterable[Chunk]) -> None:
+        for c in chunks:
+            self.put(c.sha256, data[c.offset : c.offset + c.size])
+
+    def prune(self, *, now: Optional[float] = None) -> int:
+        """Apply the age and size limits; returns the number of chunks removed."""
+        removed = 0
+        if self.max_bytes:
+            total = sum(len(blob) for blob in self._mem.values())
+            for digest in list(self._mem):
+                if total <= self.max_bytes:
+                    break
+                total -= len(self._mem.pop(digest))
+                removed += 1
+        if self.root is None or not (self.max_bytes or self.max_age_s):
+            return removed
+        entries = []
+        try:
+            for sub in self.root.iterdir():
+                if not sub.is_dir():
+                    continue
+                for path in sub.iterdir():
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            return removed
+        entries.sort(key=lambda e: e[0])
+        total = sum(e[1] for e in entries)
+        cutoff = (time.time() if now is None else now) - self.max_age_s if self.max_age_s else None
+        for mtime, size, path in entries:
+            if not ((cutoff is not None and mtime < cutoff) or (self.max_bytes and total > self.max_bytes)):
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def default_chunk_cache() -> ChunkCache:
+    """
+    Node-wide cache under ``<cache>/root_chunks`` (in-memory if no context),
+    bounded by ``ADAOS_ROOT_CHUNK_CACHE_MAX_MB`` and ``ADAOS_ROOT_CHUNK_CACHE_MAX_AGE_S``.
+    """
+    try:
+        max_bytes = int(float(os.getenv("ADAOS_ROOT_CHUNK_CACHE_MAX_MB", "") or 256) * 1024 * 1024)
+    except ValueError:
+        max_bytes = 256 * 1024 * 1024
+    try:
+        max_age_s = float(os.getenv("ADAOS_ROOT_CHUNK_CACHE_MAX_AGE_S", "") or 14 * 86400)
+    except ValueError:
+        max_age_s = 14 * 86400.0
+    try:
+        from adaos.services.agent_context import get_ctx
+
+        return ChunkCache(Path(get_ctx().paths.cache_dir()) / "root_chunks", max_bytes=max_bytes, max_age_s=max_age_s)
+    except Exception:
+        return ChunkCache(None, max_bytes=max_bytes)
@@ -1607,8 +1607,21 @@ class RootDeveloperService:
         verify = self._load_verify_context(ca_path)
         return str(cert_path), str(key_path), verify
 
-    @staticmethod
-    def _load_verify_context(ca_path: Path) -> ssl.SSLContext:
+    # Shared by all instances, keyed by (path, mtime_ns, size) of the CA file.
+    _verify_contexts: dict[tuple[str, int, int], ssl.SSLContext] = {}
+
+    @classmethod
+    def _load_verify_context(cls, ca_path: Path) -> ssl.SSLContext:
+        # Reuse the context while the CA file is unchanged: pooled Root
+        # connections are keyed by it, a fresh context would defeat keep-alive.
+        try:
+            st = ca_path.stat()
+            cache_key = (str(ca_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+        cached = cls._verify_contexts.get(cache_key) if cache_key else None
+        if cached is not None:
+            return cached
         try:
             context = ssl.create_default_context()
         except ssl.SSLError as exc:  # pragma: no cover - unexpected SSL configuration issues
@@ -1617,6 +1630,8 @@ class RootDeveloperService:
             context.load_verify_locations(cafile=str(ca_path))
         except (FileNotFoundError, ssl.SSLError) as exc:
             raise RootServiceError(f"Failed to load CA certificate from {ca_path}: {exc}") from exc
+        if cache_key:
+            cls._verify_contexts[cache_key] = context
         return context
 
     def _ensure_hub_keypair(
@@ -2128,29 +2143,19 @@ class RootDeveloperService:
             set_prototype=False,
         )
         archive_bytes = create_zip_bytes(source)
-        archive_b64 = archive_bytes_to_b64(archive_bytes)
         digest = hashlib.sha256(archive_bytes).hexdigest()
         cert_path, key_path, verify = self._mtls_material_for_role(cfg, "hub")
         client = self._client(cfg)
         node_id = cfg.node_settings.id or cfg.node_id
-        if kind == "skills":
-            response = client.push_skill_draft(
-                name=name,
-                archive_b64=archive_b64,
-                node_id=node_id,
-                verify=verify,
-                cert=(cert_path, key_path),
-                sha256=digest,
-            )
-        else:
-            response = client.push_scenario_draft(
-                name=name,
-                archive_b64=archive_b64,
-                node_id=node_id,
-                verify=verify,
-                cert=(cert_path, key_path),
-                sha256=digest,
-            )
+        response = client.push_draft_chunked(
+            kind=kind,
+            name=name,
+            archive=archive_bytes,
+            node_id=node_id,
+            verify=verify,
+            cert=(cert_path, key_path),
+            sha256=digest,
+        )
         stored = response.get("stored_path")
         if not isinstance(stored, str) or not stored:
             raise RootServiceError("Root did not return stored_path")
@@ -2159,7 +2164,7 @@ class RootDeveloperService:
             name=name,
             stored_path=stored,
             sha256=digest,
-            bytes_uploaded=len(archive_bytes),
+            bytes_uploaded=int((response.get("transfer") or {}).get("bytes_uploaded", len(archive_bytes))),
             version=(manifest_meta or {}).get("version"),
             updated_at=(manifest_meta or {}).get("updated_at"),
         )
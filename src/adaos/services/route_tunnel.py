@@ -0,0 +1,374 @@
+"""Binary framing for WebSocket tunnels carried over the hub<->root route channel.
+
+The legacy envelope is JSON: every WS frame becomes ``{"t": "frame", ...}``
+(binary payloads base64-encoded, frames above ``MAX_CHUNK_RAW`` split into
+``{"t": "chunk"}`` messages) and each one is published and awaited serially.
+
+The ``adt1`` codec is negotiated per tunnel on ``open`` (root lists it in
+``codecs``; the hub confirms with ``{"t": "open_ack", "codec": "adt1"}``).
+Control messages (open/close/http) stay JSON; data goes as binary NATS
+messages::
+
+    MAGIC | record | record | ...
+    record = type:u8 flags:u8 seq:u32 len:u32 payload
+
+``seq`` numbers data records per direction starting at 1.  A frame larger
+than the fragment size is split into consecutive records with ``FLAG_MORE``
+on all but the last.  ``REC_ACK`` carries the highest data ``seq`` received
+in its seq field and the receiver window (bytes, u32) as payload; the sender
+keeps at most one window of unacknowledged payload in flight.  Small frames
+queued while a publish is in flight are batched into the next message and
+pending acks ride along with data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+import struct
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+_log = logging.getLogger("adaos.route.tunnel")
+
+TUNNEL_CODEC_BINARY = "adt1"
+TUNNEL_CODEC_JSON = "json"
+
+# JSON envelopes always start with "{", so the prefix cannot collide.
+MAGIC = b"\xadT1"
+
+REC_BIN = 1
+REC_TEXT = 2
+REC_ACK = 3
+FLAG_MORE = 0x01
+
+_REC = struct.Struct("!BBII")
+_WINDOW = struct.Struct("!I")
+
+Frame = Union[bytes, str]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def tunnel_binary_enabled() -> bool:
+    return str(os.getenv("HUB_ROUTE_TUNNEL_BINARY", "1") or "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def negotiate_tunnel_codec(offered: Any) -> str:
+    """Pick the tunnel codec from what root offered on ``open`` (JSON unless adt1 is offered and enabled)."""
+    if isinstance(offered, str):
+        offered = [part.strip() for part in offered.split(",")]
+    if not isinstance(offered, (list, tuple)) or not tunnel_binary_enabled():
+        return TUNNEL_CODEC_JSON
+    return TUNNEL_CODEC_BINARY if TUNNEL_CODEC_BINARY in offered else TUNNEL_CODEC_JSON
+
+
+def is_binary_tunnel_message(raw: bytes) -> bool:
+    return raw[: len(MAGIC)] == MAGIC
+
+
+def encode_record(rec_type: int, seq: int, payload: bytes = b"", *, flags: int = 0) -> bytes:
+    return _REC.pack(rec_type, flags, seq & 0xFFFFFFFF, len(payload)) + payload
+
+
+def decode_records(raw: bytes) -> List[Tuple[int, int, int, bytes]]:
+    """Split a binary tunnel message into ``(type, flags, seq, payload)`` records."""
+    if not is_binary_tunnel_message(raw):
+        raise ValueError("not a binary tunnel message")
+    view = memoryview(raw)
+    pos = len(MAGIC)
+    end = len(raw)
+    out: List[Tuple[int, int, int, bytes]] = []
+    while pos < end:
+        if end - pos < _REC.size:
+            raise ValueError("truncated record header")
+        rec_type, flags, seq, size = _REC.unpack_from(raw, pos)
+        pos += _REC.size
+        if end - pos < size:
+            raise ValueError("truncated record payload")
+        out.append((rec_type, flags, seq, bytes(view[pos : pos + size])))
+        pos += size
+    return out
+
+
+def json_frame_envelopes(msg: Frame, *, max_chunk: int) -> List[Dict[str, Any]]:
+    """Legacy JSON envelopes for one upstream WS frame (``frame`` or a ``chunk`` series)."""
+    if isinstance(msg, (bytes, bytearray, memoryview)):
+        raw = bytes(msg)
+        if len(raw) <= max_chunk:
+            return [{"t": "frame", "kind": "bin", "data_b64": base64.b64encode(raw).decode("ascii")}]
+        cid = f"c_{uuid.uuid4().hex}"
+        total = (len(raw) + max_chunk - 1) // max_chunk
+        return [
+            {
+                "t": "chunk",
+                "id": cid,
+                "kind": "bin",
+                "idx": idx,
+                "total": total,
+                "data_b64": base64.b64encode(raw[idx * max_chunk : (idx + 1) * max_chunk]).decode("ascii"),
+            }
+            for idx in range(total)
+        ]
+    text = str(msg)
+    if len(text) <= max_chunk:
+        return [{"t": "frame", "kind": "text", "data": text}]
+    cid = f"c_{uuid.uuid4().hex}"
+    parts = [text[i : i + max_chunk] for i in range(0, len(text), max_chunk)]
+    return [
+        {"t": "chunk", "id": cid, "kind": "text", "idx": idx, "total": len(parts), "data": part}
+        for idx, part in enumerate(parts)
+    ]
+
+
+class TunnelSession:
+    """One direction-pair of a binary tunnel: sequencing, batching, acks and credit.
+
+    ``publish`` sends one encoded NATS message to the peer.  ``send`` waits for
+    credit only, never for the publish itself; ``receive`` decodes a message
+    from the peer and returns the reassembled frames to deliver upstream.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[bytes], Awaitable[None]],
+        *,
+        window_bytes: Optional[int] = None,
+        peer_window_bytes: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+        fragment_bytes: Optional[int] = None,
+        ack_delay_s: Optional[float] = None,
+        ack_timeout_s: Optional[float] = None,
+    ) -> None:
+        self._publish = publish
+        self.window_bytes = max(4096, window_bytes or _env_int("HUB_ROUTE_TUNNEL_WINDOW_BYTES", 1024 * 1024))
+        self.peer_window_bytes = max(4096, peer_window_bytes or self.window_bytes)
+        self.batch_bytes = max(1024, batch_bytes or _env_int("HUB_ROUTE_TUNNEL_BATCH_BYTES", 64 * 1024))
+        self.fragment_bytes = max(1024, fragment_bytes or _env_int("HUB_ROUTE_TUNNEL_FRAGMENT_BYTES", 256 * 1024))
+        self.ack_delay_s = max(0.0, ack_delay_s if ack_delay_s is not None else _env_float("HUB_ROUTE_TUNNEL_ACK_DELAY_S", 0.02))
+        self.ack_timeout_s = max(0.1, ack_timeout_s or _env_float("HUB_ROUTE_TUNNEL_ACK_TIMEOUT_S", 10.0))
+        # outbound
+        self._next_seq = 1
+        self._outbox: Deque[Tuple[int, bytes]] = deque()
+        self._outbox_bytes = 0
+        self._unacked: Deque[Tuple[int, int]] = deque()
+        self._in_flight = 0
+        self._credit = asyncio.Event()
+        self._credit.set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._drained = asyncio.Event()
+        self._drained.set()
+        # inbound
+        self._expected = 1
+        self._fragments: List[bytes] = []
+        self._fragment_type = 0
+        self._unacked_rx_bytes = 0
+        self._ack_due = False
+        self._ack_timer: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+        self.stats: Dict[str, int] = {
+            "frames_out": 0,
+            "frames_in": 0,
+            "messages_out": 0,
+            "messages_in": 0,
+            "bytes_out": 0,
+            "bytes_in": 0,
+            "acks_out": 0,
+            "acks_in": 0,
+            "credit_waits": 0,
+            "ack_timeouts": 0,
+            "publish_errors": 0,
+            "lost_records": 0,
+            "duplicate_records": 0,
+        }
+
+    # -------------------------------------------------------------- outbound
+    async def send(self, frame: Frame) -> None:
+        if self._closed:
+            raise ConnectionError("tunnel session closed")
+        if isinstance(frame, str):
+            rec_type, data = REC_TEXT, frame.encode("utf-8")
+        else:
+            rec_type, data = REC_BIN, bytes(frame)
+        step = self.fragment_bytes
+        pieces = [data[i : i + step] for i in range(0, len(data), step)] or [b""]
+        for idx, piece in enumerate(pieces):
+            await self._wait_credit(len(piece))
+            seq = self._next_seq
+            self._next_seq += 1
+            flags = FLAG_MORE if idx < len(pieces) - 1 else 0
+            record = encode_record(rec_type, seq, piece, flags=flags)
+            self._unacked.append((seq, len(piece)))
+            self._in_flight += len(piece)
+            self._outbox.append((seq, record))
+            self._outbox_bytes += len(record)
+            self._kick()
+        self.stats["frames_out"] += 1
+
+    async def _wait_credit(self, size: int) -> None:
+        # An oversized record may go alone once nothing is in flight.
+        while self._in_flight and self._in_flight + size > self.peer_window_bytes:
+            if self._closed:
+                raise ConnectionError("tunnel session closed")
+            self.stats["credit_waits"] += 1
+            self._credit.clear()
+            try:
+                await asyncio.wait_for(self._credit.wait(), timeout=self.ack_timeout_s)
+            except asyncio.TimeoutError:
+                # Acks lost (NATS core is at-most-once): do not wedge the tunnel.
+                self.stats["ack_timeouts"] += 1
+                self._unacked.clear()
+                self._in_flight = 0
+
+    def _on_ack(self, seq: int, window: Optional[int]) -> None:
+        self.stats["acks_in"] += 1
+        if window:
+            self.peer_window_bytes = max(4096, window)
+        while self._unacked and self._unacked[0][0] <= seq:
+            self._in_flight -= self._unacked.popleft()[1]
+        self._credit.set()
+
+    def _kick(self) -> None:
+        if self._closed:
+            return
+        self._drained.clear()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while (self._outbox or self._ack_due) and not self._closed:
+            parts = [MAGIC]
+            size = len(MAGIC)
+            if self._ack_due:
+                parts.append(self._ack_record())
+                size += len(parts[-1])
+            seqs: List[int] = []
+            while self._outbox and (not seqs or size + len(self._outbox[0][1]) <= self.batch_bytes):
+                seq, record = self._outbox.popleft()
+                self._outbox_bytes -= len(record)
+                parts.append(record)
+                seqs.append(seq)
+                size += len(record)
+            blob = b"".join(parts)
+            try:
+                await self._publish(blob)
+                self.stats["messages_out"] += 1
+                self.stats["bytes_out"] += len(blob)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Lost like a failed JSON reply; release its credit so the tunnel keeps flowing.
+                self.stats["publish_errors"] += 1
+                _log.debug("route tunnel publish failed: %s", exc)
+                lost = set(seqs)
+                kept = [(s, n) for s, n in self._unacked if s not in lost]
+                self._unacked = deque(kept)
+                self._in_flight = sum(n for _, n in kept)
+                self._credit.set()
+        self._drained.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been published."""
+        if self._drained.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # --------------------------------------------------------------- inbound
+    def receive(self, raw: bytes) -> List[Frame]:
+        """Process one message from the peer; returns complete frames in order."""
+        frames: List[Frame] = []
+        self.stats["messages_in"] += 1
+        self.stats["bytes_in"] += len(raw)
+        for rec_type, flags, seq, payload in decode_records(raw):
+            if rec_type == REC_ACK:
+                window = _WINDOW.unpack(payload)[0] if len(payload) >= _WINDOW.size else None
+                self._on_ack(seq, window)
+                continue
+            if rec_type not in (REC_BIN, REC_TEXT):
+                continue
+            if seq < self._expected:
+                self.stats["duplicate_records"] += 1
+                continue
+            if seq > self._expected:
+                # NATS keeps order per publisher, so a gap is a lost message:
+                # skip it and drop the half-assembled frame.
+                self.stats["lost_records"] += seq - self._expected
+                self._fragments = []
+            self._expected = seq + 1
+            self._unacked_rx_bytes += len(payload)
+            if self._fragments and rec_type != self._fragment_type:
+                self._fragments = []
+            self._fragments.append(payload)
+            self._fragment_type = rec_type
+            if flags & FLAG_MORE:
+                continue
+            data = b"".join(self._fragments) if len(self._fragments) > 1 else self._fragments[0]
+            self._fragments = []
+            frames.append(data.decode("utf-8", errors="replace") if rec_type == REC_TEXT else data)
+            self.stats["frames_in"] += 1
+        if self._expected > 1:
+            self._schedule_ack()
+        return frames
+
+    def _ack_record(self) -> bytes:
+        self._ack_due = False
+        self._unacked_rx_bytes = 0
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        self.stats["acks_out"] += 1
+        return encode_record(REC_ACK, self._expected - 1, _WINDOW.pack(self.window_bytes))
+
+    def _schedule_ack(self) -> None:
+        if self._closed:
+            return
+        self._ack_due = True
+        if self._unacked_rx_bytes >= self.window_bytes // 2 or self.ack_delay_s <= 0:
+            self._kick()
+        elif self._ack_timer is None:
+            self._ack_timer = asyncio.get_running_loop().call_later(self.ack_delay_s, self._ack_fire)
+
+    def _ack_fire(self) -> None:
+        self._ack_timer = None
+        if self._ack_due:
+            self._kick()
+
+    # ------------------------------------------------------------- lifecycle
+    def close(self) -> None:
+        self._closed = True
+        self._credit.set()
+        self._drained.set()
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight_bytes": self._in_flight,
+            "peer_window_bytes": self.peer_window_bytes,
+            "queued_bytes": self._outbox_bytes,
+            "next_seq": self._next_seq,
+            "expected_seq": self._expected,
+            **self.stats,
+        }
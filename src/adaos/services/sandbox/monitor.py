@@ -0,0 +1,154 @@
+# \src\adaos\services\sandbox\monitor.py
+from __future__ import annotations
+
+"""
+Shared resource monitor for sandboxed processes.
+
+One daemon thread polls every watched process tree (wall time, summed CPU
+time, max RSS) and kills the tree on a breach. It replaces the per-run monitor
+thread ``ProcSandbox`` used to start for every execution.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import psutil
+
+from adaos.ports.sandbox import ExecLimits
+
+
+def _poll_interval() -> float:
+    try:
+        return max(0.005, float(os.getenv("ADAOS_SANDBOX_MONITOR_INTERVAL_S", "0.05") or 0.05))
+    except Exception:
+        return 0.05
+
+
+def kill_tree(proc: psutil.Process) -> None:
+    try:
+        children = proc.children(recursive=True)
+        for c in children:
+            try:
+                c.kill()
+            except Exception:
+                pass
+        proc.kill()
+    except Exception:
+        pass
+
+
+@dataclass
+class Watch:
+    proc: psutil.Process
+    limits: ExecLimits
+    started: float = field(default_factory=time.time)
+    timed_out: bool = False
+    killed_reason: Optional[str] = None
+
+    def _tree(self) -> list[psutil.Process]:
+        try:
+            return [self.proc] + self.proc.children(recursive=True)
+        except Exception:
+            return [self.proc]
+
+    def _kill(self, reason: str) -> None:
+        self.timed_out = True
+        self.killed_reason = reason
+        kill_tree(self.proc)
+
+    def check(self, now: float) -> bool:
+        """Enforce limits once; returns False when the watch is finished."""
+        limits = self.limits
+        try:
+            if not self.proc.is_running():
+                return False
+            # wall-time
+            if limits.wall_time_sec is not None and (now - self.started) > limits.wall_time_sec:
+                self._kill("wall_time_exceeded")
+                return False
+            procs = self._tree() if (limits.cpu_time_sec is not None or limits.max_rss_mb is not None) else []
+            # cpu-time (сумма по дереву)
+            if limits.cpu_time_sec is not None:
+                total_cpu = 0.0
+                for pr in procs:
+                    try:
+                        t = pr.cpu_times()
+                        total_cpu += t.user + t.system
+                    except Exception:
+                        pass
+                if total_cpu > limits.cpu_time_sec:
+                    self._kill("cpu_time_exceeded")
+                    return False
+            # rss (берём максимум среди потомков)
+            if limits.max_rss_mb is not None:
+                max_rss = 0
+                for pr in procs:
+                    try:
+                        max_rss = max(max_rss, pr.memory_info().rss)
+                    except Exception:
+                        pass
+                if max_rss > limits.max_rss_mb * 1024 * 1024:
+                    self._kill("rss_exceeded")
+                    return False
+            return True
+        except Exception:
+            # монитор упал: лучше завершить процесс
+            self.timed_out = True
+            self.killed_reason = self.killed_reason or "monitor_error"
+            kill_tree(self.proc)
+            return False
+
+
+class SandboxMonitor:
+    def __init__(self, interval: float | None = None) -> None:
+        self._interval = interval or _poll_interval()
+        self._watches: Dict[int, Watch] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, pid: int, limits: ExecLimits) -> Watch:
+        w = Watch(proc=psutil.Process(pid), limits=limits)
+        with self._cond:
+            self._watches[id(w)] = w
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="sandbox-monitor", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return w
+
+    def unwatch(self, w: Watch) -> None:
+        with self._cond:
+            self._watches.pop(id(w), None)
+
+    def active(self) -> int:
+        with self._cond:
+            return len(self._watches)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._watches:
+                    self._cond.wait()
+                watches = list(self._watches.items())
+            now = time.time()
+            for key, w in watches:
+                if not w.check(now):
+                    with self._cond:
+                        self._watches.pop(key, None)
+            time.sleep(self._interval)
+
+
+_MONITOR: Optional[SandboxMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def sandbox_monitor() -> SandboxMonitor:
+    global _MONITOR
+    if _MONITOR is None:
+        with _MONITOR_LOCK:
+            if _MONITOR is None:
+                _MONITOR = SandboxMonitor()
+    return _MONITOR
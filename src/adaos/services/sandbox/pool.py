@@ -0,0 +1,505 @@
+# \src\adaos\services\sandbox\pool.py
+from __future__ import annotations
+
+"""
+Pool of pre-started, pre-imported Python workers for ``ProcSandbox``.
+
+Each worker is a small "zygote": a Python process started once (optionally
+pre-importing ``ADAOS_SANDBOX_PRELOAD`` modules) that receives jobs as JSON
+lines on stdin. For every job it forks a child that applies the job's rlimits,
+cwd, environment and std streams and then runs the requested ``-c`` code,
+``-m`` module or script, so jobs skip interpreter start-up but never share
+interpreter state. The child pid is reported back so the shared
+:mod:`~adaos.services.sandbox.monitor` enforces wall/CPU/RSS limits exactly as
+for cold ``Popen`` runs.
+
+Workers are recycled after ``ADAOS_SANDBOX_WORKER_MAX_JOBS`` jobs and after any
+limit breach. The pool is POSIX-only (it needs ``fork``); commands that are not
+a plain invocation of the current interpreter always take the cold path.
+
+Protocol (one JSON object per line):
+
+  - worker -> ``{"ready": <pid>}``                  after start-up
+  - host   -> ``{"argv": [...], "kind": ..., ...}``  job
+  - worker -> ``{"pid": <child pid>}``               job started
+  - worker -> ``{"exit": <code>}``                   job finished (``-signal`` if killed)
+"""
+
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from adaos.ports.sandbox import ExecLimits, ExecResult
+from adaos.services.sandbox.monitor import kill_tree, sandbox_monitor
+
+WORKER_SCRIPT = r"""
+import json
+import os
+import sys
+
+_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+_null = os.open(os.devnull, os.O_RDWR)
+os.dup2(_null, 0)
+os.dup2(_null, 1)
+
+for _name in filter(None, (os.environ.get("ADAOS_SANDBOX_PRELOAD") or "").split(",")):
+    try:
+        __import__(_name.strip())
+    except Exception:
+        pass
+
+_BASE_PATH = list(sys.path[1:])
+
+
+def _send(msg):
+    _out.write(json.dumps(msg) + "\n")
+    _out.flush()
+
+
+def _limits(spec):
+    import resource
+
+    cpu = spec.get("cpu")
+    if cpu is not None:
+        soft = hard = int(max(1, cpu))
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    rss = spec.get("rss")
+    if rss is not None:
+        mb = rss * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (mb, mb))
+        except Exception:
+            try:
+                resource.setrlimit(resource.RLIMIT_DATA, (mb, mb))
+            except Exception:
+                pass
+
+
+def _exit_code(exc):
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    try:
+        sys.stderr.write(str(code) + "\n")
+    except Exception:
+        pass
+    return 1
+
+
+def _child(job):
+    code = 1
+    try:
+        _in.close()
+        _out.close()
+        os.dup2(os.open(job.get("stdin") or os.devnull, os.O_RDONLY), 0)
+        os.dup2(os.open(job["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 1)
+        os.dup2(os.open(job["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 2)
+        sys.stdin = open(0, "r", encoding="utf-8", errors="replace", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", errors="replace", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", errors="backslashreplace", closefd=False)
+        _limits(job.get("limits") or {})
+        os.chdir(job["cwd"])
+        env = job.get("env")
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(env)
+        extra = [p for p in (os.environ.get("PYTHONPATH") or "").split(os.pathsep) if p]
+        sys.path[:] = [job["path0"], *extra, *_BASE_PATH]
+        sys.dont_write_bytecode = bool(job.get("no_bytecode"))
+        sys.argv = list(job["argv"])
+        import runpy
+        import types
+
+        kind = job["kind"]
+        if kind == "code":
+            main = types.ModuleType("__main__")
+            sys.modules["__main__"] = main
+            exec(compile(job["target"], "<string>", "exec"), main.__dict__)
+        elif kind == "module":
+            runpy.run_module(job["target"], run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(job["target"], run_name="__main__")
+        code = 0
+    except SystemExit as exc:
+        code = _exit_code(exc)
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    try:
+        import atexit
+        import threading
+
+        threading._shutdown()
+        atexit._run_exitfuncs()
+    except BaseException:
+        pass
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except BaseException:
+            pass
+    os._exit(code)
+
+
+_send({"ready": os.getpid()})
+for line in _in:
+    line = line.strip()
+    if not line:
+        continue
+    job = json.loads(line)
+    if job.get("op") == "shutdown":
+        break
+    pid = os.fork()
+    if pid == 0:
+        _child(job)
+    _send({"pid": pid})
+    _, status = os.waitpid(pid, 0)
+    _send({"exit": os.waitstatus_to_exitcode(status)})
+"""
+
+# PYTHON* variables that only influence interpreter start-up/IO and are safe to
+# honour inside a pre-started worker (PYTHONPATH is applied to ``sys.path``).
+_POOL_SAFE_PYTHON_ENV = {"PYTHONPATH", "PYTHONUNBUFFERED", "PYTHONIOENCODING", "PYTHONDONTWRITEBYTECODE", "PYTHONUTF8"}
+# Variables stripped from the worker's own start-up environment.
+_WORKER_STRIP_ENV = ("PYTHONPATH", "PYTHONSTARTUP", "PYTHONINSPECT", "PYTHONHOME")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def pool_supported() -> bool:
+    return os.name == "posix" and hasattr(os, "fork")
+
+
+def pool_enabled() -> bool:
+    if not pool_supported():
+        return False
+    return os.getenv("ADAOS_SANDBOX_POOL", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _same_interpreter(exe: str, env: Optional[Mapping[str, str]], python: str) -> bool:
+    candidate = exe
+    if os.sep not in exe:
+        search = None if env is None else (env.get("PATH") or os.defpath)
+        candidate = shutil.which(exe, path=search) or ""
+    if not candidate:
+        return False
+    # Same binary *and* same bin dir: a venv python is often a symlink to the
+    # base interpreter but has different site-packages.
+    if os.path.dirname(os.path.abspath(candidate)) != os.path.dirname(os.path.abspath(python)):
+        return False
+    try:
+        return os.path.samefile(candidate, python)
+    except OSError:
+        return False
+
+
+def python_job(
+    cmd: Sequence[str],
+    *,
+    cwd: str,
+    env: Optional[Mapping[str, str]],
+    python: str = sys.executable,
+) -> Optional[Dict[str, Any]]:
+    """Translate ``cmd`` into a pool job, or ``None`` if it needs a real exec."""
+    args = [str(a) for a in cmd]
+    if not args or not _same_interpreter(args[0], env, python):
+        return None
+    effective_env = os.environ if env is None else env
+    if any(k.upper().startswith("PYTHON") and k.upper() not in _POOL_SAFE_PYTHON_ENV for k in effective_env):
+        return None
+    no_bytecode = bool(effective_env.get("PYTHONDONTWRITEBYTECODE"))
+    rest = args[1:]
+    while rest and rest[0] in {"-u", "-B"}:
+        no_bytecode = no_bytecode or rest[0] == "-B"
+        rest = rest[1:]
+    if not rest:
+        return None
+    head = rest[0]
+    if head == "-c" and len(rest) >= 2:
+        kind, target, argv, path0 = "code", rest[1], ["-c", *rest[2:]], ""
+    elif head == "-m" and len(rest) >= 2:
+        kind, target, argv, path0 = "module", rest[1], [rest[1], *rest[2:]], cwd
+    elif not head.startswith("-"):
+        script = head if os.path.isabs(head) else os.path.join(cwd, head)
+        if not os.path.isfile(script):
+            return None
+        kind, target, argv, path0 = "script", script, [head, *rest[1:]], os.path.dirname(os.path.abspath(script))
+    else:
+        return None
+    return {
+        "kind": kind,
+        "target": target,
+        "argv": argv,
+        "path0": path0,
+        "cwd": cwd,
+        "env": dict(effective_env),
+        "no_bytecode": no_bytecode,
+    }
+
+
+class _Worker:
+    def __init__(self, python: str) -> None:
+        env = {k: v for k, v in os.environ.items() if k not in _WORKER_STRIP_ENV}
+        env["PYTHONIOENCODING"] = "utf-8"
+        self.proc = subprocess.Popen(
+            [python, "-u", "-c", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            env=env,
+            start_new_session=True,
+        )
+        self.jobs = 0
+        self.ready = False
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        line = self.proc.stdout.readline() if self.proc.stdout else ""
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except Exception:
+            return None
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(self, job: Mapping[str, Any], limits: ExecLimits) -> tuple[Optional[int], Any]:
+        """Run ``job``; returns ``(exit_code, watch)`` or ``(None, watch)`` if the worker died."""
+        if not self.ready:
+            msg = self._read()
+            if not msg or "ready" not in msg:
+                return None, None
+            self.ready = True
+        self.proc.stdin.write(json.dumps(job) + "\n")
+        self.proc.stdin.flush()
+        self.jobs += 1
+        msg = self._read()
+        if not msg or "pid" not in msg:
+            return None, None
+        watch = None
+        try:
+            watch = sandbox_monitor().watch(int(msg["pid"]), limits)
+        except Exception:
+            pass
+        try:
+            done = self._read()
+        finally:
+            if watch is not None:
+                sandbox_monitor().unwatch(watch)
+        if not done or "exit" not in done:
+            return None, watch
+        return int(done["exit"]), watch
+
+    def close(self) -> None:
+        try:
+            if self.alive() and self.proc.stdin:
+                self.proc.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=2)
+        except Exception:
+            pass
+        if self.alive():
+            try:
+                import psutil
+
+                kill_tree(psutil.Process(self.proc.pid))
+            except Exception:
+                self.proc.kill()
+        try:
+            self.proc.wait(timeout=2)
+        except Exception:
+            pass
+
+
+@dataclass(slots=True)
+class _PoolStats:
+    spawned: int = 0
+    recycled: int = 0
+    jobs: int = 0
+    cold_fallbacks: int = 0
+
+
+class SandboxPool:
+    def __init__(self, *, python: str | None = None, size: int | None = None, max_jobs: int | None = None, warm: int | None = None) -> None:
+        self.python = python or sys.executable
+        self.size = max(1, size if size is not None else _env_int("ADAOS_SANDBOX_POOL_SIZE", 2))
+        self.max_jobs = max(1, max_jobs if max_jobs is not None else _env_int("ADAOS_SANDBOX_WORKER_MAX_JOBS", 200))
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = _PoolStats()
+        for _ in range(min(self.size, warm if warm is not None else _env_int("ADAOS_SANDBOX_POOL_WARM", 1))):
+            self._idle.append(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        self.stats.spawned += 1
+        return _Worker(self.python)
+
+    def _acquire(self) -> Optional[_Worker]:
+        with self._lock:
+            if self._closed:
+                return None
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    self._busy += 1
+                    return worker
+            if self._busy + len(self._idle) >= self.size:
+                return None
+            self._busy += 1
+        try:
+            return self._spawn()
+        except Exception:
+            with self._lock:
+                self._busy -= 1
+            return None
+
+    def _release(self, worker: _Worker, *, recycle: bool) -> None:
+        recycle = recycle or worker.jobs >= self.max_jobs or not worker.alive()
+        replacement: Optional[_Worker] = None
+        if recycle:
+            self.stats.recycled += 1
+            worker.close()
+            if not self._closed:
+                try:
+                    # Keep the pool warm: start the successor before it is needed.
+                    replacement = self._spawn()
+                except Exception:
+                    replacement = None
+        with self._lock:
+            self._busy -= 1
+            keep = replacement if recycle else worker
+            if keep is not None:
+                if self._closed:
+                    keep.close()
+                else:
+                    self._idle.append(keep)
+
+    def run(
+        self,
+        job: Dict[str, Any],
+        *,
+        limits: ExecLimits,
+        stdin: Optional[bytes] = None,
+        text: bool = True,
+    ) -> Optional[ExecResult]:
+        """Execute ``job`` on a warm worker; ``None`` means "use the cold path".
+
+        Like the cold path, ``text=False`` returns stdout/stderr as raw bytes.
+        """
+        worker = self._acquire()
+        if worker is None:
+            self.stats.cold_fallbacks += 1
+            return None
+        tmpdir = tempfile.mkdtemp(prefix="adaos-sbx-")
+        recycle = True
+        try:
+            out_path = os.path.join(tmpdir, "stdout")
+            err_path = os.path.join(tmpdir, "stderr")
+            payload = dict(job)
+            payload.update(
+                {
+                    "stdout": out_path,
+                    "stderr": err_path,
+                    "limits": {"cpu": limits.cpu_time_sec, "rss": limits.max_rss_mb},
+                }
+            )
+            if stdin is not None:
+                in_path = os.path.join(tmpdir, "stdin")
+                data = stdin if isinstance(stdin, (bytes, bytearray)) else str(stdin).encode("utf-8")
+                Path(in_path).write_bytes(bytes(data))
+                payload["stdin"] = in_path
+            code, watch = worker.run(payload, limits)
+            if code is None and watch is None:
+                # Worker died before the job started: let the cold path handle it.
+                self.stats.cold_fallbacks += 1
+                return None
+            self.stats.jobs += 1
+            timed_out = bool(watch and watch.timed_out)
+            reason = watch.killed_reason if watch else None
+            # Monitor kills and kernel rlimit signals (SIGXCPU etc.) both count as breaches.
+            recycle = code is None or timed_out or code < 0
+            return ExecResult(
+                exit_code=code if code is not None else -9,
+                stdout=_read_output(out_path, text),
+                stderr=_read_output(err_path, text),
+                timed_out=timed_out,
+                killed_reason=reason,
+            )
+        finally:
+            self._release(worker, recycle=recycle)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": self._busy,
+                "spawned": self.stats.spawned,
+                "recycled": self.stats.recycled,
+                "jobs": self.stats.jobs,
+                "cold_fallbacks": self.stats.cold_fallbacks,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+def _read_output(path: str, text: bool = True) -> str | bytes:
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        data = b""
+    return data.decode("utf-8", errors="replace") if text else data
+
+
+_POOLS: Dict[str, SandboxPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_sandbox_pool(python: str | None = None) -> SandboxPool:
+    key = python or sys.executable
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = SandboxPool(python=key)
+            _POOLS[key] = pool
+        return pool
+
+
+def shutdown_sandbox_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_sandbox_pools)
@@ -1,29 +1,16 @@
 # \src\adaos\services\sandbox\runner.py
 from __future__ import annotations
-import os, sys, time, subprocess, threading
+import os, sys, subprocess
 from pathlib import Path
 from typing import Mapping, Sequence, Optional, List
-from dataclasses import dataclass
-import psutil
 
 from adaos.ports.sandbox import Sandbox, ExecLimits, ExecResult
+from adaos.services.sandbox.monitor import sandbox_monitor
+from adaos.services.sandbox.pool import get_sandbox_pool, pool_enabled, python_job
 
 _IS_POSIX = os.name == "posix"
 
 
-def _kill_tree(proc: psutil.Process) -> None:
-    try:
-        children = proc.children(recursive=True)
-        for c in children:
-            try:
-                c.kill()
-            except Exception:
-                pass
-        proc.kill()
-    except Exception:
-        pass
-
-
 def _collect_output(p: subprocess.Popen) -> tuple[str, str]:
     out, err = p.communicate()
     # p.opened with text=True — строки, иначе bytes
@@ -53,16 +40,12 @@ def _preexec_posix(limits: ExecLimits):
                 pass
 
 
-@dataclass
-class _MonState:
-    timed_out: bool = False
-    killed_reason: Optional[str] = None
-
-
 class ProcSandbox(Sandbox):
-    def __init__(self, *, fs_base: str):
+    def __init__(self, *, fs_base: str, pool: Optional[bool] = None):
         # допускаем только запуск внутри BASE_DIR (доп. проверка; FSPolicy — отдельно)
         self._base = Path(fs_base).resolve()
+        # тёплый пул python-воркеров (см. services/sandbox/pool.py); None — по ADAOS_SANDBOX_POOL
+        self._use_pool = pool_enabled() if pool is None else (bool(pool) and pool_enabled())
 
     def _check_cwd(self, cwd: Optional[str]) -> None:
         if not cwd:
@@ -94,6 +77,13 @@ class ProcSandbox(Sandbox):
                 if isinstance(k, str) and isinstance(v, str):
                     safe_env[k] = v
 
+        if self._use_pool:
+            job = python_job(cmd, cwd=cwd or os.getcwd(), env=safe_env if env is not None else None)
+            if job is not None:
+                res = get_sandbox_pool().run(job, limits=limits, stdin=stdin, text=text)
+                if res is not None:
+                    return res
+
         creationflags = 0
         preexec = None
         if _IS_POSIX and (limits.cpu_time_sec or limits.max_rss_mb):
@@ -132,79 +122,17 @@ class ProcSandbox(Sandbox):
                 except Exception:
                     pass
 
-        proc = psutil.Process(p.pid)
-        state = _MonState()
-
-        # мониторинг по CPU/RSS
-        def _monitor():
-            try:
-                start = time.time()
-                while True:
-                    if p.poll() is not None:
-                        return
-                    now = time.time()
-                    # wall-time
-                    if limits.wall_time_sec is not None and (now - start) > limits.wall_time_sec:
-                        state.timed_out = True
-                        state.killed_reason = "wall_time_exceeded"
-                        _kill_tree(proc)
-                        return
-                    # cpu-time (сумма по дереву)
-                    if limits.cpu_time_sec is not None:
-                        total_cpu = 0.0
-                        try:
-                            procs = [proc] + proc.children(recursive=True)
-                        except Exception:
-                            procs = [proc]
-                        for pr in procs:
-                            try:
-                                t = pr.cpu_times()
-                                total_cpu += t.user + t.system
-                            except Exception:
-                                pass
-                        if total_cpu > limits.cpu_time_sec:
-                            state.timed_out = True
-                            state.killed_reason = "cpu_time_exceeded"
-                            _kill_tree(proc)
-                            return
-                    # rss (берём максимум среди потомков)
-                    if limits.max_rss_mb is not None:
-                        max_rss = 0
-                        try:
-                            procs = [proc] + proc.children(recursive=True)
-                        except Exception:
-                            procs = [proc]
-                        for pr in procs:
-                            try:
-                                rss = pr.memory_info().rss
-                                if rss > max_rss:
-                                    max_rss = rss
-                            except Exception:
-                                pass
-                        if max_rss > limits.max_rss_mb * 1024 * 1024:
-                            state.timed_out = True
-                            state.killed_reason = "rss_exceeded"
-                            _kill_tree(proc)
-                            return
-                    time.sleep(0.05)
-            except Exception:
-                # монитор упал: лучше завершить процесс
-                try:
-                    _kill_tree(proc)
-                except Exception:
-                    pass
-                state.timed_out = True
-                state.killed_reason = state.killed_reason or "monitor_error"
-
-        mon = threading.Thread(target=_monitor, daemon=True)
-        mon.start()
-
-        out, err = _collect_output(p)
+        # мониторинг по CPU/RSS/wall — общий поток для всех запусков
+        watch = sandbox_monitor().watch(p.pid, limits)
+        try:
+            out, err = _collect_output(p)
+        finally:
+            sandbox_monitor().unwatch(watch)
         code = p.returncode if p.returncode is not None else -9
         return ExecResult(
             exit_code=code,
             stdout=out,
             stderr=err,
-            timed_out=state.timed_out,
-            killed_reason=state.killed_reason,
+            timed_out=watch.timed_out,
+            killed_reason=watch.killed_reason,
         )
@@ -25,6 +25,40 @@ class ProjectionTarget:
     path: Optional[str] = None
     table: Optional[str] = None
     column: Optional[str] = None
+    # Yjs only: minimum interval between two writes of this target; writes
+    # arriving in between are merged and only the latest value is written.
+    throttle_ms: Optional[int] = None
+    # Yjs only: store objects as nested Y maps/arrays so that later writes
+    # update individual entries instead of replacing the whole value.
+    structural: bool = False
+
+
+def _parse_targets(targets_raw: list) -> List[ProjectionTarget]:
+    targets: List[ProjectionTarget] = []
+    for t in targets_raw:
+        if not isinstance(t, dict):
+            continue
+        backend = str(t.get("backend") or "").strip().lower()
+        if backend not in ("yjs", "kv", "sql"):
+            continue
+        throttle_ms: Optional[int] = None
+        try:
+            if t.get("throttle_ms") is not None:
+                throttle_ms = max(0, int(t.get("throttle_ms"))) or None
+        except (TypeError, ValueError):
+            throttle_ms = None
+        targets.append(
+            ProjectionTarget(
+                backend=backend,  # type: ignore[arg-type]
+                webspace_id=str(t.get("webspace_id") or "") or None,
+                path=str(t.get("path") or "") or None,
+                table=str(t.get("table") or "") or None,
+                column=str(t.get("column") or "") or None,
+                throttle_ms=throttle_ms,
+                structural=bool(t.get("structural")),
+            )
+        )
+    return targets
 
 
 @dataclass(slots=True)
@@ -76,22 +110,7 @@ class ProjectionRegistry:
             if not isinstance(targets_raw, list):
                 continue
 
-            targets: List[ProjectionTarget] = []
-            for t in targets_raw:
-                if not isinstance(t, dict):
-                    continue
-                backend = str(t.get("backend") or "").strip().lower()
-                if backend not in ("yjs", "kv", "sql"):
-                    continue
-                targets.append(
-                    ProjectionTarget(
-                        backend=backend,  # type: ignore[arg-type]
-                        webspace_id=str(t.get("webspace_id") or "") or None,
-                        path=str(t.get("path") or "") or None,
-                        table=str(t.get("table") or "") or None,
-                        column=str(t.get("column") or "") or None,
-                    )
-                )
+            targets = _parse_targets(targets_raw)
             key = (scope, slot)
             if targets:
                 self._rules[key] = ProjectionRule(scope=scope, slot=slot, targets=targets)
@@ -135,22 +154,7 @@ class ProjectionRegistry:
             if not isinstance(targets_raw, list):
                 continue
 
-            targets: List[ProjectionTarget] = []
-            for t in targets_raw:
-                if not isinstance(t, dict):
-                    continue
-                backend = str(t.get("backend") or "").strip().lower()
-                if backend not in ("yjs", "kv", "sql"):
-                    continue
-                targets.append(
-                    ProjectionTarget(
-                        backend=backend,  # type: ignore[arg-type]
-                        webspace_id=str(t.get("webspace_id") or "") or None,
-                        path=str(t.get("path") or "") or None,
-                        table=str(t.get("table") or "") or None,
-                        column=str(t.get("column") or "") or None,
-                    )
-                )
+            targets = _parse_targets(targets_raw)
 
             key = (scope, slot)
             if targets:
@@ -171,6 +175,8 @@ class ProjectionRegistry:
               - backend: yjs
                 webspace_id: desktop
                 path: data/skills/weather/global/snapshot
+                throttle_ms: 250      # optional, write at most 4x per second
+                structural: true      # optional, diff nested entries in place
         """
         manifest = read_manifest(scenario_id, space=space)
         entries = manifest.get("data_projections") or []
@@ -3,13 +3,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, List, Optional
+import asyncio
 import json
 import logging
 
 from adaos.services.agent_context import AgentContext, get_ctx
-from adaos.services.yjs.doc import mutate_live_room, async_get_ydoc
 from adaos.services.user.profile import UserProfileService
 from .projection_registry import ProjectionRegistry, ProjectionTarget
+from .projection_writes import projection_writer
 
 _log = logging.getLogger("adaos.scenario.projection")
 
@@ -45,14 +46,18 @@ class ProjectionService:
         if not targets:
             _log.debug("no projections configured for scope=%s slot=%s", scope, slot)
             return
+        yjs_writes = []
         for t in targets:
             if t.backend == "yjs":
-                await self._apply_yjs(t, value, user_id=user_id, webspace_id=webspace_id)
+                yjs_writes.append(self._apply_yjs(t, value, user_id=user_id, webspace_id=webspace_id))
             elif t.backend == "kv":
                 self._apply_kv(scope, slot, value, user_id=user_id)
             else:
                 # sql/other backends are reserved for future use
                 _log.debug("backend %s is not implemented yet for scope=%s slot=%s", t.backend, scope, slot)
+        if yjs_writes:
+            # Submitted together so targets in the same webspace share one transaction.
+            await asyncio.gather(*yjs_writes)
 
     async def _apply_yjs(
         self,
@@ -80,38 +85,26 @@ class ProjectionService:
         segments = [s for s in path.split("/") if s]
         if len(segments) < 2:
             return
-        root_name = segments[0]
-
-        def _mutator(doc, txn) -> None:
-            root = doc.get_map(root_name)
-            try:
-                payload = json.loads(json.dumps(value))
-            except Exception:
-                payload = value
-
-            # For simple two-segment paths like ``data/weather`` keep the
-            # legacy flat ``data["weather"]`` behaviour so existing widgets
-            # continue to work. For longer paths such as ``data/infra/status``
-            # build a nested JSON object under the first key so that
-            # YDocService.getPath can resolve it reliably.
-            if len(segments) == 2:
-                key = segments[1]
-                root.set(txn, key, payload)
-                return
-
-            top_key = segments[1]
-            nested: Any = payload
-            for seg in reversed(segments[2:]):
-                nested = {seg: nested}
-            root.set(txn, top_key, nested)
-
-        if not mutate_live_room(ws_id, _mutator):
-            try:
-                async with async_get_ydoc(ws_id) as ydoc:
-                    with ydoc.begin_transaction() as txn:
-                        _mutator(ydoc, txn)
-            except Exception:
-                _log.warning("failed to apply yjs projection webspace=%s path=%s", ws_id, path, exc_info=True)
+
+        try:
+            payload = json.loads(json.dumps(value))
+        except Exception:
+            payload = value
+
+        # For simple two-segment paths like ``data/weather`` keep the legacy
+        # flat ``data["weather"]`` behaviour so existing widgets continue to
+        # work. Longer paths such as ``data/infra/status`` resolve to a nested
+        # object under the first key so that YDocService.getPath can find it;
+        # sibling keys written by other projections are kept. The writer
+        # coalesces concurrent writes per webspace and only emits changed
+        # entries.
+        await projection_writer().submit(
+            ws_id,
+            segments,
+            payload,
+            structural=target.structural,
+            throttle_ms=target.throttle_ms,
+        )
 
     def _apply_kv(self, scope: str, slot: str, value: Any, *, user_id: Optional[str]) -> None:
         # For MVP treat (current_user, "profile.settings") specially and
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+"""
+Coalesced, diff-based Yjs projection writes.
+
+``ProjectionService`` used to open one transaction per ``ctx.*.set`` call and
+replace the whole value under the first path key, so a skill publishing a
+large snapshot a few times per second shipped the full snapshot to every
+client each time, even when only one field changed.
+
+:class:`ProjectionWriter` sits between the service and the YDoc:
+
+  - writes are queued per webspace and flushed together in a single
+    transaction after a short window (``ADAOS_PROJECTION_COALESCE_MS``,
+    default 0 = next event loop iteration); for the same path only the
+    latest value is written;
+  - a target with ``throttle_ms`` is written at most once per interval,
+    intermediate values are dropped; a write that falls inside the interval
+    returns once queued and only the latest value is written when it ends;
+  - values are diffed against the document: unchanged values produce no
+    operation, nested Y maps/arrays are updated entry by entry and sibling
+    keys of nested paths are preserved. Plain JSON values stored by older
+    writers can only be replaced as a whole; targets declared with
+    ``structural: true`` are stored as nested Y types on the next change so
+    that subsequent writes become entry-level updates.
+
+``await submit(...)`` returns once the value has been handed to the room.
+All queued state belongs to one owner loop; submits from other loops are
+handed over with ``run_coroutine_threadsafe``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import y_py as Y
+
+from adaos.services.yjs.doc import async_get_ydoc, mutate_live_room
+
+_log = logging.getLogger("adaos.scenario.projection")
+
+PathKey = Tuple[str, ...]
+
+_MISSING = object()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _plain(node: Any) -> Any:
+    if isinstance(node, (Y.YMap, Y.YArray)):
+        try:
+            return json.loads(node.to_json())
+        except Exception:
+            return None
+    return node
+
+
+def _same(a: Any, b: Any) -> bool:
+    """JSON equality that survives y_py's int->float conversion but keeps bools apart."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return type(a) is type(b) and a == b
+
+
+def _prelim(value: Any, structural: bool) -> Any:
+    if not structural:
+        return value
+    if isinstance(value, dict):
+        return Y.YMap({str(k): _prelim(v, True) for k, v in value.items()})
+    if isinstance(value, list):
+        return Y.YArray([_prelim(v, True) for v in value])
+    return value
+
+
+class _Diff:
+    """Apply ``value`` onto existing Y containers with the minimal set of operations."""
+
+    def __init__(self, txn: Any, structural: bool) -> None:
+        self.txn = txn
+        self.structural = structural
+        self.ops = 0
+
+    def assign(self, ymap: Any, key: str, value: Any, current: Any = _MISSING) -> None:
+        if current is _MISSING:
+            # ``key in ymap`` would materialize every value of the map.
+            current = ymap.get(key, _MISSING)
+        if isinstance(current, Y.YMap) and isinstance(value, dict):
+            self.diff_map(current, value)
+            return
+        if isinstance(current, Y.YArray) and isinstance(value, list):
+            self.diff_array(current, value)
+            return
+        if current is not _MISSING and not isinstance(current, (Y.YMap, Y.YArray)) and _same(current, value):
+            return
+        ymap.set(self.txn, key, _prelim(value, self.structural))
+        self.ops += 1
+
+    def diff_map(self, ymap: Any, value: Dict[str, Any]) -> None:
+        for key in [k for k in ymap.keys() if k not in value]:
+            ymap.pop(self.txn, key)
+            self.ops += 1
+        for key, item in value.items():
+            self.assign(ymap, str(key), item)
+
+    def diff_array(self, yarr: Any, value: List[Any]) -> None:
+        old = list(yarr)
+        n_old, n_new = len(old), len(value)
+        prefix = 0
+        while prefix < min(n_old, n_new) and _same(_plain(old[prefix]), value[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < min(n_old, n_new) - prefix and _same(_plain(old[n_old - 1 - suffix]), value[n_new - 1 - suffix]):
+            suffix += 1
+        old_mid = old[prefix : n_old - suffix]
+        new_mid = value[prefix : n_new - suffix]
+        index = prefix
+        for current, item in zip(old_mid, new_mid):
+            if isinstance(current, Y.YMap) and isinstance(item, dict):
+                self.diff_map(current, item)
+            elif isinstance(current, Y.YArray) and isinstance(item, list):
+                self.diff_array(current, item)
+            else:
+                yarr.delete(self.txn, index)
+                yarr.insert(self.txn, index, _prelim(item, self.structural))
+                self.ops += 1
+            index += 1
+        common = min(len(old_mid), len(new_mid))
+        if len(old_mid) > common:
+            yarr.delete_range(self.txn, index, len(old_mid) - common)
+            self.ops += 1
+        elif len(new_mid) > common:
+            yarr.insert_range(self.txn, index, [_prelim(v, self.structural) for v in new_mid[common:]])
+            self.ops += 1
+
+
+def write_path(doc: Any, txn: Any, segments: Sequence[str], value: Any, *, structural: bool = False) -> int:
+    """
+    Write ``value`` at ``segments`` (``["data", "weather", ...]``) and return
+    the number of Yjs operations it took (0 when nothing changed).
+    """
+    node = doc.get_map(segments[0])
+    keys = list(segments[1:])
+    current = node.get(keys[0], _MISSING)
+    while len(keys) > 1 and isinstance(current, Y.YMap):
+        node = current
+        keys = keys[1:]
+        current = node.get(keys[0], _MISSING)
+    diff = _Diff(txn, structural)
+    if len(keys) == 1:
+        diff.assign(node, keys[0], value, current)
+        return diff.ops
+
+    # The remaining path runs through a plain JSON object: rebuild it with the
+    # new leaf while keeping the sibling keys written by other projections.
+    base = _plain(current)
+    merged: Dict[str, Any] = dict(base) if isinstance(base, dict) else {}
+    cursor = merged
+    for seg in keys[1:-1]:
+        child = cursor.get(seg)
+        child = dict(child) if isinstance(child, dict) else {}
+        cursor[seg] = child
+        cursor = child
+    cursor[keys[-1]] = value
+    diff.assign(node, keys[0], merged, current)
+    return diff.ops
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    def _done() -> None:
+        if not fut.done():
+            fut.set_result(None)
+
+    loop = fut.get_loop()
+    try:
+        if loop is asyncio.get_running_loop():
+            _done()
+            return
+    except RuntimeError:
+        pass
+    try:
+        loop.call_soon_threadsafe(_done)
+    except RuntimeError:
+        pass  # the waiter's loop is closed
+
+
+@dataclass(slots=True)
+class _Pending:
+    value: Any
+    structural: bool
+    due: float
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class ProjectionWriter:
+    def __init__(self, window_ms: Optional[float] = None) -> None:
+        if window_ms is None:
+            window_ms = _env_float("ADAOS_PROJECTION_COALESCE_MS", 0.0)
+        self.window_s = max(0.0, float(window_ms)) / 1000.0
+        # Batches, timers and waiters all live on one owner loop; submits
+        # from other loops (asyncio.run in the sync ``ctx.set`` path) are
+        # handed over to it instead of touching its timers and futures.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, Dict[PathKey, _Pending]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._last_write: Dict[Tuple[str, PathKey], float] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "writes": 0,
+            "coalesced": 0,
+            "transactions": 0,
+            "ops": 0,
+            "unchanged": 0,
+        }
+
+    async def submit(
+        self,
+        webspace_id: str,
+        segments: Sequence[str],
+        value: Any,
+        *,
+        structural: bool = False,
+        throttle_ms: Optional[int] = None,
+    ) -> None:
+        owner = self._owner()
+        coro = self._enqueue(webspace_id, tuple(segments), value, structural, throttle_ms)
+        if owner is asyncio.get_running_loop():
+            await coro
+        else:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, owner))
+
+    def _owner(self) -> asyncio.AbstractEventLoop:
+        """Return the owner loop, taking over from one that has stopped."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owner = self._loop
+            if owner is not None and owner is not loop and owner.is_running():
+                return owner
+            self._loop = loop
+            if owner is None or owner is loop:
+                return loop
+            # The previous owner is gone: its timers never fire and its
+            # waiters cannot be resolved, so reschedule the batches here.
+            self._timers.clear()
+            for batch in self._pending.values():
+                for entry in batch.values():
+                    entry.waiters = [fut for fut in entry.waiters if not fut.get_loop().is_closed()]
+            for ws in list(self._pending):
+                self._schedule(ws, loop)
+        return loop
+
+    async def _enqueue(
+        self,
+        webspace_id: str,
+        key: PathKey,
+        value: Any,
+        structural: bool,
+        throttle_ms: Optional[int],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        fut: Optional[asyncio.Future] = None
+        with self._lock:
+            self.stats["writes"] += 1
+            batch = self._pending.setdefault(webspace_id, {})
+            due = now + self.window_s
+            throttled = False
+            if throttle_ms:
+                last = self._last_write.get((webspace_id, key))
+                if last is not None and last + throttle_ms / 1000.0 > due:
+                    due = last + throttle_ms / 1000.0
+                    throttled = True
+            entry = batch.get(key)
+            if entry is not None:
+                self.stats["coalesced"] += 1
+                entry.value = value
+                entry.structural = structural
+                entry.due = min(entry.due, due)
+            else:
+                entry = batch[key] = _Pending(value=value, structural=structural, due=due)
+            if not throttled:
+                # A throttled value is only queued: a later one replaces it
+                # and the latest is written when the interval ends.
+                fut = loop.create_future()
+                entry.waiters.append(fut)
+            self._schedule(webspace_id, loop)
+        if fut is not None:
+            await fut
+
+    def _schedule(self, webspace_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        batch = self._pending.get(webspace_id)
+        if not batch:
+            return
+        due = min(entry.due for entry in batch.values())
+        timer = self._timers.get(webspace_id)
+        if timer is not None:
+            if not timer.cancelled() and timer.when() <= due:
+                return
+            timer.cancel()
+        self._timers[webspace_id] = loop.call_at(due, lambda: loop.create_task(self._flush(webspace_id)))
+
+    async def _flush(self, webspace_id: str, *, force: bool = False) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        with self._lock:
+            timer = self._timers.pop(webspace_id, None)
+            if timer is not None:
+                timer.cancel()
+            batch = self._pending.get(webspace_id) or {}
+            ready = {k: e for k, e in batch.items() if force or e.due <= now}
+            for key in ready:
+                batch.pop(key, None)
+                self._last_write[(webspace_id, key)] = now
+            if not batch:
+                self._pending.pop(webspace_id, None)
+            else:
+                self._schedule(webspace_id, loop)
+        if not ready:
+            return
+        try:
+            await self._write(webspace_id, ready)
+        finally:
+            for entry in ready.values():
+                for fut in entry.waiters:
+                    _resolve(fut)
+
+    async def _write(self, webspace_id: str, ready: Dict[PathKey, _Pending]) -> None:
+        def _mutator(doc, txn) -> None:
+            for segments, entry in ready.items():
+                try:
+                    ops = write_path(doc, txn, segments, entry.value, structural=entry.structural)
+                except Exception:
+                    _log.warning("failed to write projection webspace=%s path=%s", webspace_id, "/".join(segments), exc_info=True)
+                    continue
+                with self._lock:
+                    self.stats["ops"] += ops
+                    if not ops:
+                        self.stats["unchanged"] += 1
+
+        with self._lock:
+            self.stats["transactions"] += 1
+        if not mutate_live_room(webspace_id, _mutator):
+            try:
+                async with async_get_ydoc(webspace_id) as ydoc:
+                    with ydoc.begin_transaction() as txn:
+                        _mutator(ydoc, txn)
+            except Exception:
+                _log.warning("failed to apply yjs projection webspace=%s", webspace_id, exc_info=True)
+
+    async def flush(self, webspace_id: Optional[str] = None) -> None:
+        """Write everything queued (ignoring windows and throttles)."""
+        owner = self._owner()
+        if owner is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.flush(webspace_id), owner))
+            return
+        with self._lock:
+            targets = [webspace_id] if webspace_id is not None else list(self._pending)
+        for ws in targets:
+            await self._flush(ws, force=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "window_ms": self.window_s * 1000.0,
+                "pending": sum(len(batch) for batch in self._pending.values()),
+            }
+
+
+_WRITER: Optional[ProjectionWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def projection_writer() -> ProjectionWriter:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = ProjectionWriter()
+        return _WRITER
+
+
+__all__ = ["ProjectionWriter", "projection_writer", "write_path"]
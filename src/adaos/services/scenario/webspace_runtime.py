@@ -25,8 +25,11 @@ from adaos.services.yjs.seed import SEED
 from adaos.services.eventbus import emit
 from adaos.sdk.core.decorators import subscribe
 from .workflow_runtime import ScenarioWorkflowRuntime
+from .webui_index import SkillWebuiIndex, fingerprint, get_webui_index, project_fingerprint, webspace_dependency_graph
 
 _log = logging.getLogger("adaos.scenario.webspace_runtime")
+# Yjs subtrees written by a rebuild (see _apply_resolved_state_in_doc).
+_RESOLVED_SUBTREES = ("ui/application", "data/catalog", "data/installed", "data/desktop", "data/routing", "registry/merged")
 _WS_ID_RE = re.compile(r"[^a-zA-Z0-9-_]+")
 _SCENARIO_SWITCH_REBUILD_TASKS: dict[str, asyncio.Task[Any]] = {}
 _WEBSPACE_REBUILD_STATUS: dict[str, Dict[str, Any]] = {}
@@ -430,6 +433,12 @@ class WebspaceScenarioRuntime:
         self.ctx: AgentContext = ctx or get_ctx()
         # Cached snapshot of desktop scenarios discovered on disk.
         self._desktop_scenarios: Optional[List[Tuple[str, str]]] = None
+        # skill -> fingerprint of the webui.json consumed by the current rebuild
+        self._decl_sources: Dict[str, Any] = {}
+        # every (skill, space, fingerprint or None) webui.json lookup of the current rebuild
+        self._lookups: List[Tuple[str, str, Any]] = []
+        self._bases: Dict[str, Path] = {}
+        self._index: Optional[SkillWebuiIndex] = None
 
     # --- scenario helpers -------------------------------------------------
 
@@ -471,69 +480,65 @@ class WebspaceScenarioRuntime:
 
     # --- helpers ---------------------------------------------------------
 
-    def _load_webui(self, skill_name: str, space: str) -> Dict[str, Any]:
+    def _skills_base(self, space: str) -> Path:
+        # skills_dir() resolves the path on every call; once per rebuild is enough.
+        base = self._bases.get(space)
+        if base is None:
+            paths = self.ctx.paths
+            base = self._bases[space] = Path(paths.dev_skills_dir() if space == "dev" else paths.skills_dir())
+        return base
+
+    def _webui_path(self, skill_name: str, space: str) -> Optional[Path]:
         paths = self.ctx.paths
-        base = paths.dev_skills_dir() if space == "dev" else paths.skills_dir()
-        path = Path(base) / skill_name / "webui.json"
-        if not path.exists():
-            try:
-                repo_root_attr = getattr(paths, "repo_root", None)
-                repo_root = repo_root_attr() if callable(repo_root_attr) else repo_root_attr
-                if repo_root:
-                    fallback = (
-                        Path(repo_root).expanduser().resolve() / ".adaos" / "workspace" / "skills" / skill_name / "webui.json"
-                    )
-                    if fallback.exists():
-                        path = fallback
-            except Exception:
-                pass
-        if not path.exists():
-            _log.debug("webui.json missing for %s (%s)", skill_name, space)
-            return {}
+        path = self._skills_base(space) / skill_name / "webui.json"
+        if path.exists():
+            return path
         try:
-            # Accept UTF-8 with BOM produced by some Windows/PowerShell editors.
-            raw = json.loads(path.read_text(encoding="utf-8-sig"))
-        except Exception as exc:
-            _log.warning("failed to read webui.json for %s: %s", skill_name, exc)
-            return {}
-
-        catalog = raw.get("catalog") or {}
-        apps = raw.get("apps") or catalog.get("apps") or []
-        widgets = raw.get("widgets") or catalog.get("widgets") or []
-        registry = raw.get("registry") or {}
-        reg_modals_raw = registry.get("modals") or {}
-        reg_widgets_raw = registry.get("widgets") or {}
-        ydoc_defaults = raw.get("ydoc_defaults") or {}
-        raw_contrib = raw.get("contributions") or []
-        contributions = [c for c in raw_contrib if isinstance(c, dict)]
-
-        return {
-            "skill": skill_name,
-            "space": space,
-            "apps": [it for it in apps if isinstance(it, dict)],
-            "widgets": [it for it in widgets if isinstance(it, dict)],
-            "registry": {
-                "modals": ({str(k): v for k, v in reg_modals_raw.items()} if isinstance(reg_modals_raw, dict) else [str(x) for x in reg_modals_raw if isinstance(x, (str, int))]),
-                "widgets": (
-                    {str(k): v for k, v in reg_widgets_raw.items()} if isinstance(reg_widgets_raw, dict) else [str(x) for x in reg_widgets_raw if isinstance(x, (str, int))]
-                ),
-            },
-            "ydoc_defaults": ydoc_defaults if isinstance(ydoc_defaults, dict) else {},
-            "contributions": contributions,
-        }
+            repo_root_attr = getattr(paths, "repo_root", None)
+            repo_root = repo_root_attr() if callable(repo_root_attr) else repo_root_attr
+            if repo_root:
+                fallback = Path(repo_root).expanduser().resolve() / ".adaos" / "workspace" / "skills" / skill_name / "webui.json"
+                if fallback.exists():
+                    return fallback
+        except Exception:
+            pass
+        return None
 
-    def _collect_skill_decls(self, mode: str = "mixed") -> List[Dict[str, Any]]:
+    def _load_webui(self, skill_name: str, space: str) -> Dict[str, Any]:
+        path = self._webui_path(skill_name, space)
+        if path is None:
+            _log.debug("webui.json missing for %s (%s)", skill_name, space)
+            self._lookups.append((skill_name, space, None))
+            return {}
+        # Normalized declarations are served from the fingerprinted index; the
+        # returned dict is shared and must not be mutated.
+        if self._index is None:
+            self._index = get_webui_index(self.ctx)
+        decl, fp = self._index.lookup(skill_name, space, path)
+        self._lookups.append((skill_name, space, fp))
+        if decl:
+            self._decl_sources[skill_name] = fp
+        return decl
+
+    def _lookup_current(self, skill_name: str, space: str, fp: Any) -> bool:
+        path = self._webui_path(skill_name, space)
+        return (fingerprint(path) if path is not None else None) == fp
+
+    @staticmethod
+    def _capacity_skills() -> List[Dict[str, Any]]:
         try:
-            cap = get_local_capacity()
-            skills = cap.get("skills") or []
+            skills = get_local_capacity().get("skills") or []
         except Exception:
             skills = []
         if not isinstance(skills, list):
-            skills = []
+            return []
+        return [rec for rec in skills if isinstance(rec, dict)]
 
+    def _collect_skill_decls(self, mode: str = "mixed") -> List[Dict[str, Any]]:
+        self._bases = {}
         decls: List[Dict[str, Any]] = []
-        for rec in skills:
-            if not isinstance(rec, dict) or not rec.get("active", True):
+        for rec in self._capacity_skills():
+            if not rec.get("active", True):
                 continue
             name = rec.get("name") or rec.get("id")
             if not name:
@@ -574,6 +579,8 @@ class WebspaceScenarioRuntime:
         if isinstance(desktop_decl, dict) and desktop_decl:
             decls.append(desktop_decl)
 
+        if self._index is not None:
+            self._index.flush()
         return decls
 
     def _apply_ydoc_defaults_in_txn(self, ydoc: Y.YDoc, txn: Any, decls: List[Dict[str, Any]]) -> None:  # type: ignore[override]
@@ -602,23 +609,8 @@ class WebspaceScenarioRuntime:
                 value = default
             root.set(txn, key, value)
 
-    def _collect_resolver_inputs_in_doc(self, ydoc: Y.YDoc, webspace_id: str) -> WebspaceResolverInputs:
-        ui_map = ydoc.get_map("ui")
-        data_map = ydoc.get_map("data")
-        registry_map = ydoc.get_map("registry")
-
-        scenario_id = ui_map.get("current_scenario") or "web_desktop"
-        scenarios_ui = _coerce_dict(ui_map.get("scenarios") or {})
-        scenario_ui_entry = _coerce_dict(scenarios_ui.get(scenario_id) or {})
-        scenario_app_ui = _coerce_dict(scenario_ui_entry.get("application") or {})
-
-        scenarios_data = _coerce_dict(data_map.get("scenarios") or {})
-        scenario_entry = _coerce_dict(scenarios_data.get(scenario_id) or {})
-        base_catalog = _coerce_dict(scenario_entry.get("catalog") or {})
-
-        scenario_registry_map = _coerce_dict(registry_map.get("scenarios") or {})
-        registry_entry = _coerce_dict(scenario_registry_map.get(scenario_id) or {})
-
+    def _workspace_sources(self, webspace_id: str) -> Dict[str, Any]:
+        """Resolver inputs that come from the workspace manifest row."""
         mode = "mixed"
         metadata: Dict[str, Any] = {}
         overlay_snapshot: Dict[str, Any] = {}
@@ -646,22 +638,53 @@ class WebspaceScenarioRuntime:
         except Exception:
             mode = "mixed"
             metadata = {}
+        return {"mode": mode, "metadata": metadata, "overlay": overlay_snapshot}
+
+    def _rebuild_sources(self, webspace_id: str) -> Dict[str, Any]:
+        """Everything a rebuild reads outside the YDoc, except webui.json files."""
+        sources = self._workspace_sources(webspace_id)
+        sources["skills"] = self._capacity_skills()
+        sources["desktop_scenarios"] = self._list_desktop_scenarios(space=sources["mode"])
+        return sources
+
+    def _collect_resolver_inputs_in_doc(
+        self, ydoc: Y.YDoc, webspace_id: str, sources: Optional[Dict[str, Any]] = None
+    ) -> WebspaceResolverInputs:
+        ui_map = ydoc.get_map("ui")
+        data_map = ydoc.get_map("data")
+        registry_map = ydoc.get_map("registry")
+
+        scenario_id = ui_map.get("current_scenario") or "web_desktop"
+        scenarios_ui = _coerce_dict(ui_map.get("scenarios") or {})
+        scenario_ui_entry = _coerce_dict(scenarios_ui.get(scenario_id) or {})
+        scenario_app_ui = _coerce_dict(scenario_ui_entry.get("application") or {})
+
+        scenarios_data = _coerce_dict(data_map.get("scenarios") or {})
+        scenario_entry = _coerce_dict(scenarios_data.get(scenario_id) or {})
+        base_catalog = _coerce_dict(scenario_entry.get("catalog") or {})
+
+        scenario_registry_map = _coerce_dict(registry_map.get("scenarios") or {})
+        registry_entry = _coerce_dict(scenario_registry_map.get(scenario_id) or {})
+
+        row = sources if sources is not None else self._workspace_sources(webspace_id)
+        mode = row["mode"]
+        desktop_scenarios = sources["desktop_scenarios"] if sources is not None else self._list_desktop_scenarios(space=mode)
 
         return WebspaceResolverInputs(
             webspace_id=webspace_id,
             scenario_id=str(scenario_id),
             source_mode=mode,
-            metadata=metadata,
+            metadata=row["metadata"],
             scenario_application=scenario_app_ui,
             scenario_catalog=base_catalog,
             scenario_registry=registry_entry,
-            overlay_snapshot=overlay_snapshot,
+            overlay_snapshot=row["overlay"],
             live_state={
                 "desktop": _coerce_dict(data_map.get("desktop") or {}),
                 "routing": _coerce_dict(data_map.get("routing") or {}),
             },
             skill_decls=self._collect_skill_decls(mode=mode),
-            desktop_scenarios=self._list_desktop_scenarios(space=mode),
+            desktop_scenarios=desktop_scenarios,
         )
 
     def resolve_webspace(self, inputs: WebspaceResolverInputs) -> WebspaceResolverOutputs:
@@ -896,37 +919,108 @@ class WebspaceScenarioRuntime:
             skill_decls=skill_decls,
         )
 
-    def _apply_resolved_state_in_doc(self, ydoc: Y.YDoc, webspace_id: str, resolved: WebspaceResolverOutputs) -> None:
+    def _apply_resolved_state_in_doc(self, ydoc: Y.YDoc, webspace_id: str, resolved: WebspaceResolverOutputs) -> Dict[str, List[str]]:
+        """
+        Write the resolved subtrees, skipping those whose value is unchanged.
+
+        Each write fans out as a Yjs update to every connected client and to the
+        ystore, so an unchanged subtree is compared and left alone; when nothing
+        changed no transaction is opened at all. Returns written/skipped paths.
+        """
         ui_map = ydoc.get_map("ui")
         data_map = ydoc.get_map("data")
         registry_map = ydoc.get_map("registry")
 
-        with ydoc.begin_transaction() as txn:
+        targets = [
+            ("ui/application", ui_map, "application", resolved.application, False),
+            ("data/catalog", data_map, "catalog", resolved.catalog, False),
+            ("data/installed", data_map, "installed", resolved.installed, False),
+            ("data/desktop", data_map, "desktop", resolved.desktop, True),
+            ("data/routing", data_map, "routing", resolved.routing, True),
+            ("registry/merged", registry_map, "merged", resolved.registry, False),
+        ]
+        written: List[str] = []
+        skipped: List[str] = []
+        pending = []
+        for label, ymap, key, value, tolerant in targets:
             try:
-                self._apply_ydoc_defaults_in_txn(ydoc, txn, resolved.skill_decls)
+                current = ymap.get(key)
             except Exception:
-                _log.warning("failed to apply ydoc_defaults for webspace=%s", webspace_id, exc_info=True)
+                current = None
+            if current is not None and current == value:
+                skipped.append(label)
+            else:
+                pending.append((label, ymap, key, value, tolerant))
 
-            ui_map.set(txn, "application", resolved.application)
-            data_map.set(txn, "catalog", resolved.catalog)
-            data_map.set(txn, "installed", resolved.installed)
-            try:
-                data_map.set(txn, "desktop", resolved.desktop)
-            except Exception:
-                pass
-            try:
-                data_map.set(txn, "routing", resolved.routing)
-            except Exception:
-                pass
-            registry_map.set(txn, "merged", resolved.registry)
+        defaults_pending = self._ydoc_defaults_pending(ydoc, resolved.skill_decls)
+        if not pending and not defaults_pending:
+            return {"written": written, "skipped": skipped}
 
-    def _resolve_in_doc(self, ydoc: Y.YDoc, webspace_id: str) -> WebspaceResolverOutputs:
-        return self.resolve_webspace(self._collect_resolver_inputs_in_doc(ydoc, webspace_id))
+        with ydoc.begin_transaction() as txn:
+            if defaults_pending:
+                try:
+                    self._apply_ydoc_defaults_in_txn(ydoc, txn, resolved.skill_decls)
+                    written.append("ydoc_defaults")
+                except Exception:
+                    _log.warning("failed to apply ydoc_defaults for webspace=%s", webspace_id, exc_info=True)
+
+            for label, ymap, key, value, tolerant in pending:
+                try:
+                    ymap.set(txn, key, value)
+                except Exception:
+                    if not tolerant:
+                        raise
+                    continue
+                written.append(label)
+        return {"written": written, "skipped": skipped}
+
+    @staticmethod
+    def _ydoc_defaults_pending(ydoc: Y.YDoc, decls: List[Dict[str, Any]]) -> bool:
+        for decl in decls:
+            raw = decl.get("ydoc_defaults") or {}
+            if not isinstance(raw, dict):
+                continue
+            for path in raw:
+                if not isinstance(path, str):
+                    continue
+                segments = [s for s in path.split("/") if s]
+                if len(segments) == 2 and ydoc.get_map(segments[0]).get(segments[1]) is None:
+                    return True
+        return False
 
     def _rebuild_in_doc(self, ydoc: Y.YDoc, webspace_id: str) -> WebUIRegistryEntry:
-        resolved = self._resolve_in_doc(ydoc, webspace_id)
-        self._apply_resolved_state_in_doc(ydoc, webspace_id, resolved)
+        graph = webspace_dependency_graph()
+        self._bases = {}
+        sources = self._rebuild_sources(webspace_id)
+        try:
+            doc_state: Optional[bytes] = Y.encode_state_vector(ydoc)
+        except Exception:
+            doc_state = None
+        # Nobody wrote to the doc since the last rebuild, manifest/capacity
+        # inputs are equal and no webui.json it looked up changed (or appeared):
+        # the result would be identical, so neither resolve nor compare subtrees.
+        cached = graph.reusable(webspace_id, doc_state, sources) if doc_state is not None else None
+        if cached is not None and all(self._lookup_current(*lookup) for lookup in cached[1]):
+            graph.record_unchanged(webspace_id, list(_RESOLVED_SUBTREES))
+            return cached[0]
+
+        self._decl_sources = {}
+        self._lookups = []
+        resolved = self.resolve_webspace(self._collect_resolver_inputs_in_doc(ydoc, webspace_id, sources))
+        applied = self._apply_resolved_state_in_doc(ydoc, webspace_id, resolved)
         entry = resolved.to_registry_entry()
+        try:
+            graph.record(
+                webspace_id,
+                dict(self._decl_sources),
+                written=list((applied or {}).get("written") or []),
+                skipped=list((applied or {}).get("skipped") or []),
+            )
+            graph.remember(
+                webspace_id, doc_state=Y.encode_state_vector(ydoc), sources=sources, lookups=self._lookups, entry=entry
+            )
+        except Exception:
+            pass
 
         try:
             _log.debug(
@@ -1457,6 +1551,7 @@ class WebspaceService:
                 pass
         except Exception:
             _log.warning("failed to reset ystore for webspace=%s", webspace_id, exc_info=True)
+        webspace_dependency_graph().forget(webspace_id)
         await self._sync_listing()
         return True
 
@@ -2201,6 +2296,18 @@ async def ensure_dev_webspace_for_scenario(
     }
 
 
+def _preview_project_fingerprint(object_type: str, object_id: str, space: str) -> Any:
+    try:
+        paths = get_ctx().paths
+        if object_type == "skill":
+            base = paths.dev_skills_dir() if space == "dev" else paths.skills_dir()
+        else:
+            base = paths.dev_scenarios_dir() if space == "dev" else paths.scenarios_dir()
+        return project_fingerprint(Path(base) / object_id)
+    except Exception:
+        return None
+
+
 async def reload_preview_webspaces_for_project(
     object_type: str,
     object_id: str,
@@ -2216,7 +2323,7 @@ async def reload_preview_webspaces_for_project(
             "error": "project_identity_required",
         }
 
-    targets: list[tuple[str, str]] = []
+    targets: list[tuple[str, str, str]] = []
     for row in workspace_index.list_workspaces():
         if not row.is_dev:
             continue
@@ -2225,7 +2332,7 @@ async def reload_preview_webspaces_for_project(
             continue
         if object_type == "scenario":
             if home_scenario == object_id:
-                targets.append((row.workspace_id, home_scenario))
+                targets.append((row.workspace_id, home_scenario, str(row.effective_source_mode or "")))
             continue
         try:
             manifest = scenarios_loader.read_manifest(home_scenario, space=row.effective_source_mode)
@@ -2236,7 +2343,7 @@ async def reload_preview_webspaces_for_project(
                 if str(item).strip()
             }
             if object_id in depends:
-                targets.append((row.workspace_id, home_scenario))
+                targets.append((row.workspace_id, home_scenario, str(row.effective_source_mode or "")))
         except Exception:
             _log.debug(
                 "failed to resolve scenario depends for preview webspace=%s home=%s",
@@ -2247,7 +2354,19 @@ async def reload_preview_webspaces_for_project(
 
     reloaded: list[str] = []
     failed: list[str] = []
-    for webspace_id, scenario_id in targets:
+    unchanged: list[str] = []
+    graph = webspace_dependency_graph()
+    project = (object_type, object_id)
+    fingerprints: dict[str, Any] = {}
+    for webspace_id, scenario_id, space in targets:
+        # Handlers, skill.yaml and seeds matter as much as webui.json, so a
+        # reload is skipped only when no file of the project changed since
+        # the last one; the rebuild itself reuses unchanged declarations.
+        if space not in fingerprints:
+            fingerprints[space] = _preview_project_fingerprint(object_type, object_id, space)
+        if graph.project_current(webspace_id, project, fingerprints[space]):
+            unchanged.append(webspace_id)
+            continue
         try:
             await reload_webspace_from_scenario(
                 webspace_id,
@@ -2255,6 +2374,7 @@ async def reload_preview_webspaces_for_project(
                 action="reload",
             )
             reloaded.append(webspace_id)
+            graph.remember_project(webspace_id, project, fingerprints[space])
         except Exception:
             failed.append(webspace_id)
             _log.warning(
@@ -2273,6 +2393,7 @@ async def reload_preview_webspaces_for_project(
         "object_id": object_id,
         "reason": str(reason or "").strip() or None,
         "reloaded_webspaces": reloaded,
+        "unchanged_webspaces": unchanged,
         "failed_webspaces": failed,
     }
 
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+"""
+Skill ``webui.json`` declaration index and webspace dependency graph.
+
+Every webspace rebuild used to re-read and re-normalize the ``webui.json`` of
+every installed skill. :class:`SkillWebuiIndex` keeps the normalized
+declaration per ``(skill, space)`` together with the fingerprint
+(path, mtime_ns, size) of the file it came from and persists it under
+``<state>/webspace/webui_index.json``, so after a restart an unchanged skill
+costs one ``stat()`` instead of a JSON parse.
+
+:class:`WebspaceDependencyGraph` records, per webspace, which skill
+declarations (and fingerprints) the last rebuild consumed and which Yjs
+subtrees it actually wrote; it answers "which webspaces does this skill feed"
+and exposes the incremental-rebuild counters for diagnostics. It also keeps
+the sources of the last rebuild (Yjs state vector, manifest/capacity inputs,
+webui.json lookups) with its result, so a rebuild whose sources are all
+unchanged returns that result without resolving or touching the doc, and the
+project fingerprint each preview webspace was last reloaded from.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_log = logging.getLogger("adaos.scenario.webui_index")
+
+_INDEX_VERSION = 1
+
+Fingerprint = Tuple[str, int, int]
+
+
+def fingerprint(path: Path) -> Optional[Fingerprint]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+_PROJECT_SKIP_DIRS = frozenset({"__pycache__", ".git"})
+
+
+def project_fingerprint(root: Path) -> Optional[Tuple[Fingerprint, ...]]:
+    """Fingerprints of every file under a skill/scenario project (``None`` if absent)."""
+    if not root.is_dir():
+        return None
+    entries: List[Fingerprint] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in _PROJECT_SKIP_DIRS)
+        for name in sorted(filenames):
+            fp = fingerprint(Path(dirpath) / name)
+            if fp is not None:
+                entries.append(fp)
+    return tuple(entries)
+
+
+def normalize_webui(raw: Dict[str, Any], skill_name: str, space: str) -> Dict[str, Any]:
+    catalog = raw.get("catalog") or {}
+    apps = raw.get("apps") or catalog.get("apps") or []
+    widgets = raw.get("widgets") or catalog.get("widgets") or []
+    registry = raw.get("registry") or {}
+    reg_modals_raw = registry.get("modals") or {}
+    reg_widgets_raw = registry.get("widgets") or {}
+    ydoc_defaults = raw.get("ydoc_defaults") or {}
+    raw_contrib = raw.get("contributions") or []
+    contributions = [c for c in raw_contrib if isinstance(c, dict)]
+
+    return {
+        "skill": skill_name,
+        "space": space,
+        "apps": [it for it in apps if isinstance(it, dict)],
+        "widgets": [it for it in widgets if isinstance(it, dict)],
+        "registry": {
+            "modals": ({str(k): v for k, v in reg_modals_raw.items()} if isinstance(reg_modals_raw, dict) else [str(x) for x in reg_modals_raw if isinstance(x, (str, int))]),
+            "widgets": (
+                {str(k): v for k, v in reg_widgets_raw.items()} if isinstance(reg_widgets_raw, dict) else [str(x) for x in reg_widgets_raw if isinstance(x, (str, int))]
+            ),
+        },
+        "ydoc_defaults": ydoc_defaults if isinstance(ydoc_defaults, dict) else {},
+        "contributions": contributions,
+    }
+
+
+class SkillWebuiIndex:
+    """
+    ``(skill, space)`` -> normalized declaration, validated by file fingerprint.
+
+    Returned declarations are shared between callers and must be treated as
+    read-only (the resolver only copies out of them).
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def _key(skill: str, space: str) -> str:
+        return f"{skill}|{space}"
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {str(k): v for k, v in entries.items() if isinstance(v, dict)}
+
+    def flush(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            payload = {"version": _INDEX_VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:
+            _log.debug("failed to persist webui index at %s", self.path, exc_info=True)
+
+    def lookup(self, skill: str, space: str, source: Optional[Path]) -> Tuple[Dict[str, Any], Optional[Fingerprint]]:
+        """Declaration of ``skill`` read from ``source`` (``{}`` when missing/invalid)."""
+        key = self._key(skill, space)
+        fp = fingerprint(source) if source is not None else None
+        stamp = list(fp) if fp is not None else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.get("fp") == stamp:
+                self.hits += 1
+                return entry.get("decl") or {}, fp
+        decl: Dict[str, Any] = {}
+        if fp is not None:
+            try:
+                # Accept UTF-8 with BOM produced by some Windows/PowerShell editors.
+                raw = json.loads(Path(fp[0]).read_text(encoding="utf-8-sig"))
+                decl = normalize_webui(raw, skill, space) if isinstance(raw, dict) else {}
+            except Exception as exc:
+                _log.warning("failed to read webui.json for %s: %s", skill, exc)
+                decl = {}
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = {"fp": stamp, "decl": decl}
+            self._dirty = True
+        return decl, fp
+
+    def forget(self, skill: Optional[str] = None) -> None:
+        with self._lock:
+            if skill is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.split("|", 1)[0] == skill]:
+                    self._entries.pop(key, None)
+            self._dirty = True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class WebspaceDependencyGraph:
+    def __init__(self) -> None:
+        self._deps: Dict[str, Dict[str, Optional[Fingerprint]]] = {}
+        self._applied: Dict[str, Dict[str, Any]] = {}
+        # webspace -> (doc state vector, non-doc sources, webui lookups, registry entry)
+        self._results: Dict[str, Tuple[bytes, Dict[str, Any], List[Tuple[str, str, Optional[Fingerprint]]], Any]] = {}
+        # webspace -> {(object_type, object_id): project fingerprint of the last preview reload}
+        self._projects: Dict[str, Dict[Tuple[str, str], Tuple[Fingerprint, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, webspace_id: str, skills: Dict[str, Optional[Fingerprint]], *, written: List[str], skipped: List[str]) -> None:
+        with self._lock:
+            self._deps[webspace_id] = dict(skills)
+            prev = self._applied.get(webspace_id) or {}
+            self._applied[webspace_id] = {
+                "rebuilds": int(prev.get("rebuilds") or 0) + 1,
+                "written": list(written),
+                "skipped": list(skipped),
+                "writes_total": int(prev.get("writes_total") or 0) + len(written),
+                "skips_total": int(prev.get("skips_total") or 0) + len(skipped),
+            }
+
+    def record_unchanged(self, webspace_id: str, skipped: List[str]) -> None:
+        with self._lock:
+            prev = self._applied.get(webspace_id) or {}
+            self._applied[webspace_id] = {
+                **prev,
+                "rebuilds": int(prev.get("rebuilds") or 0) + 1,
+                "written": [],
+                "skipped": list(skipped),
+                "skips_total": int(prev.get("skips_total") or 0) + len(skipped),
+                "unchanged_total": int(prev.get("unchanged_total") or 0) + 1,
+            }
+
+    def remember(
+        self,
+        webspace_id: str,
+        *,
+        doc_state: bytes,
+        sources: Dict[str, Any],
+        lookups: List[Tuple[str, str, Optional[Fingerprint]]],
+        entry: Any,
+    ) -> None:
+        with self._lock:
+            self._results[webspace_id] = (doc_state, sources, list(lookups), entry)
+
+    def reusable(
+        self, webspace_id: str, doc_state: bytes, sources: Dict[str, Any]
+    ) -> Optional[Tuple[Any, List[Tuple[str, str, Optional[Fingerprint]]]]]:
+        """Last entry and its webui lookups when the doc and non-doc sources are unchanged."""
+        with self._lock:
+            cached = self._results.get(webspace_id)
+        if cached is None or cached[0] != doc_state or cached[1] != sources:
+            return None
+        return cached[3], cached[2]
+
+    def remember_project(self, webspace_id: str, project: Tuple[str, str], fp: Optional[Tuple[Fingerprint, ...]]) -> None:
+        with self._lock:
+            projects = self._projects.setdefault(webspace_id, {})
+            if fp is None:
+                projects.pop(project, None)
+            else:
+                projects[project] = fp
+
+    def project_current(self, webspace_id: str, project: Tuple[str, str], fp: Optional[Tuple[Fingerprint, ...]]) -> bool:
+        """True when ``webspace_id`` was last reloaded from exactly this project state."""
+        if fp is None:
+            return False
+        with self._lock:
+            return (self._projects.get(webspace_id) or {}).get(project) == fp
+
+    def skills_for(self, webspace_id: str) -> Dict[str, Optional[Fingerprint]]:
+        with self._lock:
+            return dict(self._deps.get(webspace_id) or {})
+
+    def webspaces_for_skill(self, skill: str) -> List[str]:
+        with self._lock:
+            return sorted(ws for ws, deps in self._deps.items() if skill in deps)
+
+    def describe(self, webspace_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "skills": sorted(self._deps.get(webspace_id) or {}),
+                **(self._applied.get(webspace_id) or {}),
+            }
+
+    def forget(self, webspace_id: str) -> None:
+        with self._lock:
+            self._deps.pop(webspace_id, None)
+            self._applied.pop(webspace_id, None)
+            self._results.pop(webspace_id, None)
+            self._projects.pop(webspace_id, None)
+
+
+_INDEXES: Dict[str, SkillWebuiIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+_GRAPH = WebspaceDependencyGraph()
+
+
+def get_webui_index(ctx: Any = None) -> SkillWebuiIndex:
+    """Node-wide index persisted under ``<state>/webspace/webui_index.json``."""
+    path: Optional[Path] = None
+    try:
+        if ctx is None:
+            from adaos.services.agent_context import get_ctx
+
+            ctx = get_ctx()
+        path = Path(ctx.paths.state_dir()) / "webspace" / "webui_index.json"
+    except Exception:
+        path = None
+    key = str(path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = SkillWebuiIndex(path)
+        return index
+
+
+def webspace_dependency_graph() -> WebspaceDependencyGraph:
+    return _GRAPH
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
+import json
 import logging
+import os
+import random
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from adaos.sdk.data.bus import emit as bus_emit
+from adaos.services.cron import CronSpec
 
 _log = logging.getLogger("adaos.scheduler")
 
+MISFIRE_POLICIES = ("coalesce", "catchup", "skip")
+
+# Catch-up of a cron job walks missed occurrences one by one; beyond this many
+# (e.g. a per-minute job after months offline) it resumes from now.
+_CRON_SCAN_LIMIT = 100_000
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except Exception:
+        return default
+
 
 @dataclass
 class Job:
@@ -19,34 +46,243 @@ class Job:
     payload: dict = field(default_factory=dict)
     enabled: bool = True
     next_run: float = field(default_factory=lambda: time.time())
+    cron: Optional[str] = None
+    jitter: float = 0.0
+    misfire: str = "coalesce"
+    last_run: Optional[float] = None
+    runs: int = 0
+    # runtime-only: monotonic deadline of next_run and heap generation
+    _due: float = field(default=0.0, repr=False, compare=False)
+    _gen: int = field(default=0, repr=False, compare=False)
+    _cron: Optional[CronSpec] = field(default=None, repr=False, compare=False)
+
+    def spec(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "interval": self.interval,
+            "payload": self.payload,
+            "enabled": self.enabled,
+            "cron": self.cron,
+            "jitter": self.jitter,
+            "misfire": self.misfire,
+        }
+
+
+class SystemClock:
+    """Monotonic clock for deadlines, wall clock for persisted/cron times."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]) -> None:
+        if timeout is None:
+            await event.wait()
+            return
+        try:
+            await asyncio.wait_for(event.wait(), max(0.0, timeout))
+        except asyncio.TimeoutError:
+            pass
+
+
+class VirtualClock:
+    """
+    Manually advanced clock for tests: time only moves in :meth:`advance`,
+    which wakes sleepers deadline by deadline so every timer fires exactly
+    at its scheduled instant.
+    """
+
+    def __init__(self, wall: float = 1_700_000_000.0) -> None:
+        self._mono = 0.0
+        self._wall_offset = float(wall)
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def time(self) -> float:
+        return self._wall_offset + self._mono
+
+    def set_wall(self, wall: float) -> None:
+        """Simulate a wall-clock change (NTP step, manual adjustment)."""
+        self._wall_offset = float(wall) - self._mono
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]) -> None:
+        if event.is_set():
+            return
+        fut = asyncio.get_running_loop().create_future()
+        if timeout is not None:
+            heapq.heappush(self._sleepers, (self._mono + max(0.0, timeout), next(self._seq), fut))
+        waiter = asyncio.ensure_future(event.wait())
+        try:
+            await asyncio.wait({fut, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+            if not fut.done():
+                fut.cancel()
+
+    async def advance(self, seconds: float) -> None:
+        target = self._mono + float(seconds)
+        await _settle()
+        while True:
+            while self._sleepers and self._sleepers[0][2].done():
+                heapq.heappop(self._sleepers)
+            if not self._sleepers or self._sleepers[0][0] > target:
+                break
+            deadline, _, fut = heapq.heappop(self._sleepers)
+            self._mono = max(self._mono, deadline)
+            fut.set_result(None)
+            await _settle()
+        self._mono = target
+        await _settle()
+
+
+async def _settle(rounds: int = 20) -> None:
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+class SchedulerStore:
+    """Jobs and their schedule state in the node SQLite database (``scheduler_jobs``)."""
+
+    def __init__(self, sql: Any) -> None:
+        self.sql = sql
+        with self.sql.connect() as con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scheduler_jobs (
+                    name     TEXT PRIMARY KEY,
+                    spec     TEXT NOT NULL,
+                    next_run REAL,
+                    last_run REAL,
+                    runs     INTEGER NOT NULL DEFAULT 0
+                )
+            """
+            )
+
+    def load(self) -> List[Job]:
+        with self.sql.connect() as con:
+            rows = con.execute("SELECT name, spec, next_run, last_run, runs FROM scheduler_jobs").fetchall()
+        jobs: List[Job] = []
+        for name, spec_raw, next_run, last_run, runs in rows:
+            try:
+                spec = json.loads(spec_raw)
+                jobs.append(
+                    Job(
+                        name=name,
+                        topic=str(spec["topic"]),
+                        interval=float(spec.get("interval") or 0.0),
+                        payload=dict(spec.get("payload") or {}),
+                        enabled=bool(spec.get("enabled", True)),
+                        next_run=float(next_run) if next_run is not None else time.time(),
+                        cron=spec.get("cron") or None,
+                        jitter=float(spec.get("jitter") or 0.0),
+                        misfire=str(spec.get("misfire") or "coalesce"),
+                        last_run=float(last_run) if last_run is not None else None,
+                        runs=int(runs or 0),
+                    )
+                )
+            except Exception:
+                _log.warning("skipping unreadable scheduler job name=%s", name, exc_info=True)
+        return jobs
+
+    def save(self, jobs: Iterable[Job]) -> None:
+        rows = [(j.name, json.dumps(j.spec(), ensure_ascii=False), j.next_run, j.last_run, j.runs) for j in jobs]
+        if not rows:
+            return
+        with self.sql.connect() as con:
+            con.executemany(
+                "INSERT INTO scheduler_jobs(name, spec, next_run, last_run, runs) VALUES(?,?,?,?,?) "
+                "ON CONFLICT(name) DO UPDATE SET spec=excluded.spec, next_run=excluded.next_run, "
+                "last_run=excluded.last_run, runs=excluded.runs",
+                rows,
+            )
+            con.commit()
+
+    def delete(self, name: str) -> None:
+        with self.sql.connect() as con:
+            con.execute("DELETE FROM scheduler_jobs WHERE name=?", (name,))
+            con.commit()
 
 
 class Scheduler:
     """
-    Minimal in-process scheduler:
-      * jobs are kept in-memory only (MVP);
-      * on each tick, emits an event to the core bus instead of calling code.
+    In-process scheduler that emits an event to the core bus for each run
+    instead of calling code, keeping the execution model uniform with skills:
+    everything reacts to events such as `sys.ystore.backup`.
 
-    This keeps the execution model uniform with skills: everything reacts to
-    events such as `sys.ystore.backup` rather than being invoked directly.
+      * deadlines live in a min-heap on the monotonic clock; the loop sleeps
+        exactly until the earliest one (O(log n) per registration/run, stale
+        heap entries are skipped lazily);
+      * interval jobs advance on a fixed grid (``next_run += interval``), so
+        they do not drift and wall-clock changes do not shift them;
+      * ``cron`` jobs follow local wall-clock time, ``jitter`` delays each run
+        by a random 0..jitter seconds without moving the grid;
+      * jobs and their schedule state are persisted in SQLite (when a store
+        is available); runs missed while the node was down (or while the
+        loop was blocked) are handled per job: ``coalesce`` fires once,
+        ``catchup`` fires every missed run (bounded), ``skip`` drops runs
+        that are more than the misfire grace late;
+      * at most ``max_concurrency`` runs are being emitted at once.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        store: Optional[SchedulerStore] = None,
+        clock: Any = None,
+        max_concurrency: Optional[int] = None,
+        misfire_grace: Optional[float] = None,
+        max_catchup: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         self._jobs: Dict[str, Job] = {}
-        self._lock = asyncio.Lock()
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = itertools.count()
+        self._store = store
+        self._loaded = store is None
+        self._clock = clock or SystemClock()
+        self._rng = rng or random.Random()
+        self.max_concurrency = max(1, max_concurrency or _env_int("ADAOS_SCHEDULER_MAX_CONCURRENCY", 16))
+        self.misfire_grace = misfire_grace if misfire_grace is not None else _env_float("ADAOS_SCHEDULER_MISFIRE_GRACE_S", 1.0)
+        self.max_catchup = max(1, max_catchup or _env_int("ADAOS_SCHEDULER_MAX_CATCHUP", 100))
+        self.flush_interval = flush_interval if flush_interval is not None else _env_float("ADAOS_SCHEDULER_FLUSH_S", 5.0)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running: set[asyncio.Task] = set()
+        self._active = 0
+        self._dirty: set[str] = set()
+        self._flush_due: Optional[float] = None
+        self._wakeup = asyncio.Event()
         self._task: asyncio.Task | None = None
         self._stopped = asyncio.Event()
         self._stopped.set()
+        self.stats: Dict[str, int] = {
+            "fired": 0,
+            "coalesced": 0,
+            "caught_up": 0,
+            "skipped": 0,
+            "failed": 0,
+            "wakeups": 0,
+            "peak_running": 0,
+        }
+
+    # ------------------------------------------------------------------ lifecycle
 
     async def start(self) -> None:
         if self._task and not self._task.done():
             return
+        self._load()
         self._stopped.clear()
         self._task = asyncio.create_task(self._run(), name="adaos-scheduler")
-        _log.info("scheduler started")
+        _log.info("scheduler started jobs=%d", len(self._jobs))
 
     async def stop(self) -> None:
         self._stopped.set()
+        self._wakeup.set()
         task = self._task
         if task and not task.done():
             task.cancel()
@@ -57,60 +293,258 @@ class Scheduler:
             except Exception:  # pragma: no cover - defensive logging
                 _log.warning("scheduler stop failed", exc_info=True)
         self._task = None
+        self._flush()
+
+    # ------------------------------------------------------------------ jobs
 
-    async def ensure_every(self, name: str, interval: float, topic: str, payload: dict | None = None) -> Job:
+    async def ensure_every(
+        self,
+        name: str,
+        interval: float,
+        topic: str,
+        payload: dict | None = None,
+        *,
+        jitter: float = 0.0,
+        misfire: str = "coalesce",
+    ) -> Job:
         """
         Create or update a simple \"every N seconds\" job.
         """
         interval = float(interval)
-        now = time.time()
-        async with self._lock:
-            job = self._jobs.get(name)
-            if job is None:
-                job = Job(
-                    name=name,
-                    topic=topic,
-                    interval=interval,
-                    payload=dict(payload or {}),
-                    next_run=now + interval,
-                )
-                self._jobs[name] = job
-                _log.info("scheduler job created name=%s topic=%s interval=%ss", name, topic, interval)
-            else:
-                job.topic = topic
-                job.interval = interval
-                job.payload = dict(payload or {})
-                if job.next_run < now:
-                    job.next_run = now + interval
-                _log.info("scheduler job updated name=%s topic=%s interval=%ss", name, topic, interval)
-            return job
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        return self._ensure(name, topic, payload, interval=interval, cron=None, jitter=jitter, misfire=misfire)
+
+    async def ensure_cron(
+        self,
+        name: str,
+        cron: str,
+        topic: str,
+        payload: dict | None = None,
+        *,
+        jitter: float = 0.0,
+        misfire: str = "coalesce",
+    ) -> Job:
+        """
+        Create or update a job driven by a five-field cron expression (local time).
+        """
+        CronSpec.parse(cron)  # validate before touching state
+        return self._ensure(name, topic, payload, interval=0.0, cron=cron, jitter=jitter, misfire=misfire)
 
     async def delete(self, name: str) -> None:
-        async with self._lock:
-            if self._jobs.pop(name, None) is not None:
-                _log.info("scheduler job deleted name=%s", name)
+        self._load()
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            job._gen += 1
+            self._dirty.discard(name)
+            if self._store is not None:
+                try:
+                    self._store.delete(name)
+                except Exception:
+                    _log.warning("failed to delete persisted scheduler job name=%s", name, exc_info=True)
+            _log.info("scheduler job deleted name=%s", name)
+
+    def get(self, name: str) -> Optional[Job]:
+        self._load()
+        return self._jobs.get(name)
+
+    def jobs(self) -> List[Job]:
+        self._load()
+        return list(self._jobs.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "jobs": len(self._jobs),
+            "heap": len(self._heap),
+            "running": len(self._running),
+            "max_concurrency": self.max_concurrency,
+            "persistent": self._store is not None,
+        }
+
+    def _ensure(
+        self,
+        name: str,
+        topic: str,
+        payload: dict | None,
+        *,
+        interval: float,
+        cron: Optional[str],
+        jitter: float,
+        misfire: str,
+    ) -> Job:
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"misfire must be one of {MISFIRE_POLICIES}")
+        self._load()
+        wall = self._clock.time()
+        job = self._jobs.get(name)
+        created = job is None
+        if job is None:
+            job = Job(name=name, topic=topic, interval=interval, payload=dict(payload or {}), cron=cron)
+            self._jobs[name] = job
+            job.next_run = self._first_run(job, wall)
+        else:
+            timing_changed = job.interval != interval or job.cron != cron
+            job.topic = topic
+            job.interval = interval
+            job.cron = cron
+            job.payload = dict(payload or {})
+            job._cron = None
+            if timing_changed:
+                job.next_run = self._first_run(job, wall)
+        job.jitter = max(0.0, float(jitter or 0.0))
+        job.misfire = misfire
+        self._push(job)
+        self._persist(job)
+        _log.info(
+            "scheduler job %s name=%s topic=%s %s",
+            "created" if created else "updated",
+            name,
+            topic,
+            f"cron={cron!r}" if cron else f"interval={interval}s",
+        )
+        return job
+
+    # ------------------------------------------------------------------ internals
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            jobs = self._store.load() if self._store is not None else []
+        except Exception:
+            _log.warning("failed to load persisted scheduler jobs", exc_info=True)
+            return
+        for job in jobs:
+            if job.name in self._jobs:
+                continue
+            self._jobs[job.name] = job
+            self._push(job)
+        if jobs:
+            _log.info("scheduler restored %d persisted job(s)", len(jobs))
+
+    def _cron_spec(self, job: Job) -> CronSpec:
+        if job._cron is None:
+            job._cron = CronSpec.parse(job.cron or "")
+        return job._cron
+
+    def _first_run(self, job: Job, wall: float) -> float:
+        if job.cron:
+            return self._cron_spec(job).next_after(wall)
+        return wall + job.interval
+
+    def _push(self, job: Job) -> None:
+        """(Re)schedule ``job`` from its wall-clock ``next_run``; older heap entries become stale."""
+        job._due = self._clock.monotonic() + (job.next_run - self._clock.time())
+        self._schedule(job)
+
+    def _schedule(self, job: Job) -> None:
+        job._gen += 1
+        if not job.enabled:
+            return
+        offset = self._rng.uniform(0.0, job.jitter) if job.jitter > 0 else 0.0
+        entry = (job._due + offset, next(self._seq), job.name, job._gen)
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._jobs):
+            self._heap = [e for e in self._heap if (j := self._jobs.get(e[2])) is not None and j._gen == e[3]]
+            heapq.heapify(self._heap)
+        if self._heap[0] is entry:
+            self._wakeup.set()
+
+    def _persist(self, job: Job) -> None:
+        if self._store is None:
+            return
+        try:
+            self._store.save([job])
+        except Exception:
+            _log.warning("failed to persist scheduler job name=%s", job.name, exc_info=True)
+
+    def _flush(self) -> None:
+        self._flush_due = None
+        if self._store is None or not self._dirty:
+            return
+        names, self._dirty = self._dirty, set()
+        try:
+            self._store.save(self._jobs[n] for n in names if n in self._jobs)
+        except Exception:
+            _log.warning("failed to persist scheduler state", exc_info=True)
+
+    def _advance(self, job: Job) -> List[float]:
+        """
+        Move ``job`` past the current time and return the wall-clock times of
+        the runs to emit now, according to its misfire policy.
+        """
+        mono = self._clock.monotonic()
+        wall = self._clock.time()
+        if job.cron:
+            spec = self._cron_spec(job)
+            if job.misfire == "catchup":
+                missed: Deque[float] = deque(maxlen=self.max_catchup)
+                occurrence = job.next_run
+                for _ in range(_CRON_SCAN_LIMIT):
+                    if occurrence > wall:
+                        break
+                    missed.append(occurrence)
+                    occurrence = spec.next_after(occurrence)
+                else:
+                    occurrence = spec.next_after(wall)
+                runs = list(missed)
+                self.stats["caught_up"] += max(0, len(runs) - 1)
+            else:
+                # Only the latest missed occurrence matters; find it without
+                # walking every minute of a long downtime.
+                recent = spec.next_after(wall - self.misfire_grace - job.jitter - 1e-3)
+                latest = recent if recent <= wall else job.next_run
+                occurrence = spec.next_after(wall)
+                runs = self._misfire(job, [latest], wall - latest)
+            job.next_run = occurrence
+            job._due = mono + (occurrence - wall)
+            return runs
+
+        late = mono - job._due
+        count = int(late // job.interval) + 1 if late >= 0 else 1
+        first = job.next_run
+        runs = [first + i * job.interval for i in range(max(0, count - self.max_catchup), count)]
+        # Fixed grid on the monotonic clock: no drift, no wall-clock jumps.
+        job.next_run = first + count * job.interval
+        job._due += count * job.interval
+        if job.misfire == "catchup":
+            self.stats["caught_up"] += len(runs) - 1
+            return runs
+        if count > 1:
+            self.stats["coalesced"] += count - 1
+        return self._misfire(job, runs[-1:], late - (count - 1) * job.interval)
+
+    def _misfire(self, job: Job, runs: List[float], lateness: float) -> List[float]:
+        if job.misfire == "skip" and lateness > self.misfire_grace + job.jitter:
+            self.stats["skipped"] += len(runs)
+            return []
+        return runs
 
     async def _run(self) -> None:
         try:
             while not self._stopped.is_set():
-                async with self._lock:
-                    jobs = [j for j in self._jobs.values() if j.enabled]
-
-                if not jobs:
-                    await asyncio.sleep(0.5)
-                    continue
-
-                now = time.time()
-                due = [j for j in jobs if j.next_run <= now]
-                if not due:
-                    sleep_for = max(0.1, min(j.next_run for j in jobs) - now)
-                    await asyncio.sleep(sleep_for)
-                    continue
-
-                for job in due:
-                    job.next_run = now + job.interval
-                    asyncio.create_task(self._fire(job), name=f"adaos-scheduler-job-{job.name}")
-                await asyncio.sleep(0)  # yield control
+                self._wakeup.clear()
+                now = self._clock.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _due, _seq, name, gen = heapq.heappop(self._heap)
+                    job = self._jobs.get(name)
+                    if job is None or job._gen != gen or not job.enabled:
+                        continue
+                    for scheduled in self._advance(job):
+                        self._dispatch(job, scheduled)
+                    self._dirty.add(job.name)
+                    if self._flush_due is None:
+                        self._flush_due = now + self.flush_interval
+                    self._schedule(job)
+                if self._flush_due is not None and now >= self._flush_due:
+                    self._flush()
+
+                deadlines = [d for d in (self._heap[0][0] if self._heap else None, self._flush_due) if d is not None]
+                timeout = (min(deadlines) - now) if deadlines else None
+                await self._clock.wait(self._wakeup, timeout)
+                self.stats["wakeups"] += 1
         except asyncio.CancelledError:  # pragma: no cover - controlled shutdown
             pass
         except Exception:  # pragma: no cover - defensive logging
@@ -118,11 +552,37 @@ class Scheduler:
         finally:
             _log.info("scheduler stopped")
 
-    async def _fire(self, job: Job) -> None:
-        try:
-            await bus_emit(job.topic, job.payload, source="scheduler", job_name=job.name)
-        except Exception:  # pragma: no cover - defensive logging
-            _log.warning("scheduler job failed name=%s topic=%s", job.name, job.topic, exc_info=True)
+    def _dispatch(self, job: Job, scheduled: float) -> None:
+        job.last_run = scheduled
+        job.runs += 1
+        task = asyncio.create_task(self._fire(job, scheduled), name=f"adaos-scheduler-job-{job.name}")
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _fire(self, job: Job, scheduled: float) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            self._active += 1
+            self.stats["peak_running"] = max(self.stats["peak_running"], self._active)
+            try:
+                await bus_emit(job.topic, job.payload, source="scheduler", job_name=job.name, scheduled_at=scheduled)
+                self.stats["fired"] += 1
+            except Exception:  # pragma: no cover - defensive logging
+                self.stats["failed"] += 1
+                _log.warning("scheduler job failed name=%s topic=%s", job.name, job.topic, exc_info=True)
+            finally:
+                self._active -= 1
+
+
+def _default_store() -> Optional[SchedulerStore]:
+    try:
+        from adaos.services.agent_context import get_ctx
+
+        return SchedulerStore(get_ctx().sql)
+    except Exception:
+        _log.debug("scheduler persistence unavailable; jobs are kept in memory", exc_info=True)
+        return None
 
 
 _SCHEDULER: Scheduler | None = None
@@ -131,7 +591,7 @@ _SCHEDULER: Scheduler | None = None
 def get_scheduler() -> Scheduler:
     global _SCHEDULER
     if _SCHEDULER is None:
-        _SCHEDULER = Scheduler()
+        _SCHEDULER = Scheduler(store=_default_store())
     return _SCHEDULER
 
 
@@ -147,4 +607,3 @@ async def stop_scheduler() -> None:
     Public entrypoint used from bootstrap to stop the background loop.
     """
     await get_scheduler().stop()
-
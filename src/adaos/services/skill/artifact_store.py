@@ -0,0 +1,423 @@
+"""Node-wide content-addressed store used while preparing skill runtimes.
+
+``prepare_runtime`` used to copy every skill tree into its A/B slot and run a
+networked ``pip install --upgrade`` per slot. The store keeps three kinds of
+artifacts under ``<cache>/skill_store`` so repeated preparations are cheap and
+work offline once the artifacts exist:
+
+* ``objects/`` - skill source files keyed by sha256. Slots receive hardlinks
+  to these objects (plain copies where linking is not possible), so unchanged
+  files are never copied twice;
+* ``wheels/`` + ``sets/`` - a wheelhouse and the resolved (pinned) dependency
+  set of every distinct requirement set. A set is resolved once; later installs
+  use ``--no-index --find-links wheels``;
+* ``layers/`` - a prebuilt ``--target`` site-packages per requirement set that
+  is linked into slot ``vendor`` directories when the shared interpreter
+  environment cannot be used.
+
+Environment:
+
+* ``ADAOS_SKILL_STORE=0`` disables the store (legacy per-slot pip/copy);
+* ``ADAOS_SKILL_WHEELHOUSE`` - extra local wheelhouses (``os.pathsep``
+  separated) searched before any index;
+* ``ADAOS_SKILL_OFFLINE=1`` - never contact a package index.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from importlib import metadata as importlib_metadata
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlparse
+
+STORE_DIRNAME = "skill_store"
+DEFAULT_IGNORE = (".git", "__pycache__", "*.pyc", "*.pyo", ".runtime")
+
+Runner = Callable[[List[str]], Tuple[bool, str]]
+
+
+def store_enabled() -> bool:
+    return os.getenv("ADAOS_SKILL_STORE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def offline_mode() -> bool:
+    return os.getenv("ADAOS_SKILL_OFFLINE", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def extra_wheelhouses() -> List[Path]:
+    raw = os.getenv("ADAOS_SKILL_WHEELHOUSE", "") or ""
+    return [Path(item) for item in raw.split(os.pathsep) if item.strip()]
+
+
+def run_command(cmd: List[str]) -> Tuple[bool, str]:
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError as exc:
+        return False, str(exc)
+    out = (proc.stdout or "") + ("\n" + proc.stderr if proc.stderr else "")
+    return proc.returncode == 0, out
+
+
+def _python_tag() -> str:
+    return f"{sys.implementation.cache_tag}-{sysconfig.get_platform()}"
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source: Path, target: Path) -> bool:
+    """Hardlink ``source`` to ``target``; fall back to a copy. Returns True if linked."""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        shutil.copy2(source, target)
+        try:
+            os.chmod(target, stat.S_IMODE(os.stat(target).st_mode) | stat.S_IWUSR)
+        except OSError:
+            pass
+        return False
+
+
+def _ignored(name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+@dataclass(slots=True)
+class StageStats:
+    linked: int = 0
+    copied: int = 0
+    stored: int = 0
+
+
+@dataclass(slots=True)
+class DependencySet:
+    """Pinned resolution of one requirement set."""
+
+    key: str
+    pins: List[Tuple[str, str]]
+    wheels: List[str]
+    installed: Dict[str, Dict[str, Optional[str]]] = field(default_factory=dict)
+
+    def requirements(self) -> List[str]:
+        return [f"{name}=={version}" for name, version in self.pins]
+
+
+class SkillArtifactStore:
+    def __init__(self, root: Path, *, runner: Runner | None = None, python: str | None = None) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.wheels_dir = self.root / "wheels"
+        self.sets_dir = self.root / "sets"
+        self.layers_dir = self.root / "layers"
+        self._run = runner or run_command
+        self._python = python or sys.executable
+        # path -> ((mtime_ns, size, ino), sha256); avoids rehashing unchanged sources.
+        self._digests: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Source files
+    # ------------------------------------------------------------------
+    def _digest(self, path: Path, st: os.stat_result) -> str:
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        key = str(path)
+        cached = self._digests.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        digest = _sha256_file(path)
+        self._digests[key] = (stamp, digest)
+        return digest
+
+    def put_file(self, path: Path) -> Tuple[Path, bool]:
+        """Store ``path`` by content; returns the object path and whether it was new."""
+        st = os.stat(path)
+        digest = self._digest(path, st)
+        obj = self.objects_dir / digest[:2] / digest
+        try:
+            if os.stat(obj).st_size == st.st_size:
+                return obj, False
+        except OSError:
+            pass
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=obj.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copy2(path, tmp)
+            if os.name != "nt":
+                # Objects are shared by every slot linking them: keep them read-only.
+                # (Windows refuses to unlink read-only files, so slots could not be removed.)
+                os.chmod(tmp, stat.S_IMODE(st.st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            os.replace(tmp, obj)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return obj, True
+
+    def stage_tree(self, source: Path, target: Path, *, ignore: Sequence[str] = DEFAULT_IGNORE) -> StageStats:
+        """Materialise ``source`` at ``target`` with files linked from the object store."""
+        stats = StageStats()
+        source = Path(source)
+        target = Path(target)
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=True):
+            dirnames[:] = [name for name in dirnames if not _ignored(name, ignore)]
+            rel = Path(dirpath).relative_to(source)
+            out_dir = target / rel
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name in filenames:
+                if _ignored(name, ignore):
+                    continue
+                src_file = Path(dirpath) / name
+                if src_file.is_symlink() or not src_file.is_file():
+                    shutil.copy2(src_file, out_dir / name)
+                    stats.copied += 1
+                    continue
+                obj, created = self.put_file(src_file)
+                stats.stored += int(created)
+                if link_or_copy(obj, out_dir / name):
+                    stats.linked += 1
+                else:
+                    stats.copied += 1
+        return stats
+
+    # ------------------------------------------------------------------
+    # Python dependencies
+    # ------------------------------------------------------------------
+    def requirement_set_key(self, args: Sequence[str], constraints: Path | None = None) -> str:
+        """Hash of the requirement set; ``-r`` files contribute content, not their path."""
+        digest = hashlib.sha256()
+        digest.update(_python_tag().encode("utf-8"))
+        items = list(args)
+        index = 0
+        while index < len(items):
+            item = items[index]
+            if item in {"-r", "--requirement"} and index + 1 < len(items):
+                index += 1
+                try:
+                    digest.update(b"\0-r\0" + Path(items[index]).read_bytes())
+                except OSError:
+                    digest.update(b"\0-r\0" + items[index].encode("utf-8"))
+            else:
+                digest.update(b"\0" + item.encode("utf-8"))
+            index += 1
+        if constraints is not None:
+            try:
+                digest.update(b"\0-c\0" + Path(constraints).read_bytes())
+            except OSError:
+                pass
+        return digest.hexdigest()[:32]
+
+    def _find_links(self) -> List[str]:
+        links = ["--find-links", str(self.wheels_dir)]
+        for house in extra_wheelhouses():
+            links.extend(["--find-links", str(house)])
+        return links
+
+    def _pip(self, *args: str) -> List[str]:
+        return [self._python, "-m", "pip", *args, "--disable-pip-version-check"]
+
+    def _set_path(self, key: str) -> Path:
+        return self.sets_dir / f"{key}.json"
+
+    def load_set(self, key: str) -> Optional[DependencySet]:
+        try:
+            payload = json.loads(self._set_path(key).read_text(encoding="utf-8"))
+            dep_set = DependencySet(
+                key=key,
+                pins=[(str(name), str(version)) for name, version in payload.get("pins") or []],
+                wheels=[str(item) for item in payload.get("wheels") or []],
+                installed=dict(payload.get("installed") or {}),
+            )
+        except Exception:
+            return None
+        if not all((self.wheels_dir / wheel).is_file() for wheel in dep_set.wheels):
+            return None
+        return dep_set
+
+    def _save_set(self, dep_set: DependencySet) -> None:
+        path = self._set_path(dep_set.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        payload = {"pins": dep_set.pins, "wheels": dep_set.wheels, "installed": dep_set.installed}
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def resolve(self, args: Sequence[str], constraints: Path | None = None) -> DependencySet:
+        """Return the pinned set for ``args``, fetching wheels into the store once."""
+        key = self.requirement_set_key(args, constraints)
+        dep_set = self.load_set(key)
+        if dep_set is not None:
+            return dep_set
+        with self._lock:
+            dep_set = self.load_set(key)
+            if dep_set is not None:
+                return dep_set
+            self.wheels_dir.mkdir(parents=True, exist_ok=True)
+            extra = ["-c", str(constraints)] if constraints else []
+            wheel_cmd = self._pip("wheel", "--wheel-dir", str(self.wheels_dir), *self._find_links(), *extra)
+            ok, out = self._run([*wheel_cmd, "--no-index", *args])
+            if not ok and not offline_mode():
+                ok, out = self._run([*wheel_cmd, *args])
+            if not ok:
+                raise RuntimeError(f"failed to fetch wheels into the skill store:\n{out}")
+            dep_set = self._report(key, args, extra)
+            self._save_set(dep_set)
+            return dep_set
+
+    def _report(self, key: str, args: Sequence[str], extra: Sequence[str]) -> DependencySet:
+        report_path = self.sets_dir / f"{key}.report.json"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        cmd = self._pip(
+            "install",
+            "--dry-run",
+            "--ignore-installed",
+            "--quiet",
+            "--report",
+            str(report_path),
+            "--no-index",
+            "--find-links",
+            str(self.wheels_dir),
+            *extra,
+            *args,
+        )
+        ok, out = self._run(cmd)
+        try:
+            if not ok:
+                raise RuntimeError(f"failed to resolve dependency set from the skill store:\n{out}")
+            report = json.loads(report_path.read_text(encoding="utf-8"))
+        finally:
+            report_path.unlink(missing_ok=True)
+        pins: List[Tuple[str, str]] = []
+        wheels: List[str] = []
+        for item in report.get("install") or []:
+            meta = item.get("metadata") or {}
+            pins.append((str(meta.get("name")), str(meta.get("version"))))
+            url = ((item.get("download_info") or {}).get("url")) or ""
+            wheel = Path(unquote(urlparse(url).path)).name
+            if wheel.endswith(".whl"):
+                wheels.append(wheel)
+        return DependencySet(key=key, pins=sorted(pins), wheels=sorted(wheels))
+
+    @staticmethod
+    def _installed_versions(names: Iterable[str]) -> Dict[str, Optional[str]]:
+        versions: Dict[str, Optional[str]] = {}
+        for name in names:
+            try:
+                versions[name] = importlib_metadata.version(name)
+            except importlib_metadata.PackageNotFoundError:
+                versions[name] = None
+        return versions
+
+    def is_installed(self, dep_set: DependencySet) -> bool:
+        """True if the set was installed into this interpreter and nothing changed since."""
+        recorded = dep_set.installed.get(sys.prefix)
+        if not recorded:
+            return False
+        return self._installed_versions(recorded) == recorded
+
+    def install_shared(self, dep_set: DependencySet, args: Sequence[str], constraints: Path | None = None) -> Tuple[bool, str]:
+        """Install ``args`` into the running interpreter using only the local wheelhouse."""
+        if self.is_installed(dep_set):
+            return True, ""
+        extra = ["-c", str(constraints)] if constraints else []
+        ok, out = self._run(self._pip("install", "--no-index", *self._find_links(), *extra, *args))
+        if ok:
+            with self._lock:
+                dep_set.installed[sys.prefix] = self._installed_versions(name for name, _ in dep_set.pins)
+                self._save_set(dep_set)
+        return ok, out
+
+    def layer(self, dep_set: DependencySet) -> Path:
+        """Prebuilt site-packages for ``dep_set`` (built once from the wheelhouse)."""
+        layer = self.layers_dir / dep_set.key
+        if layer.is_dir():
+            return layer
+        with self._lock:
+            if layer.is_dir():
+                return layer
+            self.layers_dir.mkdir(parents=True, exist_ok=True)
+            tmp = Path(tempfile.mkdtemp(dir=self.layers_dir, prefix=f".{dep_set.key}-"))
+            cmd = self._pip(
+                "install",
+                "--no-index",
+                "--no-deps",
+                "--find-links",
+                str(self.wheels_dir),
+                "--target",
+                str(tmp),
+                "--no-warn-script-location",
+                *dep_set.requirements(),
+            )
+            ok, out = self._run(cmd)
+            if not ok:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise RuntimeError(f"failed to build dependency layer {dep_set.key}:\n{out}")
+            try:
+                os.replace(tmp, layer)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                if not layer.is_dir():
+                    raise
+        return layer
+
+    def link_layer(self, layer: Path, target: Path) -> StageStats:
+        """Populate ``target`` (emptied first) with hardlinks to ``layer``."""
+        stats = StageStats()
+        if target.exists():
+            shutil.rmtree(target, ignore_errors=True)
+        for dirpath, _dirnames, filenames in os.walk(layer):
+            out_dir = target / Path(dirpath).relative_to(layer)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name in filenames:
+                if link_or_copy(Path(dirpath) / name, out_dir / name):
+                    stats.linked += 1
+                else:
+                    stats.copied += 1
+        return stats
+
+
+_STORES: Dict[str, SkillArtifactStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_artifact_store(cache_dir: Path) -> Optional[SkillArtifactStore]:
+    """Process-wide store rooted under ``cache_dir`` (``None`` when disabled)."""
+    if not store_enabled():
+        return None
+    root = str(Path(cache_dir) / STORE_DIRNAME)
+    with _STORES_LOCK:
+        store = _STORES.get(root)
+        if store is None:
+            store = SkillArtifactStore(Path(root))
+            _STORES[root] = store
+        return store
+
+
+__all__ = [
+    "DependencySet",
+    "SkillArtifactStore",
+    "StageStats",
+    "extra_wheelhouses",
+    "get_artifact_store",
+    "link_or_copy",
+    "offline_mode",
+    "run_command",
+    "store_enabled",
+]
@@ -8,6 +8,8 @@ import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextvars import copy_context
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
@@ -26,8 +28,18 @@ from adaos.services.git.workspace_guard import ensure_clean
 from adaos.services.settings import Settings
 from adaos.services.agent_context import AgentContext, get_ctx, use_ctx
 from adaos.services.skill.runtime_env import SkillRuntimeEnvironment, SkillSlotPaths
+from adaos.services.skill.artifact_store import DEFAULT_IGNORE, SkillArtifactStore, get_artifact_store, offline_mode
 from adaos.services.skill.tests_runner import TestResult, run_tests
+from adaos.services.skill.tool_runtime import (
+    ToolDescriptor,
+    cached_descriptor,
+    persist_env_if_changed,
+    store_descriptor,
+    tool_executor,
+)
 from adaos.skills.runtime_runner import execute_tool
+from adaos.sdk.data.secrets import skill_secrets
+from adaos.sdk.data.skill_env import skill_env_overrides
 from adaos.services.skill.validation import SkillValidationService, ValidationReport
 from adaos.services.crypto.secrets_service import SecretsService
 from adaos.services.skill.secrets_backend import SkillSecretsBackend
@@ -1343,18 +1355,23 @@ class SkillManager:
             allow_inactive=False,
         )
 
-    def run_tool(
+    def _tool_descriptor(
         self,
         name: str,
-        tool: str | None,
-        payload: Mapping[str, Any],
         *,
-        timeout: float | None = None,
-        allow_inactive: bool = False,
-        slot: str | None = None,
-    ) -> Any:
-        status = self.runtime_status(name)
-        env = self._runtime_env(name)
+        allow_inactive: bool,
+        slot: str | None,
+        dev: bool = False,
+    ) -> ToolDescriptor:
+        # Keyed by the paths provider instance: resolving skills_dir() alone
+        # costs more than the whole cached invocation.
+        key = (id(self.ctx.paths), "dev" if dev else "workspace", name)
+        cached = cached_descriptor(key)
+        if cached is not None and cached.owner is self.ctx.paths and (slot is None or slot == cached.slot):
+            return cached
+
+        env = self._runtime_env_dev(name) if dev else self._runtime_env(name)
+        status = self.dev_runtime_status(name) if dev else self.runtime_status(name)
         version = status.get("version")
         active_slot = status.get("active_slot")
         manifest_path = Path(status["resolved_manifest"])
@@ -1389,11 +1406,61 @@ class SkillManager:
             slot_name = slot
 
         data = json.loads(manifest_path.read_text(encoding="utf-8"))
-        tools = data.get("tools") or {}
-        if tool:
-            target_tool = tool
+        if data.get("source"):
+            skill_dir = Path(data["source"])
         else:
-            target_tool = data.get("default_tool")
+            skill_dir = (self.ctx.paths.dev_skills_dir() if dev else self.ctx.paths.skills_dir()) / name
+        slot_name = data.get("slot") or slot_name
+        slot_paths = env.build_slot_paths(version or data.get("version"), slot_name)
+        runtime_info = data.get("runtime", {})
+        skill_env_path = Path(runtime_info.get("skill_env") or slot_paths.skill_env_path)
+        descriptor = ToolDescriptor(
+            skill=name,
+            version=version,
+            slot=slot_name,
+            manifest_path=manifest_path,
+            skill_dir=skill_dir,
+            tools=data.get("tools") or {},
+            default_tool=data.get("default_tool"),
+            extra_paths=tuple(Path(p) for p in runtime_info.get("python_paths", []) if p),
+            skill_env_path=skill_env_path,
+            skill_memory_path=Path(runtime_info.get("skill_memory") or skill_env_path),
+            slot_paths=slot_paths,
+            env=env,
+            secrets_path=env.data_root() / "files" / "secrets.json",
+            owner=self.ctx.paths,
+        )
+        if status.get("ready", True) and slot_name == active_slot and version:
+            # Only the active slot is cached; its validity is tracked through the
+            # version/slot markers, version metadata and the resolved manifest.
+            try:
+                descriptor.watched = tuple(
+                    str(path)
+                    for path in (
+                        env.active_version_marker(),
+                        env.runtime_root,
+                        env.active_marker(version),
+                        env.metadata_path(version),
+                        manifest_path,
+                    )
+                )
+                descriptor.env_paths = (str(slot_paths.skill_env_path), str(env.skill_env_store_path()))
+                store_descriptor(key, descriptor)
+            except Exception:
+                pass  # caching is an optimisation; fall back to the slow path next time
+        return descriptor
+
+    def _invoke_tool(
+        self,
+        descriptor: ToolDescriptor,
+        tool: str | None,
+        payload: Mapping[str, Any],
+        *,
+        timeout: float | None,
+        strict_ctx: bool,
+    ) -> Any:
+        tools = descriptor.tools
+        target_tool = tool or descriptor.default_tool
         if not target_tool:
             raise KeyError("tool name not provided and no default tool defined")
         tool_spec = tools.get(target_tool)
@@ -1401,73 +1468,55 @@ class SkillManager:
             available = ", ".join(sorted(tools)) or "<none>"
             raise KeyError(f"tool '{target_tool}' not found (available: {available})")
 
+        name = descriptor.skill
         module = tool_spec.get("module")
         attr = tool_spec.get("callable") or target_tool
-        skill_dir = Path(data.get("source") or (self.ctx.paths.skills_dir() / name))
-        slot_name = data.get("slot") or slot_name
-        slot = env.build_slot_paths(version or data.get("version"), slot_name)
-        runtime_info = data.get("runtime", {})
-        extra_paths = [Path(p) for p in runtime_info.get("python_paths", []) if p]
-        skill_env_path = Path(runtime_info.get("skill_env") or slot.skill_env_path)
-        skill_memory_path = Path(runtime_info.get("skill_memory") or skill_env_path)
-
         ctx = self.ctx
-        previous = ctx.skill_ctx.get()
-        prev_env = os.environ.get("ADAOS_SKILL_ENV_PATH")
-        prev_memory = os.environ.get("ADAOS_SKILL_MEMORY_PATH")
-        prev_secrets = ctx.secrets
-        ctx.secrets = SecretsService(SkillSecretsBackend(env.data_root() / "files" / "secrets.json"), ctx.caps)
-        execution_timeout = timeout or tool_spec.get("timeout_seconds")
+        env_overrides = {
+            "ADAOS_SKILL_ENV_PATH": str(descriptor.skill_env_path),
+            "ADAOS_SKILL_MEMORY_PATH": str(descriptor.skill_memory_path),
+        }
+
+        secrets = SecretsService(SkillSecretsBackend(descriptor.secrets_path), ctx.caps)
 
         def _call_tool() -> Any:
-            with use_ctx(ctx):
+            # Runs inside a copied context: the current skill, env paths and
+            # secrets are visible to this invocation only and need no restoring
+            # afterwards.
+            try:
+                if not ctx.skill_ctx.set(name, descriptor.skill_dir):
+                    raise RuntimeError(f"failed to establish context for skill '{name}'")
+            except Exception:
+                if strict_ctx:
+                    raise
+            with use_ctx(ctx), skill_env_overrides(env_overrides), skill_secrets(secrets):
                 return execute_tool(
-                    skill_dir,
+                    descriptor.skill_dir,
                     module=module,
                     attr=attr,
                     payload=payload,
-                    extra_paths=extra_paths,
+                    extra_paths=descriptor.extra_paths,
                 )
 
-        try:
-            if not ctx.skill_ctx.set(name, skill_dir):
-                raise RuntimeError(f"failed to establish context for skill '{name}'")
-            os.environ["ADAOS_SKILL_ENV_PATH"] = str(skill_env_path)
-            os.environ["ADAOS_SKILL_MEMORY_PATH"] = str(skill_memory_path)
-
-            if execution_timeout:
-                from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-                from contextvars import copy_context
-
-                with ThreadPoolExecutor(max_workers=1) as pool:
-                    ctxvars = copy_context()
-                    future = pool.submit(lambda: ctxvars.run(_call_tool))
-                    try:
-                        result = future.result(timeout=execution_timeout)
-                    except FuturesTimeoutError as exc:
-                        future.cancel()
-                        raise TimeoutError(f"tool '{target_tool}' timed out after {execution_timeout} seconds") from exc
-            else:
-                result = _call_tool()
-        finally:
-            ctx.secrets = prev_secrets
-            if previous is None:
-                ctx.skill_ctx.clear()
-            else:
-                ctx.skill_ctx.set(previous.name, Path(previous.path))
-            if prev_env is None:
-                os.environ.pop("ADAOS_SKILL_ENV_PATH", None)
-            else:
-                os.environ["ADAOS_SKILL_ENV_PATH"] = prev_env
-            if prev_memory is None:
-                os.environ.pop("ADAOS_SKILL_MEMORY_PATH", None)
-            else:
-                os.environ["ADAOS_SKILL_MEMORY_PATH"] = prev_memory
+        execution_timeout = timeout or tool_spec.get("timeout_seconds")
+        ctxvars = copy_context()
+        if execution_timeout:
+            future = tool_executor(name).submit(ctxvars.run, _call_tool)
+            try:
+                result = future.result(timeout=execution_timeout)
+            except FuturesTimeoutError as exc:
+                future.cancel()
+                raise TimeoutError(f"tool '{target_tool}' timed out after {execution_timeout} seconds") from exc
+        else:
+            result = ctxvars.run(_call_tool)
 
-        self._persist_skill_env(env, slot)
+        if descriptor.env_paths is not None:
+            persist_env_if_changed(*descriptor.env_paths)
+        else:
+            self._persist_skill_env(descriptor.env, descriptor.slot_paths)
         return result
 
-    def run_dev_tool(
+    def run_tool(
         self,
         name: str,
         tool: str | None,
@@ -1477,120 +1526,21 @@ class SkillManager:
         allow_inactive: bool = False,
         slot: str | None = None,
     ) -> Any:
-        status = self.dev_runtime_status(name)
-        env = self._runtime_env_dev(name)
-        version = status.get("version")
-        active_slot = status.get("active_slot")
-        manifest_path = Path(status["resolved_manifest"])
-        slot_name = active_slot
+        descriptor = self._tool_descriptor(name, allow_inactive=allow_inactive, slot=slot)
+        return self._invoke_tool(descriptor, tool, payload, timeout=timeout, strict_ctx=True)
 
-        if not status.get("ready", True):
-            target_slot = slot or status.get("pending_slot")
-            target_version = status.get("pending_version") or version
-            if not allow_inactive or not target_slot or not target_version:
-                raise RuntimeError(
-                    f"skill '{name}' version {status.get('pending_version') or status.get('version')} is not activated. "
-                    f"Activate slot {target_slot or status.get('active_slot')} and retry."
-                )
-            env.prepare_version(target_version)
-            metadata = env.read_version_metadata(target_version)
-            slot_paths = env.build_slot_paths(target_version, target_slot)
-            slot_meta = metadata.get("slots", {}).get(target_slot, {})
-            manifest_path = Path(slot_meta.get("resolved_manifest") or slot_paths.resolved_manifest)
-            if not manifest_path.exists():
-                raise RuntimeError(f"slot {target_slot} for version {target_version} is not prepared")
-            version = target_version
-            slot_name = target_slot
-        elif slot and slot != active_slot:
-            env.prepare_version(version)
-            metadata = env.read_version_metadata(version)
-            slot_paths = env.build_slot_paths(version, slot)
-            slot_meta = metadata.get("slots", {}).get(slot, {})
-            candidate = Path(slot_meta.get("resolved_manifest") or slot_paths.resolved_manifest)
-            if not candidate.exists():
-                raise RuntimeError(f"slot {slot} for version {version} is not prepared")
-            manifest_path = candidate
-            slot_name = slot
-
-        data = json.loads(manifest_path.read_text(encoding="utf-8"))
-        tools = data.get("tools") or {}
-        if tool:
-            target_tool = tool
-        else:
-            target_tool = data.get("default_tool")
-        if not target_tool:
-            raise KeyError("tool name not provided and no default tool defined")
-        tool_spec = tools.get(target_tool)
-        if not tool_spec:
-            available = ", ".join(sorted(tools)) or "<none>"
-            raise KeyError(f"tool '{target_tool}' not found (available: {available})")
-
-        module = tool_spec.get("module")
-        attr = tool_spec.get("callable") or target_tool
-        skill_dir = Path(data.get("source") or (self.ctx.paths.dev_skills_dir() / name))
-        slot_name = data.get("slot") or slot_name
-        slot = env.build_slot_paths(version or data.get("version"), slot_name)
-        runtime_info = data.get("runtime", {})
-        extra_paths = [Path(p) for p in runtime_info.get("python_paths", []) if p]
-        skill_env_path = Path(runtime_info.get("skill_env") or slot.skill_env_path)
-        skill_memory_path = Path(runtime_info.get("skill_memory") or skill_env_path)
-
-        ctx = self.ctx
-        previous = ctx.skill_ctx.get()
-        prev_env = os.environ.get("ADAOS_SKILL_ENV_PATH")
-        prev_memory = os.environ.get("ADAOS_SKILL_MEMORY_PATH")
-        prev_secrets = ctx.secrets
-        ctx.secrets = SecretsService(SkillSecretsBackend(env.data_root() / "files" / "secrets.json"), ctx.caps)
-        execution_timeout = timeout or tool_spec.get("timeout_seconds")
-
-        def _call_tool() -> Any:
-            with use_ctx(ctx):
-                return execute_tool(
-                    skill_dir,
-                    module=module,
-                    attr=attr,
-                    payload=payload,
-                    extra_paths=extra_paths,
-                )
-
-        try:
-            if not ctx.skill_ctx.set(name, skill_dir):
-                raise RuntimeError(f"failed to establish context for skill '{name}'")
-        except Exception:
-            pass
-        try:
-            os.environ["ADAOS_SKILL_ENV_PATH"] = str(skill_env_path)
-            os.environ["ADAOS_SKILL_MEMORY_PATH"] = str(skill_memory_path)
-            if execution_timeout:
-                from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-                from contextvars import copy_context
-
-                with ThreadPoolExecutor(max_workers=1) as pool:
-                    ctxvars = copy_context()
-                    future = pool.submit(lambda: ctxvars.run(_call_tool))
-                    try:
-                        result = future.result(timeout=execution_timeout)
-                    except FuturesTimeoutError as exc:
-                        future.cancel()
-                        raise TimeoutError(f"tool '{target_tool}' timed out after {execution_timeout} seconds") from exc
-            else:
-                result = _call_tool()
-        finally:
-            if previous is None:
-                ctx.skill_ctx.clear()
-            else:
-                ctx.skill_ctx.set(previous.name, Path(previous.path))
-            if prev_env is None:
-                os.environ.pop("ADAOS_SKILL_ENV_PATH", None)
-            else:
-                os.environ["ADAOS_SKILL_ENV_PATH"] = prev_env
-            if prev_memory is None:
-                os.environ.pop("ADAOS_SKILL_MEMORY_PATH", None)
-            else:
-                os.environ["ADAOS_SKILL_MEMORY_PATH"] = prev_memory
-
-        self._persist_skill_env(env, slot)
-        return result
+    def run_dev_tool(
+        self,
+        name: str,
+        tool: str | None,
+        payload: Mapping[str, Any],
+        *,
+        timeout: float | None = None,
+        allow_inactive: bool = False,
+        slot: str | None = None,
+    ) -> Any:
+        descriptor = self._tool_descriptor(name, allow_inactive=allow_inactive, slot=slot, dev=True)
+        return self._invoke_tool(descriptor, tool, payload, timeout=timeout, strict_ctx=False)
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -1645,8 +1595,11 @@ class SkillManager:
         if destination_root.exists():
             self._remove_tree(destination_root)
         namespace_root.mkdir(parents=True, exist_ok=True)
-        ignore = shutil.ignore_patterns(".git", "__pycache__", "*.pyc", "*.pyo", ".runtime")
-        shutil.copytree(source, target, ignore=ignore)
+        store = self._artifact_store()
+        if store is not None:
+            store.stage_tree(source, target, ignore=DEFAULT_IGNORE)
+        else:
+            shutil.copytree(source, target, ignore=shutil.ignore_patterns(*DEFAULT_IGNORE))
         package_init = target / "__init__.py"
         if not package_init.exists():
             package_init.write_text("", encoding="utf-8")
@@ -1769,6 +1722,18 @@ class SkillManager:
             out = (p.stdout or "") + ("\n" + p.stderr if p.stderr else "")
             return ok, out
 
+        # 0) Node-wide wheel store: resolve the set once, install offline from it.
+        store = self._artifact_store()
+        if store is not None:
+            stored_paths = self._install_from_store(
+                store,
+                python_args=python_args,
+                constraints=constraints,
+                vendor_dir=vendor_dir,
+            )
+            if stored_paths is not None:
+                return stored_paths
+
         # 1) Try pip in current interpreter; bootstrap pip if missing
         ok, out = _run(shared_cmd)
         if not ok and ("No module named pip" in out or "No module named pip" in out.replace("\r", "\n")):
@@ -1836,6 +1801,46 @@ class SkillManager:
             f"uv(target) -> {out4}"
         )
 
+    def _artifact_store(self) -> SkillArtifactStore | None:
+        try:
+            return get_artifact_store(Path(self.ctx.paths.cache_dir()))
+        except Exception:
+            return None
+
+    def _install_from_store(
+        self,
+        store: SkillArtifactStore,
+        *,
+        python_args: list[str],
+        constraints: Path | None,
+        vendor_dir: Path,
+    ) -> list[str] | None:
+        """Install a requirement set from the local wheel store.
+
+        Returns the extra python paths on success or ``None`` to fall back to the
+        per-slot pip/uv strategies below.
+        """
+        try:
+            dep_set = store.resolve(python_args, constraints)
+        except Exception:
+            if offline_mode():
+                raise
+            return None
+        ok, _ = store.install_shared(dep_set, python_args, constraints)
+        if ok:
+            if vendor_dir.exists():
+                shutil.rmtree(vendor_dir, ignore_errors=True)
+                vendor_dir.mkdir(parents=True, exist_ok=True)
+            return []
+        try:
+            layer = store.layer(dep_set)
+            store.link_layer(layer, vendor_dir)
+        except Exception:
+            if offline_mode():
+                raise
+            return None
+        return [str(vendor_dir)]
+
     def _constraints_file(self) -> Path | None:
         candidates: list[Path] = []
         workspace = self.ctx.paths.workspace_dir()
@@ -1918,14 +1923,7 @@ class SkillManager:
             self._write_json_object(store_path, merged)
 
     def _persist_skill_env(self, env: SkillRuntimeEnvironment, slot: SkillSlotPaths) -> None:
-        source = slot.skill_env_path
-        if not source.exists():
-            return
-        target = env.skill_env_store_path()
-        if source.resolve() == target.resolve():
-            return
-        target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, target)
+        persist_env_if_changed(slot.skill_env_path, env.skill_env_store_path())
 
     def _latest_prepared_version(self, env: SkillRuntimeEnvironment) -> Optional[str]:
         latest_version: Optional[str] = None
@@ -0,0 +1,147 @@
+"""Process-wide caches backing :meth:`SkillManager.run_tool`.
+
+``SkillManager`` instances are created per request, so everything that should
+survive between tool calls lives here:
+
+* resolved tool descriptors keyed by paths provider and skill name, validated by
+  ``stat`` stamps of the runtime markers and the resolved manifest instead of
+  re-reading and re-parsing them on every call;
+* one long-lived, bounded executor per skill for tools that run with a timeout;
+* the last persisted stamp of each skill env file, so the env is copied only
+  when it actually changed.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from adaos.services.skill.runtime_env import SkillRuntimeEnvironment, SkillSlotPaths
+
+Stamp = Optional[Tuple[int, int]]
+
+
+def file_stamp(path: str | Path) -> Stamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass(slots=True)
+class ToolDescriptor:
+    """Everything ``run_tool`` needs to invoke tools of one active skill slot."""
+
+    skill: str
+    version: Optional[str]
+    slot: str
+    manifest_path: Path
+    skill_dir: Path
+    tools: Mapping[str, Any]
+    default_tool: Optional[str]
+    extra_paths: Tuple[Path, ...]
+    skill_env_path: Path
+    skill_memory_path: Path
+    slot_paths: SkillSlotPaths
+    env: SkillRuntimeEnvironment
+    secrets_path: Path
+    owner: Any = None
+    # Filled in for cached descriptors only (see SkillManager._tool_descriptor).
+    env_paths: Optional[Tuple[str, str]] = None
+    watched: Tuple[str, ...] = ()
+    stamps: Tuple[Stamp, ...] = field(default=())
+
+    def is_current(self) -> bool:
+        return tuple(file_stamp(path) for path in self.watched) == self.stamps
+
+
+DescriptorKey = Tuple[Any, ...]
+
+_DESCRIPTORS: Dict[DescriptorKey, ToolDescriptor] = {}
+_EXECUTORS: Dict[str, ThreadPoolExecutor] = {}
+_PERSISTED_ENV: Dict[str, Stamp] = {}
+_LOCK = threading.Lock()
+
+
+def cached_descriptor(key: DescriptorKey) -> Optional[ToolDescriptor]:
+    descriptor = _DESCRIPTORS.get(key)
+    if descriptor is not None and descriptor.is_current():
+        return descriptor
+    return None
+
+
+def store_descriptor(key: DescriptorKey, descriptor: ToolDescriptor) -> ToolDescriptor:
+    descriptor.stamps = tuple(file_stamp(path) for path in descriptor.watched)
+    with _LOCK:
+        _DESCRIPTORS[key] = descriptor
+    return descriptor
+
+
+def invalidate_tool_descriptors(skill: Optional[str] = None) -> None:
+    with _LOCK:
+        if skill is None:
+            _DESCRIPTORS.clear()
+            return
+        for key in [key for key in _DESCRIPTORS if key[-1] == skill]:
+            _DESCRIPTORS.pop(key, None)
+
+
+def _max_workers() -> int:
+    try:
+        return max(1, int(os.getenv("ADAOS_SKILL_TOOL_WORKERS", "4") or 4))
+    except Exception:
+        return 4
+
+
+def tool_executor(skill: str) -> ThreadPoolExecutor:
+    """Bounded executor reused for all timed tool calls of ``skill``."""
+    pool = _EXECUTORS.get(skill)
+    if pool is None:
+        with _LOCK:
+            pool = _EXECUTORS.get(skill)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix=f"skill-{skill}")
+                _EXECUTORS[skill] = pool
+    return pool
+
+
+def shutdown_tool_executors(*, wait: bool = False) -> None:
+    with _LOCK:
+        pools = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def persist_env_if_changed(source: str | Path, target: str | Path) -> bool:
+    """Copy ``source`` to ``target`` unless it is unchanged since the last copy."""
+    stamp = file_stamp(source)
+    if stamp is None:
+        return False
+    key = str(source)
+    if _PERSISTED_ENV.get(key) == stamp and file_stamp(target) is not None:
+        return False
+    source, target = Path(source), Path(target)
+    if source.resolve() != target.resolve():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+    _PERSISTED_ENV[key] = stamp
+    return True
+
+
+__all__ = [
+    "ToolDescriptor",
+    "cached_descriptor",
+    "file_stamp",
+    "invalidate_tool_descriptors",
+    "persist_env_if_changed",
+    "shutdown_tool_executors",
+    "store_descriptor",
+    "tool_executor",
+]
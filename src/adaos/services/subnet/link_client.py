@@ -71,6 +71,46 @@ class MemberLinkClient:
         self._last_control_error = ""
         self._last_control_requested_at = 0.0
         self._last_control_completed_at = 0.0
+        self._yjs_static_interest = self._parse_interest(os.getenv("ADAOS_SUBNET_YJS_INTEREST", "default"))
+        self._yjs_declared: set[str] = set()
+        self._yjs_written: set[str] = set()
+        self._yjs_sync_total = 0
+        self._yjs_sync_reply_total = 0
+        # Outbound Yjs merge window: local writes are held per webspace for a
+        # few milliseconds and sent as one diff against the state vector the
+        # hub is known to have.
+        self._yjs_merge_window_s = self._env_float("ADAOS_SUBNET_YJS_MERGE_WINDOW_MS", 30.0, maximum=1000.0) / 1000.0
+        self._yjs_merge_max_bytes = int(self._env_float("ADAOS_SUBNET_YJS_MERGE_MAX_BYTES", 256 * 1024.0, maximum=16 * 1024 * 1024.0))
+        self._yjs_pending: dict[str, list[bytes]] = {}
+        self._yjs_pending_bytes: dict[str, int] = {}
+        self._yjs_flush_handles: dict[str, asyncio.TimerHandle] = {}
+        self._yjs_hub_vectors: dict[str, bytes] = {}
+        self._yjs_merge_stats: dict[str, int] = {
+            "updates_in": 0,
+            "bytes_in": 0,
+            "messages_out": 0,
+            "bytes_out": 0,
+            "merged_flushes": 0,
+            "raw_flushes": 0,
+            "cap_flushes": 0,
+            "disconnect_flushes": 0,
+        }
+
+    @staticmethod
+    def _env_float(name: str, default: float, *, maximum: float) -> float:
+        try:
+            value = float(str(os.getenv(name) or "").strip() or default)
+        except Exception:
+            value = float(default)
+        return max(0.0, min(float(maximum), value))
+
+    @staticmethod
+    def _parse_interest(raw: str | None) -> set[str] | None:
+        txt = str(raw or "").strip()
+        if txt in ("*", "all"):
+            # Legacy mode: never declare interest, hub routes every webspace.
+            return None
+        return {p.strip() for p in txt.split(",") if p.strip()}
 
     @staticmethod
     def _parse_bus_prefixes(raw: str | None) -> list[str] | None:
@@ -112,6 +152,10 @@ class MemberLinkClient:
             "last_control_error": self._last_control_error or None,
             "last_control_request_ago_s": round(max(0.0, now - self._last_control_requested_at), 3) if self._last_control_requested_at else None,
             "last_control_result_ago_s": round(max(0.0, now - self._last_control_completed_at), 3) if self._last_control_completed_at else None,
+            "yjs_interest": sorted(self._yjs_declared) if self._yjs_static_interest is not None else None,
+            "yjs_sync_total": self._yjs_sync_total,
+            "yjs_sync_reply_total": self._yjs_sync_reply_total,
+            "yjs_merge": self._yjs_merge_snapshot(),
             "updated_at": now,
         }
 
@@ -220,6 +264,9 @@ class MemberLinkClient:
         self._task = None
         self._connected.clear()
         self._connected_at = 0.0
+        for handle in self._yjs_flush_handles.values():
+            handle.cancel()
+        self._yjs_flush_handles.clear()
         try:
             if self._remove_ystore_listener:
                 self._remove_ystore_listener()
@@ -237,23 +284,117 @@ class MemberLinkClient:
                 return
             if not self._connected.is_set():
                 return
+            ws_id = webspace_id or "default"
             try:
-                b64 = base64.b64encode(update).decode("ascii")
-            except Exception:
-                return
-            msg = {
-                "t": "yjs.update",
-                "webspace_id": webspace_id or "default",
-                "update_b64": b64,
-                "ts": time.time(),
-            }
-            try:
-                self._out_q.put_nowait(msg)
+                if self._yjs_static_interest is not None and ws_id not in self._yjs_declared:
+                    # Writing to a webspace makes this member a host of it:
+                    # subscribe before the update so hub fan-out reaches us.
+                    self._yjs_written.add(ws_id)
+                    self._yjs_declared.add(ws_id)
+                    self._out_q.put_nowait({"t": "yjs.interest", "mode": "add", "webspaces": [ws_id], "ts": time.time()})
             except Exception:
                 return
+            self._queue_yjs_update(ws_id, update)
 
         self._remove_ystore_listener = add_ystore_write_listener(_on_write)
 
+    def _queue_yjs_update(self, webspace_id: str, update: bytes) -> None:
+        stats = self._yjs_merge_stats
+        stats["updates_in"] += 1
+        stats["bytes_in"] += len(update)
+        if self._yjs_merge_window_s <= 0.0:
+            self._put_yjs_message(webspace_id, update)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._put_yjs_message(webspace_id, update)
+            return
+        self._yjs_pending.setdefault(webspace_id, []).append(update)
+        size = self._yjs_pending_bytes.get(webspace_id, 0) + len(update)
+        self._yjs_pending_bytes[webspace_id] = size
+        if size >= self._yjs_merge_max_bytes:
+            handle = self._yjs_flush_handles.pop(webspace_id, None)
+            if handle is not None:
+                handle.cancel()
+            stats["cap_flushes"] += 1
+            loop.create_task(self._flush_yjs_updates(webspace_id))
+            return
+        if webspace_id not in self._yjs_flush_handles:
+            self._yjs_flush_handles[webspace_id] = loop.call_later(
+                self._yjs_merge_window_s,
+                lambda: loop.create_task(self._flush_yjs_updates(webspace_id)),
+            )
+
+    def _put_yjs_message(self, webspace_id: str, update: bytes) -> None:
+        try:
+            self._out_q.put_nowait(
+                {
+                    "t": "yjs.update",
+                    "webspace_id": webspace_id,
+                    "update_b64": base64.b64encode(update).decode("ascii"),
+                    "ts": time.time(),
+                }
+            )
+        except Exception:
+            return
+        self._yjs_merge_stats["messages_out"] += 1
+        self._yjs_merge_stats["bytes_out"] += len(update)
+
+    async def _flush_yjs_updates(self, webspace_id: str) -> None:
+        """
+        Send the pending window for a webspace as a single update.
+
+        Yjs merge semantics come from the member store: the diff against the
+        last state vector known for the hub contains exactly the pending
+        writes (plus anything else the hub lacks), and the vector from the
+        same encode becomes the new baseline. The store keeps its materialized
+        doc between flushes and only applies the writes of the window, so a
+        flush costs the size of the window, not of the doc. Vectors are first
+        learned from a hub `yjs.sync`; until then (or with hubs that do not
+        send it) the raw updates are forwarded unmerged.
+        """
+        handle = self._yjs_flush_handles.pop(webspace_id, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._yjs_pending.pop(webspace_id, None)
+        self._yjs_pending_bytes.pop(webspace_id, None)
+        if not pending:
+            return
+        store = get_ystore_for_webspace(webspace_id)
+        hub_sv = self._yjs_hub_vectors.get(webspace_id)
+        try:
+            if hub_sv is not None:
+                diff, own_sv = await store.encode_sync_reply(hub_sv)
+                self._yjs_hub_vectors[webspace_id] = own_sv
+                self._yjs_merge_stats["merged_flushes"] += 1
+                if len(diff) > 2:
+                    self._put_yjs_message(webspace_id, diff)
+                return
+        except Exception:
+            _log.debug("yjs merge failed webspace=%s; sending raw updates", webspace_id, exc_info=True)
+        self._yjs_merge_stats["raw_flushes"] += 1
+        for update in pending:
+            self._put_yjs_message(webspace_id, update)
+
+    async def _flush_all_yjs_updates(self, *, reason: str) -> None:
+        for webspace_id in list(self._yjs_pending.keys()):
+            if reason == "disconnect":
+                self._yjs_merge_stats["disconnect_flushes"] += 1
+            await self._flush_yjs_updates(webspace_id)
+
+    def _yjs_merge_snapshot(self) -> dict[str, Any]:
+        stats = dict(self._yjs_merge_stats)
+        messages_out = int(stats.get("messages_out") or 0)
+        bytes_out = int(stats.get("bytes_out") or 0)
+        stats["window_ms"] = round(self._yjs_merge_window_s * 1000.0, 3)
+        stats["max_bytes"] = int(self._yjs_merge_max_bytes)
+        stats["pending_webspaces"] = len(self._yjs_pending)
+        stats["pending_updates"] = sum(len(items) for items in self._yjs_pending.values())
+        stats["merge_ratio"] = round(int(stats.get("updates_in") or 0) / messages_out, 3) if messages_out else None
+        stats["byte_ratio"] = round(int(stats.get("bytes_in") or 0) / bytes_out, 3) if bytes_out else None
+        return stats
+
     def _ensure_bus_subscription(self) -> None:
         if self._bus_subscribed:
             return
@@ -322,6 +463,7 @@ class MemberLinkClient:
             receiver_t: asyncio.Task | None = None
             ping_t: asyncio.Task | None = None
             snapshot_t: asyncio.Task | None = None
+            interest_t: asyncio.Task | None = None
             try:
                 async with websockets.connect(
                     ws_url,
@@ -404,6 +546,10 @@ class MemberLinkClient:
                                 if self._yjs_enabled:
                                     await self._on_yjs_update(msg)
                                 continue
+                            if t == "yjs.sync":
+                                if self._yjs_enabled:
+                                    await self._on_yjs_sync(msg)
+                                continue
                             if t == "hub.event":
                                 await self._on_hub_event(msg)
                                 continue
@@ -435,6 +581,9 @@ class MemberLinkClient:
                     ping_t = asyncio.create_task(self._ping_loop(ws), name="subnet-link-ping")
                     snapshot_t = asyncio.create_task(_snapshot_loop(), name="subnet-link-snapshot")
                     tasks = [sender_t, receiver_t, ping_t, snapshot_t]
+                    if self._yjs_enabled and self._yjs_static_interest is not None:
+                        interest_t = asyncio.create_task(self._interest_loop(), name="subnet-link-interest")
+                        tasks.append(interest_t)
                     done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
                     for p in pending:
                         p.cancel()
@@ -446,15 +595,22 @@ class MemberLinkClient:
             except Exception as exc:
                 _log.debug("subnet link connect failed ws=%s err=%s", ws_url, exc)
             finally:
-                for t in (sender_t, receiver_t, ping_t, snapshot_t):
+                for t in (sender_t, receiver_t, ping_t, snapshot_t, interest_t):
                     if t and not t.done():
                         t.cancel()
                 try:
-                    await asyncio.gather(*(t for t in (sender_t, receiver_t, ping_t, snapshot_t) if t), return_exceptions=True)
+                    await asyncio.gather(*(t for t in (sender_t, receiver_t, ping_t, snapshot_t, interest_t) if t), return_exceptions=True)
                 except Exception:
                     pass
                 self._connected.clear()
                 self._connected_at = 0.0
+                # Keep pending writes in the outbound queue for the next
+                # connection; the hub state is re-established by yjs.sync.
+                try:
+                    await self._flush_all_yjs_updates(reason="disconnect")
+                except Exception:
+                    pass
+                self._yjs_hub_vectors.clear()
 
             await asyncio.sleep(backoff)
             backoff = min(backoff * 2.0, 15.0)
@@ -481,6 +637,101 @@ class MemberLinkClient:
         except Exception:
             return
 
+    def _local_yjs_interest(self) -> set[str]:
+        """
+        Webspaces this member hosts or views: the configured set, rooms opened
+        by local Yjs clients and webspaces written locally.
+        """
+        interest = set(self._yjs_static_interest or ())
+        interest |= self._yjs_written
+        try:
+            from adaos.services.yjs.gateway import y_server  # pylint: disable=import-outside-toplevel
+
+            interest |= {str(name) for name in list(y_server.rooms.keys()) if name}
+        except Exception:
+            pass
+        return interest
+
+    async def _declare_interest(self, *, mode: str, webspaces: set[str]) -> None:
+        vectors: dict[str, str] = {}
+        if mode != "remove":
+            for ws_id in sorted(webspaces):
+                try:
+                    sv = await get_ystore_for_webspace(ws_id).encode_state_vector()
+                    vectors[ws_id] = base64.b64encode(sv).decode("ascii")
+                except Exception:
+                    continue
+        try:
+            self._out_q.put_nowait(
+                {
+                    "t": "yjs.interest",
+                    "mode": mode,
+                    "webspaces": sorted(webspaces),
+                    "state_vectors_b64": vectors,
+                    "ts": time.time(),
+                }
+            )
+        except Exception:
+            _log.debug("failed to queue yjs interest declaration mode=%s", mode, exc_info=True)
+
+    async def _interest_loop(self) -> None:
+        interval_raw = str(os.getenv("ADAOS_SUBNET_YJS_INTEREST_POLL_S") or "").strip()
+        try:
+            interval = max(0.2, min(60.0, float(interval_raw or 2.0)))
+        except Exception:
+            interval = 2.0
+        # Every (re)connect starts from a full declaration so the hub can
+        # catch this member up with one diff per webspace.
+        self._yjs_declared = self._local_yjs_interest()
+        await self._declare_interest(mode="set", webspaces=self._yjs_declared)
+        while True:
+            await asyncio.sleep(interval)
+            current = self._local_yjs_interest()
+            added = current - self._yjs_declared
+            removed = self._yjs_declared - current
+            if added:
+                self._yjs_declared |= added
+                await self._declare_interest(mode="add", webspaces=added)
+            if removed:
+                self._yjs_declared -= removed
+                await self._declare_interest(mode="remove", webspaces=removed)
+
+    async def _on_yjs_sync(self, msg: dict[str, Any]) -> None:
+        """
+        Apply the hub's catch-up diff and answer with what the hub is missing.
+        """
+        try:
+            ws_id = str(msg.get("webspace_id") or "default")
+            store = get_ystore_for_webspace(ws_id)
+            b64 = str(msg.get("update_b64") or "")
+            if b64:
+                upd = base64.b64decode(b64.encode("ascii"), validate=False)
+                async with suppress_ystore_write_notifications():
+                    await store.write(upd)
+                apply_update_to_live_room(ws_id, upd)
+            self._yjs_sync_total += 1
+            sv_b64 = str(msg.get("state_vector_b64") or "")
+            if not sv_b64:
+                return
+            hub_sv = base64.b64decode(sv_b64.encode("ascii"), validate=False)
+            diff, own_sv = await store.encode_sync_reply(hub_sv)
+            # After this reply the hub holds everything in the local store.
+            self._yjs_hub_vectors[ws_id] = own_sv
+            # An empty Yjs update encodes as two zero bytes.
+            if len(diff) <= 2:
+                return
+            self._out_q.put_nowait(
+                {
+                    "t": "yjs.update",
+                    "webspace_id": ws_id,
+                    "update_b64": base64.b64encode(diff).decode("ascii"),
+                    "ts": time.time(),
+                }
+            )
+            self._yjs_sync_reply_total += 1
+        except Exception:
+            _log.debug("failed to apply yjs.sync from hub", exc_info=True)
+
     async def _on_rpc(self, ws, msg: dict[str, Any]) -> None:
         rid = msg.get("id")
         method = msg.get("method")
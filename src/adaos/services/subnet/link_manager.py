@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import collections
 import logging
+import os
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, Optional
 
 from fastapi import WebSocket
 
@@ -17,6 +19,33 @@ from adaos.services.yjs.store import get_ystore_for_webspace, suppress_ystore_wr
 
 _log = logging.getLogger("adaos.subnet.link")
 
+SLOW_CONSUMER_POLICIES = ("merge", "disconnect")
+
+
+def _env_int(name: str, default: int, *, minimum: int = 0) -> int:
+    try:
+        value = int(os.getenv(name, str(default)) or str(default))
+    except Exception:
+        value = int(default)
+    return max(int(minimum), value)
+
+
+def _slow_consumer_policy() -> str:
+    raw = str(os.getenv("ADAOS_SUBNET_SLOW_CONSUMER_POLICY") or "").strip().lower()
+    return raw if raw in SLOW_CONSUMER_POLICIES else "merge"
+
+
+@dataclass
+class _Outbound:
+    msg: dict[str, Any] | None
+    enqueued_at: float
+    webspace_id: str | None = None
+    resync: bool = False
+    # Catch-up sync entries carry the member's state vector and are answered
+    # with a `yjs.sync` diff instead of a full-state resync.
+    sync: bool = False
+    state_vector: bytes | None = None
+
 
 @dataclass
 class HubMemberLink:
@@ -41,11 +70,235 @@ class HubMemberLink:
     node_snapshot: dict[str, Any] = field(default_factory=dict)
     send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     pending_rpc: Dict[str, asyncio.Future] = field(default_factory=dict)
+    # Webspaces the member hosts or views; None means the member never declared
+    # interest (older builds) and receives every webspace.
+    yjs_interest: set[str] | None = None
+    # Outbound queue drained by a per-link sender task, so one slow member
+    # never delays fan-out to the others.
+    queue_limit: int = field(default_factory=lambda: _env_int("ADAOS_SUBNET_LINK_QUEUE_MAX", 1000, minimum=8))
+    slow_consumer_policy: str = field(default_factory=_slow_consumer_policy)
+    out_q: Deque[_Outbound] = field(default_factory=collections.deque)
+    out_ready: asyncio.Event = field(default_factory=asyncio.Event)
+    resync_pending: set[str] = field(default_factory=set)
+    sender_task: asyncio.Task | None = None
+    closing: bool = False
+    queued_total: int = 0
+    sent_total: int = 0
+    send_failed_total: int = 0
+    rejected_total: int = 0
+    merged_total: int = 0
+    resync_total: int = 0
+    queue_high_watermark: int = 0
+    last_send_lag_s: float | None = None
+    max_send_lag_s: float = 0.0
+    avg_send_lag_s: float | None = None
 
     async def send_json(self, msg: dict[str, Any]) -> None:
         async with self.send_lock:
             await self.websocket.send_json(msg)
 
+    def start_sender(self) -> None:
+        if self.sender_task is not None and not self.sender_task.done():
+            return
+        self.sender_task = asyncio.get_running_loop().create_task(
+            self._sender_loop(),
+            name=f"subnet-link-sender:{self.node_id}",
+        )
+
+    async def stop_sender(self) -> None:
+        self.closing = True
+        task = self.sender_task
+        self.sender_task = None
+        self.out_q.clear()
+        self.resync_pending.clear()
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except BaseException:
+            pass
+
+    def enqueue(self, msg: dict[str, Any], *, webspace_id: str | None = None) -> bool:
+        """
+        Queue a message for the sender task without awaiting the socket.
+
+        Returns False when the link is closing or the slow-consumer policy
+        decided to drop the member.
+        """
+        if self.closing:
+            self.rejected_total += 1
+            return False
+        if len(self.out_q) >= self.queue_limit and not self._relieve_backpressure():
+            self.rejected_total += 1
+            return False
+        if webspace_id is not None and webspace_id in self.resync_pending:
+            # A pending resync is encoded from the hub store when it is sent,
+            # so it already covers this update.
+            self.merged_total += 1
+            return True
+        self.out_q.append(_Outbound(msg=msg, enqueued_at=time.time(), webspace_id=webspace_id))
+        self.queued_total += 1
+        depth = len(self.out_q)
+        if depth > self.queue_high_watermark:
+            self.queue_high_watermark = depth
+        self.out_ready.set()
+        return True
+
+    def enqueue_sync(self, webspace_id: str, *, state_vector: bytes | None) -> bool:
+        """
+        Queue a state-vector based catch-up for a newly added interest.
+
+        Like a resync, the diff is encoded when the entry is sent, so live
+        updates for the same webspace queued meanwhile are absorbed by it.
+        """
+        if self.closing:
+            self.rejected_total += 1
+            return False
+        if len(self.out_q) >= self.queue_limit and not self._relieve_backpressure():
+            self.rejected_total += 1
+            return False
+        self.out_q.append(
+            _Outbound(
+                msg=None,
+                enqueued_at=time.time(),
+                webspace_id=webspace_id,
+                resync=True,
+                sync=True,
+                state_vector=state_vector,
+            )
+        )
+        self.resync_pending.add(webspace_id)
+        self.queued_total += 1
+        self.out_ready.set()
+        return True
+
+    def _relieve_backpressure(self) -> bool:
+        if self.slow_consumer_policy == "merge":
+            self._merge_pending_yjs()
+            if len(self.out_q) < self.queue_limit:
+                return True
+        self._disconnect_slow_consumer()
+        return False
+
+    def _merge_pending_yjs(self) -> None:
+        """
+        Collapse queued Yjs updates into one resync entry per webspace.
+
+        The resync entry keeps the position of the first update it replaces so
+        ordering relative to other messages is preserved.
+        """
+        merged: list[_Outbound] = []
+        seen: set[str] = set()
+        for item in self.out_q:
+            ws_id = item.webspace_id
+            if ws_id is None:
+                merged.append(item)
+                continue
+            if ws_id in seen:
+                self.merged_total += 1
+                continue
+            seen.add(ws_id)
+            self.resync_pending.add(ws_id)
+            if item.resync:
+                merged.append(item)
+                continue
+            self.resync_total += 1
+            merged.append(_Outbound(msg=None, enqueued_at=item.enqueued_at, webspace_id=ws_id, resync=True))
+        self.out_q = collections.deque(merged)
+
+    def _disconnect_slow_consumer(self) -> None:
+        if self.closing:
+            return
+        self.closing = True
+        self.out_q.clear()
+        self.resync_pending.clear()
+        _log.warning(
+            "subnet link: disconnecting slow member node_id=%s queue_limit=%s policy=%s",
+            self.node_id,
+            self.queue_limit,
+            self.slow_consumer_policy,
+        )
+
+        async def _close() -> None:
+            try:
+                await self.websocket.close(code=1013)
+            except Exception:
+                pass
+
+        try:
+            asyncio.get_running_loop().create_task(_close())
+        except RuntimeError:
+            pass
+
+    async def _sender_loop(self) -> None:
+        while not self.closing:
+            if not self.out_q:
+                self.out_ready.clear()
+                await self.out_ready.wait()
+                continue
+            item = self.out_q.popleft()
+            if item.resync:
+                self.resync_pending.discard(item.webspace_id or "default")
+            try:
+                msg = item.msg if not item.resync else await self._resync_message(item)
+                await self.send_json(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.send_failed_total += 1
+                _log.debug("subnet link send failed node_id=%s", self.node_id, exc_info=True)
+                continue
+            self.sent_total += 1
+            lag = max(0.0, time.time() - item.enqueued_at)
+            self.last_send_lag_s = lag
+            self.max_send_lag_s = max(self.max_send_lag_s, lag)
+            self.avg_send_lag_s = lag if self.avg_send_lag_s is None else (self.avg_send_lag_s * 0.9 + lag * 0.1)
+
+    @staticmethod
+    async def _resync_message(item: _Outbound) -> dict[str, Any]:
+        webspace_id = item.webspace_id or "default"
+        store = get_ystore_for_webspace(webspace_id)
+        if item.sync:
+            diff, hub_sv = await store.encode_sync_reply(item.state_vector)
+            return {
+                "t": "yjs.sync",
+                "webspace_id": webspace_id,
+                "update_b64": base64.b64encode(diff).decode("ascii"),
+                "state_vector_b64": base64.b64encode(hub_sv).decode("ascii"),
+                "ts": time.time(),
+            }
+        update = await store.encode_state()
+        return {
+            "t": "yjs.update",
+            "webspace_id": webspace_id,
+            "update_b64": base64.b64encode(update).decode("ascii"),
+            "origin_node_id": None,
+            "resync": True,
+            "ts": time.time(),
+        }
+
+    def outbound_snapshot(self, *, now: float | None = None) -> dict[str, Any]:
+        now_ts = time.time() if now is None else float(now)
+        oldest = self.out_q[0].enqueued_at if self.out_q else None
+        return {
+            "policy": self.slow_consumer_policy,
+            "queue_depth": len(self.out_q),
+            "queue_limit": int(self.queue_limit),
+            "queue_high_watermark": int(self.queue_high_watermark),
+            "queued_total": int(self.queued_total),
+            "sent_total": int(self.sent_total),
+            "send_failed_total": int(self.send_failed_total),
+            "rejected_total": int(self.rejected_total),
+            "merged_total": int(self.merged_total),
+            "resync_total": int(self.resync_total),
+            "lag_s": round(max(0.0, now_ts - oldest), 3) if oldest is not None else 0.0,
+            "last_send_lag_s": round(self.last_send_lag_s, 4) if self.last_send_lag_s is not None else None,
+            "avg_send_lag_s": round(self.avg_send_lag_s, 4) if self.avg_send_lag_s is not None else None,
+            "max_send_lag_s": round(self.max_send_lag_s, 4),
+            "closing": bool(self.closing),
+        }
+
 
 class HubLinkManager:
     """
@@ -56,6 +309,12 @@ class HubLinkManager:
     - Provide RPC (hub -> member) used by tool routing
     - Relay Yjs updates between members and the hub's YStore
     - Ingest selected bus events (member -> hub)
+
+    Broadcasts never await member sockets: each link owns a bounded outbound
+    queue and a sender task. When a member falls behind, the slow-consumer
+    policy (``ADAOS_SUBNET_SLOW_CONSUMER_POLICY``) either merges its pending
+    Yjs updates into one resync update per webspace (``merge``, default) or
+    drops the link so the member reconnects (``disconnect``).
     """
 
     def __init__(self) -> None:
@@ -63,6 +322,13 @@ class HubLinkManager:
         self._lock = asyncio.Lock()
         self._hub_event_total = 0
         self._hub_core_update_broadcast_total = 0
+        # webspace_id -> node ids that declared interest; links without a
+        # declaration are routed every webspace via `_yjs_wildcard`.
+        self._yjs_interest: dict[str, set[str]] = {}
+        self._yjs_wildcard: set[str] = set()
+        self._yjs_routed_total = 0
+        self._yjs_filtered_total = 0
+        self._yjs_sync_total = 0
 
     async def register(
         self,
@@ -84,7 +350,14 @@ class HubLinkManager:
             # replace existing link if reconnecting
             prev = self._links.get(node_id)
             self._links[node_id] = link
+            self._drop_member_interest(node_id)
+            self._yjs_wildcard.add(node_id)
+        link.start_sender()
         if prev is not None:
+            try:
+                await prev.stop_sender()
+            except Exception:
+                pass
             try:
                 for rid, fut in list(prev.pending_rpc.items()):
                     if not fut.done():
@@ -112,8 +385,14 @@ class HubLinkManager:
     async def unregister(self, node_id: str) -> None:
         async with self._lock:
             link = self._links.pop(node_id, None)
+            if link is not None:
+                self._drop_member_interest(node_id)
         if not link:
             return
+        try:
+            await link.stop_sender()
+        except Exception:
+            pass
         try:
             for rid, fut in list(link.pending_rpc.items()):
                 if not fut.done():
@@ -132,6 +411,70 @@ class HubLinkManager:
         except Exception:
             pass
 
+    def _drop_member_interest(self, node_id: str) -> None:
+        self._yjs_wildcard.discard(node_id)
+        for webspace_id in [ws_id for ws_id, nodes in self._yjs_interest.items() if node_id in nodes]:
+            nodes = self._yjs_interest[webspace_id]
+            nodes.discard(node_id)
+            if not nodes:
+                self._yjs_interest.pop(webspace_id, None)
+
+    async def update_member_interest(
+        self,
+        node_id: str,
+        *,
+        webspaces: list[str],
+        mode: str = "set",
+        state_vectors: dict[str, bytes] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Record which webspaces a member hosts or views.
+
+        `mode` is ``set`` (replace), ``add`` or ``remove``. Every newly added
+        webspace gets a catch-up sync computed against the member's state
+        vector (or the full state when none was sent).
+        """
+        mode_norm = str(mode or "set").strip().lower()
+        if mode_norm not in {"set", "add", "remove"}:
+            return {"ok": False, "error": "invalid_mode", "node_id": node_id}
+        requested = {str(item or "").strip() for item in webspaces or [] if str(item or "").strip()}
+        async with self._lock:
+            link = self._links.get(node_id)
+            if not link:
+                return {"ok": False, "error": "member_not_connected", "node_id": node_id}
+            before = set(link.yjs_interest or ())
+            if mode_norm == "set":
+                after = requested
+            elif mode_norm == "add":
+                after = before | requested
+            else:
+                after = before - requested
+            link.yjs_interest = after
+            self._yjs_wildcard.discard(node_id)
+            for webspace_id in before - after:
+                nodes = self._yjs_interest.get(webspace_id)
+                if nodes is not None:
+                    nodes.discard(node_id)
+                    if not nodes:
+                        self._yjs_interest.pop(webspace_id, None)
+            for webspace_id in after:
+                self._yjs_interest.setdefault(webspace_id, set()).add(node_id)
+        added = sorted(after - before)
+        vectors = state_vectors or {}
+        for webspace_id in added:
+            if link.enqueue_sync(webspace_id, state_vector=vectors.get(webspace_id)):
+                self._yjs_sync_total += 1
+        return {
+            "ok": True,
+            "node_id": node_id,
+            "webspaces": sorted(after),
+            "added": added,
+            "removed": sorted(before - after),
+        }
+
+    def interested_members(self, webspace_id: str) -> list[str]:
+        return sorted(self._yjs_wildcard | self._yjs_interest.get(webspace_id, set()))
+
     def is_connected(self, node_id: str) -> bool:
         return node_id in self._links
 
@@ -360,7 +703,9 @@ class HubLinkManager:
         failed = 0
         for link in links:
             try:
-                await link.send_json(msg)
+                if not link.enqueue(msg):
+                    failed += 1
+                    continue
                 link.last_hub_event_at = time.time()
                 link.last_hub_event_type = event_type_norm
                 if event_type_norm == "core.update.status":
@@ -416,6 +761,8 @@ class HubLinkManager:
                     "last_control_result": dict(link.last_control_result) if isinstance(link.last_control_result, dict) else {},
                     "node_snapshot": dict(link.node_snapshot) if isinstance(link.node_snapshot, dict) else {},
                     "pending_rpc": len(link.pending_rpc),
+                    "outbound": link.outbound_snapshot(now=now),
+                    "yjs_interest": sorted(link.yjs_interest) if link.yjs_interest is not None else None,
                     "connected": True,
                 }
             )
@@ -425,6 +772,13 @@ class HubLinkManager:
             "connected_total": len(items),
             "hub_event_total": self._hub_event_total,
             "hub_core_update_broadcast_total": self._hub_core_update_broadcast_total,
+            "yjs_routing": {
+                "interest_webspace_total": len(self._yjs_interest),
+                "wildcard_member_total": len(self._yjs_wildcard),
+                "routed_total": self._yjs_routed_total,
+                "filtered_total": self._yjs_filtered_total,
+                "sync_total": self._yjs_sync_total,
+            },
             "members": items,
             "updated_at": now,
         }
@@ -479,29 +833,32 @@ class HubLinkManager:
 
     async def broadcast_yjs_update(self, *, webspace_id: str, update: bytes, origin_node_id: str | None) -> None:
         """
-        Broadcast an update to all connected members except the origin.
+        Queue an update for interested members except the origin.
+
+        The message is encoded once and handed to each member's sender task;
+        the caller never waits for member sockets. Members that declared
+        webspace interest only receive the webspaces they listed.
         """
         if not update:
             return
-        b64 = base64.b64encode(update).decode("ascii")
-        async with self._lock:
-            links = list(self._links.values())
-        for link in links:
-            if origin_node_id and link.node_id == origin_node_id:
+        msg = {
+            "t": "yjs.update",
+            "webspace_id": webspace_id,
+            "update_b64": base64.b64encode(update).decode("ascii"),
+            "origin_node_id": origin_node_id,
+            "ts": time.time(),
+        }
+        targets = self._yjs_wildcard | self._yjs_interest.get(webspace_id, set())
+        self._yjs_filtered_total += max(0, len(self._links) - len(targets))
+        for node_id in targets:
+            if origin_node_id and node_id == origin_node_id:
                 continue
-            try:
-                await link.send_json(
-                    {
-                        "t": "yjs.update",
-                        "webspace_id": webspace_id,
-                        "update_b64": b64,
-                        "origin_node_id": origin_node_id,
-                        "ts": time.time(),
-                    }
-                )
-            except Exception:
-                # best-effort
+            link = self._links.get(node_id)
+            if link is None:
                 continue
+            # best-effort: a rejected enqueue means the link is being dropped
+            if link.enqueue(msg, webspace_id=webspace_id):
+                self._yjs_routed_total += 1
 
     async def ingest_member_yjs_update(self, *, node_id: str, webspace_id: str, update: bytes) -> None:
         """
@@ -157,6 +157,25 @@ async def subnet_ws(websocket: WebSocket) -> None:
                     await mgr.update_member_control_result(node_id, result=result)
                 continue
 
+            if t == "yjs.interest":
+                try:
+                    webspaces = msg.get("webspaces") or []
+                    raw_vectors = msg.get("state_vectors_b64") or {}
+                    state_vectors: dict[str, bytes] = {}
+                    if isinstance(raw_vectors, dict):
+                        for ws_id, b64 in raw_vectors.items():
+                            if isinstance(b64, str) and b64:
+                                state_vectors[str(ws_id)] = base64.b64decode(b64.encode("ascii"), validate=False)
+                    await mgr.update_member_interest(
+                        node_id,
+                        webspaces=list(webspaces) if isinstance(webspaces, list) else [],
+                        mode=str(msg.get("mode") or "set"),
+                        state_vectors=state_vectors,
+                    )
+                except Exception:
+                    _log.debug("failed to update member yjs interest node_id=%s", node_id, exc_info=True)
+                continue
+
             if t == "yjs.update":
                 try:
                     webspace_id = str(msg.get("webspace_id") or "default")
@@ -3,6 +3,7 @@ from __future__ import annotations
 from .doc import get_ydoc, async_get_ydoc, mutate_live_room
 from .store import (
     AdaosMemoryYStore,
+    evict_ystore_for_webspace,
     get_ystore_for_webspace,
     restore_ystore_for_webspace,
     reset_ystore_for_webspace,
@@ -17,6 +18,7 @@ __all__ = [
     "async_get_ydoc",
     "mutate_live_room",
     "AdaosMemoryYStore",
+    "evict_ystore_for_webspace",
     "get_ystore_for_webspace",
     "restore_ystore_for_webspace",
     "reset_ystore_for_webspace",
@@ -29,7 +29,7 @@ except ImportError as exc:  # pragma: no cover - import guard for dev envs
 
 from adaos.services.workspaces import ensure_workspace, get_workspace
 from adaos.services.yjs.bootstrap import ensure_webspace_seeded_from_scenario
-from adaos.services.yjs.store import get_ystore_for_webspace
+from adaos.services.yjs.store import evict_ystore_for_webspace, get_ystore_for_webspace
 from adaos.services.scheduler import get_scheduler
 from adaos.services.yjs.observers import attach_room_observers
 from adaos.domain import Event as DomainEvent
@@ -58,6 +58,17 @@ _TRANSPORT_STATE: dict[str, dict[str, Any]] = {
     },
 }
 _ACTIVE_YWS_CONNECTIONS: dict[str, list[WebSocket]] = {}
+# Idle room hibernation: last client/room activity per webspace, and the
+# webspaces currently parked on disk.
+_ROOM_ACTIVITY: dict[str, float] = {}
+_HIBERNATED_ROOMS: dict[str, dict[str, Any]] = {}
+_HIBERNATION_STATS: dict[str, Any] = {
+    "hibernated_total": 0,
+    "restored_total": 0,
+    "skipped_busy_total": 0,
+    "freed_bytes_total": 0,
+    "last_sweep_at": 0.0,
+}
 _YWS_OPEN_HISTORY: deque[float] = deque(maxlen=512)
 _YWS_CLIENT_OPEN_HISTORY: dict[str, deque[float]] = {}
 
@@ -329,11 +340,16 @@ def gateway_transport_snapshot(*, now_ts: float | None = None) -> dict[str, Any]
     yws_state = state.get("yws") if isinstance(state.get("yws"), dict) else None
     if yws_state is not None:
         yws_state.update(_yws_storm_snapshot(now))
+    try:
+        rooms = yjs_room_memory_snapshot(now_ts=now)
+    except Exception:
+        rooms = {}
     return {
         "transports": state,
         "servers": {
             "yws": _y_server_runtime_snapshot(),
         },
+        "rooms": rooms,
         "updated_at": now,
     }
 
@@ -389,6 +405,9 @@ class WorkspaceWebsocketServer(WebsocketServer):
                 # have already created the room while we were waiting.
                 if name not in self.rooms:
                     _ylog.info("creating YRoom for webspace=%s", webspace_id)
+                    if _HIBERNATED_ROOMS.pop(webspace_id, None) is not None:
+                        _HIBERNATION_STATS["restored_total"] = int(_HIBERNATION_STATS["restored_total"]) + 1
+                        _ylog.info("restoring hibernated YRoom for webspace=%s", webspace_id)
                     ensure_workspace(webspace_id)
                     ystore = get_ystore_for_webspace(webspace_id)
                     row = get_workspace(webspace_id)
@@ -419,6 +438,7 @@ class WorkspaceWebsocketServer(WebsocketServer):
                         _ylog.warning("apply_updates failed for webspace=%s", webspace_id, exc_info=True)
                     self.rooms[name] = room
         room = self.rooms[name]
+        _note_room_activity(webspace_id)
         room._thread_id = getattr(room, "_thread_id", threading.get_ident())
         room._loop = getattr(room, "_loop", asyncio.get_running_loop())
         try:
@@ -443,14 +463,171 @@ class WorkspaceWebsocketServer(WebsocketServer):
 y_server = WorkspaceWebsocketServer(auto_clean_rooms=False)
 _y_server_started = False
 _y_server_task: asyncio.Task[None] | None = None
+_hibernation_task: asyncio.Task[None] | None = None
 _room_locks: dict[str, asyncio.Lock] = {}
 
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(str(os.getenv(name) or "").strip() or default)
+    except Exception:
+        return float(default)
+
+
+def _room_idle_timeout_s() -> float:
+    """Idle time before a client-less room hibernates; 0 disables it."""
+    return max(0.0, _env_float("ADAOS_YJS_ROOM_IDLE_MIN", 30.0)) * 60.0
+
+
+def _note_room_activity(webspace_id: str, *, now: float | None = None) -> None:
+    _ROOM_ACTIVITY[str(webspace_id or "default")] = time.time() if now is None else float(now)
+
+
+def _room_last_activity(webspace_id: str, room: Any) -> float:
+    ystore = getattr(room, "ystore", None)
+    last_write = float(getattr(ystore, "_last_write_at", 0.0) or 0.0)
+    return max(float(_ROOM_ACTIVITY.get(webspace_id) or 0.0), last_write)
+
+
+async def hibernate_room(webspace_id: str, *, reason: str = "idle") -> dict[str, Any]:
+    """
+    Snapshot a client-less room to disk and drop it, its in-memory store and
+    its backup job. The next `get_room` restores it from the snapshot.
+    """
+    key = str(webspace_id or "").strip() or "default"
+    room = y_server.rooms.get(key)
+    if room is None:
+        return {"ok": False, "webspace_id": key, "error": "room_not_loaded"}
+    if getattr(room, "clients", None):
+        return {"ok": False, "webspace_id": key, "error": "room_has_clients"}
+    ystore = getattr(room, "ystore", None)
+    freed_bytes = 0
+    if ystore is not None:
+        try:
+            freed_bytes = sum(len(item[0]) for item in list(getattr(ystore, "_updates", []) or []))
+        except Exception:
+            freed_bytes = 0
+        last_write = getattr(ystore, "_last_write_at", None)
+        try:
+            await ystore.backup_to_disk()
+        except Exception:
+            _ylog.warning("hibernation snapshot failed for webspace=%s", key, exc_info=True)
+            return {"ok": False, "webspace_id": key, "error": "snapshot_failed"}
+        if getattr(ystore, "_last_write_at", None) != last_write or getattr(room, "clients", None):
+            # Written to or reopened while the snapshot was taken; try later.
+            _HIBERNATION_STATS["skipped_busy_total"] = int(_HIBERNATION_STATS["skipped_busy_total"]) + 1
+            return {"ok": False, "webspace_id": key, "error": "room_busy"}
+    # From here on no awaits until the room and store are unlinked, so no
+    # write can slip in between the snapshot and the eviction.
+    if y_server.rooms.get(key) is room:
+        y_server.rooms.pop(key, None)
+    _room_locks.pop(key, None)
+    _ROOM_ACTIVITY.pop(key, None)
+    if ystore is not None:
+        evict_ystore_for_webspace(key, store=ystore)
+    now = time.time()
+    _HIBERNATED_ROOMS[key] = {"hibernated_at": now, "reason": reason, "freed_bytes": int(freed_bytes)}
+    _HIBERNATION_STATS["hibernated_total"] = int(_HIBERNATION_STATS["hibernated_total"]) + 1
+    _HIBERNATION_STATS["freed_bytes_total"] = int(_HIBERNATION_STATS["freed_bytes_total"]) + int(freed_bytes)
+    stop_room = getattr(room, "stop", None)
+    if callable(stop_room):
+        try:
+            result = stop_room()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            pass
+    try:
+        await get_scheduler().delete(f"ystores.backup.{key}")
+    except Exception:
+        _ylog.debug("failed to drop YStore backup job for webspace=%s", key, exc_info=True)
+    _ylog.info("YRoom hibernated webspace=%s reason=%s freed_bytes=%s", key, reason, freed_bytes)
+    return {"ok": True, "webspace_id": key, "freed_bytes": int(freed_bytes)}
+
+
+async def hibernate_idle_rooms(*, idle_s: float | None = None, now: float | None = None) -> dict[str, Any]:
+    """
+    Hibernate every loaded room that has had no clients and no writes for
+    ``idle_s`` seconds (default: ``ADAOS_YJS_ROOM_IDLE_MIN`` minutes).
+    """
+    threshold = _room_idle_timeout_s() if idle_s is None else max(0.0, float(idle_s))
+    now_ts = time.time() if now is None else float(now)
+    _HIBERNATION_STATS["last_sweep_at"] = now_ts
+    hibernated: list[str] = []
+    if threshold <= 0.0:
+        return {"hibernated": hibernated, "idle_s": threshold}
+    for webspace_id, room in list(y_server.rooms.items()):
+        if getattr(room, "clients", None):
+            _note_room_activity(webspace_id, now=now_ts)
+            continue
+        if now_ts - _room_last_activity(webspace_id, room) < threshold:
+            continue
+        result = await hibernate_room(webspace_id, reason="idle")
+        if result.get("ok"):
+            hibernated.append(webspace_id)
+    return {"hibernated": hibernated, "idle_s": threshold}
+
+
+async def _hibernation_loop() -> None:
+    interval = max(1.0, _env_float("ADAOS_YJS_ROOM_SWEEP_S", 60.0))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await hibernate_idle_rooms()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _ylog.warning("YRoom hibernation sweep failed", exc_info=True)
+
+
+def yjs_room_memory_snapshot(*, now_ts: float | None = None) -> dict[str, Any]:
+    """
+    Per-webspace memory accounting for loaded rooms and their stores, plus
+    the set of hibernated webspaces.
+    """
+    from adaos.services.yjs.store import _YSTORE_CACHE  # pylint: disable=import-outside-toplevel
+
+    now = time.time() if now_ts is None else float(now_ts)
+    webspaces: dict[str, dict[str, Any]] = {}
+    for webspace_id in sorted(set(y_server.rooms.keys()) | set(_YSTORE_CACHE.keys())):
+        room = y_server.rooms.get(webspace_id)
+        ystore = _YSTORE_CACHE.get(webspace_id)
+        try:
+            log_bytes = sum(len(item[0]) for item in list(getattr(ystore, "_updates", []) or []))
+        except Exception:
+            log_bytes = 0
+        last_activity = _room_last_activity(webspace_id, room) if room is not None else 0.0
+        webspaces[webspace_id] = {
+            "room_loaded": room is not None,
+            "clients": len(getattr(room, "clients", None) or []) if room is not None else 0,
+            "ystore_cached": ystore is not None,
+            "update_log_bytes": int(log_bytes),
+            "idle_s": round(max(0.0, now - last_activity), 3) if last_activity else None,
+        }
+    hibernated = {
+        key: {
+            **value,
+            "hibernated_ago_s": round(max(0.0, now - float(value.get("hibernated_at") or now)), 3),
+        }
+        for key, value in sorted(_HIBERNATED_ROOMS.items())
+    }
+    return {
+        "idle_timeout_s": _room_idle_timeout_s(),
+        "loaded_room_total": len(y_server.rooms),
+        "ystore_cached_total": len(_YSTORE_CACHE),
+        "update_log_bytes_total": sum(int(item["update_log_bytes"]) for item in webspaces.values()),
+        "hibernated_room_total": len(hibernated),
+        "stats": dict(_HIBERNATION_STATS),
+        "webspaces": webspaces,
+        "hibernated": hibernated,
+    }
+
+
 async def start_y_server() -> None:
     """
     Ensure the shared Y websocket server background task is running.
     """
-    global _y_server_started, _y_server_task
+    global _y_server_started, _y_server_task, _hibernation_task
     if _y_server_started:
         return
     _y_server_started = True
@@ -460,6 +637,8 @@ async def start_y_server() -> None:
 
     _y_server_task = asyncio.create_task(_runner(), name="adaos-yjs-websocket-server")
     await y_server.started.wait()
+    if _room_idle_timeout_s() > 0.0 and (_hibernation_task is None or _hibernation_task.done()):
+        _hibernation_task = asyncio.create_task(_hibernation_loop(), name="adaos-yjs-room-hibernation")
 
 
 async def stop_y_server() -> None:
@@ -469,9 +648,12 @@ async def stop_y_server() -> None:
     Without an explicit stop, the anyio task group inside ypy-websocket can
     keep the process alive after FastAPI/uvicorn shutdown.
     """
-    global _y_server_started, _y_server_task
+    global _y_server_started, _y_server_task, _hibernation_task
     if not _y_server_started:
         return
+    if _hibernation_task is not None:
+        _hibernation_task.cancel()
+        _hibernation_task = None
     try:
         y_server.stop()
     except Exception:
@@ -634,6 +816,7 @@ async def _yws_impl(websocket: WebSocket, room: str | None) -> None:
         return
     finally:
         _untrack_yws_connection(webspace_id, websocket)
+        _note_room_activity(webspace_id)
         _transport_mark_close("yws")
         _ylog.info("yws connection closed webspace=%s dev=%s", webspace_id, dev_id)
         if _ws_trace_enabled():
@@ -185,6 +185,11 @@ class AdaosMemoryYStore(BaseYStore):
         self._last_loaded_from_disk_at = 0.0
         self._last_update_bytes = 0
         self._last_snapshot_bytes = 0
+        # Doc behind encode_*(): built from the log once, then advanced with the
+        # updates written since, instead of replaying the whole log per call.
+        self._live_doc: Y.YDoc | None = None
+        self._live_pending: List[bytes] = []
+        self._live_rebuild_total = 0
 
     async def start(self, *, task_status: TaskStatus[None] = TASK_STATUS_IGNORED):
         """
@@ -204,6 +209,9 @@ class AdaosMemoryYStore(BaseYStore):
         """
         Append an update to the in-memory log, with optional TTL-based squashing.
         """
+        # A store recreated after hibernation must pick up its disk snapshot
+        # before the first append, otherwise the snapshot would be shadowed.
+        await self._load_from_disk_if_needed()
         metadata = await self.get_metadata()
         now = time.time()
         async with self._lock:
@@ -218,6 +226,8 @@ class AdaosMemoryYStore(BaseYStore):
                     self._compact_updates_locked(now=now, keep_tail=0)
 
             self._updates.append((data, metadata, now))
+            if self._live_doc is not None:
+                self._live_pending.append(data)
             if len(self._updates) > self.max_updates:
                 self._compact_updates_locked(now=now, keep_tail=self.replay_window)
         try:
@@ -265,6 +275,8 @@ class AdaosMemoryYStore(BaseYStore):
         async with self._lock:
             if not self._updates:
                 self._updates.append((data, metadata, now))
+                if self._live_doc is not None:
+                    self._live_pending.append(data)
                 self._last_loaded_from_disk_at = now
                 self._last_snapshot_bytes = len(data)
         self._loaded_from_disk = True
@@ -282,6 +294,57 @@ class AdaosMemoryYStore(BaseYStore):
         for update, metadata, _ts in snapshot:
             yield update, metadata
 
+    async def _materialize(self) -> Y.YDoc:
+        """
+        Current state as a YDoc shared by the encode_* helpers (read-only).
+
+        Compaction and TTL squashing keep the state unchanged, so only the
+        updates written since the previous call need to be applied.
+        """
+        await self._load_from_disk_if_needed()
+        async with self._lock:
+            ydoc = self._live_doc
+            if ydoc is None:
+                ydoc = Y.YDoc()
+                for update, _meta, _ts in self._updates:
+                    Y.apply_update(ydoc, update)  # type: ignore[arg-type]
+                self._live_doc = ydoc
+                self._live_rebuild_total += 1
+            else:
+                for update in self._live_pending:
+                    Y.apply_update(ydoc, update)  # type: ignore[arg-type]
+            self._live_pending = []
+        return ydoc
+
+    async def encode_state(self, state_vector: bytes | None = None) -> bytes:
+        """
+        Encode the current store state as a single Yjs update.
+
+        When ``state_vector`` is given only the diff the holder of that vector
+        is missing is returned. Used by link replication to resync a peer with
+        one update instead of replaying the individual log entries.
+        """
+        ydoc = await self._materialize()
+        if state_vector:
+            return Y.encode_state_as_update(ydoc, state_vector)  # type: ignore[arg-type]
+        return Y.encode_state_as_update(ydoc)  # type: ignore[arg-type]
+
+    async def encode_state_vector(self) -> bytes:
+        ydoc = await self._materialize()
+        return Y.encode_state_vector(ydoc)  # type: ignore[arg-type]
+
+    async def encode_sync_reply(self, state_vector: bytes | None) -> tuple[bytes, bytes]:
+        """
+        Yjs sync step 2 against this store: return ``(diff, own_state_vector)``
+        so the peer can apply what it is missing and answer with its own diff.
+        """
+        ydoc = await self._materialize()
+        if state_vector:
+            diff = Y.encode_state_as_update(ydoc, state_vector)  # type: ignore[arg-type]
+        else:
+            diff = Y.encode_state_as_update(ydoc)  # type: ignore[arg-type]
+        return diff, Y.encode_state_vector(ydoc)  # type: ignore[arg-type]
+
     async def backup_to_disk(self) -> None:
         """
         Persist the current YDoc state as a single update snapshot.
@@ -307,6 +370,7 @@ class AdaosMemoryYStore(BaseYStore):
             snapshot_size = 0
         updates = list(self._updates)
         update_log_entries = len(updates)
+        update_log_bytes = sum(len(item[0]) for item in updates)
         base_snapshot_present = bool(updates) and bool(self._loaded_from_disk or self._compact_total > 0)
         replay_window_entries = max(0, update_log_entries - (1 if base_snapshot_present else 0))
         if update_log_entries <= 0:
@@ -319,6 +383,7 @@ class AdaosMemoryYStore(BaseYStore):
             "webspace_id": self.path,
             "log_mode": log_mode,
             "update_log_entries": update_log_entries,
+            "update_log_bytes": int(update_log_bytes),
             "replay_window_entries": replay_window_entries,
             "replay_window_limit": int(self.replay_window),
             "max_update_log_entries": int(self.max_updates),
@@ -327,6 +392,7 @@ class AdaosMemoryYStore(BaseYStore):
             "write_total": int(self._write_total),
             "compact_total": int(self._compact_total),
             "backup_total": int(self._backup_total),
+            "live_doc_rebuild_total": int(self._live_rebuild_total),
             "snapshot_file_exists": bool(snapshot_exists),
             "snapshot_file_size": int(snapshot_size),
             "last_update_bytes": int(self._last_update_bytes),
@@ -361,10 +427,28 @@ def get_ystore_for_webspace(webspace_id: str) -> AdaosMemoryYStore:
     return store
 
 
+def evict_ystore_for_webspace(webspace_id: str, *, store: AdaosMemoryYStore | None = None) -> bool:
+    """
+    Drop the cached in-memory store for a webspace but keep its disk
+    snapshot; the next `get_ystore_for_webspace` call reloads it lazily.
+
+    When ``store`` is given, the entry is only dropped if it is still that
+    instance, so a concurrently recreated store is left alone.
+    """
+    key = str(webspace_id or "")
+    current = _YSTORE_CACHE.get(key)
+    if current is None or (store is not None and current is not store):
+        return False
+    _YSTORE_CACHE.pop(key, None)
+    current.stop()
+    return True
+
+
 def ystore_runtime_snapshot(*, webspace_id: str | None = None, now_ts: float | None = None) -> dict[str, Any]:
     now = time.time() if now_ts is None else float(now_ts)
     if webspace_id:
-        store = get_ystore_for_webspace(str(webspace_id))
+        # Do not pin an evicted webspace back into memory just to report it.
+        store = _YSTORE_CACHE.get(str(webspace_id)) or AdaosMemoryYStore(str(webspace_id))
         return {
             "webspace_id": str(webspace_id),
             "webspace_total": 1,
@@ -375,14 +459,17 @@ def ystore_runtime_snapshot(*, webspace_id: str | None = None, now_ts: float | N
 
     webspaces: dict[str, Any] = {}
     active_total = 0
+    memory_bytes = 0
     for ws_id, store in sorted(_YSTORE_CACHE.items()):
         item = store.runtime_snapshot(now_ts=now)
         webspaces[str(ws_id)] = item
+        memory_bytes += int(item.get("update_log_bytes") or 0)
         if int(item.get("update_log_entries") or 0) > 0 or bool(item.get("snapshot_file_exists")):
             active_total += 1
     return {
         "webspace_total": len(webspaces),
         "active_webspace_total": active_total,
+        "update_log_bytes_total": memory_bytes,
         "webspaces": webspaces,
     }
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import importlib
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable, Mapping
 
@@ -19,7 +20,7 @@ def execute_tool(
 
     import sys
 
-    skill_path = Path(skill_dir).resolve()
+    skill_path = _resolved(str(skill_dir))
     # Ensure both the skill package root and its parent (which usually
     # contains the ``skills.<name>`` namespace) are visible on sys.path.
     for p in (skill_path, skill_path.parent):
@@ -28,7 +29,7 @@ def execute_tool(
             sys.path.insert(0, p_str)
 
     for extra in extra_paths or ():
-        extra_path = Path(extra).resolve()
+        extra_path = _resolved(str(extra))
         if str(extra_path) not in sys.path:
             sys.path.insert(0, str(extra_path))
 
@@ -76,7 +77,24 @@ def execute_tool(
     return func(mapping)
 
 
+@lru_cache(maxsize=256)
+def _resolved(path: str) -> Path:
+    return Path(path).resolve()
+
+
 def _should_expand_keywords(func) -> bool:
+    try:
+        return _should_expand_keywords_cached(func)
+    except TypeError:  # unhashable callable
+        return _inspect_expand_keywords(func)
+
+
+@lru_cache(maxsize=1024)
+def _should_expand_keywords_cached(func) -> bool:
+    return _inspect_expand_keywords(func)
+
+
+def _inspect_expand_keywords(func) -> bool:
     try:
         import inspect
 
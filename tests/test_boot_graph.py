@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import time
+from types import SimpleNamespace
+
+import pytest
+from typer.testing import CliRunner
+
+from adaos.services.boot_graph import BootGraph, BootGraphError, BootTask, boot_step, boot_timeline_snapshot
+
+
+def _stub(log: list, name: str, delay: float, *, fail: bool = False):
+    async def _run() -> None:
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} broke")
+        log.append(("done", name))
+
+    return _run
+
+
+def test_independent_components_start_concurrently_and_probes_stay_off_ready_path() -> None:
+    log: list = []
+
+    async def _flow() -> tuple[dict, dict, float]:
+        graph = BootGraph(
+            [
+                BootTask("observer", _stub(log, "observer", 0.2)),
+                BootTask("yjs", _stub(log, "yjs", 0.2)),
+                BootTask("sidecar", _stub(log, "sidecar", 0.2)),
+                BootTask("boot_sequence", _stub(log, "boot_sequence", 0.05), deps=("observer", "yjs", "sidecar")),
+                BootTask("telegram_probe", _stub(log, "telegram_probe", 0.6), deps=("boot_sequence",), critical=False),
+            ]
+        )
+        started = time.monotonic()
+        ready = await graph.run()
+        elapsed = time.monotonic() - started
+        assert await graph.wait_all(timeout=5)
+        return ready, graph.timeline(), elapsed
+
+    ready, complete, elapsed = asyncio.run(_flow())
+
+    # Sequential start would take 0.65s before serving; the graph needs ~0.25s.
+    assert elapsed < 0.5
+    assert ready["state"] == "ready" and ready["time_to_ready_ms"] < 500
+    assert log.index(("start", "sidecar")) < log.index(("done", "observer"))
+    assert log.index(("start", "boot_sequence")) > max(log.index(("done", n)) for n in ("observer", "yjs", "sidecar"))
+    probe = {task["name"]: task for task in ready["tasks"]}["telegram_probe"]
+    assert probe["state"] == "running" and probe["critical"] is False
+
+    assert complete["state"] == "complete"
+    assert complete["time_to_complete_ms"] >= complete["time_to_ready_ms"] + 500
+    assert complete["critical_path"][-1] == "boot_sequence" and len(complete["critical_path"]) == 2
+    assert boot_timeline_snapshot()["tasks"][-1]["state"] == "ready"
+
+
+def test_graph_validation_and_failure_semantics() -> None:
+    noop = _stub([], "noop", 0)
+    with pytest.raises(BootGraphError, match="unknown"):
+        BootGraph([BootTask("a", noop, deps=("missing",))])
+    with pytest.raises(BootGraphError, match="cycle"):
+        BootGraph([BootTask("a", noop, deps=("b",)), BootTask("b", noop, deps=("a",))])
+    with pytest.raises(BootGraphError, match="non-critical"):
+        BootGraph([BootTask("probe", noop, critical=False), BootTask("core", noop, deps=("probe",))])
+
+    log: list = []
+
+    async def _best_effort() -> dict:
+        graph = BootGraph(
+            [
+                BootTask("yjs", _stub(log, "yjs", 0, fail=True)),
+                BootTask("slow", _stub(log, "slow", 5), timeout_s=0.1),
+                BootTask("boot_sequence", _stub(log, "boot_sequence", 0), deps=("yjs", "slow")),
+            ]
+        )
+        return await graph.run()
+
+    timeline = asyncio.run(_best_effort())
+    tasks = {task["name"]: task for task in timeline["tasks"]}
+    assert tasks["yjs"]["state"] == "failed" and "yjs broke" in tasks["yjs"]["error"]
+    assert tasks["slow"]["state"] == "failed" and tasks["slow"]["error"].startswith("timeout")
+    assert tasks["boot_sequence"]["state"] == "ready"
+    assert tasks["boot_sequence"]["failed_deps"] == ["yjs", "slow"]
+    assert timeline["failed"] == ["yjs", "slow"]
+
+    async def _fatal() -> list:
+        probe_log: list = []
+        graph = BootGraph(
+            [
+                BootTask("observer", _stub(probe_log, "observer", 0.05, fail=True), fatal=True),
+                BootTask("probe", _stub(probe_log, "probe", 5), critical=False),
+            ]
+        )
+        with pytest.raises(RuntimeError, match="observer broke"):
+            await graph.run()
+        return [task["state"] for task in graph.timeline()["tasks"]]
+
+    assert asyncio.run(_fatal()) == ["failed", "cancelled"]
+
+
+def test_gates_and_steps_are_recorded_and_rendered_by_cli(monkeypatch) -> None:
+    state = {"bound": False}
+
+    async def _start_sidecar() -> None:
+        asyncio.get_running_loop().call_later(0.1, state.update, {"bound": True})
+
+    async def _boot_sequence() -> None:
+        with boot_step("skill_handlers"):
+            await asyncio.sleep(0.02)
+        with boot_step("scheduler"):
+            pass
+
+    async def _flow() -> dict:
+        graph = BootGraph(
+            [
+                BootTask("sidecar", _start_sidecar, gate=lambda: state["bound"]),
+                BootTask("boot_sequence", _boot_sequence, deps=("sidecar",)),
+            ],
+            gate_poll_s=0.01,
+        )
+        return await graph.run()
+
+    timeline = asyncio.run(_flow())
+    tasks = {task["name"]: task for task in timeline["tasks"]}
+    assert tasks["sidecar"]["gate_ms"] >= 90
+    assert tasks["boot_sequence"]["start_ms"] >= tasks["sidecar"]["ready_ms"]
+    assert [step["name"] for step in tasks["boot_sequence"]["steps"]] == ["skill_handlers", "scheduler"]
+    assert tasks["boot_sequence"]["steps"][0]["duration_ms"] >= 15
+
+    node_cli = importlib.import_module("adaos.apps.cli.commands.node")
+    monkeypatch.setattr(node_cli, "load_config", lambda: SimpleNamespace(token="dev-token", role="hub", hub_url=None))
+    monkeypatch.setattr(
+        node_cli, "_control_get_json", lambda **kwargs: (200, {"ok": True, "ready": True, "timeline": timeline})
+    )
+    result = CliRunner().invoke(node_cli.app, ["boot-timeline"])
+
+    assert result.exit_code == 0
+    assert "boot: state=complete ready=True" in result.output
+    assert "critical_path: sidecar -> boot_sequence" in result.output
+    assert "- skill_handlers:" in result.output
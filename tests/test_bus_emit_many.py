@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+
+from adaos.sdk.data import bus
+from adaos.services.agent_context import get_ctx
+from adaos.services.eventbus import LocalEventBus
+
+
+def _use_bus(monkeypatch, target) -> None:
+    monkeypatch.setattr(get_ctx(), "bus", target, raising=False)
+
+
+def test_publish_adapter_is_built_once_per_bus(monkeypatch) -> None:
+    local = LocalEventBus()
+    _use_bus(monkeypatch, local)
+    seen: list[dict] = []
+    builds: list[object] = []
+    real_build = bus._build_publisher
+    monkeypatch.setattr(bus, "_build_publisher", lambda publish, b=None: builds.append(b) or real_build(publish, b))
+
+    async def _flow() -> None:
+        await bus.on("unit.adapter", lambda payload: seen.append(payload))
+        for i in range(20):
+            await bus.emit("unit.adapter", {"i": i}, source="test", trace="x")
+        await local.wait_for_idle()
+
+    asyncio.run(_flow())
+    assert [p["i"] for p in seen] == list(range(20))
+    assert seen[0]["_meta"] == {"trace": "x"}
+    assert builds == [local]
+
+    # A different bus object gets its own adapter.
+    other = LocalEventBus()
+    _use_bus(monkeypatch, other)
+    asyncio.run(bus.emit("unit.adapter", {"i": -1}))
+    assert builds == [local, other]
+
+
+def test_emit_many_uses_publish_many_in_order(monkeypatch) -> None:
+    local = LocalEventBus()
+    _use_bus(monkeypatch, local)
+    batches: list[int] = []
+    real_many = local.publish_many
+    monkeypatch.setattr(local, "publish_many", lambda events: (batches.append(len(events)), real_many(events))[1])
+    seen: list[tuple[str, int]] = []
+
+    async def _handler(payload: dict) -> None:
+        seen.append((payload["_meta"]["batch"], payload["n"]))
+
+    async def _flow() -> list:
+        await bus.on("unit.many", _handler)
+        res = await bus.emit_many([("unit.many.a", {"n": 1}), ("unit.many.b", {"n": 2}), ("unit.many.a", {"n": 3})], source="t", batch="b1")
+        await local.wait_for_idle()
+        return res
+
+    assert asyncio.run(_flow()) == [None, None, None]
+    assert batches == [3]
+    assert seen == [("b1", 1), ("b1", 2), ("b1", 3)]
+
+
+def test_emit_many_falls_back_to_topic_payload_publish(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    class _TopicBus:
+        async def publish(self, topic, payload, source=None, ts=None):
+            calls.append((topic, payload["v"], source))
+            return len(calls)
+
+        def subscribe(self, topic, handler, options=None):
+            calls.append(("sub", topic))
+
+    _use_bus(monkeypatch, _TopicBus())
+    assert asyncio.run(bus.emit_many([("x", {"v": 1}), ("y", {"v": 2})], source="s")) == [1, 2]
+    assert asyncio.run(bus.emit_many([])) == []
+    asyncio.run(bus.on("z", lambda payload: None))
+    assert calls == [("x", 1, "s"), ("y", 2, "s"), ("sub", "z")]
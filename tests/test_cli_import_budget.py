@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Cold-start budget for ``import adaos.apps.cli.app`` (cumulative, microseconds
+# as reported by ``-X importtime``). Generous on purpose: the eager import graph
+# was >1s, lazy registration keeps it around 0.2s on a dev machine.
+_BUDGET_US = int(os.getenv("ADAOS_CLI_IMPORT_BUDGET_MS", "800")) * 1000
+
+# Modules that must only be imported by the commands that use them.
+_HEAVY = (
+    "fastapi",
+    "adaos.apps.cli.commands.skill",
+    "adaos.services.skill.manager",
+    "adaos.services.root.service",
+    "adaos.adapters.db",
+    "adaos.adapters.skills.git_repo",
+    "adaos.services.sandbox.runner",
+)
+
+
+def _run(code: str, tmp_path: Path) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ADAOS_TESTING": "1",
+            "ADAOS_BASE_DIR": str(tmp_path / "base"),
+            "ADAOS_DISABLE_PREFERRED_PYTHON_REEXEC": "1",
+        }
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+
+
+def _imported(stderr: str) -> dict[str, int]:
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        try:
+            modules[parts[2].strip()] = int(parts[1].strip())
+        except (IndexError, ValueError):
+            continue
+    return modules
+
+
+def test_cli_app_import_stays_lazy_and_within_budget(tmp_path) -> None:
+    proc = _run("import adaos.apps.cli.app", tmp_path)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules = _imported(proc.stderr)
+    assert "adaos.apps.cli.app" in modules
+    assert [name for name in _HEAVY if name in modules] == []
+    assert modules["adaos.apps.cli.app"] < _BUDGET_US, f"cold import took {modules['adaos.apps.cli.app'] / 1000:.0f}ms"
+
+
+def test_help_and_light_commands_do_not_import_command_modules(tmp_path) -> None:
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from adaos.apps.cli.app import app\n"
+        "runner = CliRunner()\n"
+        "assert runner.invoke(app, ['--help']).exit_code == 0\n"
+        "assert runner.invoke(app, ['where']).exit_code == 0\n"
+        "from adaos.services.agent_context import get_ctx\n"
+        "ctx = get_ctx()\n"
+        "assert not ctx.sql.resolved and not ctx.secrets.resolved and not ctx.sandbox.resolved\n"
+        "assert not [m for m in sys.modules if m.startswith('adaos.apps.cli.commands.')]\n"
+    )
+    proc = _run(code, tmp_path)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules = _imported(proc.stderr)
+    assert [name for name in _HEAVY if name in modules] == []
+    assert not any(name.startswith("adaos.apps.cli.commands.") for name in modules)
+
+
+def test_lazy_command_imports_only_its_module(tmp_path) -> None:
+    # CliRunner swaps sys.stderr, which hides -X importtime output, so check sys.modules.
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from adaos.apps.cli.app import app\n"
+        "result = CliRunner().invoke(app, ['sandbox', '--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "assert 'sandbox' in result.output\n"
+        "print(','.join(sorted(m for m in sys.modules if m.startswith('adaos.apps.cli.commands.'))))\n"
+    )
+    proc = _run(code, tmp_path)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1] == "adaos.apps.cli.commands.sandbox"
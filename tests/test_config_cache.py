@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import yaml
+
+from adaos.services.capacity import get_local_capacity, install_skill_in_capacity
+from adaos.services import node_config
+from adaos.services.config_cache import ConfigCache, config_cache
+from adaos.services.node_config import load_config, node_base_dir, save_config
+
+
+def test_steady_state_reads_do_not_parse_yaml() -> None:
+    conf = load_config()
+    cache = config_cache()
+    parses = cache.stats["parses"]
+
+    for _ in range(50):
+        again = load_config()
+        get_local_capacity()
+    assert again.node_id == conf.node_id
+    assert cache.stats["parses"] == parses
+
+    # Callers get private copies.
+    again.node_settings.node_names = ["mutated"]
+    assert load_config().node_settings.node_names != ["mutated"]
+
+    # Writes go through the cache: the next reads see them without parsing.
+    install_skill_in_capacity("weather", "1.2.0")
+    assert {"name": "weather", "version": "1.2.0", "active": True, "dev": False} in get_local_capacity()["skills"]
+    conf = load_config()
+    conf.role = "member"
+    save_config(conf)
+    assert load_config().role == "member"
+    assert "weather" in (node_base_dir() / "node.yaml").read_text(encoding="utf-8")  # capacity section preserved
+    assert cache.stats["parses"] == parses
+    assert cache.stats["writes"] >= 2
+
+
+def test_key_material_migration_runs_at_load_not_in_the_cached_builder(monkeypatch) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(node_config, "_migrate_managed_key_material", lambda conf: calls.append(conf.node_id) or False)
+    monkeypatch.setattr(node_config, "_KEYS_MIGRATED", None)
+
+    node_config._node_from_data({"node_id": "n-1"})
+    assert calls == []
+
+    conf = load_config()
+    for _ in range(5):
+        load_config()
+    assert calls == [conf.node_id]
+
+    conf.role = "member"
+    save_config(conf)
+    load_config()
+    assert calls == [conf.node_id, conf.node_id]
+
+
+def test_external_edits_are_detected_even_within_one_timestamp_tick(tmp_path) -> None:
+    cache = ConfigCache(use_inotify=False)
+    path = tmp_path / "node.yaml"
+    path.write_text("role: hub\n", encoding="utf-8")
+    assert cache.load_yaml(path) == {"role": "hub"}
+    path.write_text("role: abc\n", encoding="utf-8")  # same size, likely same mtime tick
+    assert cache.load_yaml(path) == {"role": "abc"}
+    assert cache.load_yaml(path) == {"role": "abc"}
+    assert cache.stats["parses"] == 2
+
+    path.write_text(": not yaml : [\n", encoding="utf-8")
+    assert cache.load_yaml(path, default={}) == {}
+    try:
+        cache.derive(path, "x", lambda data: data)
+    except yaml.YAMLError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("derive must surface parse errors")
+    path.unlink()
+    assert cache.load_yaml(path, default={"missing": True}) == {"missing": True}
+
+    if os.name == "posix":
+        path.write_text("role: hub\n", encoding="utf-8")
+        os.chmod(path, 0o600)
+        cache.write_yaml(path, {"role": "member"})
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert cache.load_yaml(path) == {"role": "member"}
+
+
+def _wait(event: threading.Event, timeout: float = 3.0) -> bool:
+    return event.wait(timeout)
+
+
+def test_subscribers_are_notified_by_polling_and_inotify(tmp_path) -> None:
+    for use_inotify in (False, True):
+        cache = ConfigCache(use_inotify=use_inotify, poll_interval=0.05)
+        path = tmp_path / f"cfg_{use_inotify}.yaml"
+        path.write_text("a: 1\n", encoding="utf-8")
+        assert cache.derive(path, "a", lambda data: data["a"]) == 1
+        seen = []
+        fired = threading.Event()
+        unsubscribe = cache.subscribe(path, lambda p: (seen.append(p), fired.set()))
+
+        # external edit
+        time.sleep(0.01)
+        path.write_text("a: 22\n", encoding="utf-8")
+        assert _wait(fired)
+        assert cache.derive(path, "a", lambda data: data["a"]) == 22
+
+        # in-process write-through notifies too
+        fired.clear()
+        cache.write_yaml(path, {"a": 3})
+        assert _wait(fired)
+        assert cache.derive(path, "a", lambda data: data["a"]) == 3
+        unsubscribe()
+        if use_inotify and cache.snapshot()["backend"] == "inotify":
+            # With inotify, old files are served without even a stat() call.
+            old = tmp_path / "old.yaml"
+            old.write_text("b: 1\n", encoding="utf-8")
+            os.utime(old, (time.time() - 60, time.time() - 60))
+            cache.load_yaml(old)
+            cache.load_yaml(old)
+            checks = cache.stats["stat_checks"]
+            for _ in range(10):
+                assert cache.load_yaml(old) == {"b": 1}
+            assert cache.stats["stat_checks"] == checks
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from adaos.services.interpreter.parse_worker import RasaParseWorker
+
+
+_FAKE_RASA_MODEL = '''
+import os
+
+LOADS = 0
+
+
+class Interpreter:
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    @classmethod
+    def load(cls, model_path):
+        global LOADS
+        LOADS += 1
+        return cls(model_path)
+
+    def parse(self, text):
+        if text == "boom":
+            raise ValueError("bad text")
+        return {"text": text, "intent": {"name": "stub", "confidence": 1.0}, "loads": LOADS, "pid": os.getpid()}
+'''
+
+
+@pytest.fixture
+def fake_rasa(tmp_path: Path, monkeypatch) -> Path:
+    pkg = tmp_path / "fake_site" / "rasa" / "nlu"
+    pkg.mkdir(parents=True)
+    (pkg.parent / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "model.py").write_text(_FAKE_RASA_MODEL, encoding="utf-8")
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "fake_site"))
+    model = tmp_path / "interpreter_latest.tar.gz"
+    model.write_bytes(b"model-v1")
+    return model
+
+
+def test_worker_loads_model_once_and_reloads_on_change(fake_rasa: Path) -> None:
+    worker = RasaParseWorker()
+    try:
+        first = worker.parse(fake_rasa, "hello")
+        second = worker.parse(fake_rasa, "again")
+        assert first["intent"]["name"] == "stub"
+        assert first["loads"] == second["loads"] == 1
+        assert first["pid"] == second["pid"] == worker.ping()["pid"]
+
+        stat = fake_rasa.stat()
+        os.utime(fake_rasa, (stat.st_atime, stat.st_mtime + 10))
+        third = worker.parse(fake_rasa, "retrained")
+        assert third["loads"] == 2
+        assert third["pid"] == first["pid"]
+
+        batch = worker.parse_many(fake_rasa, ["a", "b", "c"])
+        assert [item["text"] for item in batch] == ["a", "b", "c"]
+        snap = worker.snapshot()
+        assert snap["alive"] is True
+        assert snap["started_total"] == 1
+        assert snap["max_batch"] == 3
+        assert snap["health"]["parses"] == 6
+    finally:
+        worker.close()
+    assert worker.snapshot()["alive"] is False
+
+
+def test_worker_batches_concurrent_callers_and_restarts_after_crash(fake_rasa: Path) -> None:
+    worker = RasaParseWorker()
+    try:
+        worker.ping()
+        results: dict[int, dict] = {}
+
+        def _call(idx: int) -> None:
+            results[idx] = worker.parse(fake_rasa, f"t{idx}")
+
+        with worker._io_lock:
+            threads = [threading.Thread(target=_call, args=(idx,)) for idx in range(6)]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 2.0
+            while len(worker._pending) < 6 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        for thread in threads:
+            thread.join(timeout=30)
+        assert {idx: item["text"] for idx, item in results.items()} == {idx: f"t{idx}" for idx in range(6)}
+        assert worker.snapshot()["batches_total"] == 1
+
+        with pytest.raises(RuntimeError, match="bad text"):
+            worker.parse(fake_rasa, "boom")
+
+        worker._proc.kill()
+        worker._proc.wait(timeout=5)
+        assert worker.parse(fake_rasa, "back")["text"] == "back"
+        assert worker.snapshot()["restarts_total"] == 1
+    finally:
+        worker.close()
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import socket
+import sys
+import textwrap
+import time
+
+from adaos.launcher.sentinel import SentinelConfig, SentinelGateway
+
+_STUB_CORE = textwrap.dedent(
+    """
+    import http.server, sys, time
+
+    port, delay, log = int(sys.argv[1]), float(sys.argv[2]), sys.argv[3]
+    with open(log, "a") as fh:
+        fh.write("start\\n")
+    time.sleep(delay)
+
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/ws":
+                self.send_response(101)
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.end_headers()
+                self.wfile.flush()
+                while True:
+                    data = self.connection.recv(4096)
+                    if not data:
+                        break
+                    self.connection.sendall(data.upper())
+                self.close_connection = True
+            elif self.path.startswith("/stream"):
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i in range(200):
+                    part = b"line %d\\n" % i
+                    self.wfile.write(b"%x\\r\\n%s\\r\\n" % (len(part), part))
+                self.wfile.write(b"0\\r\\n\\r\\n")
+            else:
+                self._send(("%s %s" % (self.path, self.headers.get("X-AdaOS-Token"))).encode())
+
+        def do_POST(self):
+            total = 0
+            if "chunked" in (self.headers.get("Transfer-Encoding") or ""):
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        break
+                    total += len(self.rfile.read(size))
+                    self.rfile.readline()
+            else:
+                total = len(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            self._send(b"received %d" % total)
+
+
+    http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+    """
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _config(tmp_path, **overrides) -> SentinelConfig:
+    script = tmp_path / "core.py"
+    script.write_text(_STUB_CORE, encoding="utf-8")
+    port = _free_port()
+    base = dict(
+        cmd=f"{sys.executable} {script} {port} 0.5 {tmp_path / 'core.log'}",
+        target_port=port,
+        listen_port=0,
+        token="tok",
+        boot_timeout_s=15.0,
+    )
+    base.update(overrides)
+    return SentinelConfig(**base)
+
+
+def _get(port: int, path: str, *, token: str | None = "tok", conn: http.client.HTTPConnection | None = None):
+    own = conn is None
+    conn = conn or http.client.HTTPConnection("127.0.0.1", port, timeout=20)
+    try:
+        conn.request("GET", path, headers={"X-AdaOS-Token": token} if token else {})
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        if own:
+            conn.close()
+
+
+def test_cold_boot_releases_queued_concurrent_requests_and_reuses_upstream(tmp_path) -> None:
+    config = _config(tmp_path)
+
+    async def _flow() -> None:
+        gateway = SentinelGateway(config)
+        await gateway.start()
+        try:
+            port = gateway.port
+            assert await asyncio.to_thread(_get, port, "/ready") == (503, b'{"ok":false}')
+            assert (await asyncio.to_thread(_get, port, "/x", token="bad"))[0] == 401
+
+            results = await asyncio.gather(*(asyncio.to_thread(_get, port, f"/hello/{i}") for i in range(10)))
+            assert results == [(200, b"/hello/%d tok" % i) for i in range(10)]
+            assert gateway.stats["boots"] == 1
+            assert gateway.stats["queued_during_boot"] >= 1
+
+            def _sequential() -> list:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=20)
+                try:
+                    return [_get(port, f"/seq/{i}", conn=conn) for i in range(20)]
+                finally:
+                    conn.close()
+
+            opened = gateway.stats["upstream_opened"]
+            assert all(status == 200 for status, _ in await asyncio.to_thread(_sequential))
+            assert gateway.stats["upstream_opened"] <= opened + 1
+            assert gateway.stats["upstream_reused"] >= 19
+            assert await asyncio.to_thread(_get, port, "/ready") == (200, b'{"ok":true}')
+        finally:
+            await gateway.close()
+
+    asyncio.run(_flow())
+    assert (tmp_path / "core.log").read_text().count("start") == 1
+
+
+def test_streams_chunked_bodies_and_passes_websocket_upgrades(tmp_path) -> None:
+    config = _config(tmp_path)
+
+    async def _flow() -> None:
+        gateway = SentinelGateway(config)
+        await gateway.start()
+        try:
+            port = gateway.port
+
+            def _upload() -> tuple[int, bytes]:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=20)
+                try:
+                    body = (b"x" * 65536 for _ in range(16))
+                    conn.request("POST", "/upload", body=body, headers={"X-AdaOS-Token": "tok"}, encode_chunked=True)
+                    resp = conn.getresponse()
+                    return resp.status, resp.read()
+                finally:
+                    conn.close()
+
+            assert await asyncio.to_thread(_upload) == (200, b"received %d" % (16 * 65536))
+            status, body = await asyncio.to_thread(_get, port, "/stream")
+            assert status == 200 and body.count(b"\n") == 200 and body.endswith(b"line 199\n")
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                b"GET /ws HTTP/1.1\r\nHost: core\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                b"X-AdaOS-Token: tok\r\n\r\n"
+            )
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            assert head.startswith(b"HTTP/1.0 101") or head.startswith(b"HTTP/1.1 101")
+            writer.write(b"hello")
+            assert await asyncio.wait_for(reader.readexactly(5), 10) == b"HELLO"
+            writer.close()
+            assert gateway.stats["upgrades"] == 1
+        finally:
+            await gateway.close()
+
+    asyncio.run(_flow())
+
+
+def test_idle_core_is_stopped_and_lazily_booted_again(tmp_path) -> None:
+    config = _config(tmp_path, idle_timeout_s=0.4, health_interval_s=0.1)
+
+    async def _flow() -> None:
+        gateway = SentinelGateway(config)
+        await gateway.start()
+        try:
+            port = gateway.port
+            assert (await asyncio.to_thread(_get, port, "/a"))[0] == 200
+            proc = gateway.core.proc
+            assert proc is not None and proc.poll() is None
+            deadline = time.monotonic() + 10
+            while gateway.stats["idle_shutdowns"] == 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            assert gateway.stats["idle_shutdowns"] == 1
+            assert proc.poll() is not None and gateway.core.proc is None
+            assert (await asyncio.to_thread(_get, port, "/ready"))[0] == 503
+
+            assert await asyncio.to_thread(_get, port, "/b") == (200, b"/b tok")
+            assert gateway.stats["boots"] == 2
+        finally:
+            await gateway.close()
+
+    asyncio.run(_flow())
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from adaos.services.nlu import llm_teacher_runtime as rt
+from adaos.services.nlu.llm_teacher_gateway import TeacherGateway, TeacherResponseCache, normalize_utterance
+
+
+class _FakeLlmEndpoint:
+    """Stands in for root /v1/llm/response: answers single and batch teacher prompts."""
+
+    def __init__(self, *, latency_s: float = 0.05, break_batches: bool = False) -> None:
+        self.latency_s = latency_s
+        self.break_batches = break_batches
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _answer(text: str) -> dict:
+        return {"decision": "revise_nlu", "intent": "intent." + normalize_utterance(text).split(" ")[0], "confidence": 0.9}
+
+    def request(self, method, path, **kwargs):
+        assert (method, path) == ("POST", "/v1/llm/response")
+        body = kwargs["json"]
+        time.sleep(self.latency_s)
+        user = json.loads(body["messages"][-1]["content"])
+        with self._lock:
+            self.calls.append({"request_id": body.get("request_id"), "user": user})
+        if "requests" in user:
+            if self.break_batches:
+                text = "sorry, one at a time"
+            else:
+                results = [dict(self._answer(r["text"]), index=r["index"]) for r in user["requests"]]
+                text = json.dumps({"results": list(reversed(results))})
+        else:
+            text = json.dumps(self._answer(user["request"]["text"]))
+        return {"output": [{"content": [{"type": "output_text", "text": text}]}]}
+
+
+def _gateway(monkeypatch, endpoint: _FakeLlmEndpoint, cache: TeacherResponseCache, **kw) -> TeacherGateway:
+    monkeypatch.setattr(rt.RootHttpClient, "from_settings", classmethod(lambda cls, settings: endpoint))
+    return TeacherGateway(
+        call=lambda messages, request_id: rt._llm_call(messages, request_id=request_id),
+        build_single=rt._build_prompt,
+        build_batch=rt._build_batch_prompt,
+        extract_text=rt._extract_first_output_text,
+        cache=cache,
+        **kw,
+    )
+
+
+def test_burst_is_coalesced_batched_and_cached(monkeypatch, tmp_path: Path) -> None:
+    endpoint = _FakeLlmEndpoint()
+    cache_path = tmp_path / "llm_teacher_cache.json"
+    gateway = _gateway(monkeypatch, endpoint, TeacherResponseCache(cache_path), concurrency=1, batch_max=8)
+    context = {"current_scenario": "web_desktop"}
+    texts = ["Погода в Берлине", "погода  в берлине!", " ПОГОДА в Берлине ", "погода в берлине?"]
+    texts += [f"open app{i}" for i in range(8)]
+
+    async def _burst() -> list:
+        out = await asyncio.gather(
+            *(
+                gateway.suggest(
+                    request={"text": t, "request_id": f"nlu.{i}"}, webspace_id="ws", context=context, fingerprint="fp"
+                )
+                for i, t in enumerate(texts)
+            )
+        )
+        await gateway.flush()
+        return out
+
+    results = asyncio.run(_burst())
+
+    for text, (raw, _source) in zip(texts, results):
+        assert json.loads(raw)["intent"] == "intent." + normalize_utterance(text).split(" ")[0]
+    assert [src for _, src in results].count("shared") == 3
+    # 12 utterances, 9 distinct: one batch of 8 plus the one left over.
+    assert len(endpoint.calls) == 2 and gateway.stats["batch_calls"] == 1
+    assert gateway.stats["batched_items"] == 8
+    assert sum(call["request_id"].startswith("batch.") for call in endpoint.calls) == 1
+
+    # Responses survive a restart: a new gateway over the same file makes no calls.
+    cold = _gateway(monkeypatch, endpoint, TeacherResponseCache(cache_path))
+    raw, source = asyncio.run(
+        cold.suggest(request={"text": "OPEN app3", "request_id": "nlu.x"}, webspace_id="ws", context=context, fingerprint="fp")
+    )
+    assert source == "cache" and json.loads(raw)["intent"] == "intent.open"
+    assert len(endpoint.calls) == 2
+    # A different context fingerprint is a different key.
+    raw, source = asyncio.run(
+        cold.suggest(request={"text": "open app3", "request_id": "nlu.y"}, webspace_id="ws", context=context, fingerprint="fp2")
+    )
+    assert source == "llm" and len(endpoint.calls) == 3
+
+
+def test_unmatched_batch_answer_falls_back_to_single_calls_and_errors_are_not_cached(monkeypatch) -> None:
+    endpoint = _FakeLlmEndpoint(break_batches=True)
+    gateway = _gateway(monkeypatch, endpoint, TeacherResponseCache(None), concurrency=1, batch_max=4)
+
+    async def _burst() -> list:
+        return await asyncio.gather(
+            *(
+                gateway.suggest(request={"text": f"turn on lamp{i}", "request_id": f"r{i}"}, webspace_id="ws", context={}, fingerprint="fp")
+                for i in range(4)
+            )
+        )
+
+    results = asyncio.run(_burst())
+    assert all(json.loads(raw)["intent"] == "intent.turn" for raw, _ in results)
+    assert gateway.stats["batch_fallbacks"] == 1
+    assert len(endpoint.calls) == 1 + 4  # broken batch, then one call per utterance
+    assert len(gateway.cache) == 4
+
+    class _Down:
+        def request(self, *args, **kwargs):
+            raise RuntimeError("root unavailable")
+
+    failing = _gateway(monkeypatch, _Down(), TeacherResponseCache(None))  # type: ignore[arg-type]
+
+    async def _twice() -> list:
+        return await asyncio.gather(
+            *(failing.suggest(request={"text": "hi", "request_id": "r"}, webspace_id="ws", context={}, fingerprint="fp") for _ in range(2)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(_twice())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert failing.stats["llm_calls"] == 1 and len(failing.cache) == 0
+
+
+def test_teacher_context_is_memoized_until_skill_or_scenario_changes(monkeypatch) -> None:
+    from adaos.services.agent_context import get_ctx
+    from adaos.services.yjs.doc import async_get_ydoc
+
+    ctx = get_ctx()
+    webspace_id = "ws-teacher-memo"
+    skill_yaml = Path(ctx.paths.skills_dir()) / "weather_skill" / "skill.yaml"
+    skill_yaml.parent.mkdir(parents=True, exist_ok=True)
+    skill_yaml.write_text("name: weather_skill\nllm_policy: {autoapply_nlu_teacher: false}\n", encoding="utf-8")
+
+    builds: list[int] = []
+    real_compute = rt._compute_teacher_context
+
+    def _counting(snapshot):
+        builds.append(1)
+        return real_compute(snapshot)
+
+    monkeypatch.setattr(rt, "_compute_teacher_context", _counting)
+    rt.invalidate_teacher_context()
+
+    async def _flow() -> list:
+        async with async_get_ydoc(webspace_id) as ydoc:
+            data_map = ydoc.get_map("data")
+            with ydoc.begin_transaction() as txn:
+                data_map.set(txn, "catalog", {"apps": [{"id": "weather", "origin": "skill:weather_skill"}], "widgets": []})
+        first = await rt._build_teacher_context(webspace_id)
+        second = await rt._build_teacher_context(webspace_id)
+        assert second[2] == first[2] and len(builds) == 1
+        assert first[0]["skills"] == ["weather_skill"]
+        assert first[1] == {}  # no scenario intents -> no policies derived
+
+        stat = skill_yaml.stat()
+        os.utime(skill_yaml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        await rt._build_teacher_context(webspace_id)
+        assert len(builds) == 2
+
+        await rt._on_teacher_context_changed({"skill": "weather_skill"})
+        await rt._build_teacher_context(webspace_id)
+        assert len(builds) == 3
+
+        async with async_get_ydoc(webspace_id) as ydoc:
+            ui_map = ydoc.get_map("ui")
+            with ydoc.begin_transaction() as txn:
+                ui_map.set(txn, "current_scenario", "other_scenario")
+        changed = await rt._build_teacher_context(webspace_id)
+        assert len(builds) == 4 and changed[2] != first[2]
+        return builds
+
+    asyncio.run(_flow())
+    rt.invalidate_teacher_context()
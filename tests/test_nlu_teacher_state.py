@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import y_py as Y
+
+from adaos.services.nlu import teacher_state as ts
+from adaos.services.nlu.teacher_store import load_teacher_state, teacher_journal_path, teacher_state_path
+
+
+def _capture_updates(monkeypatch) -> list[int]:
+    import adaos.services.yjs.doc as ydoc_mod
+
+    sizes: list[int] = []
+    monkeypatch.setattr(ydoc_mod, "_schedule_room_update", lambda webspace_id, update: sizes.append(len(update or b"")))
+    return sizes
+
+
+def _event(i: int, rid: str) -> dict:
+    return {"id": f"evt.{i}", "ts": float(i), "request_id": rid, "request_text": f"text {rid}", "kind": "request", "title": "NLU"}
+
+
+def test_record_ops_keep_updates_small_and_views_per_request(monkeypatch) -> None:
+    webspace_id = "ws-teacher-state-ops"
+    sizes = _capture_updates(monkeypatch)
+
+    async def _flow() -> dict:
+        for i in range(300):
+            await ts.append_record(webspace_id, "events", _event(i, f"nlu.{i // 3}"))
+        await ts.append_record(
+            webspace_id,
+            "revisions",
+            {"id": "rev.1", "ts": 1.0, "request_id": "nlu.7", "status": "pending", "text": "text nlu.7"},
+        )
+        async with ts.open_teacher(webspace_id) as teacher:
+            updated = teacher.patch_request(
+                "revisions", "nlu.7", {"status": "applied"}, where=lambda r: r.get("status") == "pending"
+            )
+            assert updated is not None and updated["status"] == "applied"
+            assert teacher.patch_request("revisions", "nlu.7", {"status": "x"}, where=lambda r: r.get("status") == "pending") is None
+        return await ts.read_teacher(webspace_id)
+
+    teacher = asyncio.run(_flow())
+
+    assert [e["id"] for e in teacher["events"]][-1] == "evt.299"
+    assert len(teacher["events"]) == 300
+    threads = {row["request_id"]: row for row in teacher["threads_by_request"]}
+    assert len(threads) == 100
+    assert threads["nlu.7"]["subtitle"] == "revisions=1" and "applied" in threads["nlu.7"]["details"]
+    assert threads["nlu.8"]["subtitle"] == "" and threads["nlu.8"]["title"] == "text nlu.8"
+    # Updates carry the touched records, not the history (the only part that
+    # grows is the Yjs delete set, a few bytes per earlier writer).
+    whole = len(json.dumps(teacher, ensure_ascii=False).encode("utf-8"))
+    assert max(sizes[:300]) * 10 < whole
+
+
+def test_legacy_plain_value_is_migrated_and_trimmed(monkeypatch) -> None:
+    from adaos.services.yjs.doc import async_get_ydoc
+
+    monkeypatch.setitem(ts.COLLECTION_LIMITS, "candidates", 5)
+    ts.forget_mirror()
+    webspace_id = "ws-teacher-state-legacy"
+    legacy = [{"id": f"cand.{i}", "ts": float(i), "request_id": f"nlu.{i}", "text": "hi", "status": "pending"} for i in range(5)]
+
+    async def _flow() -> tuple:
+        async with async_get_ydoc(webspace_id) as ydoc:
+            with ydoc.begin_transaction() as txn:
+                ydoc.get_map("data").set(txn, "nlu_teacher", {"candidates": legacy, "enabled": True})
+        await ts.append_record(webspace_id, "candidates", {"id": "cand.new", "ts": 9.0, "request_id": "nlu.9", "text": "hi"})
+        await ts.patch_record(webspace_id, "candidates", "cand.3", {"status": "applied"})
+        async with async_get_ydoc(webspace_id) as ydoc:
+            raw = ydoc.get_map("data").get("nlu_teacher")
+            is_map = isinstance(raw, Y.YMap)
+        return is_map, await ts.read_teacher(webspace_id)
+
+    is_map, teacher = asyncio.run(_flow())
+    assert is_map
+    assert [c["id"] for c in teacher["candidates"]] == ["cand.1", "cand.2", "cand.3", "cand.4", "cand.new"]
+    assert teacher["candidates"][2]["status"] == "applied"
+    assert teacher["enabled"] is True and "_rev" not in teacher
+    assert {row["candidate_id"] for row in teacher["threads_by_candidate"]} >= {"cand.new", "cand.3"}
+
+
+def test_journal_replays_and_compacts(monkeypatch) -> None:
+    monkeypatch.setattr(ts, "_JOURNAL_COMPACT_OPS", 6)
+    webspace_id = "ws-teacher-state-journal"
+    journal = teacher_journal_path(webspace_id)
+
+    async def _append(i: int) -> None:
+        await ts.append_record(webspace_id, "llm_logs", {"id": f"llm.{i}", "ts": float(i), "request_id": "nlu.1", "status": "pending"})
+
+    async def _flow() -> None:
+        for i in range(4):
+            await _append(i)
+        await ts.patch_record(webspace_id, "llm_logs", "llm.2", {"status": "ok"})
+
+    asyncio.run(_flow())
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5 and json.loads(lines[-1]) == {"op": "patch", "c": "llm_logs", "id": "llm.2", "p": {"status": "ok"}}
+    restored = load_teacher_state(webspace_id=webspace_id)
+    assert [x["status"] for x in restored["llm_logs"]] == ["pending", "pending", "ok", "pending"]
+
+    # The sixth op reaches the threshold: snapshot written, journal truncated.
+    asyncio.run(_append(4))
+    assert not journal.exists()
+    snapshot = json.loads(teacher_state_path(webspace_id).read_text(encoding="utf-8"))
+    assert [x["id"] for x in snapshot["llm_logs"]] == [f"llm.{i}" for i in range(5)]
+    assert "threads_by_request" not in snapshot
+    assert load_teacher_state(webspace_id=webspace_id)["llm_logs"][2]["status"] == "ok"
+
+
+def test_journal_io_runs_off_the_event_loop(monkeypatch) -> None:
+    monkeypatch.setattr(ts, "_JOURNAL_COMPACT_OPS", 3)
+    webspace_id = "ws-teacher-state-threads"
+    threads: list[tuple[str, int]] = []
+    real_append, real_save = ts.append_teacher_journal, ts.save_teacher_state
+
+    def _append(**kw):
+        threads.append(("append", threading.get_ident()))
+        return real_append(**kw)
+
+    def _save(**kw):
+        threads.append(("save", threading.get_ident()))
+        return real_save(**kw)
+
+    monkeypatch.setattr(ts, "append_teacher_journal", _append)
+    monkeypatch.setattr(ts, "save_teacher_state", _save)
+
+    async def _flow() -> int:
+        for i in range(3):
+            await ts.append_record(webspace_id, "events", _event(i, "nlu.1"))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(_flow())
+    assert [kind for kind, _ in threads] == ["append", "append", "append", "save"]
+    assert all(ident != loop_thread for _, ident in threads)
+    assert [x["id"] for x in load_teacher_state(webspace_id=webspace_id)["events"]] == ["evt.0", "evt.1", "evt.2"]
+
+
+def test_trimming_is_batched_and_compaction_rewrites_the_structure(monkeypatch) -> None:
+    monkeypatch.setitem(ts.COLLECTION_LIMITS, "events", 16)
+    monkeypatch.setattr(ts, "_JOURNAL_COMPACT_OPS", 20)
+    ts.forget_mirror()
+    webspace_id = "ws-teacher-state-compact"
+    compacted: list[str] = []
+    real_compact = ts._compact_doc
+
+    def _spy(ws: str, ydoc) -> None:
+        compacted.append(ws)
+        real_compact(ws, ydoc)
+
+    monkeypatch.setattr(ts, "_compact_doc", _spy)
+
+    async def _flow() -> tuple:
+        lengths = []
+        for i in range(19):
+            await ts.append_record(webspace_id, "events", _event(i, f"nlu.{i}"))
+            lengths.append(len((await ts.read_teacher(webspace_id))["events"]))
+        # The 20th op compacts the journal and rewrites the Y structure.
+        await ts.patch_record(webspace_id, "events", "evt.18", {"title": "patched"})
+        await ts.append_record(webspace_id, "events", _event(19, "nlu.19"))
+        return lengths, await ts.read_teacher(webspace_id)
+
+    lengths, teacher = asyncio.run(_flow())
+    # Up to limit // 8 extra records, then one trim back to the limit.
+    assert lengths[15:] == [16, 17, 18, 16]
+    assert compacted == [webspace_id]
+    assert len(teacher_journal_path(webspace_id).read_text(encoding="utf-8").splitlines()) == 1
+    # The session after the rewrite still finds its records by position.
+    assert [e["id"] for e in teacher["events"]] == [f"evt.{i}" for i in range(3, 20)]
+    assert teacher["events"][-2]["title"] == "patched"
+    assert {row["request_id"] for row in teacher["threads_by_request"]} >= {"nlu.18", "nlu.19"}
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from adaos.services.nlu import trace_store
+from adaos.services.nlu.trace_store import TraceStore
+
+
+def _item(i: int, kind: str = "nlp.intent.detected", rid: str | None = None) -> dict:
+    return {"ts": 1000.0 + i, "type": kind, "text": f"utterance {i}", "request_id": rid or f"nlu.{i}"}
+
+
+def test_ring_retention_sampling_and_pages() -> None:
+    store = TraceStore(max_items=50, sample=1.0)
+    for i in range(120):
+        store.append("ws", _item(i, "nlp.intent.detect.request" if i % 2 else "nlp.intent.detected"))
+
+    first = store.query("ws", limit=20)
+    assert [x["seq"] for x in first["items"]] == list(range(120, 100, -1))
+    assert first["next_before"] == 101 and first["last_seq"] == 120
+    second = store.query("ws", before=first["next_before"], limit=20, types=["nlp.intent.detected"])
+    assert [x["seq"] for x in second["items"]] == list(range(99, 70, -2))
+    assert second["next_before"] is None  # the ring only holds the last 50
+    assert store.query("other")["items"] == []
+
+    now = time.time()
+    expiring = TraceStore(max_items=50, retention_s=10.5)
+    for i in range(30):
+        expiring.append("ws", dict(_item(i), ts=now - 29 + i))
+    assert [x["seq"] for x in expiring.query("ws", limit=50)["items"]][-1] == 20
+    stale = TraceStore(max_items=50, retention_s=10.5)
+    for i in range(5):
+        stale.append("ws", dict(_item(i), ts=now - 60))
+    assert stale.summary("ws")["count"] == 0 and stale.summary("ws")["items"] == []
+
+    sampled = TraceStore(max_items=1000, sample=0.25)
+    for i in range(400):
+        sampled.append("ws", _item(i, rid=f"nlu.{i // 2}"))
+        sampled.append("ws", _item(i, kind="nlp.intent.not_obtained", rid=f"nlu.{i // 2}"))
+    kept = sampled.query("ws", limit=500, types=["nlp.intent.detected"])["items"]
+    assert 40 <= len(kept) <= 160 and sampled.stats["sampled_out"] == 400 - len(kept)
+    # Both events of a request share the decision; not_obtained is always kept.
+    assert all(len([x for x in kept if x["request_id"] == r["request_id"]]) == 2 for r in kept)
+    assert len(sampled.query("ws", limit=500, types=["nlp.intent.not_obtained"])["items"]) == 400
+
+
+def test_sqlite_pages_past_the_ring_and_survives_restart(tmp_path: Path) -> None:
+    db = tmp_path / "trace.sqlite3"
+    store = TraceStore(max_items=10, db_path=db, db_max_rows=100)
+    for i in range(150):
+        store.append("ws", _item(i))
+    assert store.flush() == 150
+
+    page = store.query("ws", limit=25)
+    assert [x["seq"] for x in page["items"]] == list(range(150, 125, -1))
+    older = store.query("ws", before=page["next_before"], limit=200)
+    assert [x["seq"] for x in older["items"]] == list(range(125, 50, -1))  # 100 rows kept in the db
+    assert older["next_before"] is None
+    assert asyncio.run(store.query_async("ws", before=page["next_before"], limit=200)) == older
+    store.close()
+
+    reopened = TraceStore(max_items=10, db_path=db, db_max_rows=100)
+    assert reopened._seq == {"ws": 150}  # read once, not on the first append/query
+    record = reopened.append("ws", _item(999))
+    assert record is not None and record["seq"] == 151
+    assert [x["seq"] for x in reopened.query("ws", request_id="nlu.140")["items"]] == [141]
+    reopened.close()
+
+
+def test_events_stream_and_project_a_throttled_summary(monkeypatch) -> None:
+    from adaos.services.scenario import projection_writes
+
+    store = TraceStore(max_items=100)
+    monkeypatch.setattr(trace_store, "_STORE", store)
+    monkeypatch.setattr(trace_store, "_YJS_INTERVAL_S", 0.05)
+    monkeypatch.setattr(trace_store, "_YJS_ITEMS", 5)
+    writes: list = []
+
+    class _Writer:
+        async def submit(self, webspace_id, segments, value, **kwargs):
+            writes.append((webspace_id, tuple(segments), value))
+
+    monkeypatch.setattr(projection_writes, "projection_writer", lambda: _Writer())
+
+    async def _flow() -> list:
+        queue = store.subscribe("ws")
+        for i in range(40):
+            await trace_store.on_detected({"webspace_id": "ws", "text": f"t{i}", "intent": "x", "request_id": f"r{i}"})
+        streamed = [queue.get_nowait()["text"] for _ in range(queue.qsize())]
+        store.unsubscribe("ws", queue)
+        await asyncio.sleep(0.15)
+        await trace_store.on_not_obtained({"webspace_id": "ws", "text": "late", "request_id": "r40"})
+        await asyncio.sleep(0.15)
+        return streamed
+
+    streamed = asyncio.run(_flow())
+    assert streamed == [f"t{i}" for i in range(40)]
+    assert len(writes) == 2
+    ws, path, summary = writes[0]
+    assert (ws, path) == ("ws", ("data", "nlu_trace"))
+    assert [x["text"] for x in summary["items"]] == [f"t{i}" for i in range(35, 40)]
+    assert summary["count"] == 40 and summary["last_seq"] == 40
+    assert writes[1][2]["items"][-1]["text"] == "late"
+
+
+def test_cancelled_stream_unsubscribes(monkeypatch) -> None:
+    from adaos.apps.api import nlu_trace_api
+
+    store = TraceStore(max_items=100)
+    monkeypatch.setattr(nlu_trace_api, "get_trace_store", lambda: store)
+
+    async def _flow() -> None:
+        stream = nlu_trace_api._stream_iter("ws", None)
+        task = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.05)
+        assert len(store._subscribers["ws"]) == 1
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        else:
+            raise AssertionError("cancellation was swallowed")
+        assert "ws" not in store._subscribers
+
+    asyncio.run(_flow())
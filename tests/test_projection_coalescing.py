@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+
+import y_py as Y
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.scenario import projection_writes
+from adaos.services.scenario.projection_registry import ProjectionRegistry
+from adaos.services.scenario.projection_service import ProjectionService
+from adaos.services.scenario.projection_writes import ProjectionWriter
+
+
+def _live_room(monkeypatch, window_ms: float = 0.0):
+    """Route projection writes into an in-memory doc standing in for the live room."""
+    doc = Y.YDoc()
+    updates: list[int] = []
+    doc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+
+    def _mutate(webspace_id, mutator):
+        with doc.begin_transaction() as txn:
+            mutator(doc, txn)
+        return True
+
+    writer = ProjectionWriter(window_ms=window_ms)
+    monkeypatch.setattr(projection_writes, "mutate_live_room", _mutate)
+    monkeypatch.setattr(projection_writes, "_WRITER", writer)
+    return doc, updates, writer
+
+
+def _service(entries: list[dict]) -> ProjectionService:
+    registry = ProjectionRegistry()
+    registry.load_entries(entries)
+    return ProjectionService(ctx=get_ctx(), registry=registry)
+
+
+def test_concurrent_writes_share_one_transaction_and_keep_siblings(monkeypatch) -> None:
+    doc, updates, writer = _live_room(monkeypatch)
+    svc = _service(
+        [
+            {"scope": "subnet", "slot": f"infra.{name}", "targets": [{"backend": "yjs", "path": f"data/infra/{name}"}]}
+            for name in ("status", "nodes", "links")
+        ]
+    )
+
+    async def _burst() -> None:
+        await asyncio.gather(
+            svc.apply("subnet", "infra.status", {"ok": False}),
+            svc.apply("subnet", "infra.nodes", [1, 2]),
+            svc.apply("subnet", "infra.links", {"a": 1}),
+            svc.apply("subnet", "infra.status", {"ok": True}),
+        )
+
+    asyncio.run(_burst())
+    assert writer.snapshot()["pending"] == 0
+    assert writer.stats["coalesced"] == 1
+    assert doc.get_map("data").get("infra") == {"status": {"ok": True}, "nodes": [1, 2], "links": {"a": 1}}
+
+    # Rewriting an identical value costs no operation.
+    updates.clear()
+    asyncio.run(svc.apply("subnet", "infra.nodes", [1, 2]))
+    assert writer.stats["unchanged"] == 1
+    assert [u for u in updates if u > 2] == []
+
+
+def test_structural_targets_update_only_changed_entries(monkeypatch) -> None:
+    doc, updates, writer = _live_room(monkeypatch)
+    svc = _service(
+        [
+            {
+                "scope": "subnet",
+                "slot": "weather.snapshot",
+                "targets": [{"backend": "yjs", "path": "data/weather", "structural": True}],
+            }
+        ]
+    )
+    snapshot = {
+        "cities": {f"city{i}": {"temp": i, "text": "x" * 200} for i in range(50)},
+        "log": [{"n": i} for i in range(20)],
+    }
+    asyncio.run(svc.apply("subnet", "weather.snapshot", snapshot))
+    full = sum(updates)
+
+    updates.clear()
+    snapshot["cities"]["city7"]["temp"] = 99
+    snapshot["log"].append({"n": 20})
+    del snapshot["cities"]["city3"]
+    asyncio.run(svc.apply("subnet", "weather.snapshot", snapshot))
+
+    weather = doc.get_map("data").get("weather")
+    assert isinstance(weather, Y.YMap)
+    data = weather.get("cities").get("city7")
+    assert data.get("temp") == 99
+    assert "city3" not in weather.get("cities")
+    assert len(weather.get("log")) == 21
+    assert sum(updates) * 20 < full
+
+
+def test_throttled_target_writes_latest_value_once_per_interval(monkeypatch) -> None:
+    registry = ProjectionRegistry()
+    registry.load_entries(
+        [{"scope": "subnet", "slot": "cpu", "targets": [{"backend": "yjs", "path": "data/cpu", "throttle_ms": "200"}]}]
+    )
+    assert registry.resolve("subnet", "cpu")[0].throttle_ms == 200
+    doc, _updates, writer = _live_room(monkeypatch)
+    svc = ProjectionService(ctx=get_ctx(), registry=registry)
+
+    async def _stream() -> None:
+        await svc.apply("subnet", "cpu", 0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for value in range(1, 11):
+            # Inside the interval the value is only queued, the caller does not wait it out.
+            await svc.apply("subnet", "cpu", value)
+            await asyncio.sleep(0.002)
+        assert loop.time() - started < 0.15
+        assert doc.get_map("data").get("cpu") == 0
+        await asyncio.sleep(0.3)
+
+    asyncio.run(_stream())
+    assert doc.get_map("data").get("cpu") == 10
+    assert writer.stats["writes"] == 11
+    assert writer.stats["transactions"] <= 3
+
+
+def test_submits_from_another_loop_are_handed_to_the_owner(monkeypatch) -> None:
+    doc, _updates, writer = _live_room(monkeypatch, window_ms=20.0)
+
+    def _sync_set(value: int) -> None:
+        # What the sync ``ctx.set`` path does off the event loop.
+        asyncio.run(writer.submit("ws", ["data", "from_thread"], value))
+
+    async def _flow() -> None:
+        pending = asyncio.create_task(writer.submit("ws", ["data", "from_loop"], 1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(asyncio.to_thread(_sync_set, 2), timeout=2.0)
+        await asyncio.wait_for(pending, timeout=2.0)
+
+    asyncio.run(_flow())
+    assert doc.get_map("data").get("from_loop") == 1
+    assert doc.get_map("data").get("from_thread") == 2
+    assert writer.snapshot()["pending"] == 0
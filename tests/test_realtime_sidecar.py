@@ -684,3 +684,80 @@ async def test_realtime_sidecar_matches_pongs_to_sidecar_and_client_pings_in_ord
         await writer.wait_closed()
     finally:
         await server.close()
+
+
+@pytest.mark.asyncio
+async def test_realtime_relay_buffer_applies_credit_coalescing_and_drops() -> None:
+    buf = realtime_sidecar_mod._RelayBuffer("to_remote", max_bytes=10, max_frames=8)
+    await buf.put(b"12345678")
+    assert buf.offer(b"PING\r\n") is False  # optional frame dropped without credit
+
+    blocked = asyncio.create_task(buf.put(b"abcd"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and buf.blocked_total == 1
+
+    chunks, size, enqueued_at = await buf.take(1024)
+    assert chunks == [b"12345678"]
+    await asyncio.sleep(0.01)
+    assert not blocked.done()  # credit only comes back after the write completed
+    buf.release(len(chunks), size, enqueued_at)
+    await asyncio.wait_for(blocked, timeout=1.0)
+
+    await buf.put(b"PONG\r\n", coalesce=True)
+    await buf.put(b"PONG\r\n", coalesce=True)
+    chunks, size, enqueued_at = await buf.take(1024)
+    assert chunks == [b"abcd", b"PONG\r\n"]
+    buf.release(len(chunks), size, enqueued_at)
+    snap = buf.snapshot()
+    assert snap["coalesced_total"] == 1 and snap["dropped_total"] == 1
+    assert snap["depth_bytes"] == 0 and snap["peak_bytes"] <= 10
+    assert snap["latency_ms_max"] >= snap["latency_ms_last"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_realtime_sidecar_backpressures_local_client_when_remote_is_slow(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    class _SlowRemoteWS(_FakeRemoteWS):
+        async def send(self, payload: bytes) -> None:
+            await asyncio.sleep(0.005)
+            await super().send(payload)
+
+    fake_ws = _SlowRemoteWS()
+
+    async def _fake_connect(*args, **kwargs):
+        return fake_ws
+
+    import websockets  # type: ignore
+
+    monkeypatch.setattr(websockets, "connect", _fake_connect)
+    monkeypatch.setattr(realtime_sidecar_mod, "_realtime_nats_ping_interval_s", lambda: None)
+    monkeypatch.setenv("ADAOS_REALTIME_DIAG_FILE", str(tmp_path / "diag.jsonl"))
+    monkeypatch.setenv("ADAOS_REALTIME_LOG", str(tmp_path / "sidecar.log"))
+    monkeypatch.setenv("ADAOS_REALTIME_ENABLE", "1")
+    monkeypatch.setenv("ADAOS_REALTIME_REMOTE_WS_URL", "wss://example.invalid/nats")
+    monkeypatch.setenv("ADAOS_REALTIME_RELAY_MAX_BYTES", "65536")
+    monkeypatch.setenv("ADAOS_REALTIME_RELAY_BATCH_BYTES", "16384")
+
+    server = RealtimeSidecarServer(host="127.0.0.1", port=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(server.listen_host, server.listen_port)
+        payload = b"".join(b"PUB x %d\r\n" % i for i in range(40000))
+        writer.write(payload)
+        await writer.drain()
+        for _ in range(500):
+            if sum(len(item) for item in fake_ws.sent) >= len(payload):
+                break
+            await asyncio.sleep(0.01)
+
+        assert b"".join(fake_ws.sent) == payload
+        relay = server._diag_snapshot()["relay"]["to_remote"]
+        assert relay["peak_bytes"] <= 65536
+        assert relay["blocked_total"] >= 1
+        assert relay["depth_bytes"] == 0
+        assert all(len(item) <= 65536 for item in fake_ws.sent)  # one read() chunk or a 16 KiB batch
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        await server.close()
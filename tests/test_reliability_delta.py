@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import time
+from types import SimpleNamespace
+import types
+
+if "nats" not in sys.modules:
+    sys.modules["nats"] = types.ModuleType("nats")
+if "y_py" not in sys.modules:
+    sys.modules["y_py"] = types.SimpleNamespace(YDoc=object)
+if "ypy_websocket" not in sys.modules:
+    ystore_mod = types.SimpleNamespace(BaseYStore=object, YDocNotFound=RuntimeError)
+    sys.modules["ypy_websocket"] = types.SimpleNamespace(ystore=ystore_mod)
+    sys.modules["ypy_websocket.ystore"] = ystore_mod
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from adaos.services import reliability
+from adaos.services.reliability import (
+    channel_diagnostics_snapshot,
+    mark_root_control_down,
+    mark_root_control_up,
+    mark_route_degraded,
+    mark_route_ready,
+    reliability_delta_stats,
+    reliability_generation,
+    reliability_snapshot_delta,
+    reset_reliability_runtime_state,
+)
+from adaos.services.runtime_lifecycle import reset_runtime_lifecycle
+
+_KW = dict(
+    node_id="node-1",
+    subnet_id="sn_1",
+    role="hub",
+    local_ready=True,
+    node_state="ready",
+    draining=False,
+    route_mode="hub",
+    connected_to_hub=None,
+)
+
+
+def _reset_state() -> None:
+    reset_runtime_lifecycle()
+    reset_reliability_runtime_state()
+
+
+def test_channel_diagnostics_are_memoized_until_mutation_or_window_expiry(monkeypatch) -> None:
+    _reset_state()
+    generation = reliability_generation()
+    mark_root_control_up()
+    mark_root_control_down()
+    assert reliability_generation() > generation
+
+    first = channel_diagnostics_snapshot()
+    cached = reliability._CHANNEL_DIAG_CACHE["base"]
+    second = channel_diagnostics_snapshot()
+    assert reliability._CHANNEL_DIAG_CACHE["base"] is cached
+    assert second["root_control"]["recent_non_ready_transitions_5m"] == 1
+    assert second["root_control"]["stability"] == first["root_control"]["stability"]
+    # Returned containers are copies: callers may not corrupt the memo.
+    second["root_control"]["incident_classes_5m"]["bogus"] = 1
+    assert "bogus" not in channel_diagnostics_snapshot()["root_control"]["incident_classes_5m"]
+
+    mark_root_control_up()
+    mark_root_control_down()
+    assert reliability._CHANNEL_DIAG_CACHE["base"] is cached  # lazily recomputed on read
+    assert channel_diagnostics_snapshot()["root_control"]["recent_non_ready_transitions_5m"] == 2
+
+    # Six minutes later the 5m window is empty without any new mutation.
+    later = time.time() + 360.0
+    monkeypatch.setattr(reliability, "time", SimpleNamespace(time=lambda: later, monotonic=time.monotonic))
+    aged = channel_diagnostics_snapshot()["root_control"]
+    assert aged["recent_non_ready_transitions_5m"] == 0
+    assert aged["recent_non_ready_transitions_15m"] == 2
+    assert aged["non_ready_for_s"] >= 360.0
+
+
+def test_readiness_builders_are_memoized_on_their_inputs(monkeypatch) -> None:
+    _reset_state()
+    mark_root_control_up()
+    mark_route_ready()
+    snapshot = reliability.reliability_snapshot(**_KW)["runtime"]
+    again = reliability.reliability_snapshot(**_KW)["runtime"]
+    assert again["readiness_tree"] is snapshot["readiness_tree"]
+    assert again["degraded_matrix"] is snapshot["degraded_matrix"]
+    assert reliability._strip_volatile(again["hub_member_channels"]["channels"]) == reliability._strip_volatile(
+        snapshot["hub_member_channels"]["channels"]
+    )
+
+    mark_route_degraded()
+    changed = reliability.reliability_snapshot(**_KW)["runtime"]
+    assert changed["readiness_tree"] is not snapshot["readiness_tree"]
+    assert changed["readiness_tree"]["route"]["status"] == "degraded"
+    assert changed["degraded_matrix"] is not snapshot["degraded_matrix"]
+
+    # Ages in the member channel selection move with time, the selection does not.
+    later = time.time() + 30.0
+    monkeypatch.setattr(reliability, "time", SimpleNamespace(time=lambda: later, monotonic=time.monotonic))
+    aged = reliability.reliability_snapshot(**_KW)["runtime"]["hub_member_channels"]
+    assert aged["updated_at"] == later
+    assert [c["active_path"] for c in aged["channels"].values()] == [
+        c["active_path"] for c in snapshot["hub_member_channels"]["channels"].values()
+    ]
+
+
+def test_reliability_delta_returns_only_changed_sections(monkeypatch) -> None:
+    _reset_state()
+    monkeypatch.setenv("ADAOS_RELIABILITY_DELTA_REFRESH_S", "60")
+    full = reliability_snapshot_delta(**_KW)
+    assert full["full"] is True
+    assert {"node", "model", "runtime.readiness_tree", "runtime.channel_diagnostics"} <= set(full["sections"])
+
+    computed = reliability_delta_stats()["computed"]
+    idle = reliability_snapshot_delta(since=full["version"], epoch=full["epoch"], **_KW)
+    assert idle["sections"] == {} and idle["version"] == full["version"]
+    assert reliability_delta_stats()["computed"] == computed  # unchanged poll reused the last snapshot
+
+    mark_route_ready(details={"subject": "route.to_hub.*"})
+    delta = reliability_snapshot_delta(since=full["version"], epoch=full["epoch"], **_KW)
+    assert delta["version"] == full["version"] + 1
+    assert "runtime.signals" in delta["sections"]
+    assert delta["sections"]["runtime.channel_diagnostics"]["route"]["status"] == "ready"
+    assert "model" not in delta["sections"] and "node" not in delta["sections"]
+
+    # A client from another process lifetime gets everything again.
+    stale = reliability_snapshot_delta(since=delta["version"], epoch="other", **_KW)
+    assert stale["full"] is True and "model" in stale["sections"]
+
+
+def _ages(value, path: str = "") -> dict[str, float]:
+    out: dict[str, float] = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith(("_ago_s", "_age_s")) and isinstance(item, (int, float)):
+                out[f"{path}.{key}"] = item
+            else:
+                out.update(_ages(item, f"{path}.{key}"))
+    return out
+
+
+def test_reused_delta_sections_have_current_ages(monkeypatch) -> None:
+    _reset_state()
+    monkeypatch.setenv("ADAOS_RELIABILITY_DELTA_REFRESH_S", "60")
+    mark_route_ready(details={"subject": "route.to_hub.*"})
+    first = reliability_snapshot_delta(**_KW)
+    before = _ages(first["sections"])
+    assert before
+
+    computed = reliability_delta_stats()["computed"]
+    base = time.monotonic()
+    monkeypatch.setattr(reliability.time, "monotonic", lambda: base + 5.0)
+    again = reliability_snapshot_delta(**_KW)
+    assert reliability_delta_stats()["computed"] == computed
+    after = _ages(again["sections"])
+    assert set(after) == set(before)
+    assert all(after[key] >= before[key] + 4.9 for key in before)
+    assert reliability._strip_volatile(again["sections"]["runtime.channel_diagnostics"]) == reliability._strip_volatile(
+        first["sections"]["runtime.channel_diagnostics"]
+    )
+
+
+def test_node_reliability_delta_endpoint_long_polls_for_changes(monkeypatch) -> None:
+    _reset_state()
+    monkeypatch.setenv("ADAOS_RELIABILITY_DELTA_REFRESH_S", "60")
+    monkeypatch.setenv("ADAOS_RELIABILITY_DELTA_POLL_S", "0.02")
+    mark_root_control_up()
+    mark_route_ready()
+
+    fake_bootstrap = types.ModuleType("adaos.services.bootstrap")
+    fake_bootstrap.is_ready = lambda: True
+    fake_bootstrap.load_config = lambda: SimpleNamespace(node_id="node-1", subnet_id="sn_1", role="hub")
+    fake_bootstrap.request_hub_root_reconnect = lambda *args, **kwargs: {"ok": True}
+
+    async def _fake_switch_role(*args, **kwargs):
+        return fake_bootstrap.load_config()
+
+    fake_bootstrap.switch_role = _fake_switch_role
+    monkeypatch.setitem(sys.modules, "adaos.services.bootstrap", fake_bootstrap)
+
+    fake_link_client_mod = types.ModuleType("adaos.services.subnet.link_client")
+    fake_link_client_mod.get_member_link_client = lambda: SimpleNamespace(is_connected=lambda: False)
+    monkeypatch.setitem(sys.modules, "adaos.services.subnet.link_client", fake_link_client_mod)
+
+    sys.modules.pop("adaos.apps.api.node_api", None)
+    node_api = importlib.import_module("adaos.apps.api.node_api")
+    require_token = importlib.import_module("adaos.apps.api.auth").require_token
+
+    app = FastAPI()
+    app.include_router(node_api.router, prefix="/api/node")
+    app.dependency_overrides[require_token] = lambda: None
+    monkeypatch.setattr(node_api, "runtime_lifecycle_snapshot", lambda: {"node_state": "ready", "draining": False})
+
+    client = TestClient(app)
+    first = client.get("/api/node/reliability/delta").json()
+    assert first["full"] is True
+    assert first["sections"]["runtime.readiness_tree"]["route"]["status"] == "ready"
+    query = {"since": first["version"], "epoch": first["epoch"]}
+
+    started = time.monotonic()
+    idle = client.get("/api/node/reliability/delta", params={**query, "wait_s": 0.2}).json()
+    assert idle["sections"] == {} and time.monotonic() - started >= 0.2
+
+    timer = threading.Timer(0.1, mark_route_degraded)
+    timer.start()
+    try:
+        changed = client.get("/api/node/reliability/delta", params={**query, "wait_s": 10}).json()
+    finally:
+        timer.cancel()
+    assert changed["version"] > first["version"]
+    assert changed["sections"]["runtime.readiness_tree"]["route"]["status"] == "degraded"
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Response
+
+from adaos.services.root import client as root_client
+from adaos.services.root.client import RootHttpClient
+from adaos.services.root.draft_sync import ChunkCache, assemble, split_chunks
+from adaos.services.root.service import create_zip_bytes
+
+
+class _FakeRoot:
+    """ASGI stand-in for Root's draft endpoints (legacy + chunked)."""
+
+    def __init__(self, *, chunked: bool = True) -> None:
+        self.chunks: dict[str, bytes] = {}
+        self.drafts: dict[str, bytes] = {}
+        self.manifests: dict[str, dict] = {}
+        self.received = 0
+        self.ports: set[int] = set()
+        self.paths: list[str] = []
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def _track(request: Request, call_next):
+            self.ports.add(request.client.port)
+            self.paths.append(request.url.path)
+            return await call_next(request)
+
+        @app.post("/v1/{kind}/draft")
+        async def legacy_push(kind: str, request: Request):
+            body = await request.body()
+            self.received += len(body)
+            payload = await request.json()
+            self.drafts[payload["name"]] = base64.b64decode(payload["archive_b64"])
+            return {"stored_path": f"{kind}/{payload['name']}"}
+
+        @app.get("/v1/{kind}/draft/archive")
+        async def legacy_archive(kind: str, name: str):
+            return {"name": name, "archive_b64": base64.b64encode(self.drafts[name]).decode()}
+
+        if chunked:
+
+            @app.post("/v1/{kind}/draft/chunks/missing")
+            async def missing(kind: str, request: Request):
+                hashes = (await request.json())["hashes"]
+                return {"missing": [h for h in hashes if h not in self.chunks]}
+
+            @app.put("/v1/{kind}/draft/chunks/{digest}")
+            async def put_chunk(kind: str, digest: str, request: Request):
+                blob = await request.body()
+                self.received += len(blob)
+                if hashlib.sha256(blob).hexdigest() != digest:
+                    raise HTTPException(400, "digest mismatch")
+                self.chunks[digest] = blob
+                return Response(status_code=204)
+
+            @app.get("/v1/{kind}/draft/chunks/{digest}")
+            async def get_chunk(kind: str, digest: str):
+                return Response(self.chunks[digest], media_type="application/octet-stream")
+
+            @app.post("/v1/{kind}/draft/manifest")
+            async def commit(kind: str, request: Request):
+                payload = await request.json()
+                manifest = payload["manifest"]
+                self.drafts[payload["name"]] = assemble(manifest, self.chunks.__getitem__)
+                self.manifests[payload["name"]] = manifest
+                return {"stored_path": f"{kind}/{payload['name']}"}
+
+            @app.get("/v1/{kind}/draft/manifest")
+            async def get_manifest(kind: str, name: str):
+                return self.manifests[name]
+
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.server = uvicorn.Server(uvicorn.Config(app, log_level="error", lifespan="off"))
+        self.thread = threading.Thread(target=self.server.run, kwargs={"sockets": [self.sock]}, daemon=True)
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+
+    def __enter__(self) -> "_FakeRoot":
+        self.thread.start()
+        deadline = time.monotonic() + 5
+        while not self.server.started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        root_client.close_pooled_clients()
+        root_client._NO_CHUNKED.clear()
+        root_client._NO_CHUNKED_FETCH.clear()
+        self.server.should_exit = True
+        self.thread.join(5)
+
+
+def _make_skill(root, files: int = 40, size: int = 32 * 1024) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "skill.yaml").write_text("name: big\nversion: 1.0.0\n", encoding="utf-8")
+    for i in range(files):
+        # incompressible payload so the archive is really large
+        (root / f"asset_{i:03d}.bin").write_bytes(os.urandom(size))
+    (root / "handlers").mkdir(exist_ok=True)
+    (root / "handlers" / "main.py").write_text("def handle(topic, payload):\n    return payload\n" * 20, encoding="utf-8")
+
+
+def test_one_file_edit_uploads_kilobytes_not_the_archive(tmp_path) -> None:
+    skill = tmp_path / "big"
+    _make_skill(skill)
+    with _FakeRoot() as root:
+        client = RootHttpClient(base_url=root.base)
+        first = create_zip_bytes(skill)
+        reply = client.push_draft_chunked(kind="skills", name="big", archive=first, node_id="n1")
+        assert reply["stored_path"] == "skills/big"
+        assert reply["transfer"]["mode"] == "chunked"
+        assert root.drafts["big"] == first
+        assert len(first) > 1024 * 1024
+
+        main = skill / "handlers" / "main.py"
+        main.write_text(main.read_text(encoding="utf-8") + "# tweak\n", encoding="utf-8")
+        second = create_zip_bytes(skill)
+        before = root.received
+        reply = client.push_draft_chunked(kind="skills", name="big", archive=second, node_id="n1")
+
+        assert root.drafts["big"] == second
+        sent = root.received - before
+        assert sent == reply["transfer"]["bytes_uploaded"]
+        assert sent < 96 * 1024  # vs ~1.3 MB archive (+33% as base64)
+        assert reply["transfer"]["uploaded_chunks"] <= 3
+        # every request rode the same keep-alive connection
+        assert len(root.ports) == 1
+
+
+def test_download_fetches_only_missing_chunks(tmp_path) -> None:
+    skill = tmp_path / "big"
+    _make_skill(skill, files=20)
+    cache = ChunkCache(tmp_path / "chunks")
+    with _FakeRoot() as root:
+        client = RootHttpClient(base_url=root.base)
+        client.push_draft_chunked(kind="skills", name="big", archive=create_zip_bytes(skill), node_id=None)
+        got = client.get_skill_draft_archive(name="big", node_id=None, cache=cache)
+        assert base64.b64decode(got["archive_b64"]) == root.drafts["big"]
+        assert got["transfer"]["fetched_chunks"] == got["transfer"]["chunks"]
+
+        (skill / "asset_005.bin").write_bytes(os.urandom(32 * 1024))
+        client.push_draft_chunked(kind="skills", name="big", archive=create_zip_bytes(skill), node_id=None)
+        again = client.get_skill_draft_archive(name="big", node_id=None, cache=cache)
+        assert base64.b64decode(again["archive_b64"]) == root.drafts["big"]
+        assert again["transfer"]["fetched_chunks"] <= 3
+        assert again["transfer"]["bytes_downloaded"] < 96 * 1024
+
+
+def test_falls_back_to_base64_endpoints_on_old_root(tmp_path) -> None:
+    skill = tmp_path / "small"
+    _make_skill(skill, files=2, size=1024)
+    archive = create_zip_bytes(skill)
+    with _FakeRoot(chunked=False) as root:
+        client = RootHttpClient(base_url=root.base)
+        reply = client.push_draft_chunked(kind="scenarios", name="small", archive=archive, node_id="n1")
+        assert reply["transfer"] == {"mode": "legacy", "bytes_uploaded": len(archive)}
+        assert root.drafts["small"] == archive
+        got = client.get_scenario_draft_archive(name="small", node_id="n1", cache=ChunkCache(None))
+        assert base64.b64decode(got["archive_b64"]) == archive
+
+
+def test_legacy_fetch_verdict_is_cached_per_root(tmp_path) -> None:
+    with _FakeRoot(chunked=False) as root:
+        root.drafts["small"] = b"legacy archive"
+        client = RootHttpClient(base_url=root.base)
+        for _ in range(3):
+            got = client.get_scenario_draft_archive(name="small", node_id="n1", cache=ChunkCache(None))
+            assert base64.b64decode(got["archive_b64"]) == b"legacy archive"
+        assert root.paths.count("/v1/scenarios/draft/manifest") == 1
+        assert root.paths.count("/v1/scenarios/draft/archive") == 3
+
+
+def test_chunk_cache_evicts_by_age_and_size(tmp_path) -> None:
+    cache = ChunkCache(tmp_path / "chunks", max_bytes=3000, max_age_s=3600)
+    blobs = [bytes([i]) * 1000 for i in range(5)]
+    digests = [hashlib.sha256(b).hexdigest() for b in blobs]
+    now = time.time()
+    for i, (digest, blob) in enumerate(zip(digests, blobs)):
+        cache.put(digest, blob)
+        os.utime(cache._path(digest), (now - 100 + i, now - 100 + i))
+    os.utime(cache._path(digests[0]), (now - 7200, now - 7200))
+    assert cache.get(digests[1]) == blobs[1]  # a read counts as a use
+
+    assert cache.prune(now=now) == 2
+    assert cache.get(digests[0]) is None  # too old
+    assert cache.get(digests[2]) is None  # least recently used past the size limit
+    assert [cache.get(d) is not None for d in digests[1:]] == [True, False, True, True]
+
+    mem = ChunkCache(None, max_bytes=2000)
+    for digest, blob in zip(digests, blobs):
+        mem.put(digest, blob)
+    assert mem.prune() == 3 and mem.get(digests[4]) == blobs[4]
+
+
+def test_chunk_boundaries_are_content_defined() -> None:
+    blob = os.urandom(512 * 1024)
+    edited = blob[:100_000] + b"inserted bytes" + blob[100_000:]
+    a = {c.sha256 for c in split_chunks(blob)}
+    b = split_chunks(edited)
+    assert sum(c.size for c in b) == len(edited)
+    assert max(c.size for c in b) <= 64 * 1024
+    changed = [c for c in b if c.sha256 not in a]
+    assert sum(c.size for c in changed) <= 128 * 1024
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import pytest
+
+from adaos.services.route_tunnel import (
+    FLAG_MORE,
+    MAGIC,
+    REC_ACK,
+    REC_BIN,
+    REC_TEXT,
+    TUNNEL_CODEC_BINARY,
+    TUNNEL_CODEC_JSON,
+    TunnelSession,
+    decode_records,
+    encode_record,
+    is_binary_tunnel_message,
+    json_frame_envelopes,
+    negotiate_tunnel_codec,
+)
+
+
+def test_codec_negotiation_records_and_legacy_envelopes(monkeypatch) -> None:
+    assert negotiate_tunnel_codec(None) == TUNNEL_CODEC_JSON
+    assert negotiate_tunnel_codec(["json"]) == TUNNEL_CODEC_JSON
+    assert negotiate_tunnel_codec(["adt1", "json"]) == TUNNEL_CODEC_BINARY
+    assert negotiate_tunnel_codec("json, adt1") == TUNNEL_CODEC_BINARY
+    monkeypatch.setenv("HUB_ROUTE_TUNNEL_BINARY", "0")
+    assert negotiate_tunnel_codec(["adt1"]) == TUNNEL_CODEC_JSON
+
+    blob = MAGIC + encode_record(REC_BIN, 7, b"\x00\x01", flags=FLAG_MORE) + encode_record(REC_ACK, 3, b"")
+    assert is_binary_tunnel_message(blob) and not is_binary_tunnel_message(b'{"t":"frame"}')
+    assert decode_records(blob) == [(REC_BIN, FLAG_MORE, 7, b"\x00\x01"), (REC_ACK, 0, 3, b"")]
+    with pytest.raises(ValueError):
+        decode_records(blob[:-3] + encode_record(REC_TEXT, 8, b"abc")[:-1])
+
+    small = json_frame_envelopes(b"\xff" * 10, max_chunk=100)
+    assert small == [{"t": "frame", "kind": "bin", "data_b64": base64.b64encode(b"\xff" * 10).decode("ascii")}]
+    chunks = json_frame_envelopes(b"x" * 250, max_chunk=100)
+    assert [(c["t"], c["idx"], c["total"]) for c in chunks] == [("chunk", 0, 3), ("chunk", 1, 3), ("chunk", 2, 3)]
+    assert len({c["id"] for c in chunks}) == 1
+    assert json_frame_envelopes("hi", max_chunk=100) == [{"t": "frame", "kind": "text", "data": "hi"}]
+
+
+def test_sessions_batch_small_frames_fragment_large_ones_and_ack() -> None:
+    async def _flow() -> None:
+        received: list = []
+        wire: list[int] = []
+        hub: TunnelSession
+        root: TunnelSession
+
+        async def _to_root(blob: bytes) -> None:
+            wire.append(len(blob))
+            await asyncio.sleep(0.001)  # NATS round trip stand-in
+            received.extend(root.receive(blob))
+
+        async def _to_hub(blob: bytes) -> None:
+            hub.receive(blob)
+
+        hub = TunnelSession(_to_root, window_bytes=64 * 1024, batch_bytes=16 * 1024, fragment_bytes=4096, ack_delay_s=0.005)
+        root = TunnelSession(_to_hub, window_bytes=64 * 1024, ack_delay_s=0.005)
+
+        frames: list = [bytes([i % 256]) * 40 for i in range(300)] + ["text-frame", b"L" * 10_000]
+        for frame in frames:
+            await hub.send(frame)
+        assert await hub.drain(timeout=5)
+        await asyncio.sleep(0.05)
+
+        assert received == frames
+        # 300 small frames went out in far fewer NATS messages.
+        assert hub.stats["messages_out"] < 50
+        assert max(wire) <= 16 * 1024 + 64
+        assert hub.stats["frames_out"] == len(frames) and root.stats["frames_in"] == len(frames)
+        # The 10 KB frame was fragmented into 3 records, all acknowledged.
+        assert hub.snapshot()["next_seq"] == 300 + 1 + 3 + 1
+        assert root.stats["acks_out"] >= 1 and hub.stats["acks_in"] >= 1
+        assert hub.snapshot()["in_flight_bytes"] == 0
+        hub.close()
+        root.close()
+
+    asyncio.run(_flow())
+
+
+def test_credit_window_blocks_sender_until_ack_and_recovers_from_lost_acks() -> None:
+    async def _flow() -> None:
+        published: list[bytes] = []
+
+        async def _blackhole(blob: bytes) -> None:
+            published.append(blob)
+
+        session = TunnelSession(_blackhole, peer_window_bytes=8192, ack_timeout_s=5.0)
+        await session.send(b"a" * 4096)
+        await session.send(b"b" * 4096)
+        blocked = asyncio.ensure_future(session.send(b"c" * 10))
+        await asyncio.sleep(0.05)
+        assert not blocked.done() and session.stats["credit_waits"] >= 1
+        assert session.snapshot()["in_flight_bytes"] == 8192
+
+        session.receive(MAGIC + encode_record(REC_ACK, 1, (16384).to_bytes(4, "big")))
+        await asyncio.wait_for(blocked, 1)
+        assert session.peer_window_bytes == 16384
+        assert session.snapshot()["in_flight_bytes"] == 4096 + 10
+
+        # No acks at all: the sender gives up waiting instead of wedging.
+        lossy = TunnelSession(_blackhole, peer_window_bytes=4096, ack_timeout_s=0.1)
+        await lossy.send(b"x" * 4096)
+        await asyncio.wait_for(lossy.send(b"y"), 2)
+        assert lossy.stats["ack_timeouts"] == 1
+
+        # A failed publish releases its credit immediately.
+        async def _broken(blob: bytes) -> None:
+            raise RuntimeError("publish timeout")
+
+        broken = TunnelSession(_broken, peer_window_bytes=4096, ack_timeout_s=5.0)
+        await broken.send(b"z" * 4096)
+        assert await broken.drain(timeout=1)
+        await asyncio.wait_for(broken.send(b"z" * 4096), 1)
+        assert broken.stats["publish_errors"] >= 1 and broken.stats["ack_timeouts"] == 0
+        for item in (session, lossy, broken):
+            item.close()
+
+    asyncio.run(_flow())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+
+from adaos.ports.sandbox import ExecLimits
+from adaos.services.sandbox import pool as sandbox_pool
+from adaos.services.sandbox.runner import ProcSandbox
+
+pytestmark = pytest.mark.skipif(not sandbox_pool.pool_supported(), reason="sandbox pool needs fork()")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    sandbox_pool.shutdown_sandbox_pools()
+    yield
+    sandbox_pool.shutdown_sandbox_pools()
+
+
+def _env() -> dict[str, str]:
+    return {"PATH": os.environ.get("PATH", ""), "MARK": "pooled"}
+
+
+def test_pooled_jobs_keep_process_semantics(tmp_path) -> None:
+    sb = ProcSandbox(fs_base=str(tmp_path), pool=True)
+    (tmp_path / "script.py").write_text(
+        "import os, sys\nprint(os.getcwd(), sys.argv[1:], sys.stdin.read(), os.environ.get('MARK'))\nsys.exit('boom')\n",
+        encoding="utf-8",
+    )
+
+    res = sb.run([sys.executable, "script.py", "a", "b"], cwd=str(tmp_path), env=_env(), stdin=b"payload")
+    assert res.exit_code == 1
+    assert res.stdout.strip() == f"{tmp_path} ['a', 'b'] payload pooled"
+    assert res.stderr.strip() == "boom"
+
+    res = sb.run([sys.executable, "-c", "import os; print(sorted(os.environ)); raise ValueError('x')"], cwd=str(tmp_path), env=_env())
+    assert res.exit_code == 1
+    assert res.stdout.strip() == "['MARK', 'PATH']"
+    assert "ValueError: x" in res.stderr
+
+    res = sb.run([sys.executable, "-m", "json.tool"], cwd=str(tmp_path), env=_env(), stdin=b'{"a": 1}')
+    assert (res.exit_code, res.stdout.split()) == (0, ["{", '"a":', "1", "}"])
+    assert sandbox_pool.get_sandbox_pool().snapshot()["jobs"] == 3
+
+    # Anything but the current interpreter takes the cold path.
+    res = sb.run(["/bin/sh", "-c", "echo cold"], cwd=str(tmp_path), env=_env())
+    assert (res.exit_code, res.stdout.strip()) == (0, "cold")
+    assert sandbox_pool.get_sandbox_pool().snapshot()["jobs"] == 3
+
+
+def test_pooled_jobs_return_bytes_when_text_is_false(tmp_path) -> None:
+    sb = ProcSandbox(fs_base=str(tmp_path), pool=True)
+    code = "import sys; sys.stdout.buffer.write(b'\\xff\\x00ok'); sys.stderr.write('err')"
+
+    res = sb.run([sys.executable, "-c", code], cwd=str(tmp_path), env=_env(), text=False)
+    assert res.exit_code == 0
+    assert isinstance(res.stdout, bytes) and isinstance(res.stderr, bytes)
+    assert (res.stdout, res.stderr) == (b"\xff\x00ok", b"err")
+    assert sandbox_pool.get_sandbox_pool().snapshot()["jobs"] == 1
+
+    res = sb.run([sys.executable, "-c", "print('hi')"], cwd=str(tmp_path), env=_env())
+    assert res.stdout == "hi\n"
+
+
+def test_pooled_jobs_are_killed_on_limits_and_workers_recycled(tmp_path) -> None:
+    sb = ProcSandbox(fs_base=str(tmp_path), pool=True)
+    spin = [sys.executable, "-c", "while True: pass"]
+
+    res = sb.run(spin, cwd=str(tmp_path), env=_env(), limits=ExecLimits(wall_time_sec=0.3))
+    assert res.timed_out and res.killed_reason == "wall_time_exceeded"
+    assert res.exit_code == -9
+
+    res = sb.run(spin, cwd=str(tmp_path), env=_env(), limits=ExecLimits(wall_time_sec=20, cpu_time_sec=1))
+    assert res.exit_code < 0
+    assert res.killed_reason in {None, "cpu_time_exceeded"}
+
+    hog = [sys.executable, "-c", "import time; b = bytearray(400 * 1024 * 1024); time.sleep(5)"]
+    res = sb.run(hog, cwd=str(tmp_path), env=_env(), limits=ExecLimits(wall_time_sec=20, max_rss_mb=64))
+    assert res.exit_code != 0
+    assert "MemoryError" in res.stderr or res.killed_reason == "rss_exceeded"
+
+    snap = sandbox_pool.get_sandbox_pool().snapshot()
+    assert snap["recycled"] >= 2
+    res = sb.run([sys.executable, "-c", "print('still warm')"], cwd=str(tmp_path), env=_env())
+    assert (res.exit_code, res.stdout.strip()) == (0, "still warm")
+
+
+def test_many_short_jobs_are_faster_than_cold_starts(tmp_path) -> None:
+    job = [sys.executable, "-c", "import sys; print(sys.argv[1])", "x"]
+    pooled, cold = ProcSandbox(fs_base=str(tmp_path), pool=True), ProcSandbox(fs_base=str(tmp_path), pool=False)
+    pooled.run(job, cwd=str(tmp_path), env=_env())  # worker ready
+
+    def _timed(sb: ProcSandbox, n: int = 20) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            res = sb.run(job, cwd=str(tmp_path), env=_env())
+            assert (res.exit_code, res.stdout) == (0, "x\n")
+        return time.perf_counter() - started
+
+    assert _timed(pooled) < _timed(cold)
+    snap = sandbox_pool.get_sandbox_pool().snapshot()
+    assert snap["jobs"] == 21
+    assert snap["spawned"] <= snap["size"]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime
+
+from adaos.services import scheduler as scheduler_mod
+from adaos.services.agent_context import get_ctx
+from adaos.services.cron import CronError, CronSpec
+from adaos.services.scheduler import Scheduler, SchedulerStore, VirtualClock
+
+
+def _capture(monkeypatch, clock: dict) -> list[tuple[str, float, float]]:
+    """Record (job_name, virtual monotonic time, scheduled_at) for every emitted run."""
+    fired: list[tuple[str, float, float]] = []
+
+    async def _emit(topic, payload, **kw):
+        fired.append((kw["job_name"], clock["clock"].monotonic(), kw["scheduled_at"]))
+
+    monkeypatch.setattr(scheduler_mod, "bus_emit", _emit)
+    return fired
+
+
+def test_interval_jobs_fire_on_a_fixed_grid_despite_wall_clock_jumps(monkeypatch) -> None:
+    clock = VirtualClock()
+    fired = _capture(monkeypatch, {"clock": clock})
+
+    async def _flow() -> None:
+        sched = Scheduler(clock=clock)
+        await sched.start()
+        await sched.ensure_every("a", 10.0, "t.a")
+        await sched.ensure_every("b", 4.0, "t.b")
+        await clock.advance(25)
+        clock.set_wall(clock.time() - 3600)  # NTP step backwards
+        await clock.advance(15)
+        await sched.delete("b")
+        await clock.advance(20)
+        assert sched.snapshot()["jobs"] == 1
+        await sched.stop()
+
+    asyncio.run(_flow())
+    assert [t for name, t, _ in fired if name == "a"] == [10, 20, 30, 40, 50, 60]
+    assert [t for name, t, _ in fired if name == "b"] == [4, 8, 12, 16, 20, 24, 28, 32, 36, 40]
+
+
+def test_jobs_survive_restart_and_apply_misfire_policies(monkeypatch) -> None:
+    store = SchedulerStore(get_ctx().sql)
+    first = VirtualClock(wall=1_000_000.0)
+    current = {"clock": first}
+    fired = _capture(monkeypatch, current)
+
+    async def _before() -> None:
+        sched = Scheduler(store=store, clock=first)
+        await sched.start()
+        for policy in ("catchup", "coalesce", "skip"):
+            await sched.ensure_every(f"job.{policy}", 10.0, "t", misfire=policy)
+        await sched.ensure_every("job.fresh", 10.0, "t", misfire="skip")
+        await first.advance(10)
+        await sched.stop()
+
+    asyncio.run(_before())
+    assert sorted(name for name, _, _ in fired) == ["job.catchup", "job.coalesce", "job.fresh", "job.skip"]
+    fired.clear()
+
+    # Node comes back 45s after the last run: 4 runs (20, 30, 40, 50) were missed.
+    second = VirtualClock(wall=1_000_000.0 + 10 + 45)
+    current["clock"] = second
+
+    async def _after() -> Scheduler:
+        sched = Scheduler(store=store, clock=second)
+        await sched.start()
+        # Re-registering an unchanged job keeps its persisted schedule.
+        await sched.ensure_every("job.fresh", 10.0, "t", misfire="skip")
+        await second.advance(0)
+        await second.advance(5)
+        await sched.stop()
+        return sched
+
+    sched = asyncio.run(_after())
+    runs = {}
+    for name, t, scheduled in fired:
+        runs.setdefault(name, []).append((t, scheduled - 1_000_000.0))
+    assert runs["job.catchup"] == [(0, 20), (0, 30), (0, 40), (0, 50), (5, 60)]
+    assert runs["job.coalesce"] == [(0, 50), (5, 60)]
+    assert runs["job.skip"] == [(5, 60)]
+    assert sched.stats["skipped"] == 2
+    assert sched.get("job.catchup").runs == 6
+
+
+def test_cron_jitter_and_bounded_concurrency(monkeypatch) -> None:
+    spec = CronSpec.parse("*/15 9-17 * * 1-5")
+    monday = datetime(2026, 10, 19, 8, 59, 30).timestamp()
+    assert datetime.fromtimestamp(spec.next_after(monday)) == datetime(2026, 10, 19, 9, 0)
+    friday_evening = datetime(2026, 10, 23, 17, 45).timestamp()
+    assert datetime.fromtimestamp(spec.next_after(friday_evening)) == datetime(2026, 10, 26, 9, 0)
+    assert datetime.fromtimestamp(CronSpec.parse("@monthly").next_after(friday_evening)) == datetime(2026, 11, 1, 0, 0)
+    # Day-of-month / day-of-week: a field covering its whole range is unrestricted,
+    # otherwise the two day fields are OR-ed.
+    sat = datetime(2026, 10, 24, 12, 0).timestamp()
+    assert datetime.fromtimestamp(CronSpec.parse("0 0 1-31 * 1").next_after(sat)) == datetime(2026, 10, 26, 0, 0)
+    assert datetime.fromtimestamp(CronSpec.parse("0 0 13 * 0-7").next_after(sat)) == datetime(2026, 11, 13, 0, 0)
+    assert datetime.fromtimestamp(CronSpec.parse("0 0 */2 * 1").next_after(sat)) == datetime(2026, 10, 25, 0, 0)
+    for bad in ("* * *", "61 * * * *", "*/0 * * * *"):
+        try:
+            CronSpec.parse(bad)
+        except CronError:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError(bad)
+
+    clock = VirtualClock(wall=datetime(2026, 10, 19, 9, 0, 50).timestamp())
+    running = {"now": 0, "peak": 0}
+    fired: list[tuple[str, float]] = []
+
+    async def _slow_emit(topic, payload, **kw):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        running["now"] -= 1
+        fired.append((kw["job_name"], clock.monotonic()))
+
+    monkeypatch.setattr(scheduler_mod, "bus_emit", _slow_emit)
+
+    async def _flow() -> Scheduler:
+        sched = Scheduler(clock=clock, max_concurrency=3, rng=random.Random(7))
+        await sched.start()
+        await sched.ensure_cron("report", "* * * * *", "t.report", jitter=5.0)
+        for i in range(20):
+            await sched.ensure_every(f"tick{i}", 30.0, "t.tick")
+        await clock.advance(100)
+        await sched.stop()
+        return sched
+
+    sched = asyncio.run(_flow())
+    report = [t for name, t in fired if name == "report"]
+    assert len(report) == 2
+    assert 10 <= report[0] <= 15 and 70 <= report[1] <= 75  # 09:01 and 09:02 plus jitter
+    assert len([1 for name, _ in fired if name.startswith("tick")]) == 60
+    assert running["peak"] == sched.stats["peak_running"] == 3
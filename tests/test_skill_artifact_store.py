@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.skill.artifact_store import SkillArtifactStore
+from adaos.services.skill.manager import SkillManager
+from adaos.services.skill.runtime_env import SkillRuntimeEnvironment
+
+_PKG = "adaos_store_probe"
+
+
+class _Caps:
+    def require(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _record_line(name: str, data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+    return f"{name},sha256={digest},{len(data)}"
+
+
+def _build_wheel(wheelhouse: Path, version: str = "0.1") -> Path:
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    dist_info = f"{_PKG}-{version}.dist-info"
+    files = {
+        f"{_PKG}/__init__.py": f"VERSION = {version!r}\n".encode(),
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {_PKG}\nVersion: {version}\n".encode(),
+        f"{dist_info}/WHEEL": b"Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = [_record_line(name, data) for name, data in files.items()] + [f"{dist_info}/RECORD,,"]
+    path = wheelhouse / f"{_PKG}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+        zf.writestr(f"{dist_info}/RECORD", "\n".join(record) + "\n")
+    return path
+
+
+@pytest.fixture
+def offline_wheelhouse(tmp_path, monkeypatch) -> Path:
+    wheelhouse = tmp_path / "wheelhouse"
+    _build_wheel(wheelhouse)
+    monkeypatch.setenv("ADAOS_SKILL_WHEELHOUSE", str(wheelhouse))
+    monkeypatch.setenv("ADAOS_SKILL_OFFLINE", "1")
+    return wheelhouse
+
+
+def test_stage_skill_sources_hardlinks_unchanged_files_across_slots(tmp_path) -> None:
+    ctx = get_ctx()
+    source = tmp_path / "src" / "store_skill"
+    (source / "handlers").mkdir(parents=True)
+    (source / "handlers" / "main.py").write_text("def handle(*a, **k):\n    return None\n", encoding="utf-8")
+    (source / "skill.yaml").write_text("name: store_skill\n", encoding="utf-8")
+    (source / "__pycache__").mkdir()
+    (source / "__pycache__" / "junk.pyc").write_bytes(b"\0")
+
+    env = SkillRuntimeEnvironment(skills_root=Path(ctx.paths.skills_dir()), skill_name="store_skill")
+    env.prepare_version("1.0.0")
+    mgr = SkillManager(git=ctx.git, paths=ctx.paths, caps=_Caps())
+    staged = [mgr._stage_skill_sources(source, env.build_slot_paths("1.0.0", slot)) for slot in ("A", "B")]
+
+    a, b = (Path(item) / "handlers" / "main.py" for item in staged)
+    assert a.read_text(encoding="utf-8") == (source / "handlers" / "main.py").read_text(encoding="utf-8")
+    assert os.stat(a).st_ino == os.stat(b).st_ino
+    assert os.stat(a).st_ino != os.stat(source / "handlers" / "main.py").st_ino
+    assert not (staged[0] / "__pycache__").exists()
+    assert (staged[0] / "handlers" / "__init__.py").exists()
+    assert any((Path(ctx.paths.cache_dir()) / "skill_store" / "objects").rglob("*"))
+
+    # Editing the workspace copy must not leak into already staged slots.
+    (source / "handlers" / "main.py").write_text("def handle(*a, **k):\n    return 1\n", encoding="utf-8")
+    assert "return None" in a.read_text(encoding="utf-8")
+
+
+def test_requirement_sets_resolve_once_and_share_a_layer_offline(tmp_path, offline_wheelhouse) -> None:
+    store = SkillArtifactStore(tmp_path / "store")
+    req_a = tmp_path / "a" / "requirements.in"
+    req_b = tmp_path / "b" / "requirements.in"
+    for req in (req_a, req_b):
+        req.parent.mkdir(parents=True)
+        req.write_text(f"{_PKG}==0.1\n", encoding="utf-8")
+
+    dep_set = store.resolve(["-r", str(req_a)])
+    assert dep_set.pins == [(_PKG, "0.1")]
+    assert (store.wheels_dir / dep_set.wheels[0]).is_file()
+
+    def _no_pip(cmd):
+        raise AssertionError(f"unexpected pip call: {cmd}")
+
+    # Same requirement content from another skill: served from the recorded set.
+    cached_store = SkillArtifactStore(tmp_path / "store", runner=_no_pip)
+    assert cached_store.resolve(["-r", str(req_b)]).key == dep_set.key
+
+    layer = store.layer(dep_set)
+    assert (layer / _PKG / "__init__.py").is_file()
+    assert cached_store.layer(dep_set) == layer
+
+    vendors = [tmp_path / "slots" / name / "vendor" for name in ("A", "B")]
+    for vendor in vendors:
+        store.link_layer(layer, vendor)
+    inodes = {os.stat(vendor / _PKG / "__init__.py").st_ino for vendor in vendors}
+    assert inodes == {os.stat(layer / _PKG / "__init__.py").st_ino}
+
+
+def test_install_dependencies_falls_back_to_store_layer(tmp_path, offline_wheelhouse, monkeypatch) -> None:
+    ctx = get_ctx()
+    env = SkillRuntimeEnvironment(skills_root=Path(ctx.paths.skills_dir()), skill_name="layer_skill")
+    env.prepare_version("1.0.0")
+    slot = env.build_slot_paths("1.0.0", "A")
+    mgr = SkillManager(git=ctx.git, paths=ctx.paths, caps=_Caps())
+    store = mgr._artifact_store()
+    # Keep the test interpreter clean: pretend the shared environment is read-only.
+    monkeypatch.setattr(store, "install_shared", lambda *_a, **_k: (False, "read-only"))
+
+    manifest = {"dependencies": [f"{_PKG}==0.1"]}
+    paths = mgr._install_python_dependencies(manifest=manifest, slot=slot, skill_dir=tmp_path)
+
+    assert paths == [str(slot.vendor_dir)]
+    assert (slot.vendor_dir / _PKG / "__init__.py").read_text(encoding="utf-8") == "VERSION = '0.1'\n"
+
+    monkeypatch.setenv("ADAOS_SKILL_WHEELHOUSE", str(tmp_path / "empty"))
+    with pytest.raises(RuntimeError, match="skill store"):
+        mgr._install_python_dependencies(manifest={"dependencies": [f"{_PKG}==0.2"]}, slot=slot, skill_dir=tmp_path)
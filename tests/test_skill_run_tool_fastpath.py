@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.skill import tool_runtime
+from adaos.services.skill.manager import SkillManager
+from adaos.services.skill.runtime_env import SkillRuntimeEnvironment
+
+
+class _Caps:
+    def require(self, *_args, **_kwargs) -> None:
+        return None
+
+
+_TOOLS_SRC = """
+import os
+import threading
+
+from adaos.sdk.data import secrets, skill_env
+
+BARRIER = None
+
+
+def whoami(payload):
+    if BARRIER is not None:
+        BARRIER.wait(timeout=5)
+    return {
+        "env": skill_env._getenv("ADAOS_SKILL_ENV_PATH"),
+        "os_env": os.environ.get("ADAOS_SKILL_ENV_PATH"),
+        "thread": threading.current_thread().name,
+        "secret": secrets.get("TOKEN") if payload.get("secret") else None,
+    }
+
+
+def echo(payload):
+    return dict(payload)
+"""
+
+
+def _install_runtime_skill(name: str, *, extra_tools: dict | None = None) -> SkillRuntimeEnvironment:
+    ctx = get_ctx()
+    env = SkillRuntimeEnvironment(skills_root=Path(ctx.paths.skills_dir()), skill_name=name)
+    env.prepare_version("1.0.0")
+    slot = env.build_slot_paths("1.0.0", "A")
+    src = slot.src_dir / name
+    src.mkdir(parents=True, exist_ok=True)
+    (src / f"{name}_tools.py").write_text(_TOOLS_SRC, encoding="utf-8")
+    tools = {
+        "whoami": {"module": f"{name}_tools", "callable": "whoami"},
+        "timed": {"module": f"{name}_tools", "callable": "whoami", "timeout_seconds": 5},
+    }
+    tools.update(extra_tools or {})
+    manifest = {"source": str(src), "version": "1.0.0", "slot": "A", "default_tool": "whoami", "tools": tools, "runtime": {}}
+    slot.resolved_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+    return env
+
+
+def _manager() -> SkillManager:
+    ctx = get_ctx()
+    return SkillManager(git=ctx.git, paths=ctx.paths, caps=_Caps())
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tool_runtime(monkeypatch):
+    monkeypatch.delenv("ADAOS_SKILL_ENV_PATH", raising=False)
+    monkeypatch.delenv("ADAOS_SKILL_MEMORY_PATH", raising=False)
+    tool_runtime.invalidate_tool_descriptors()
+    yield
+    tool_runtime.invalidate_tool_descriptors()
+    tool_runtime.shutdown_tool_executors()
+
+
+def test_run_tool_reuses_descriptor_until_manifest_changes(monkeypatch) -> None:
+    env = _install_runtime_skill("fastpath_cache")
+    assert _manager().run_tool("fastpath_cache", "whoami", {})["os_env"] is None
+
+    mgr = _manager()
+    monkeypatch.setattr(mgr, "runtime_status", lambda _name: (_ for _ in ()).throw(AssertionError("slow path")))
+    assert mgr.run_tool("fastpath_cache", None, {})["env"].endswith("skill_env.json")
+
+    _install_runtime_skill("fastpath_cache", extra_tools={"echo": {"module": "fastpath_cache_tools", "callable": "echo"}})
+    with pytest.raises(AssertionError, match="slow path"):
+        mgr.run_tool("fastpath_cache", "echo", {"x": 1})
+    assert _manager().run_tool("fastpath_cache", "echo", {"x": 1}) == {"x": 1}
+
+    # Switching the active slot invalidates the descriptor as well.
+    env.active_marker("1.0.0").write_text("B", encoding="utf-8")
+    with pytest.raises(AssertionError, match="slow path"):
+        mgr.run_tool("fastpath_cache", "echo", {})
+
+
+def test_run_tool_env_is_context_local_across_concurrent_skills(monkeypatch) -> None:
+    import importlib
+
+    names = ("fastpath_env_a", "fastpath_env_b")
+    for name in names:
+        env = _install_runtime_skill(name)
+        store = env.data_root() / "files" / "secrets.json"
+        store.parent.mkdir(parents=True, exist_ok=True)
+        store.write_text(json.dumps({"profile": {"TOKEN": {"value": f"token-{name}"}}}), encoding="utf-8")
+    monkeypatch.setattr(get_ctx(), "caps", _Caps())
+    shared_secrets = get_ctx().secrets
+    results: dict[str, dict] = {}
+    barrier = threading.Barrier(2)
+
+    def _call(name: str) -> None:
+        results[name] = _manager().run_tool(name, "whoami", {"secret": True})
+
+    for name in names:
+        _manager().run_tool(name, "whoami", {})  # import the tool modules
+        importlib.import_module(f"{name}_tools").BARRIER = barrier
+    threads = [threading.Thread(target=_call, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert "ADAOS_SKILL_ENV_PATH" not in os.environ
+    assert get_ctx().secrets is shared_secrets
+    for name in names:
+        assert results[name]["os_env"] is None
+        assert f"{os.sep}{name}{os.sep}" in results[name]["env"]
+        assert results[name]["secret"] == f"token-{name}"
+
+
+def test_timed_tools_share_a_long_lived_executor() -> None:
+    _install_runtime_skill("fastpath_timed")
+    first = _manager().run_tool("fastpath_timed", "timed", {})
+    pool = tool_runtime.tool_executor("fastpath_timed")
+    second = _manager().run_tool("fastpath_timed", "timed", {})
+    assert first["thread"].startswith("skill-fastpath_timed")
+    assert second["thread"].startswith("skill-fastpath_timed")
+    assert tool_runtime.tool_executor("fastpath_timed") is pool
+
+
+def test_skill_env_is_persisted_only_when_changed(tmp_path: Path) -> None:
+    source = tmp_path / "slot" / "skill_env.json"
+    target = tmp_path / "store" / "skill_env.json"
+    source.parent.mkdir(parents=True)
+    source.write_text('{"a": 1}', encoding="utf-8")
+
+    assert tool_runtime.persist_env_if_changed(source, target) is True
+    assert tool_runtime.persist_env_if_changed(source, target) is False
+    source.write_text('{"a": 22}', encoding="utf-8")
+    assert tool_runtime.persist_env_if_changed(source, target) is True
+    assert json.loads(target.read_text(encoding="utf-8")) == {"a": 22}
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import y_py as Y
+
+from adaos.services.subnet.link_manager import HubLinkManager
+from adaos.services.yjs.store import get_ystore_for_webspace
+
+
+class _FakeWebSocket:
+    def __init__(self, *, gate: asyncio.Event | None = None) -> None:
+        self.gate = gate
+        self.sent: list[dict] = []
+        self.closed_code: int | None = None
+
+    async def send_json(self, msg: dict) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(msg)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_code = code
+
+
+def _doc_updates(count: int) -> list[bytes]:
+    ydoc = Y.YDoc()
+    updates: list[bytes] = []
+    ydoc.observe_after_transaction(lambda event: updates.append(event.get_update()))
+    text = ydoc.get_text("txt")
+    for idx in range(count):
+        with ydoc.begin_transaction() as txn:
+            text.extend(txn, str(idx))
+    return updates
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+def test_broadcast_does_not_wait_for_slow_member() -> None:
+    async def _run() -> None:
+        mgr = HubLinkManager()
+        gate = asyncio.Event()
+        slow_ws = _FakeWebSocket(gate=gate)
+        fast_ws = _FakeWebSocket()
+        await mgr.register("slow", slow_ws, hostname=None, roles=["member"])
+        await mgr.register("fast", fast_ws, hostname=None, roles=["member"])
+
+        result = await asyncio.wait_for(
+            mgr.broadcast_event(event_type="core.update.status", payload={"state": "countdown"}),
+            timeout=0.5,
+        )
+        assert result == {"sent": 2, "failed": 0}
+        await _wait_for(lambda: len(fast_ws.sent) == 1)
+        assert slow_ws.sent == []
+
+        members = {item["node_id"]: item for item in mgr.snapshot()["members"]}
+        assert members["slow"]["outbound"]["sent_total"] == 0
+        assert members["fast"]["outbound"]["sent_total"] == 1
+
+        gate.set()
+        await _wait_for(lambda: len(slow_ws.sent) == 1)
+        await mgr.unregister("slow")
+        await mgr.unregister("fast")
+
+    asyncio.run(_run())
+
+
+def test_merge_policy_collapses_backlog_into_single_resync(monkeypatch) -> None:
+    monkeypatch.setenv("ADAOS_SUBNET_LINK_QUEUE_MAX", "8")
+    monkeypatch.setenv("ADAOS_SUBNET_SLOW_CONSUMER_POLICY", "merge")
+
+    async def _run() -> None:
+        mgr = HubLinkManager()
+        gate = asyncio.Event()
+        ws = _FakeWebSocket(gate=gate)
+        await mgr.register("member-1", ws, hostname=None, roles=["member"])
+        store = get_ystore_for_webspace("fanout-merge")
+        await store.start()
+
+        updates = _doc_updates(30)
+        for upd in updates:
+            await store.write(upd)
+            await mgr.broadcast_yjs_update(webspace_id="fanout-merge", update=upd, origin_node_id=None)
+
+        outbound = mgr.snapshot()["members"][0]["outbound"]
+        assert outbound["queue_depth"] <= 8
+        assert outbound["resync_total"] >= 1
+        assert outbound["merged_total"] > 0
+
+        gate.set()
+        await _wait_for(lambda: mgr.snapshot()["members"][0]["outbound"]["queue_depth"] == 0)
+        replica = Y.YDoc()
+        for msg in ws.sent:
+            Y.apply_update(replica, base64.b64decode(msg["update_b64"]))
+        assert str(replica.get_text("txt")) == "".join(str(i) for i in range(30))
+        assert any(msg.get("resync") for msg in ws.sent)
+        assert len(ws.sent) < len(updates)
+        await mgr.unregister("member-1")
+
+    asyncio.run(_run())
+
+
+def test_disconnect_policy_drops_slow_member(monkeypatch) -> None:
+    monkeypatch.setenv("ADAOS_SUBNET_LINK_QUEUE_MAX", "8")
+    monkeypatch.setenv("ADAOS_SUBNET_SLOW_CONSUMER_POLICY", "disconnect")
+
+    async def _run() -> None:
+        mgr = HubLinkManager()
+        ws = _FakeWebSocket(gate=asyncio.Event())
+        await mgr.register("member-1", ws, hostname=None, roles=["member"])
+        for upd in _doc_updates(12):
+            await mgr.broadcast_yjs_update(webspace_id="fanout-drop", update=upd, origin_node_id=None)
+        await _wait_for(lambda: ws.closed_code is not None)
+        assert ws.closed_code == 1013
+        outbound = mgr.snapshot()["members"][0]["outbound"]
+        assert outbound["closing"] is True
+        assert outbound["rejected_total"] > 0
+        await mgr.unregister("member-1")
+
+    asyncio.run(_run())
+
+
+def test_yjs_updates_follow_declared_interest() -> None:
+    async def _run() -> None:
+        mgr = HubLinkManager()
+        viewer_ws = _FakeWebSocket()
+        legacy_ws = _FakeWebSocket()
+        await mgr.register("viewer", viewer_ws, hostname=None, roles=["member"])
+        await mgr.register("legacy", legacy_ws, hostname=None, roles=["member"])
+        result = await mgr.update_member_interest("viewer", webspaces=["ws-a"], mode="set")
+        assert result["added"] == ["ws-a"]
+        await _wait_for(lambda: any(msg["t"] == "yjs.sync" for msg in viewer_ws.sent))
+        viewer_ws.sent.clear()
+
+        update = _doc_updates(1)[0]
+        await mgr.broadcast_yjs_update(webspace_id="ws-b", update=update, origin_node_id=None)
+        await mgr.broadcast_yjs_update(webspace_id="ws-a", update=update, origin_node_id=None)
+        await _wait_for(lambda: len(legacy_ws.sent) == 2)
+        await _wait_for(lambda: len(viewer_ws.sent) == 1)
+        assert viewer_ws.sent[0]["webspace_id"] == "ws-a"
+        assert mgr.interested_members("ws-b") == ["legacy"]
+        assert mgr.snapshot()["yjs_routing"]["filtered_total"] == 1
+
+        await mgr.update_member_interest("viewer", webspaces=["ws-a"], mode="remove")
+        assert mgr.interested_members("ws-a") == ["legacy"]
+        await mgr.unregister("viewer")
+        await mgr.unregister("legacy")
+
+    asyncio.run(_run())
+
+
+def test_interest_add_sends_state_vector_catch_up() -> None:
+    async def _run() -> None:
+        mgr = HubLinkManager()
+        ws = _FakeWebSocket()
+        await mgr.register("member-1", ws, hostname=None, roles=["member"])
+        store = get_ystore_for_webspace("ws-catchup")
+        await store.start()
+        updates = _doc_updates(6)
+        for upd in updates:
+            await store.write(upd)
+
+        member_doc = Y.YDoc()
+        for upd in updates[:4]:
+            Y.apply_update(member_doc, upd)
+        await mgr.update_member_interest(
+            "member-1",
+            webspaces=["ws-catchup"],
+            mode="add",
+            state_vectors={"ws-catchup": Y.encode_state_vector(member_doc)},
+        )
+        await _wait_for(lambda: len(ws.sent) == 1)
+        msg = ws.sent[0]
+        assert msg["t"] == "yjs.sync"
+        diff = base64.b64decode(msg["update_b64"])
+        assert len(diff) < len(await store.encode_state())
+        Y.apply_update(member_doc, diff)
+        assert str(member_doc.get_text("txt")) == "012345"
+        assert base64.b64decode(msg["state_vector_b64"]) == await store.encode_state_vector()
+        await mgr.unregister("member-1")
+
+    asyncio.run(_run())
+
+
+def test_member_answers_sync_with_missing_local_state() -> None:
+    from adaos.services.subnet.link_client import MemberLinkClient
+
+    async def _run() -> None:
+        client = MemberLinkClient()
+        updates = _doc_updates(3)
+        store = get_ystore_for_webspace("ws-reply")
+        await store.start()
+        for upd in updates:
+            await store.write(upd)
+        hub_doc = Y.YDoc()
+        Y.apply_update(hub_doc, updates[0])
+        await client._on_yjs_sync(
+            {
+                "t": "yjs.sync",
+                "webspace_id": "ws-reply",
+                "update_b64": "",
+                "state_vector_b64": base64.b64encode(Y.encode_state_vector(hub_doc)).decode("ascii"),
+            }
+        )
+        reply = client._out_q.get_nowait()
+        assert reply["t"] == "yjs.update"
+        Y.apply_update(hub_doc, base64.b64decode(reply["update_b64"]))
+        assert str(hub_doc.get_text("txt")) == "012"
+        assert client.snapshot()["yjs_sync_reply_total"] == 1
+
+    asyncio.run(_run())
+
+
+def test_member_merges_write_burst_into_one_update(monkeypatch) -> None:
+    from adaos.services.subnet.link_client import MemberLinkClient
+
+    monkeypatch.setenv("ADAOS_SUBNET_YJS_MERGE_WINDOW_MS", "20")
+
+    async def _run() -> None:
+        client = MemberLinkClient()
+        store = get_ystore_for_webspace("ws-burst")
+        await store.start()
+        updates = _doc_updates(40)
+        hub_doc = Y.YDoc()
+        for upd in updates[:10]:
+            await store.write(upd)
+            Y.apply_update(hub_doc, upd)
+        client._yjs_hub_vectors["ws-burst"] = Y.encode_state_vector(hub_doc)
+
+        for upd in updates[10:]:
+            await store.write(upd)
+            client._queue_yjs_update("ws-burst", upd)
+        assert client._out_q.empty()
+        await asyncio.sleep(0.08)
+
+        assert client._out_q.qsize() == 1
+        msg = client._out_q.get_nowait()
+        Y.apply_update(hub_doc, base64.b64decode(msg["update_b64"]))
+        assert str(hub_doc.get_text("txt")) == "".join(str(i) for i in range(40))
+        merge = client.snapshot()["yjs_merge"]
+        assert merge["updates_in"] == len(updates) - 10
+        assert merge["messages_out"] == 1
+        assert merge["merge_ratio"] == float(len(updates) - 10)
+
+    asyncio.run(_run())
+
+
+def test_member_merge_windows_do_not_rebuild_the_doc(monkeypatch) -> None:
+    from adaos.services.subnet.link_client import MemberLinkClient
+
+    monkeypatch.setenv("ADAOS_SUBNET_YJS_MERGE_WINDOW_MS", "10")
+
+    async def _run() -> None:
+        client = MemberLinkClient()
+        store = get_ystore_for_webspace("ws-windows")
+        await store.start()
+        updates = _doc_updates(50)
+        hub_doc = Y.YDoc()
+        Y.apply_update(hub_doc, updates[0])
+        await store.write(updates[0])
+        client._yjs_hub_vectors["ws-windows"] = Y.encode_state_vector(hub_doc)
+
+        windows = range(1, len(updates), 7)
+        for start in windows:
+            window = updates[start : start + 7]
+            for upd in window:
+                await store.write(upd)
+            for upd in window:
+                client._queue_yjs_update("ws-windows", upd)
+            await _wait_for(lambda: client._out_q.qsize() == 1)
+            Y.apply_update(hub_doc, base64.b64decode(client._out_q.get_nowait()["update_b64"]))
+
+        assert str(hub_doc.get_text("txt")) == "".join(str(i) for i in range(50))
+        assert client.snapshot()["yjs_merge"]["merged_flushes"] == len(windows)
+        assert store.runtime_snapshot()["live_doc_rebuild_total"] == 1
+
+    asyncio.run(_run())
+
+
+def test_member_merge_flushes_raw_without_hub_vector_and_on_size_cap(monkeypatch) -> None:
+    from adaos.services.subnet.link_client import MemberLinkClient
+
+    monkeypatch.setenv("ADAOS_SUBNET_YJS_MERGE_WINDOW_MS", "500")
+    monkeypatch.setenv("ADAOS_SUBNET_YJS_MERGE_MAX_BYTES", "64")
+
+    async def _run() -> None:
+        client = MemberLinkClient()
+        store = get_ystore_for_webspace("ws-cap")
+        await store.start()
+        updates = _doc_updates(5)
+        for upd in updates:
+            await store.write(upd)
+            client._queue_yjs_update("ws-cap", upd)
+        await asyncio.sleep(0.02)
+        await client._flush_all_yjs_updates(reason="disconnect")
+
+        sent = []
+        while not client._out_q.empty():
+            sent.append(client._out_q.get_nowait())
+        replica = Y.YDoc()
+        for msg in sent:
+            Y.apply_update(replica, base64.b64decode(msg["update_b64"]))
+        assert str(replica.get_text("txt")) == "01234"
+        merge = client.snapshot()["yjs_merge"]
+        assert merge["cap_flushes"] >= 1
+        assert merge["pending_updates"] == 0
+        assert merge["raw_flushes"] >= 2
+        assert "ws-cap" not in client._yjs_hub_vectors
+
+    asyncio.run(_run())
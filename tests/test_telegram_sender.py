@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from adaos.integrations.telegram import sender as tg_sender
+from adaos.integrations.telegram.file_cache import TelegramFileIdCache
+from adaos.integrations.telegram.sender import TelegramSender
+from adaos.services.chat_io.interfaces import ChatOutputEvent, ChatOutputMessage
+from adaos.services.io_bus.rate_limit import AdaptiveRateLimiter
+
+
+class _FakeBotApi:
+    """Minimal Bot API: records every request, can answer 429 on demand."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.throttle: dict[str, int] = {}  # chat_id -> number of 429s to answer
+        self.uploads = 0
+        self._lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args) -> None:
+                return None
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                method = self.path.rsplit("/", 1)[-1]
+                multipart = self.headers.get("Content-Type", "").startswith("multipart/")
+                if multipart:
+                    text = body.decode("latin-1")
+                    chat_id = text.split('name="chat_id"', 1)[1].split("\r\n\r\n", 1)[1].split("\r\n", 1)[0]
+                    payload = {"chat_id": chat_id}
+                else:
+                    payload = json.loads(body or b"{}")
+                    chat_id = str(payload.get("chat_id"))
+                status, reply = api._answer(method, chat_id, payload, multipart)
+                with api._lock:
+                    api.requests.append(
+                        {"t": time.monotonic(), "method": method, "chat_id": chat_id, "upload": multipart, "port": self.client_address[1], "status": status}
+                    )
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _answer(self, method: str, chat_id: str, payload: dict, multipart: bool) -> tuple[int, dict]:
+        with self._lock:
+            if self.throttle.get(chat_id, 0) > 0:
+                self.throttle[chat_id] -= 1
+                return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+            if multipart:
+                self.uploads += 1
+                file_id = f"F{self.uploads}"
+            else:
+                file_id = None
+        field = {"sendVoice": "voice", "sendPhoto": "photo", "sendDocument": "document"}.get(method)
+        if field and not multipart:
+            if payload.get(field) == "stale":
+                return 400, {"ok": False, "description": "Bad Request: wrong file identifier"}
+            file_id = payload.get(field)
+        result: dict = {"message_id": len(self.requests) + 1}
+        if field:
+            result[field] = [{"file_id": file_id}] if field == "photo" else {"file_id": file_id}
+        return 200, {"ok": True, "result": result}
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "_FakeBotApi":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def bot_api():
+    with _FakeBotApi() as api:
+        yield api
+
+
+def _text(chat_id: str, text: str) -> ChatOutputEvent:
+    return ChatOutputEvent(target={"chat_id": chat_id}, messages=[ChatOutputMessage(type="text", text=text)])
+
+
+async def _send_all(sender: TelegramSender, events: list[ChatOutputEvent]) -> None:
+    try:
+        await asyncio.gather(*(sender.send(ev) for ev in events))
+    finally:
+        await tg_sender.aclose_shared_client()
+
+
+def test_global_and_per_chat_limits_over_pooled_connections(bot_api, tmp_path) -> None:
+    limiter = AdaptiveRateLimiter(global_rate=40.0, global_capacity=1, key_rate=10.0, key_capacity=1)
+    sender = TelegramSender("bot", token="T", api_base=bot_api.base, limiter=limiter, file_cache=TelegramFileIdCache(None))
+    events = [_text(chat, f"m{i}") for i in range(10) for chat in ("a", "b", "c")]
+
+    started = time.monotonic()
+    asyncio.run(_send_all(sender, events))
+    elapsed = time.monotonic() - started
+
+    assert len(bot_api.requests) == 30
+    times = sorted(r["t"] for r in bot_api.requests)
+    assert elapsed >= 29 / 40.0 * 0.9  # global 40/s
+    per_chat = sorted(r["t"] for r in bot_api.requests if r["chat_id"] == "a")
+    assert per_chat[-1] - per_chat[0] >= 9 / 10.0 * 0.9  # chat 10/s
+    assert times[-1] - times[0] < 3.0
+    assert len({r["port"] for r in bot_api.requests}) <= 8  # pooled keep-alive connections
+
+
+def test_retry_after_blocks_only_the_throttled_chat(bot_api) -> None:
+    limiter = AdaptiveRateLimiter(global_rate=100.0, global_capacity=10, key_rate=100.0, key_capacity=10)
+    sender = TelegramSender("bot", token="T", api_base=bot_api.base, limiter=limiter, file_cache=TelegramFileIdCache(None))
+    bot_api.throttle["slow"] = 1
+
+    asyncio.run(_send_all(sender, [_text("slow", "hi"), _text("fast", "hi")]))
+
+    slow = [r for r in bot_api.requests if r["chat_id"] == "slow"]
+    fast = [r for r in bot_api.requests if r["chat_id"] == "fast"]
+    assert [r["status"] for r in slow] == [429, 200]
+    assert slow[1]["t"] - slow[0]["t"] >= 0.9
+    assert fast[0]["t"] - slow[0]["t"] < 0.5
+    assert limiter.global_rate < 100.0  # adaptive slow-down after 429
+
+
+def test_media_is_uploaded_once_and_then_sent_by_file_id(bot_api, tmp_path) -> None:
+    voice = tmp_path / "reply.ogg"
+    voice.write_bytes(b"OggS" + b"\0" * 2048)
+    cache_path = tmp_path / "state" / "file_ids.json"
+    limiter = AdaptiveRateLimiter(global_rate=100.0, global_capacity=10, key_rate=100.0, key_capacity=10)
+
+    def _voice(chat: str) -> ChatOutputEvent:
+        return ChatOutputEvent(target={"chat_id": chat}, messages=[ChatOutputMessage(type="voice", audio_path=str(voice))])
+
+    sender = TelegramSender("bot", token="SECRET-TOKEN", api_base=bot_api.base, limiter=limiter, file_cache=TelegramFileIdCache(cache_path))
+    asyncio.run(_send_all(sender, [_voice("a")]))
+    asyncio.run(_send_all(sender, [_voice("b")]))
+    # A fresh sender (e.g. after restart) reuses the persisted file_id.
+    restarted = TelegramSender("bot", token="SECRET-TOKEN", api_base=bot_api.base, limiter=limiter, file_cache=TelegramFileIdCache(cache_path))
+    asyncio.run(_send_all(restarted, [_voice("c")]))
+    assert [r["upload"] for r in bot_api.requests] == [True, False, False]
+    assert "SECRET" not in cache_path.read_text(encoding="utf-8")
+
+    # A stale file_id is dropped and the file uploaded again.
+    cache = TelegramFileIdCache(cache_path)
+    digest = cache.digest(str(voice))
+    cache.put(restarted._bot, "voice", digest, "stale")
+    fixed = TelegramSender("bot", token="SECRET-TOKEN", api_base=bot_api.base, limiter=limiter, file_cache=cache)
+    asyncio.run(_send_all(fixed, [_voice("d")]))
+    assert [r["upload"] for r in bot_api.requests[3:]] == [False, True]
+    assert cache.get(fixed._bot, "voice", digest) == "F2"
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from adaos.adapters.audio.stt.vosk_pool import VoskModelRegistry
+
+
+class _StubModel:
+    def __init__(self, path: str) -> None:
+        time.sleep(0.2)  # a real model takes seconds
+        self.path = path
+
+
+class _StubRecognizer:
+    """Emits a final phrase whenever a chunk ends with b'.'."""
+
+    created = 0
+
+    def __init__(self, model: _StubModel, samplerate: int) -> None:
+        type(self).created += 1
+        self.model = model
+        self.samplerate = samplerate
+        self.words = None
+        self.buf = b""
+        self.resets = 0
+
+    def SetWords(self, value: bool) -> None:
+        self.words = value
+
+    def AcceptWaveform(self, chunk: bytes) -> bool:
+        self.buf += chunk
+        return chunk.endswith(b".")
+
+    def _take(self) -> str:
+        text, self.buf = self.buf.decode().strip(" ."), b""
+        return json.dumps({"text": text})
+
+    def Result(self) -> str:
+        return self._take()
+
+    def FinalResult(self) -> str:
+        return self._take()
+
+    def Reset(self) -> None:
+        self.resets += 1
+        self.buf = b""
+
+
+@pytest.fixture
+def registry() -> VoskModelRegistry:
+    _StubRecognizer.created = 0
+    return VoskModelRegistry(model_factory=_StubModel, recognizer_factory=_StubRecognizer, pool_size=2, wait_s=2.0, idle_ttl_s=60)
+
+
+def test_concurrent_sessions_share_one_model_and_reuse_recognizers(registry, tmp_path) -> None:
+    sessions = []
+    lock = threading.Lock()
+
+    def _open() -> None:
+        s = registry.open_session(tmp_path, words=True)
+        with lock:
+            sessions.append(s)
+
+    threads = [threading.Thread(target=_open) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert registry.loads == 1
+    assert sessions[0].model is sessions[1].model
+    assert sessions[0].recognizer is not sessions[1].recognizer
+    assert sessions[0].recognizer.words is True
+
+    # Pool is bounded: a third session waits until one is returned.
+    releaser = threading.Timer(0.2, sessions[0].close)
+    releaser.start()
+    started = time.monotonic()
+    third = registry.open_session(tmp_path, words=True)
+    assert time.monotonic() - started >= 0.15
+    assert third.recognizer is sessions[0].recognizer
+    assert third.recognizer.resets == 1
+    assert _StubRecognizer.created == 2
+
+    # Warm session start-up is (near) free: no model load, no new recognizer.
+    third.close()
+    started = time.monotonic()
+    with registry.open_session(tmp_path, words=True) as warm:
+        assert warm.accept(b"hello world.") == "hello world"
+    assert time.monotonic() - started < 0.05
+    sessions[1].close()
+
+    snap = registry.snapshot()["models"][str(tmp_path.resolve())]
+    assert snap["refs"] == 0
+    assert snap["pools"]["16000:1"]["created"] == 2
+    registry.evict_idle(ttl=0)
+    assert registry.snapshot()["models"] == {}
+
+
+def test_async_stream_feeds_chunks_inline(registry, tmp_path) -> None:
+    async def _pcm():
+        for chunk in (b"turn ", b"on.", b" the ", b"light"):
+            yield chunk
+
+    async def _run() -> tuple[list[str], set[str]]:
+        async with await registry.open_session_async(tmp_path) as session:
+            threads: set[str] = set()
+            phrases = []
+            async for text in session.transcribe_stream(_pcm()):
+                threads.add(threading.current_thread().name)
+                phrases.append(text)
+        async with await registry.open_session_async(tmp_path) as again:
+            assert await again.feed(b"x.") == "x"
+        return phrases, threads
+
+    phrases, threads = asyncio.run(_run())
+    assert phrases == ["turn on", "the light"]
+    assert threads == {threading.main_thread().name}
+    assert registry.loads == 1
+    assert _StubRecognizer.created == 1
+
+
+def test_failed_model_load_is_not_cached(tmp_path) -> None:
+    calls = []
+
+    def _broken(path: str):
+        calls.append(path)
+        raise OSError("bad model")
+
+    registry = VoskModelRegistry(model_factory=_broken, recognizer_factory=_StubRecognizer)
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="bad model"):
+            registry.open_session(tmp_path)
+    assert len(calls) == 2
+    assert registry.snapshot()["models"] == {}
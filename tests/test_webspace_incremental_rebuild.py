@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import y_py as Y
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.capacity import install_skill_in_capacity
+from adaos.services.scenario import webspace_runtime as webspace_runtime_module
+from adaos.services.scenario.webspace_runtime import WebspaceScenarioRuntime
+from adaos.services.scenario.webui_index import SkillWebuiIndex, get_webui_index, webspace_dependency_graph
+from adaos.services.workspaces import ensure_workspace, set_workspace_manifest
+
+
+def _write_webui(skill: str, apps: list[str]) -> Path:
+    path = Path(get_ctx().paths.skills_dir()) / skill / "webui.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "apps": [{"id": f"{skill}:{app}", "title": app} for app in apps],
+                "registry": {"modals": {f"{skill}_modal": {"title": skill}}},
+                "ydoc_defaults": {f"data/{skill}_state": {"ready": True}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_rebuild_only_writes_changed_subtrees_and_reuses_declarations() -> None:
+    skills = [f"skill_{i}" for i in range(12)]
+    for name in skills:
+        _write_webui(name, ["main"])
+        install_skill_in_capacity(name, "1.0.0")
+
+    ydoc = Y.YDoc()
+    updates: list[int] = []
+    ydoc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+    runtime = WebspaceScenarioRuntime(get_ctx())
+    index = get_webui_index(get_ctx())
+
+    entry = runtime._rebuild_in_doc(ydoc, "ws-a")
+    assert {a["id"] for a in entry.apps} >= {f"{name}:main" for name in skills}
+    assert index.misses == len(skills)
+    assert ydoc.get_map("data").get("skill_3_state") == {"ready": True}
+    first_writes = len([u for u in updates if u > 2])
+    assert first_writes == 1
+
+    # Nothing changed: the previous result is reused without reading
+    # declarations or comparing subtrees, and no Yjs update is produced.
+    updates.clear()
+    assert runtime._rebuild_in_doc(ydoc, "ws-a") == entry
+    assert (index.hits, index.misses) == (0, len(skills))
+    assert [u for u in updates if u > 2] == []
+    described = webspace_dependency_graph().describe("ws-a")
+    assert described["written"] == [] and described["unchanged_total"] == 1
+    assert "data/catalog" in described["skipped"]
+
+    # Someone else wrote to the doc: resolved again (declarations from the
+    # index), but every subtree is still equal and left alone.
+    with ydoc.begin_transaction() as txn:
+        ydoc.get_map("data").set(txn, "unrelated", {"x": 1})
+    updates.clear()
+    runtime._rebuild_in_doc(ydoc, "ws-a")
+    assert index.hits >= len(skills) and index.misses == len(skills)
+    assert [u for u in updates if u > 2] == []
+    assert webspace_dependency_graph().describe("ws-a")["written"] == []
+
+    # One skill gains an app: only that file is re-read, only catalog is rewritten.
+    _write_webui("skill_5", ["main", "extra"])
+    runtime._rebuild_in_doc(ydoc, "ws-a")
+    assert index.misses == len(skills) + 1
+    described = webspace_dependency_graph().describe("ws-a")
+    assert described["written"] == ["data/catalog"]
+    assert "skill_5:extra" in {a["id"] for a in ydoc.get_map("data").get("catalog")["apps"]}
+    assert "ws-a" in webspace_dependency_graph().webspaces_for_skill("skill_5")
+
+    # A skill without webui.json that gains one is picked up as well.
+    install_skill_in_capacity("skill_late", "1.0.0")
+    runtime._rebuild_in_doc(ydoc, "ws-a")
+    _write_webui("skill_late", ["main"])
+    runtime._rebuild_in_doc(ydoc, "ws-a")
+    assert "skill_late:main" in {a["id"] for a in ydoc.get_map("data").get("catalog")["apps"]}
+
+
+def test_preview_reload_is_skipped_only_when_no_project_file_changed(monkeypatch) -> None:
+    preview = "dev-incremental-preview"
+    ensure_workspace(preview)
+    set_workspace_manifest(preview, display_name="DEV: Preview", kind="dev", source_mode="workspace", home_scenario="demo_scenario")
+    project = Path(get_ctx().paths.skills_dir()) / "preview_skill"
+    project.mkdir(parents=True, exist_ok=True)
+    (project / "webui.json").write_text(json.dumps({"apps": []}), encoding="utf-8")
+    (project / "handlers.py").write_text("VALUE = 1\n", encoding="utf-8")
+
+    reloads: list[str] = []
+
+    async def _fake_reload(webspace_id: str, *, scenario_id: str | None = None, action: str = "reload") -> dict[str, object]:
+        reloads.append(webspace_id)
+        return {"ok": True}
+
+    monkeypatch.setattr(webspace_runtime_module, "reload_webspace_from_scenario", _fake_reload)
+    monkeypatch.setattr(
+        webspace_runtime_module.scenarios_loader,
+        "read_manifest",
+        lambda scenario_id, *, space="workspace": {"depends": ["preview_skill"]},
+    )
+
+    def _reload() -> dict:
+        return asyncio.run(webspace_runtime_module.reload_preview_webspaces_for_project("skill", "preview_skill"))
+
+    assert _reload()["reloaded_webspaces"] == [preview]
+    result = _reload()
+    assert (result["reloaded_webspaces"], result["unchanged_webspaces"]) == ([], [preview])
+
+    # webui.json is untouched, but the handler changed: the preview must reload.
+    (project / "handlers.py").write_text("VALUE = 22\n", encoding="utf-8")
+    assert _reload()["reloaded_webspaces"] == [preview]
+    (project / "skill.yaml").write_text("name: preview_skill\n", encoding="utf-8")
+    assert _reload()["reloaded_webspaces"] == [preview]
+    assert reloads == [preview, preview, preview]
+
+
+def test_declaration_index_survives_restart(tmp_path) -> None:
+    path = _write_webui("persisted", ["main"])
+    store = tmp_path / "webui_index.json"
+    first = SkillWebuiIndex(store)
+    decl, _fp = first.lookup("persisted", "default", path)
+    first.flush()
+
+    reopened = SkillWebuiIndex(store)
+    again, _fp = reopened.lookup("persisted", "default", path)
+    assert again == decl
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+    path.write_text(path.read_text(encoding="utf-8").replace("main", "other!"), encoding="utf-8")
+    changed, _fp = reopened.lookup("persisted", "default", path)
+    assert changed["apps"][0]["id"] == "persisted:other!"
+    assert reopened.misses == 1
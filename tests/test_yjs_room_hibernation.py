@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import y_py as Y
+
+from adaos.services.yjs import gateway_ws as gateway_module
+from adaos.services.yjs.store import _YSTORE_CACHE, get_ystore_for_webspace, ystore_path_for_webspace
+
+
+class _FakeRoom:
+    def __init__(self, ystore, *, clients: list | None = None) -> None:
+        self.ystore = ystore
+        self.clients = list(clients or [])
+        self.stopped = False
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+class _Scheduler:
+    def __init__(self) -> None:
+        self.deleted: list[str] = []
+
+    async def delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+
+def _text_update(text: str, ydoc: Y.YDoc | None = None) -> bytes:
+    doc = ydoc or Y.YDoc()
+    before = Y.encode_state_vector(doc)
+    with doc.begin_transaction() as txn:
+        doc.get_text("txt").extend(txn, text)
+    return Y.encode_state_as_update(doc, before)
+
+
+def _read_text(store) -> str:
+    async def _load() -> str:
+        ydoc = Y.YDoc()
+        await store.apply_updates(ydoc)
+        return str(ydoc.get_text("txt"))
+
+    return asyncio.run(_load())
+
+
+def test_idle_room_is_snapshotted_evicted_and_restored(monkeypatch) -> None:
+    scheduler = _Scheduler()
+    monkeypatch.setattr(gateway_module, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(gateway_module.y_server, "rooms", {})
+
+    webspace_id = "hibernate-idle"
+    store = get_ystore_for_webspace(webspace_id)
+    doc = Y.YDoc()
+    asyncio.run(store.write(_text_update("hello", doc)))
+    room = _FakeRoom(store)
+    gateway_module.y_server.rooms[webspace_id] = room
+    gateway_module._note_room_activity(webspace_id, now=time.time() - 3600)
+    store._last_write_at = time.time() - 3600
+
+    memory = gateway_module.yjs_room_memory_snapshot()
+    assert memory["webspaces"][webspace_id]["update_log_bytes"] > 0
+
+    result = asyncio.run(gateway_module.hibernate_idle_rooms(idle_s=60.0))
+
+    assert result["hibernated"] == [webspace_id]
+    assert webspace_id not in gateway_module.y_server.rooms
+    assert webspace_id not in _YSTORE_CACHE
+    assert room.stopped is True
+    assert scheduler.deleted == [f"ystores.backup.{webspace_id}"]
+    assert ystore_path_for_webspace(webspace_id).exists()
+    snapshot = gateway_module.yjs_room_memory_snapshot()
+    assert webspace_id in snapshot["hibernated"]
+    assert snapshot["stats"]["freed_bytes_total"] > 0
+
+    # A write that lands before any read must not shadow the disk snapshot.
+    restored = get_ystore_for_webspace(webspace_id)
+    asyncio.run(restored.write(_text_update(" world", doc)))
+    assert _read_text(restored) == "hello world"
+
+
+def test_rooms_with_clients_or_recent_writes_stay_loaded(monkeypatch) -> None:
+    monkeypatch.setattr(gateway_module, "get_scheduler", lambda: _Scheduler())
+    monkeypatch.setattr(gateway_module.y_server, "rooms", {})
+
+    busy_store = get_ystore_for_webspace("hibernate-busy")
+    fresh_store = get_ystore_for_webspace("hibernate-fresh")
+    asyncio.run(busy_store.write(_text_update("a")))
+    asyncio.run(fresh_store.write(_text_update("b")))
+    gateway_module.y_server.rooms["hibernate-busy"] = _FakeRoom(busy_store, clients=[object()])
+    gateway_module.y_server.rooms["hibernate-fresh"] = _FakeRoom(fresh_store)
+    busy_store._last_write_at = time.time() - 3600
+
+    result = asyncio.run(gateway_module.hibernate_idle_rooms(idle_s=60.0))
+
+    assert result["hibernated"] == []
+    assert set(gateway_module.y_server.rooms) == {"hibernate-busy", "hibernate-fresh"}
+    assert asyncio.run(gateway_module.hibernate_room("hibernate-busy"))["error"] == "room_has_clients"
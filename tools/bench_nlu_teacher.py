@@ -0,0 +1,130 @@
+"""Benchmark for NLU teacher LLM round trips under a burst of unresolved utterances.
+
+A fake root LLM endpoint answers after ``--latency-ms`` (plus a small per-utterance
+cost for batched prompts). A burst of ``--utterances`` arrives at once, a share of
+them (``--dup``) repeating earlier phrases with different casing/punctuation.
+
+  - direct:  one call per utterance (previous behaviour), same concurrency limit,
+  - gateway: TeacherGateway (single-flight, micro-batching, response cache),
+  - warm:    the same burst again through the gateway (served from the cache).
+
+Reports LLM calls, total wall time and p50/p95 latency per utterance.
+
+Usage: python tools/bench_nlu_teacher.py [--utterances 40] [--dup 0.3] [--latency-ms 400]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+def _burst(count: int, dup: float) -> list:
+    rnd = random.Random(3)
+    base: list = []
+    out = []
+    for i in range(count):
+        if base and rnd.random() < dup:
+            out.append(rnd.choice(base).upper() + "!")
+        else:
+            phrase = f"покажи погоду в городе {i}"
+            base.append(phrase)
+            out.append(phrase)
+    return out
+
+
+class _Endpoint:
+    def __init__(self, latency_s: float, per_item_s: float) -> None:
+        self.latency_s = latency_s
+        self.per_item_s = per_item_s
+        self.calls = 0
+
+    async def __call__(self, messages, request_id):
+        self.calls += 1
+        user = json.loads(messages[-1]["content"])
+        items = user.get("requests") or [dict(user["request"], index=0)]
+        await asyncio.sleep(self.latency_s + self.per_item_s * len(items))
+        results = [{"index": r["index"], "decision": "ignore", "confidence": 0.1} for r in items]
+        text = json.dumps({"results": results} if "requests" in user else results[0])
+        return {"output": [{"content": [{"type": "output_text", "text": text}]}]}
+
+
+def _pct(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _timed(coros: list) -> tuple:
+    lat: list = []
+
+    async def _one(coro) -> None:
+        t0 = time.perf_counter()
+        await coro
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_one(c) for c in coros))
+    return time.perf_counter() - t0, lat
+
+
+async def _run(args) -> None:
+    from adaos.services.nlu.llm_teacher_gateway import TeacherGateway, TeacherResponseCache
+    from adaos.services.nlu.llm_teacher_runtime import _build_batch_prompt, _build_prompt, _extract_first_output_text
+
+    texts = _burst(args.utterances, args.dup)
+    context = {"current_scenario": "web_desktop", "skills": ["weather_skill"]}
+    latency_s = args.latency_ms / 1000.0
+
+    endpoint = _Endpoint(latency_s, args.per_item_ms / 1000.0)
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def _direct(i: int, text: str) -> None:
+        async with limit:
+            await endpoint(_build_prompt(request={"text": text, "request_id": f"r{i}"}, webspace_id="ws", context=context), f"r{i}")
+
+    wall, lat = await _timed([_direct(i, t) for i, t in enumerate(texts)])
+    print(f"direct   {endpoint.calls:4d} calls  {wall:6.2f}s wall  p50 {_pct(lat, 0.5):5.2f}s  p95 {_pct(lat, 0.95):5.2f}s")
+
+    endpoint = _Endpoint(latency_s, args.per_item_ms / 1000.0)
+    gateway = TeacherGateway(
+        call=endpoint,
+        build_single=_build_prompt,
+        build_batch=_build_batch_prompt,
+        extract_text=_extract_first_output_text,
+        cache=TeacherResponseCache(None),
+        concurrency=args.concurrency,
+        batch_max=args.batch_max,
+    )
+    for name in ("gateway", "warm"):
+        calls0 = endpoint.calls
+        wall, lat = await _timed(
+            [
+                gateway.suggest(request={"text": t, "request_id": f"r{i}"}, webspace_id="ws", context=context, fingerprint="fp")
+                for i, t in enumerate(texts)
+            ]
+        )
+        print(
+            f"{name:<8} {endpoint.calls - calls0:4d} calls  {wall:6.2f}s wall  "
+            f"p50 {_pct(lat, 0.5):5.2f}s  p95 {_pct(lat, 0.95):5.2f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, default=40)
+    parser.add_argument("--dup", type=float, default=0.3)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--per-item-ms", type=float, default=40.0)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--batch-max", type=int, default=8)
+    args = parser.parse_args()
+    print(
+        f"{args.utterances} utterances, dup {args.dup:.0%}, latency {args.latency_ms:.0f}ms "
+        f"+{args.per_item_ms:.0f}ms/item, concurrency {args.concurrency}"
+    )
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark for NLU teacher state writes as the history grows.
+
+Replays ``--requests`` teacher requests, each producing the usual record mix
+(3 events, an LLM log appended then patched, a candidate), against an
+in-memory Yjs document and a temporary store directory, two ways:
+
+  - legacy: read the whole ``nlu_teacher`` value, copy the lists, rebuild all
+            derived views, write the whole value back; the store snapshot is
+            rewritten on candidate changes (previous behaviour),
+  - record: teacher_state sessions (per-record Y array ops, per-request
+            views, journal with periodic compaction).
+
+Reports CPU microseconds and Yjs update bytes per op for the first and the
+last 10% of the run, CPU per op for every tenth of the run (the record
+path should stay flat once the collections reached their limits), and the
+bytes written to disk. The default 2000 requests are 12000 ops.
+
+Usage: python tools/bench_nlu_teacher_state.py [--requests 2000] [--record-only]
+"""
+
+import argparse
+import asyncio
+import inspect
+import tempfile
+import time
+from pathlib import Path
+
+import y_py as Y
+
+from adaos.services.nlu import teacher_state, teacher_store
+from adaos.services.nlu.teacher_events import rebuild_events_by_candidate
+from adaos.services.nlu.ycoerce import coerce_dict, iter_mappings
+
+
+def _ops(requests: int) -> list:
+    out = []
+    for n in range(requests):
+        rid = f"nlu.{n}"
+        text = f"покажи погоду в городе {n}"
+        for k, kind in enumerate(("request", "not_obtained", "llm.request")):
+            out.append(("append", "events", {"id": f"evt.{n}.{k}", "ts": n + k / 10, "request_id": rid, "request_text": text, "kind": kind, "title": kind}))
+        out.append(("append", "llm_logs", {"id": f"llm.{n}", "ts": float(n), "request_id": rid, "status": "pending", "request": {"text": text}}))
+        out.append(("patch", "llm_logs", f"llm.{n}", {"status": "ok", "response": {"decision": "propose_skill", "confidence": 0.7}}))
+        out.append(("append", "candidates", {"id": f"cand.{n}", "ts": float(n), "request_id": rid, "text": text, "kind": "skill", "status": "pending", "candidate": {"name": f"city_{n}"}}))
+    return out
+
+
+def _doc() -> tuple:
+    doc = Y.YDoc()
+    updates: list = []
+    doc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+    return doc, updates
+
+
+def _legacy(doc, op: tuple, written: list) -> None:
+    data_map = doc.get_map("data")
+    teacher = coerce_dict(data_map.get("nlu_teacher"))
+    kind, coll = op[0], op[1]
+    items = [dict(x) for x in iter_mappings(teacher.get(coll))]
+    if kind == "append":
+        items.append(dict(op[2]))
+    else:
+        for item in items:
+            if item.get("id") == op[2]:
+                item.update(op[3])
+    limit = teacher_state.COLLECTION_LIMITS[coll]
+    teacher[coll] = items[-limit:]
+    rebuild_events_by_candidate(teacher)
+    with doc.begin_transaction() as txn:
+        data_map.set(txn, "nlu_teacher", teacher)
+    if coll == "candidates":
+        teacher_store.save_teacher_state(webspace_id="legacy", teacher=teacher)
+        written.append(teacher_store.teacher_state_path("legacy").stat().st_size)
+
+
+async def _record(doc, op: tuple) -> None:
+    async with teacher_state._journaled_session("record", doc) as teacher:
+        if op[0] == "append":
+            teacher.append(op[1], op[2])
+        else:
+            teacher.patch(op[1], op[2], op[3])
+
+
+def _run(name: str, step, ops: list) -> None:
+    doc, updates = _doc()
+    cpu: list = []
+
+    async def _loop() -> None:
+        for op in ops:
+            t0 = time.process_time()
+            res = step(doc, op)
+            if inspect.isawaitable(res):
+                await res
+            cpu.append(time.process_time() - t0)
+
+    asyncio.run(_loop())
+    tenth = max(1, len(ops) // 10)
+    head_us = sum(cpu[:tenth]) / tenth * 1e6
+    tail_us = sum(cpu[-tenth:]) / tenth * 1e6
+    head_b = sum(updates[:tenth]) / tenth
+    tail_b = sum(updates[-tenth:]) / tenth
+    print(
+        f"{name:<7} cpu/op {head_us:8.0f}us -> {tail_us:8.0f}us   "
+        f"update/op {head_b:8.0f}B -> {tail_b:8.0f}B   total {sum(cpu):6.2f}s"
+    )
+    tenths = [sum(cpu[i * tenth : (i + 1) * tenth]) / tenth * 1e6 for i in range(len(ops) // tenth)]
+    print(f"{'':<7} cpu/op by tenth " + " ".join(f"{us:6.0f}" for us in tenths[:10]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--record-only", action="store_true", help="skip the (slow) legacy replay")
+    args = parser.parse_args()
+    ops = _ops(args.requests)
+    print(f"{args.requests} requests, {len(ops)} teacher ops")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        teacher_store._state_dir = lambda: root
+        journal_bytes = 0
+        real_append = teacher_store.append_teacher_journal
+
+        def _counting_append(*, webspace_id: str, ops: list) -> int:
+            nonlocal journal_bytes
+            path = teacher_store.teacher_journal_path(webspace_id)
+            before = path.stat().st_size if path.exists() else 0
+            pending = real_append(webspace_id=webspace_id, ops=ops)
+            journal_bytes += (path.stat().st_size if path.exists() else 0) - before
+            return pending
+
+        snapshots: list = []
+        real_save = teacher_store.save_teacher_state
+
+        def _counting_save(*, webspace_id: str, teacher) -> None:
+            real_save(webspace_id=webspace_id, teacher=teacher)
+            snapshots.append(teacher_store.teacher_state_path(webspace_id).stat().st_size)
+
+        teacher_state.append_teacher_journal = _counting_append
+        teacher_state.save_teacher_state = _counting_save
+
+        legacy_written: list = []
+        if not args.record_only:
+            _run("legacy", lambda doc, op: _legacy(doc, op, legacy_written), ops)
+        _run("record", _record, ops)
+        print(
+            f"disk    legacy {sum(legacy_written) / 1048576:7.1f} MB in {len(legacy_written)} snapshots   "
+            f"record {(journal_bytes + sum(snapshots)) / 1048576:7.1f} MB (journal + {len(snapshots)} compactions)"
+        )
+
+
+if __name__ == "__main__":
+    main()
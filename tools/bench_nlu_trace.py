@@ -0,0 +1,122 @@
+"""Benchmark for NLU trace recording.
+
+Replays ``--utterances`` utterances (detect.request + detected/not_obtained
+each) arriving at ``--rate`` per second against an in-memory Yjs document,
+two ways:
+
+  - legacy: read ``data.nlu_trace.items``, append, truncate to
+            ``--window`` and write the whole list back per event
+            (previous behaviour),
+  - ring:   TraceStore ring per webspace, summary of the last
+            ``--summary`` items projected once per ``--interval-s`` of
+            simulated time.
+
+Reports CPU microseconds and Yjs update bytes per event for the first and
+the last 10% of the run.
+
+Usage: python tools/bench_nlu_trace.py [--utterances 5000] [--rate 20]
+"""
+
+import argparse
+import time
+
+import y_py as Y
+
+from adaos.services.nlu.trace_store import TraceStore
+
+
+def _events(count: int) -> list:
+    out = []
+    for n in range(count):
+        rid = f"nlu.{n}"
+        text = f"покажи погоду в городе {n}"
+        meta = {"webspace_id": "ws", "device_id": "dev-1", "trace_id": f"t{n}"}
+        out.append({"type": "nlp.intent.detect.request", "text": text, "request_id": rid, "_meta": meta})
+        if n % 4:
+            out.append({"type": "nlp.intent.detected", "text": text, "intent": "desktop.open_weather", "confidence": 0.9, "slots": {"city": str(n)}, "via": "regex", "request_id": rid, "_meta": meta})
+        else:
+            out.append({"type": "nlp.intent.not_obtained", "text": text, "reason": "no_match", "via": "pipeline", "request_id": rid, "_meta": meta})
+    return out
+
+
+def _doc() -> tuple:
+    doc = Y.YDoc()
+    updates: list = []
+    doc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+    return doc, updates
+
+
+def _report(name: str, cpu: list, update_bytes: list) -> None:
+    tenth = max(1, len(cpu) // 10)
+    head_us = sum(cpu[:tenth]) / tenth * 1e6
+    tail_us = sum(cpu[-tenth:]) / tenth * 1e6
+    head_b = sum(update_bytes[:tenth]) / tenth
+    tail_b = sum(update_bytes[-tenth:]) / tenth
+    print(
+        f"{name:<7} cpu/event {head_us:7.0f}us -> {tail_us:7.0f}us   "
+        f"yjs/event {head_b:8.0f}B -> {tail_b:8.0f}B   total {sum(update_bytes) / 1048576:7.1f} MB"
+    )
+
+
+def _legacy(events: list, window: int) -> None:
+    doc, updates = _doc()
+    data_map = doc.get_map("data")
+    cpu: list = []
+    per_event: list = []
+    for i, item in enumerate(events):
+        t0 = time.process_time()
+        current = data_map.get("nlu_trace")
+        items = list(current.get("items") or []) if isinstance(current, dict) else []
+        items.append(dict(item, ts=i * 0.025))
+        items = items[-window:]
+        with doc.begin_transaction() as txn:
+            data_map.set(txn, "nlu_trace", {"items": items})
+        cpu.append(time.process_time() - t0)
+        per_event.append(updates[-1])
+    _report("legacy", cpu, per_event)
+
+
+def _ring(events: list, window: int, summary: int, per_interval: int) -> None:
+    from adaos.services.scenario.projection_writes import write_path
+
+    doc, updates = _doc()
+    store = TraceStore(max_items=window)
+    cpu: list = []
+    per_event: list = []
+    for i, item in enumerate(events):
+        t0 = time.process_time()
+        store.append("ws", dict(item, ts=i * 0.025))
+        written = 0
+        if i % per_interval == per_interval - 1:
+            # One throttled projection per interval, its cost spread over the events in it.
+            n0 = len(updates)
+            with doc.begin_transaction() as txn:
+                write_path(doc, txn, ("data", "nlu_trace"), store.summary("ws", items=summary))
+            written = sum(updates[n0:])
+        cpu.append(time.process_time() - t0)
+        per_event.append(written)
+    # Amortize the projection over its interval.
+    spread = []
+    for start in range(0, len(per_event), per_interval):
+        chunk = per_event[start : start + per_interval]
+        spread.extend([sum(chunk) / len(chunk)] * len(chunk))
+    _report("ring", cpu, spread)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=20.0, help="events per second")
+    parser.add_argument("--window", type=int, default=200, help="legacy Yjs window / ring size")
+    parser.add_argument("--summary", type=int, default=20)
+    parser.add_argument("--interval-s", type=float, default=1.0)
+    args = parser.parse_args()
+    events = _events(args.utterances)
+    per_interval = max(1, int(args.rate * args.interval_s))
+    print(f"{len(events)} trace events, {args.rate:.0f}/s, window {args.window}, summary {args.summary} every {args.interval_s}s")
+    _legacy(events, args.window)
+    _ring(events, args.window, args.summary, per_interval)
+
+
+if __name__ == "__main__":
+    main()
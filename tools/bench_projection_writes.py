@@ -0,0 +1,100 @@
+"""Benchmark for Yjs projection writes.
+
+Simulates ``--skills`` skills publishing a snapshot projection (``--entries``
+nested entries each) ``--rounds`` times, with one entry changing per publish
+and all skills publishing concurrently, three ways:
+
+  - legacy:     one transaction per write, whole value replaced (old behaviour),
+  - coalesced:  ProjectionWriter, plain JSON values (default targets),
+  - structural: ProjectionWriter with ``structural: true`` targets.
+
+Reports Yjs transactions and update bytes.
+
+Usage: python tools/bench_projection_writes.py [--skills 20] [--entries 50] [--rounds 50]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import y_py as Y
+
+from adaos.services.scenario import projection_writes
+from adaos.services.scenario.projection_writes import ProjectionWriter
+
+
+def _snapshot(entries: int, skill: int, round_no: int) -> dict:
+    items = {f"item{i}": {"value": 0, "label": f"skill {skill} item {i}"} for i in range(entries)}
+    items[f"item{round_no % entries}"]["value"] = round_no
+    return {"items": items, "updated": round_no}
+
+
+def _doc() -> tuple[Y.YDoc, list[int]]:
+    doc = Y.YDoc()
+    updates: list[int] = []
+    doc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+    return doc, updates
+
+
+def _legacy(args) -> tuple[int, int, float]:
+    doc, updates = _doc()
+    started = time.perf_counter()
+    for round_no in range(args.rounds):
+        for skill in range(args.skills):
+            payload = json.loads(json.dumps(_snapshot(args.entries, skill, round_no)))
+            with doc.begin_transaction() as txn:
+                # legacy nested path: data/<skill>/snapshot -> data[<skill>] = {"snapshot": ...}
+                doc.get_map("data").set(txn, f"skill{skill}", {"snapshot": payload})
+    return len(updates), sum(updates), time.perf_counter() - started
+
+
+def _coalesced(args, *, structural: bool) -> tuple[int, int, float]:
+    doc, updates = _doc()
+
+    def _mutate(webspace_id, mutator):
+        with doc.begin_transaction() as txn:
+            mutator(doc, txn)
+        return True
+
+    projection_writes.mutate_live_room = _mutate
+    writer = ProjectionWriter(window_ms=0)
+
+    async def _run() -> None:
+        for round_no in range(args.rounds):
+            await asyncio.gather(
+                *(
+                    writer.submit(
+                        "bench",
+                        ["data", f"skill{skill}", "snapshot"],
+                        _snapshot(args.entries, skill, round_no),
+                        structural=structural,
+                    )
+                    for skill in range(args.skills)
+                )
+            )
+
+    started = time.perf_counter()
+    asyncio.run(_run())
+    return writer.stats["transactions"], sum(updates), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.skills} skills x {args.entries} entries x {args.rounds} rounds")
+    for name, fn in (
+        ("legacy", lambda: _legacy(args)),
+        ("coalesced", lambda: _coalesced(args, structural=False)),
+        ("structural", lambda: _coalesced(args, structural=True)),
+    ):
+        txns, size, elapsed = fn()
+        print(f"{name:<11} {txns:6d} transactions  {size:10d} update bytes  {elapsed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
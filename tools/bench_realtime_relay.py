@@ -0,0 +1,108 @@
+"""Load test for the realtime sidecar relay against a deliberately slow remote.
+
+A local client floods ``--mb`` megabytes of NATS protocol lines through the
+sidecar while the fake remote websocket accepts ``--remote-kbps`` KB/s.
+The run is repeated with the relay budget effectively unlimited, which is
+what the old unbounded queues did.
+
+Reports peak traced memory, peak queued bytes and the worst time a frame
+waited in the relay.
+
+Usage: python tools/bench_realtime_relay.py [--mb 32] [--remote-kbps 8192]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+class _SlowRemoteWS:
+    def __init__(self, bytes_per_s: float) -> None:
+        self.bytes_per_s = bytes_per_s
+        self.received = 0
+        self.closed = False
+        self.transport = None
+        self._recv: asyncio.Queue = asyncio.Queue()
+
+    async def recv(self) -> bytes:
+        return await self._recv.get()
+
+    async def send(self, payload: bytes) -> None:
+        await asyncio.sleep(len(payload) / self.bytes_per_s)
+        self.received += len(payload)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def wait_closed(self) -> None:
+        return None
+
+
+async def _run(total: int, bytes_per_s: float, max_bytes: int) -> dict:
+    import websockets  # type: ignore
+
+    from adaos.services.realtime_sidecar import RealtimeSidecarServer
+
+    os.environ["ADAOS_REALTIME_RELAY_MAX_BYTES"] = str(max_bytes)
+    os.environ["ADAOS_REALTIME_RELAY_MAX_FRAMES"] = str(1 << 30)
+    remote = _SlowRemoteWS(bytes_per_s)
+
+    async def _connect(*args, **kwargs):
+        return remote
+
+    websockets.connect = _connect
+    server = RealtimeSidecarServer(host="127.0.0.1", port=0)
+    await server.start()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        _, writer = await asyncio.open_connection(server.listen_host, server.listen_port)
+        line = b"PUB bench.subject 64\r\n" + b"x" * 64 + b"\r\n"
+        block = line * (65536 // len(line))
+        sent = 0
+        while sent < total:
+            writer.write(block)
+            await writer.drain()
+            sent += len(block)
+        while remote.received < sent:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        relay = server._diag_snapshot()["relay"]["to_remote"]
+        writer.close()
+    finally:
+        tracemalloc.stop()
+        await server.close()
+    return {"elapsed": elapsed, "peak_mem": peak, "relay": relay}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=32.0)
+    parser.add_argument("--remote-kbps", type=float, default=8192.0)
+    args = parser.parse_args()
+    total = int(args.mb * 1024 * 1024)
+    bytes_per_s = args.remote_kbps * 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ADAOS_REALTIME_DIAG_FILE"] = os.path.join(tmp, "diag.jsonl")
+        os.environ["ADAOS_REALTIME_LOG"] = os.path.join(tmp, "sidecar.log")
+        os.environ["ADAOS_REALTIME_ENABLE"] = "1"
+        os.environ["ADAOS_REALTIME_REMOTE_WS_URL"] = "wss://example.invalid/nats"
+        os.environ["ADAOS_REALTIME_NATS_PING_S"] = "0"
+        print(f"{args.mb:.0f} MB through a {args.remote_kbps:.0f} KB/s remote")
+        for name, max_bytes in (("bounded", 4 * 1024 * 1024), ("unbounded", 1 << 40)):
+            res = asyncio.run(_run(total, bytes_per_s, max_bytes))
+            relay = res["relay"]
+            print(
+                f"{name:<10} {res['elapsed']:6.2f}s  peak mem {res['peak_mem'] / 1048576:7.1f} MB  "
+                f"peak queued {relay['peak_bytes'] / 1048576:7.1f} MB  "
+                f"max relay latency {relay['latency_ms_max']:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark for the reliability snapshot and its delta API.
+
+Fills the runtime state to its history limits (128 channel transitions per
+channel, 64 transport events, a few dozen protocol subscriptions), then
+measures:
+
+  - uncached:  reliability_snapshot() with every memo (channel
+               diagnostics, readiness tree, degraded matrix, member
+               channels, sidecar listener probe) dropped before every call
+               (old behaviour),
+  - cached:    reliability_snapshot() with memoized sub-snapshots,
+  - delta:     reliability_snapshot_delta() for a client that already holds
+               the current version (idle node polling),
+  - delta+mut: the same after one route incident per call.
+
+Reports milliseconds per call and the delta payload size.
+
+Usage: python tools/bench_reliability_snapshot.py [--calls 200]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("ADAOS_TESTING", "1")
+        os.environ.setdefault("ADAOS_RELIABILITY_DELTA_REFRESH_S", "2")
+        from adaos.apps.bootstrap import init_ctx
+        from adaos.services import reliability as rel
+        from adaos.services.settings import Settings
+
+        init_ctx(Settings.from_sources().with_overrides(base_dir=tmp))
+        for i in range(200):
+            (rel.mark_root_control_up if i % 2 else rel.mark_root_control_down)(details={"kind": "ws", "i": i})
+            (rel.mark_route_ready if i % 3 else rel.mark_route_degraded)(details={"i": i})
+            rel.note_route_incident(status="late_reply", summary="late reply", details={"t": "http", "i": i})
+            rel.record_hub_root_transport_event("connected" if i % 2 else "connect_failed", server="wss://root/nats")
+        for i in range(40):
+            rel.observe_hub_root_protocol_subscription(f"hub.control.s{i}", qsize=i, dispatched=True)
+            rel.observe_hub_root_protocol_publish(f"route.to_hub.s{i}", ok=bool(i % 5))
+        kw = dict(
+            node_id="node-1",
+            subnet_id="sn_1",
+            role="hub",
+            local_ready=True,
+            node_state="ready",
+            draining=False,
+            route_mode="hub",
+            connected_to_hub=None,
+        )
+
+        def _uncached() -> None:
+            rel._CHANNEL_DIAG_CACHE["base"] = None
+            rel._READINESS_TREE_CACHE["value"] = None
+            rel._DEGRADED_MATRIX_CACHE["value"] = None
+            rel._MEMBER_CHANNELS_CACHE["base"] = None
+            rel._SIDECAR_PROBE_CACHE["value"] = None
+            rel.reliability_snapshot(**kw)
+
+        def _cached() -> None:
+            rel.reliability_snapshot(**kw)
+
+        head = rel.reliability_snapshot_delta(**kw)
+        full_bytes = len(json.dumps(head, default=str))
+        sizes: list[int] = []
+
+        def _delta() -> None:
+            out = rel.reliability_snapshot_delta(since=head["version"], epoch=head["epoch"], **kw)
+            sizes.append(len(json.dumps(out, default=str)))
+
+        state = {"version": head["version"]}
+
+        def _delta_mut() -> None:
+            rel.note_route_incident(status="publish_fail", summary="publish failed")
+            out = rel.reliability_snapshot_delta(since=state["version"], epoch=head["epoch"], **kw)
+            state["version"] = out["version"]
+            sizes.append(len(json.dumps(out, default=str)))
+
+        print(f"{args.calls} calls, full snapshot {full_bytes / 1024:.1f} KB")
+        for name, fn in (("uncached", _uncached), ("cached", _cached), ("delta", _delta), ("delta+mut", _delta_mut)):
+            sizes.clear()
+            fn()
+            started = time.perf_counter()
+            for _ in range(args.calls):
+                fn()
+            ms = (time.perf_counter() - started) / args.calls * 1e3
+            extra = f"  {sum(sizes) / max(1, len(sizes)) / 1024:7.1f} KB/response" if sizes else ""
+            print(f"{name:<10} {ms:9.3f} ms/call{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark for WS tunnel framing over the hub->root route channel.
+
+Pushes a Yjs-like frame mix (mostly 40-400 byte updates, every 50th frame a
+32 KB state chunk) from the hub side of a tunnel to a root stand-in over a
+loopback "NATS" whose publish costs ``--publish-us`` on the event loop.
+
+  - json:   legacy envelopes (base64 + JSON, one awaited publish per frame),
+            decoded on the root side like the proxy does,
+  - binary: adt1 TunnelSession on both ends (batching, acks, credit).
+
+Reports frames/s, MB/s of payload, CPU microseconds per frame and the number
+of NATS messages.
+
+Usage: python tools/bench_route_tunnel.py [--frames 20000] [--publish-us 150]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+
+
+class _LoopbackNats:
+    """Delivers published messages to one subscriber, in order, after a fixed cost."""
+
+    def __init__(self, publish_s: float, deliver) -> None:
+        self.publish_s = publish_s
+        self.deliver = deliver
+        self.messages = 0
+
+    async def publish(self, subject: str, payload: bytes) -> None:
+        self.messages += 1
+        if self.publish_s:
+            await asyncio.sleep(self.publish_s)
+        await self.deliver(payload)
+
+
+def _frames(count: int) -> list:
+    rnd = random.Random(7)
+    out = []
+    for i in range(count):
+        size = 32 * 1024 if i % 50 == 49 else rnd.randint(40, 400)
+        out.append(rnd.randbytes(size))
+    return out
+
+
+async def _run_json(frames: list, publish_s: float) -> dict:
+    from adaos.services.route_tunnel import json_frame_envelopes
+
+    got = []
+
+    async def _root(payload: bytes) -> None:
+        msg = json.loads(payload.decode("utf-8"))
+        got.append(base64.b64decode(msg["data_b64"]))
+
+    nc = _LoopbackNats(publish_s, _root)
+    for frame in frames:
+        for env in json_frame_envelopes(frame, max_chunk=300_000):
+            # Mirrors _route_reply: dumps for the publish and again for the byte counter.
+            await nc.publish("route.v2.to_browser.x", json.dumps(env, ensure_ascii=False).encode("utf-8"))
+            len(json.dumps(env, ensure_ascii=False).encode("utf-8"))
+    assert got == frames
+    return {"messages": nc.messages}
+
+
+async def _run_binary(frames: list, publish_s: float) -> dict:
+    from adaos.services.route_tunnel import TunnelSession
+
+    got = []
+    hub: TunnelSession
+    root: TunnelSession
+
+    async def _to_root(payload: bytes) -> None:
+        got.extend(root.receive(payload))
+
+    async def _to_hub(payload: bytes) -> None:
+        hub.receive(payload)
+
+    nc_up = _LoopbackNats(publish_s, _to_root)
+    nc_down = _LoopbackNats(publish_s, _to_hub)
+    hub = TunnelSession(lambda blob: nc_up.publish("route.v2.to_browser.x", blob))
+    root = TunnelSession(lambda blob: nc_down.publish("route.v2.to_hub.x", blob))
+    for frame in frames:
+        await hub.send(frame)
+    await hub.drain()
+    while len(got) < len(frames):
+        await asyncio.sleep(0.001)
+    assert got == frames
+    hub.close()
+    root.close()
+    return {"messages": nc_up.messages + nc_down.messages}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--publish-us", type=float, default=150.0)
+    args = parser.parse_args()
+    frames = _frames(args.frames)
+    payload_mb = sum(len(f) for f in frames) / 1048576
+    print(f"{args.frames} frames, {payload_mb:.1f} MB payload, publish cost {args.publish_us:.0f}us")
+    for name, runner in (("json", _run_json), ("binary", _run_binary)):
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        res = asyncio.run(runner(frames, args.publish_us / 1e6))
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        print(
+            f"{name:<7} {args.frames / wall:10.0f} frames/s  {payload_mb / wall:7.1f} MB/s  "
+            f"{cpu / args.frames * 1e6:7.1f} us cpu/frame  {res['messages']:6d} NATS messages"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark for SkillManager.run_tool invocation overhead.
+
+Installs a throwaway skill with a no-op tool into a temporary AdaOS base dir and
+times a tight loop of ``run_tool`` calls twice: with the cached tool descriptor
+(fast path) and with the descriptor cache dropped before every call, which
+re-runs runtime status, slot preparation and manifest parsing (cold path).
+
+Usage: python tools/bench_skill_run_tool.py [--calls 2000] [--timeout 0]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+class _Caps:
+    def require(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _install(ctx, name: str) -> None:
+    from adaos.services.skill.runtime_env import SkillRuntimeEnvironment
+
+    env = SkillRuntimeEnvironment(skills_root=Path(ctx.paths.skills_dir()), skill_name=name)
+    env.prepare_version("1.0.0")
+    slot = env.build_slot_paths("1.0.0", "A")
+    src = slot.src_dir / name
+    src.mkdir(parents=True, exist_ok=True)
+    (src / f"{name}_tools.py").write_text("def noop(payload):\n    return None\n", encoding="utf-8")
+    manifest = {
+        "source": str(src),
+        "version": "1.0.0",
+        "slot": "A",
+        "tools": {"noop": {"module": f"{name}_tools", "callable": "noop"}},
+        "runtime": {},
+    }
+    slot.resolved_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def _loop(mgr, name: str, calls: int, timeout: float | None, *, cold: bool) -> float:
+    from adaos.services.skill.tool_runtime import invalidate_tool_descriptors
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        if cold:
+            invalidate_tool_descriptors(name)
+        mgr.run_tool(name, "noop", {}, timeout=timeout)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=0.0, help="run tools through the per-skill executor")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("ADAOS_TESTING", "1")
+        from adaos.apps.bootstrap import init_ctx
+        from adaos.services.settings import Settings
+        from adaos.services.skill.manager import SkillManager
+
+        ctx = init_ctx(Settings.from_sources().with_overrides(base_dir=tmp))
+        name = "bench_run_tool"
+        _install(ctx, name)
+        mgr = SkillManager(git=ctx.git, paths=ctx.paths, caps=_Caps())
+        timeout = args.timeout or None
+        mgr.run_tool(name, "noop", {}, timeout=timeout)  # warm imports
+
+        cold_calls = max(1, args.calls // 10)
+        cold = _loop(mgr, name, cold_calls, timeout, cold=True)
+        fast = _loop(mgr, name, args.calls, timeout, cold=False)
+        print(f"cold path: {cold:9.1f} us/call ({cold_calls} calls)")
+        print(f"fast path: {fast:9.1f} us/call ({args.calls} calls)")
+        print(f"speedup:   {cold / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
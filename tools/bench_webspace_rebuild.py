@@ -0,0 +1,105 @@
+"""Benchmark for webspace rebuilds with many skills and webspaces.
+
+Creates a temporary AdaOS base dir with ``--skills`` skills (each with a
+``webui.json``) and rebuilds ``--webspaces`` in-memory YDocs three ways:
+
+  - cold:    declaration index dropped before every rebuild (old behaviour:
+             every webui.json re-read, every subtree rewritten into fresh docs),
+  - steady:  nothing changed since the previous rebuild,
+  - one:     one skill's webui.json edited between rebuild rounds.
+
+Reports ms per webspace rebuild and the Yjs update bytes produced.
+
+Usage: python tools/bench_webspace_rebuild.py [--skills 200] [--webspaces 20]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def _write_webui(skills_dir: Path, name: str, revision: int = 0) -> None:
+    path = skills_dir / name / "webui.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    apps = [{"id": f"{name}:app{i}", "title": f"{name} {i} r{revision}", "icon": "apps-outline"} for i in range(3)]
+    widgets = [{"id": f"{name}:w{i}", "type": "metric.tile", "title": f"w{i}"} for i in range(3)]
+    modals = {f"{name}_modal": {"title": name, "schema": {"id": f"{name}_modal", "widgets": widgets}}}
+    path.write_text(json.dumps({"apps": apps, "widgets": widgets, "registry": {"modals": modals}}), encoding="utf-8")
+
+
+def _round(runtime, docs, updates, before=None) -> tuple[float, int]:
+    updates.clear()
+    started = time.perf_counter()
+    for ws, doc in docs.items():
+        if before is not None:
+            before()
+        runtime._rebuild_in_doc(doc, ws)
+    elapsed = (time.perf_counter() - started) / len(docs) * 1e3
+    return elapsed, sum(updates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--webspaces", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("ADAOS_TESTING", "1")
+        import y_py as Y
+
+        from adaos.apps.bootstrap import init_ctx
+        from adaos.services.capacity import install_skill_in_capacity
+        from adaos.services.scenario.webspace_runtime import WebspaceScenarioRuntime
+        from adaos.services.scenario.webui_index import get_webui_index
+        from adaos.services.settings import Settings
+
+        ctx = init_ctx(Settings.from_sources().with_overrides(base_dir=tmp))
+        skills_dir = Path(ctx.paths.skills_dir())
+        names = [f"bench_skill_{i:03d}" for i in range(args.skills)]
+        for name in names:
+            _write_webui(skills_dir, name)
+            install_skill_in_capacity(name, "1.0.0")
+        runtime = WebspaceScenarioRuntime(ctx)
+        index = get_webui_index(ctx)
+        updates: list[int] = []
+
+        def _docs() -> dict:
+            docs = {}
+            for i in range(args.webspaces):
+                doc = Y.YDoc()
+                doc.observe_after_transaction(lambda evt: updates.append(len(evt.get_update())))
+                docs[f"bench-ws-{i}"] = doc
+            return docs
+
+        cold_ms = cold_bytes = 0.0
+        for _ in range(args.rounds):
+            ms, size = _round(runtime, _docs(), updates, before=index.forget)
+            cold_ms, cold_bytes = cold_ms + ms / args.rounds, cold_bytes + size / args.rounds
+
+        docs = _docs()
+        _round(runtime, docs, updates)
+        steady_ms = steady_bytes = 0.0
+        for _ in range(args.rounds):
+            ms, size = _round(runtime, docs, updates)
+            steady_ms, steady_bytes = steady_ms + ms / args.rounds, steady_bytes + size / args.rounds
+
+        one_ms = one_bytes = 0.0
+        for rev in range(1, args.rounds + 1):
+            _write_webui(skills_dir, names[rev % len(names)], revision=rev)
+            ms, size = _round(runtime, docs, updates)
+            one_ms, one_bytes = one_ms + ms / args.rounds, one_bytes + size / args.rounds
+
+        print(f"{args.skills} skills x {args.webspaces} webspaces")
+        print(f"cold rebuild:      {cold_ms:8.2f} ms/webspace  {cold_bytes:10.0f} update bytes/round")
+        print(f"steady rebuild:    {steady_ms:8.2f} ms/webspace  {steady_bytes:10.0f} update bytes/round")
+        print(f"one skill changed: {one_ms:8.2f} ms/webspace  {one_bytes:10.0f} update bytes/round")
+        print(f"index: {index.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()